@@ -0,0 +1,98 @@
+"""
+Micro-benchmark: PIL preprocessing vs. PIL-free OpenCV/NumPy preprocessing.
+
+Compares load_image_tensor() with get_transform() (BGR→RGB, numpy→PIL,
+PIL resize, ToTensor, Normalize) against get_opencv_transform() on BGR frames
+of typical line-camera resolutions, and reports the numerical difference.
+
+Usage:
+    python benchmarks/bench_preprocessing.py [--repeats 50]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Import ML modules the same way the desktop app does
+PROJ_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJ_ROOT / "desktop_app"))
+
+from ml.shared.transforms import get_transform, get_opencv_transform
+from ml.shared.utils import load_image_tensor
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080), (3840, 2160)]
+
+
+def make_frame(width, height, seed=0):
+    """Create a synthetic BGR fabric frame."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    gray = 128 + 50 * np.sin(x * 60.0 / width) * np.cos(y * 45.0 / height)
+    gray = np.clip(gray + rng.normal(0, 8, gray.shape), 0, 255)
+    return np.dstack([gray, gray * 0.9, gray * 0.8]).astype(np.uint8)
+
+
+def time_ms(fn, repeats):
+    """Return median wall time of fn() in milliseconds."""
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def run(repeats=50):
+    """
+    Run the benchmark.
+
+    Args:
+        repeats: Timed iterations per resolution and path
+
+    Returns:
+        list of dicts, one per resolution
+    """
+    pil_transform = get_transform(input_size=224, normalize=True)
+    cv_transform = get_opencv_transform(input_size=224, normalize=True)
+
+    results = []
+    for width, height in RESOLUTIONS:
+        frame = make_frame(width, height)
+
+        pil_ms = time_ms(lambda: load_image_tensor(frame, pil_transform), repeats)
+        cv_ms = time_ms(lambda: load_image_tensor(frame, cv_transform), repeats)
+
+        diff = (load_image_tensor(frame, cv_transform) - load_image_tensor(frame, pil_transform)).abs()
+
+        results.append({
+            'resolution': f"{width}x{height}",
+            'pil_ms': pil_ms,
+            'opencv_ms': cv_ms,
+            'speedup': pil_ms / cv_ms if cv_ms > 0 else 0.0,
+            'mean_abs_diff': diff.mean().item(),
+            'max_abs_diff': diff.max().item(),
+        })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preprocessing micro-benchmark")
+    parser.add_argument("--repeats", type=int, default=50, help="Timed iterations per case")
+    args = parser.parse_args()
+
+    print(f"{'Resolution':>10} | {'PIL (ms)':>9} | {'OpenCV (ms)':>11} | {'Speedup':>7} | {'Mean diff':>9} | {'Max diff':>8}")
+    print("-" * 70)
+    for r in run(args.repeats):
+        print(
+            f"{r['resolution']:>10} | {r['pil_ms']:9.2f} | {r['opencv_ms']:11.2f} | "
+            f"{r['speedup']:6.2f}x | {r['mean_abs_diff']:9.4f} | {r['max_abs_diff']:8.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
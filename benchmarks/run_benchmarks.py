@@ -0,0 +1,272 @@
+"""
+Reproducible benchmark suite for the ML inspection path.
+
+Runs fully offline: models are random-initialised (pretrained=False) and all
+frames come from the seeded synthetic fabric generator. Measures
+
+- preprocess:          TextileInspectionPipeline.preprocess()
+- texture_features:    defect / fabric extractors and the fused
+                       extract_frame_features()
+- inspect_frame:       full single-frame inspection
+- inspect_batch:       batched inspection (per-frame time)
+- video_loop:          CameraManager-style loop (decode → preview → inspect)
+                       over a synthetic video file
+
+at several resolutions and writes the results to JSON. Passing --compare
+checks throughput against an earlier result file and exits with status 1
+on regressions beyond --tolerance.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --quick --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import torch
+
+# Import app modules the same way the desktop app does
+PROJ_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJ_ROOT / "desktop_app"))
+
+from ml.pipeline import TextileInspectionPipeline
+from ml.shared.features import extract_frame_features
+from ml.defect_detection.preprocessing import extract_texture_features
+from ml.fabric_classification.preprocessing import extract_fabric_features
+from ml.defect_detection.model import DefectDetectionModel
+from ml.fabric_classification.model import FabricClassificationModel
+from synthetic_fabric import generate_fabric_frame, generate_fabric_frames
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080), (3840, 2160)]
+QUICK_RESOLUTIONS = [(640, 480), (1920, 1080)]
+BATCH_SIZE = 8
+VIDEO_FRAMES = 60
+
+
+def time_samples_ms(fn, repeats, warmup=1):
+    """Run fn() repeatedly and return per-call wall times in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+    return samples
+
+
+def summarize(samples, frames_per_call=1):
+    """Median/p95 latency per frame and throughput for a list of samples."""
+    per_frame = np.asarray(samples) / frames_per_call
+    median = float(np.median(per_frame))
+    return {
+        'median_ms': median,
+        'p95_ms': float(np.percentile(per_frame, 95)),
+        'fps': 1000.0 / median if median > 0 else 0.0,
+        'samples': len(samples),
+    }
+
+
+def build_pipeline(weights_dir):
+    """Create an inspection pipeline with random-init weights (no downloads)."""
+    torch.manual_seed(0)
+    defect_path = os.path.join(weights_dir, "defect.pth")
+    fabric_path = os.path.join(weights_dir, "fabric.pth")
+    torch.save(DefectDetectionModel(pretrained=False).state_dict(), defect_path)
+    torch.save(FabricClassificationModel(pretrained=False).state_dict(), fabric_path)
+
+    return TextileInspectionPipeline(
+        defect_weights_path=defect_path,
+        fabric_weights_path=fabric_path,
+        device=torch.device("cpu"),
+    )
+
+
+def write_video(path, width, height, count, fps=30):
+    """Write a synthetic fabric video (MJPG) and return its path."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"Cannot write benchmark video {path}")
+    for frame in generate_fabric_frames(count, width, height, seed=7, defect_rate=0.1):
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def bench_video_loop(pipeline, video_path, preview_size=(640, 480)):
+    """
+    CameraManager-style loop over a video file: decode, render the preview
+    and inspect every frame. Returns per-frame wall times (ms).
+    """
+    from preview import PreviewRenderer
+
+    preview = PreviewRenderer(*preview_size)
+    cap = cv2.VideoCapture(str(video_path))
+    samples = []
+    try:
+        while True:
+            start = time.perf_counter_ns()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            preview.render(frame)
+            pipeline.inspect_frame(frame)
+            samples.append((time.perf_counter_ns() - start) / 1e6)
+    finally:
+        cap.release()
+    return samples
+
+
+def run(resolutions=RESOLUTIONS, repeats=10, video_frames=VIDEO_FRAMES):
+    """
+    Run the whole suite.
+
+    Args:
+        resolutions: List of (width, height)
+        repeats: Timed iterations per case
+        video_frames: Frames in each synthetic video
+
+    Returns:
+        dict: {'meta': {...}, 'results': {case: {median_ms, p95_ms, fps, samples}}}
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = build_pipeline(tmp)
+
+        for width, height in resolutions:
+            res = f"{width}x{height}"
+            frame = generate_fabric_frame(width, height, seed=1)
+            batch = [generate_fabric_frame(width, height, seed=i) for i in range(BATCH_SIZE)]
+            print(f"⏱️  {res}...")
+
+            results[f"preprocess/{res}"] = summarize(
+                time_samples_ms(lambda: pipeline.preprocess(frame), repeats)
+            )
+            results[f"texture_features/defect/{res}"] = summarize(
+                time_samples_ms(lambda: extract_texture_features(frame), repeats)
+            )
+            results[f"texture_features/fabric/{res}"] = summarize(
+                time_samples_ms(lambda: extract_fabric_features(frame), repeats)
+            )
+            results[f"texture_features/fused/{res}"] = summarize(
+                time_samples_ms(lambda: extract_frame_features(frame), repeats)
+            )
+            results[f"inspect_frame/{res}"] = summarize(
+                time_samples_ms(lambda: pipeline.inspect_frame(frame), repeats)
+            )
+            results[f"inspect_batch/{res}"] = summarize(
+                time_samples_ms(lambda: pipeline.inspect_batch(batch), max(1, repeats // 2)),
+                frames_per_call=BATCH_SIZE
+            )
+
+            video_path = write_video(Path(tmp) / f"fabric_{res}.avi", width, height, video_frames)
+            results[f"video_loop/{res}"] = summarize(bench_video_loop(pipeline, video_path))
+
+    return {'meta': collect_metadata(), 'results': results}
+
+
+def collect_metadata():
+    """Environment details needed to compare runs."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJ_ROOT,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'torch': torch.__version__,
+        'opencv': cv2.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'torch_threads': torch.get_num_threads(),
+    }
+
+
+def compare(current, baseline, tolerance=0.15):
+    """
+    Compare throughput of two result files.
+
+    Args:
+        current: Output of run()
+        baseline: Earlier output of run()
+        tolerance: Allowed relative FPS drop (0.15 = 15%)
+
+    Returns:
+        list of dicts (case, baseline_fps, current_fps, change, regression)
+        for cases present in both
+    """
+    rows = []
+    for case, result in current['results'].items():
+        base = baseline['results'].get(case)
+        if base is None or base['fps'] <= 0:
+            continue
+        change = result['fps'] / base['fps'] - 1.0
+        rows.append({
+            'case': case,
+            'baseline_fps': base['fps'],
+            'current_fps': result['fps'],
+            'change': change,
+            'regression': change < -tolerance,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open Textile Intelligence - ML benchmark suite")
+    parser.add_argument("--output", type=str, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=str, help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed relative throughput drop before failing (default 0.15)")
+    parser.add_argument("--repeats", type=int, default=10, help="Timed iterations per case")
+    parser.add_argument("--quick", action="store_true", help="Only 640x480 and 1920x1080, fewer frames")
+    args = parser.parse_args()
+
+    report = run(
+        resolutions=QUICK_RESOLUTIONS if args.quick else RESOLUTIONS,
+        repeats=args.repeats,
+        video_frames=VIDEO_FRAMES // 2 if args.quick else VIDEO_FRAMES,
+    )
+
+    print(f"\n{'Case':<34} | {'Median (ms)':>11} | {'p95 (ms)':>9} | {'FPS':>8}")
+    print("-" * 72)
+    for case, r in report['results'].items():
+        print(f"{case:<34} | {r['median_ms']:11.2f} | {r['p95_ms']:9.2f} | {r['fps']:8.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        rows = compare(report, baseline, args.tolerance)
+        print(f"\nComparison with {baseline['meta'].get('commit') or args.compare}:")
+        for row in rows:
+            flag = "❌ REGRESSION" if row['regression'] else "✅"
+            print(f"{row['case']:<34} | {row['baseline_fps']:8.1f} → {row['current_fps']:8.1f} FPS "
+                  f"({row['change']:+.1%}) {flag}")
+
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
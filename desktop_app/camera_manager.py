@@ -3,14 +3,125 @@ Real camera manager for Open Textile Intelligence.
 Handles OpenCV camera capture in a background thread.
 
 PRODUCTION MODE: Uses REAL ML models for defect detection and fabric classification.
+
+Capture and inference are decoupled: the capture thread writes frames into a
+bounded FrameRingBuffer and separate InferenceWorker threads consume from it,
+so a slow model never stalls the camera or lets its buffer fill with stale frames.
+
+Frames come from a FrameSource (frame_sources.py): a real camera by default,
+or a video file, image folder, frame dump or synthetic generator for testing
+the whole chain without hardware.
 """
 
 import cv2
 import numpy as np
+import threading
 import time
+from contextlib import nullcontext
 from PySide6.QtCore import QThread, Signal
 from PySide6.QtGui import QImage
-from constants import YARDS_PER_FRAME
+from constants import (
+    YARDS_PER_FRAME, DropPolicy, FRAME_QUEUE_SIZE, TARGET_CAPTURE_FPS, UI_REFRESH_HZ
+)
+from defect_tracker import DefectTracker, detection_location
+from frame_buffer import FrameRingBuffer
+from frame_sources import CameraSource, FrameSourceError, default_camera_backend
+from preview import PreviewRenderer
+
+
+def build_detection_record(ml_result, frame_id, frame_shape=None):
+    """
+    Convert a pipeline result into the detection record shown in the UI.
+
+    Args:
+        ml_result: Result dict from TextileInspectionPipeline
+        frame_id: Display id of the frame (e.g. "CAM-00042")
+        frame_shape: Shape of the inspected frame, used to locate tiled
+                     defect boxes (None = no location)
+
+    Returns:
+        dict: Detection record
+    """
+    return {
+        "timestamp": time.strftime("%H:%M:%S"),
+        "frame_id": frame_id,
+        "is_defective": ml_result['defect_detected'],
+        "status": "KUSUR" if ml_result['defect_detected'] else "TAMAM",
+        "defect_type": ml_result['defect_type'],
+        "confidence": ml_result['defect_confidence'],
+
+        # Fabric classification
+        "fabric_type": ml_result['fabric_type'],
+        "fabric_confidence": ml_result['fabric_confidence'],
+
+        # Severity and structural info
+        "is_structural": ml_result['is_structural'],
+        "severity": ml_result['severity'],
+
+        # Performance
+        "inference_time_ms": ml_result['inference_time_ms'],
+
+        # Additional details
+        "texture_features": ml_result.get('texture_features', {}),
+        "fabric_features": ml_result.get('fabric_features', {}),
+
+        # Defect position in the image (tiled inspection only), used by DefectTracker
+        "location": detection_location(ml_result, frame_shape) if frame_shape is not None else None,
+    }
+
+
+def build_error_record(error, frame_id):
+    """
+    Detection record for a frame whose ML inference failed.
+
+    Args:
+        error: Exception raised by the pipeline
+        frame_id: Display id of the frame
+
+    Returns:
+        dict: Detection record with status "ML HATASI"
+    """
+    return {
+        "timestamp": time.strftime("%H:%M:%S"),
+        "frame_id": frame_id,
+        "is_defective": False,
+        "status": "ML HATASI",
+        "defect_type": f"ML Error: {str(error)}",
+        "confidence": 0.0,
+        "fabric_type": "Bilinmiyor",
+        "fabric_confidence": 0.0,
+        "is_structural": False,
+        "severity": "NONE",
+    }
+
+
+class InferenceWorker(QThread):
+    """
+    Consumes captured frames from a FrameRingBuffer and runs ML on them.
+    """
+
+    def __init__(self, frame_buffer, handler):
+        """
+        Initialize inference worker.
+
+        Args:
+            frame_buffer: FrameRingBuffer to consume from
+            handler: Callable invoked with each frame packet
+        """
+        super().__init__()
+        self.frame_buffer = frame_buffer
+        self.handler = handler
+
+    def run(self):
+        """Process frames until the buffer is closed and drained."""
+        while True:
+            packet = self.frame_buffer.get(timeout=0.1)
+            if packet is None:
+                if self.frame_buffer.closed:
+                    break
+                continue
+
+            self.handler(packet)
 
 
 class CameraManager(QThread):
@@ -20,16 +131,31 @@ class CameraManager(QThread):
     """
 
     # Signals
-    frame_captured = Signal(QImage)  # For UI display
-    frame_analyzed = Signal(dict)    # Detection results
+    frame_captured = Signal(QImage)  # For UI display (already sized to the preview)
+    frame_analyzed = Signal(dict)    # Consolidated defect events (DefectTracker)
     fps_updated = Signal(float)      # Frame rate
+    queue_stats_updated = Signal(dict)  # Per-stage queue depth / drop counters
     camera_error = Signal(str)       # Error messages
     scanning_progress = Signal(int)  # Progress percentage (0-100)
     scan_complete = Signal()         # Scan finished
     camera_opened = Signal(bool)     # Camera opened successfully
     stats_update = Signal(dict)      # Real-time statistics (matches simulation)
 
-    def __init__(self, camera_index=0, duration_seconds=10, ml_pipeline=None):
+    def __init__(
+        self,
+        camera_index=0,
+        duration_seconds=10,
+        ml_pipeline=None,
+        queue_size=FRAME_QUEUE_SIZE,
+        drop_policy=DropPolicy.DROP_OLDEST,
+        num_inference_workers=1,
+        target_fps=TARGET_CAPTURE_FPS,
+        preview_size=None,
+        preview_fps=UI_REFRESH_HZ,
+        frame_source=None,
+        defect_tracker=None,
+        detection_store=None
+    ):
         """
         Initialize camera manager.
 
@@ -37,19 +163,67 @@ class CameraManager(QThread):
             camera_index: Camera device index
             duration_seconds: Scan duration
             ml_pipeline: TextileInspectionPipeline instance (if None, ML disabled)
+            queue_size: Capacity of the capture → inference frame buffer
+            drop_policy: DropPolicy used when inference falls behind capture
+            num_inference_workers: Number of threads consuming the frame buffer.
+                                   Calls into a pipeline that is not
+                                   thread_safe (TextileInspectionPipeline)
+                                   are serialized, so >1 only runs inference
+                                   in parallel with ParallelInspectionPipeline
+            target_fps: Upper bound on capture rate of the default camera
+                        source (0 = as fast as camera delivers)
+            preview_size: (width, height) of the preview widget; frames are
+                          downscaled to fit it in this thread (None = native size)
+            preview_fps: Maximum preview frames rendered per second
+            frame_source: FrameSource to capture from (None = camera
+                          camera_index paced to target_fps); its own
+                          target_fps sets the capture rate
+            defect_tracker: DefectTracker that merges detections of the same
+                            defect across frames (None = default tracker)
+            detection_store: Optional DetectionHistory that persists every
+                             defect event
         """
         super().__init__()
         self.camera_index = camera_index
         self.duration_seconds = duration_seconds
+        if frame_source is None:
+            frame_source = CameraSource(camera_index, target_fps=target_fps)
+        self.frame_source = frame_source
+        self.target_fps = frame_source.target_fps
         self.is_running = False
-        self.cap = None
-        self.frame_count = 0
-        self.clean_frame_count = 0  # Frames without defects
+        self.frame_count = 0         # Frames captured
+        self.analyzed_count = 0      # Frames processed by ML
+        self.clean_frame_count = 0   # Frames without defects
+        self._stats_lock = threading.Lock()
+
+        # Capture → inference queue
+        self.frame_buffer = FrameRingBuffer(capacity=queue_size, drop_policy=drop_policy)
+        self.num_inference_workers = max(1, int(num_inference_workers))
+        self.inference_workers = []
+
+        # Preview rendering (scaled and converted off the UI thread)
+        preview_size = preview_size or (None, None)
+        self.preview = PreviewRenderer(*preview_size, max_fps=preview_fps)
 
         # ML Pipeline
         self.ml_pipeline = ml_pipeline
         self.ml_enabled = ml_pipeline is not None
 
+        # TextileInspectionPipeline keeps per-frame state (counters, latency
+        # recorder, pre-filter baseline, roll context) without locking; only
+        # a pipeline declaring thread_safe is called from several workers at once
+        if getattr(ml_pipeline, 'thread_safe', False):
+            self._inference_lock = nullcontext()
+        else:
+            self._inference_lock = threading.Lock()
+
+        # One event per physical defect instead of one per defective frame
+        self.defect_tracker = defect_tracker or DefectTracker()
+        self.detection_store = detection_store
+
+        # Capture-side stages go into the pipeline's latency histograms
+        self.profiler = getattr(ml_pipeline, 'profiler', None)
+
         if not self.ml_enabled:
             print("⚠️  Camera manager initialized WITHOUT ML pipeline")
             print("   Defect detection will be disabled")
@@ -63,7 +237,7 @@ class CameraManager(QThread):
             tuple: (success: bool, error_message: str)
         """
         try:
-            cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)  # Windows DirectShow
+            cap = cv2.VideoCapture(camera_index, default_camera_backend())  # DirectShow on Windows
 
             if not cap.isOpened():
                 return False, f"Kamera açılamadı (İndeks: {camera_index})\n\nOlası sebepler:\n• Kamera bağlı değil\n• Windows kamera izinleri engellendi\n• Başka uygulama kamerayı kullanıyor"
@@ -89,35 +263,11 @@ class CameraManager(QThread):
 
     def run(self):
         """Main camera capture loop."""
-        # Open camera with DirectShow backend (Windows optimized)
-        self.cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-
-        # Verify camera opened
-        if not self.cap.isOpened():
-            error_msg = (
-                f"Kamera açılamadı (İndeks: {self.camera_index})\n\n"
-                "ÇÖZÜM ADIMLARI:\n"
-                "1. Windows Ayarlar → Gizlilik ve Güvenlik → Kamera\n"
-                "2. 'Uygulamaların kameraya erişmesine izin ver' → AÇIK\n"
-                "3. Başka uygulamaları kapatın (Zoom, Teams, vb.)\n"
-                "4. Kamerayı çıkarıp tekrar takın"
-            )
-            self.camera_error.emit(error_msg)
-            self.camera_opened.emit(False)
-            return
-
-        # Try to read first frame to verify camera works
-        ret, test_frame = self.cap.read()
-        if not ret:
-            self.cap.release()
-            error_msg = (
-                "Kamera açıldı ama kare okunamadı\n\n"
-                "ÇÖZÜM ADIMLARI:\n"
-                "1. USB kablosunu kontrol edin\n"
-                "2. Farklı USB port deneyin\n"
-                "3. Bilgisayarı yeniden başlatın"
-            )
-            self.camera_error.emit(error_msg)
+        # Open frame source (camera: verifies the first frame can be read)
+        try:
+            self.frame_source.open()
+        except FrameSourceError as e:
+            self.camera_error.emit(str(e))
             self.camera_opened.emit(False)
             return
 
@@ -125,44 +275,49 @@ class CameraManager(QThread):
         self.camera_opened.emit(True)
         self.is_running = True
 
+        # Start inference consumers
+        if self.ml_enabled:
+            self._start_inference_workers()
+
         start_time = time.time()
         fps_start = time.time()
         fps_frames = 0
+        frame_interval = 1.0 / self.target_fps if self.target_fps else 0.0
 
         while self.is_running and (time.time() - start_time) < self.duration_seconds:
-            ret, frame = self.cap.read()
-
-            if not ret:
-                self.camera_error.emit("Kare okunamadı - Kamera bağlantısı koptu")
+            loop_start = time.time()
+            capture_start = time.perf_counter_ns()
+            frame = self.frame_source.read()
+            self._record_stage('capture', time.perf_counter_ns() - capture_start)
+
+            if frame is None:
+                if self.frame_source.is_live:
+                    self.camera_error.emit("Kare okunamadı - Kamera bağlantısı koptu")
+                # Recorded sources simply end
                 break
 
             self.frame_count += 1
 
-            # Convert frame to QImage for display (BGR → RGB)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_frame.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-
-            # Emit frame for UI display
-            self.frame_captured.emit(qt_image.copy())
-
-            # Analyze frame for defects using ML
+            # Emit preview for UI display, already scaled to the widget
+            # (skipped for frames the UI would never show)
+            if self.preview.due(loop_start):
+                render_start = time.perf_counter_ns()
+                preview_image = self.preview.render(frame)
+                emit_start = time.perf_counter_ns()
+                self._record_stage('color_conversion', emit_start - render_start)
+                self.frame_captured.emit(preview_image)
+                self._record_stage('ui_emit', time.perf_counter_ns() - emit_start)
+
+            # Hand frame over to inference workers (never blocks capture)
             if self.ml_enabled:
-                detection_result = self._analyze_frame_with_ml(frame)
-
-                # Emit detection result if defect found
-                if detection_result["is_defective"]:
-                    self.frame_analyzed.emit(detection_result)
-                else:
-                    # Track clean frames for efficiency
-                    self.clean_frame_count += 1
+                self.frame_buffer.put((self.frame_count, frame))
 
             # Calculate FPS
             fps_frames += 1
             if time.time() - fps_start >= 1.0:
                 fps = fps_frames / (time.time() - fps_start)
                 self.fps_updated.emit(fps)
+                self.queue_stats_updated.emit(self.get_queue_stats())
                 fps_frames = 0
                 fps_start = time.time()
 
@@ -172,34 +327,134 @@ class CameraManager(QThread):
             self.scanning_progress.emit(progress)
 
             # Emit statistics update (matches simulation pattern)
-            scanned_yards = self.frame_count * YARDS_PER_FRAME
-            efficiency = int((self.clean_frame_count / self.frame_count) * 100) if self.frame_count > 0 else 100
-
-            self.stats_update.emit({
-                'scanned_yards': scanned_yards,
-                'defects_found': self.frame_count - self.clean_frame_count,
-                'efficiency': efficiency
-            })
+            self.stats_update.emit(self._build_stats())
 
-            # Control frame rate (avoid overwhelming CPU)
-            time.sleep(0.033)  # ~30 FPS
+            # Pace capture to target FPS (avoid overwhelming CPU)
+            remaining = frame_interval - (time.time() - loop_start)
+            if remaining > 0:
+                time.sleep(remaining)
 
         # Cleanup
+        # Let workers finish queued frames, then stop them
+        self._stop_inference_workers()
+
+        # Defects still in view at the end of the scan
+        self._publish_events(self.defect_tracker.flush())
+
         # Emit final statistics
         if self.frame_count > 0:
-            scanned_yards = self.frame_count * YARDS_PER_FRAME
-            efficiency = int((self.clean_frame_count / self.frame_count) * 100)
-            self.stats_update.emit({
-                'scanned_yards': scanned_yards,
-                'defects_found': self.frame_count - self.clean_frame_count,
-                'efficiency': efficiency
-            })
+            self.stats_update.emit(self._build_stats())
+        self.queue_stats_updated.emit(self.get_queue_stats())
 
         self.scanning_progress.emit(100)  # Ensure 100% at end
         self.release_camera()
         self.scan_complete.emit()
 
-    def _analyze_frame_with_ml(self, frame):
+    def _record_stage(self, stage, duration_ns):
+        """Record a capture-side stage latency (if the pipeline is profiling)."""
+        if self.profiler is not None:
+            self.profiler.record(stage, duration_ns)
+
+    def set_preview_size(self, width, height):
+        """
+        Update the preview widget size (called from the UI thread on resize).
+
+        Args:
+            width, height: Widget size in pixels
+        """
+        self.preview.set_target_size(width, height)
+
+    def _start_inference_workers(self):
+        """Start threads that consume the frame buffer."""
+        self.inference_workers = []
+        for _ in range(self.num_inference_workers):
+            worker = InferenceWorker(self.frame_buffer, self._process_frame_packet)
+            worker.start()
+            self.inference_workers.append(worker)
+
+    def _stop_inference_workers(self):
+        """Close the frame buffer and wait for all workers to exit."""
+        self.frame_buffer.close()
+        for worker in self.inference_workers:
+            worker.wait()
+        self.inference_workers = []
+
+    def _process_frame_packet(self, packet):
+        """
+        Run ML on one queued frame and publish the result.
+
+        Called from InferenceWorker threads.
+
+        Args:
+            packet: (frame_number, frame) tuple from the frame buffer
+        """
+        frame_number, frame = packet
+        detection_result = self._analyze_frame_with_ml(frame, frame_number)
+
+        with self._stats_lock:
+            self.analyzed_count += 1
+            if not detection_result["is_defective"]:
+                # Track clean frames for efficiency
+                self.clean_frame_count += 1
+
+        # Emit one event per defect once it has left the view
+        detections = [detection_result] if detection_result["is_defective"] else []
+        self._publish_events(self.defect_tracker.update(frame_number, detections))
+
+    def _publish_events(self, events):
+        """Persist consolidated defect events and send them to the UI."""
+        for event in events:
+            if self.detection_store is not None:
+                self.detection_store.append(event)
+            self.frame_analyzed.emit(event)
+
+    def _build_stats(self):
+        """
+        Build statistics dict for stats_update.
+
+        Returns:
+            dict with scanned_yards, defects_found, efficiency
+        """
+        with self._stats_lock:
+            analyzed = self.analyzed_count
+            clean = self.clean_frame_count
+
+        scanned_yards = self.frame_count * YARDS_PER_FRAME
+        efficiency = int((clean / analyzed) * 100) if analyzed > 0 else 100
+
+        return {
+            'scanned_yards': scanned_yards,
+            'defects_found': self.defect_tracker.defect_count,
+            'efficiency': efficiency
+        }
+
+    def get_queue_stats(self):
+        """
+        Get per-stage queue statistics.
+
+        Returns:
+            dict with 'capture' and 'inference' stage counters
+        """
+        queue_stats = self.frame_buffer.get_stats()
+        with self._stats_lock:
+            analyzed = self.analyzed_count
+
+        return {
+            'capture': {
+                'frames_captured': self.frame_count,
+                'queue_depth': queue_stats['depth'],
+                'queue_capacity': queue_stats['capacity'],
+                'frames_dropped': queue_stats['frames_dropped'],
+                'drop_policy': queue_stats['drop_policy'],
+            },
+            'inference': {
+                'workers': len(self.inference_workers),
+                'frames_analyzed': analyzed,
+                'frames_pending': queue_stats['depth'],
+            },
+        }
+
+    def _analyze_frame_with_ml(self, frame, frame_number=None):
         """
         Analyze camera frame using REAL ML models.
 
@@ -211,64 +466,31 @@ class CameraManager(QThread):
 
         Args:
             frame: OpenCV frame (BGR numpy array)
+            frame_number: Capture sequence number (None = latest captured)
 
         Returns:
             dict: Detection result with ML predictions
         """
+        if frame_number is None:
+            frame_number = self.frame_count
+
         try:
             # Run ML pipeline
-            ml_result = self.ml_pipeline.inspect_frame(frame)
-
-            # Create detection record
-            detection_record = {
-                "timestamp": time.strftime("%H:%M:%S"),
-                "frame_id": f"CAM-{self.frame_count:05d}",
-                "is_defective": ml_result['defect_detected'],
-                "status": "KUSUR" if ml_result['defect_detected'] else "TAMAM",
-                "defect_type": ml_result['defect_type'],
-                "confidence": ml_result['defect_confidence'],
-
-                # Fabric classification
-                "fabric_type": ml_result['fabric_type'],
-                "fabric_confidence": ml_result['fabric_confidence'],
-
-                # Severity and structural info
-                "is_structural": ml_result['is_structural'],
-                "severity": ml_result['severity'],
-
-                # Performance
-                "inference_time_ms": ml_result['inference_time_ms'],
-
-                # Additional details
-                "texture_features": ml_result.get('texture_features', {}),
-                "fabric_features": ml_result.get('fabric_features', {}),
-            }
-
-            return detection_record
+            with self._inference_lock:
+                ml_result = self.ml_pipeline.inspect_frame(frame)
+            return build_detection_record(ml_result, f"CAM-{frame_number:05d}", frame.shape)
 
         except Exception as e:
             # If ML fails, return error record
             print(f"❌ ML inference error: {e}")
-            return {
-                "timestamp": time.strftime("%H:%M:%S"),
-                "frame_id": f"CAM-{self.frame_count:05d}",
-                "is_defective": False,
-                "status": "ML HATASI",
-                "defect_type": f"ML Error: {str(e)}",
-                "confidence": 0.0,
-                "fabric_type": "Bilinmiyor",
-                "fabric_confidence": 0.0,
-                "is_structural": False,
-                "severity": "NONE",
-            }
+            return build_error_record(e, f"CAM-{frame_number:05d}")
 
     def stop(self):
         """Stop camera capture."""
         self.is_running = False
         self.wait()  # Wait for thread to finish
+        self._stop_inference_workers()
 
     def release_camera(self):
-        """Release camera resources properly."""
-        if self.cap is not None and self.cap.isOpened():
-            self.cap.release()
-            self.cap = None
+        """Release camera (frame source) resources properly."""
+        self.frame_source.close()
@@ -4,6 +4,7 @@ Defines system modes and states for production-level clarity.
 """
 
 from enum import Enum, auto
+from pathlib import Path
 
 
 class ScanMode(Enum):
@@ -40,3 +41,50 @@ STATE_NAMES = {
 
 # Frame to yards conversion (matches simulation: 0.5 yards/frame)
 YARDS_PER_FRAME = 0.5
+
+# Fabric length visible in one camera frame, along the direction of travel
+# (image y axis). Measure it on the line: a defect stays in view for
+# CAMERA_VIEW_LENGTH_YARDS / YARDS_PER_FRAME frames, which the defect
+# tracker relies on to link them into one event.
+CAMERA_VIEW_LENGTH_YARDS = 2.0
+
+# Simulation mode frame rate (frames per second, 0 = as fast as possible)
+SIMULATION_FRAME_RATE = 10
+
+
+class DropPolicy(Enum):
+    """
+    What a bounded frame queue does when inference falls behind capture.
+    """
+    DROP_OLDEST = auto()  # Full queue evicts its oldest frame for the new one
+    KEEP_LATEST = auto()  # Consumers always take the newest frame, skipping stale ones
+
+
+# Camera capture → ML inference queue defaults
+FRAME_QUEUE_SIZE = 4
+TARGET_CAPTURE_FPS = 30
+
+# Live detection table: rows kept in memory
+DETECTION_TABLE_CAPACITY = 10000
+
+# UI refresh rate for coalesced worker signals (progress, stats, preview, detections)
+UI_REFRESH_HZ = 30
+
+# Persistent detection history (SQLite, see src/detection_store.py)
+DETECTION_DB_PATH = Path(__file__).parent / "data" / "detections.db"
+DETECTION_RETENTION_DAYS = 90
+
+# Cold start: window interactive within this budget (seconds, measured to first paint)
+STARTUP_BUDGET_SECONDS = 1.0
+
+# Delay after the first paint before the ML pipeline is preloaded in the background
+ML_PRELOAD_DELAY_MS = 500
+
+# Fabric type lock per roll (see ml/roll_context.py): the fabric classifier
+# runs on the first frames of a roll and then only for periodic re-checks.
+# Per-fabric profiles ({"Denim": {"confidence_threshold": 0.7}, ...}) go in
+# "profiles".
+FABRIC_ROLL_CONTEXT = {
+    "warmup_frames": 10,
+    "recheck_interval": 200,
+}
@@ -0,0 +1,302 @@
+"""
+Temporal defect tracking for Open Textile Intelligence.
+
+At 30 FPS a single stain stays in view for many consecutive frames, and
+every one of those frames is classified as defective. DefectTracker sits
+between the ML pipeline and the UI: it links per-frame detections of the
+same defect and emits ONE consolidated defect event (first/last frame, peak
+confidence) when the defect has left the view.
+
+Detections are linked when they come from the same camera, have the same
+defect class and at most max_gap_frames analyzed frames of that camera lie
+between them. Gaps are counted in analyzed frames, not capture numbers:
+frames dropped by a full queue were never inspected, so they cannot count
+as missed detections. If both carry a location
+(tiled inspection boxes), they must also map to the same spot on the fabric:
+the fabric advances yards_per_frame per frame, so a defect seen at image
+row y in frame n lies at
+
+    position = n * yards_per_frame - y * view_length_yards
+
+yards from the start of the roll (the fabric moves towards +y in the image),
+which stays constant while the defect crosses the view. view_length_yards
+is a property of the camera mounting (CAMERA_VIEW_LENGTH_YARDS) and must be
+longer than the fabric advance per frame, otherwise no defect is ever seen
+twice.
+
+Whole-frame detections carry no location, so fabric advance also bounds a
+track in time: a defect leaves the view after view_length_yards /
+yards_per_frame frames. A track spanning more than that (plus
+max_gap_frames) capture frames is closed and the run continues as a new
+event - a long same-class run is several defects, not one.
+"""
+
+import math
+import threading
+import time
+
+from constants import YARDS_PER_FRAME, CAMERA_VIEW_LENGTH_YARDS
+
+SEVERITY_ORDER = {"NONE": 0, "LOW": 1, "MEDIUM": 2, "HIGH": 3}
+
+
+def detection_location(ml_result, frame_shape):
+    """
+    Normalized location of the strongest defect box of a tiled result.
+
+    Args:
+        ml_result: Result dict from TextileInspectionPipeline
+        frame_shape: Shape of the inspected frame (height, width, ...)
+
+    Returns:
+        tuple (x, y) of the box centre in 0-1 image coordinates, or None
+        if the result has no defect boxes (whole-frame inspection)
+    """
+    boxes = ml_result.get('defect_boxes')
+    if not boxes:
+        return None
+
+    height, width = frame_shape[:2]
+    box = boxes[0]  # sorted by score, strongest first
+    return (
+        (box['x'] + box['width'] / 2) / width,
+        (box['y'] + box['height'] / 2) / height,
+    )
+
+
+class _Track:
+    """One defect being followed across frames."""
+
+    def __init__(self, track_id, camera_id, frame_number, index, detection, position):
+        self.track_id = track_id
+        self.camera_id = camera_id
+        self.defect_type = detection['defect_type']
+        self.first_frame = frame_number
+        self.last_frame = frame_number
+        self.last_index = index  # analyzed-frame count of the camera when last seen
+        self.frame_count = 1
+        self.position = position  # (yards along the roll, x) or None
+        self.peak = detection
+        self.severity = detection.get('severity', 'NONE')
+        self.first_seen = detection.get('timestamp') or time.strftime("%H:%M:%S")
+
+    def add(self, frame_number, index, detection, position):
+        self.first_frame = min(self.first_frame, frame_number)
+        self.last_frame = max(self.last_frame, frame_number)
+        self.last_index = index
+        self.frame_count += 1
+        if position is not None:
+            self.position = position
+        if detection.get('confidence', 0) > self.peak.get('confidence', 0):
+            self.peak = detection
+        severity = detection.get('severity', 'NONE')
+        if SEVERITY_ORDER.get(severity, 0) > SEVERITY_ORDER.get(self.severity, 0):
+            self.severity = severity
+
+
+class DefectTracker:
+    """
+    Links per-frame defect detections into consolidated defect events.
+
+    Thread-safe: update() may be called from several inference workers.
+    """
+
+    def __init__(
+        self,
+        yards_per_frame=YARDS_PER_FRAME,
+        view_length_yards=CAMERA_VIEW_LENGTH_YARDS,
+        max_gap_frames=3,
+        position_tolerance_yards=0.1,
+        lateral_tolerance=0.15
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            yards_per_frame: Fabric advance between consecutive frames
+            view_length_yards: Fabric length visible in one frame (along y),
+                               measured at the camera
+            max_gap_frames: Analyzed frames a defect may go undetected
+                            before its track is closed (covers missed
+                            detections; dropped frames do not count)
+            position_tolerance_yards: Maximum difference in roll position
+                                      for located detections to match
+            lateral_tolerance: Maximum difference in normalized x position
+                               for located detections to match
+        """
+        if view_length_yards <= yards_per_frame:
+            raise ValueError(
+                f"view_length_yards ({view_length_yards}) must be longer than "
+                f"yards_per_frame ({yards_per_frame}): a defect would never be in "
+                f"view for more than one frame"
+            )
+
+        self.yards_per_frame = yards_per_frame
+        self.view_length_yards = view_length_yards
+        self.max_gap_frames = max_gap_frames
+        self.position_tolerance_yards = position_tolerance_yards
+        self.lateral_tolerance = lateral_tolerance
+
+        # Capture frames one defect can stay in view (plus missed detections)
+        self.max_span_frames = math.ceil(view_length_yards / yards_per_frame) + max_gap_frames
+
+        self._lock = threading.Lock()
+        self._tracks = []
+        self._analyzed = {}  # camera_id → frames analyzed so far
+        self._next_id = 1
+
+        # Counters
+        self.detections_in = 0
+        self.events_out = 0
+
+    def _position(self, frame_number, location):
+        """Roll position (yards, x) of a located detection, else None."""
+        if location is None:
+            return None
+        x, y = location
+        return (frame_number * self.yards_per_frame - y * self.view_length_yards, x)
+
+    def _matches(self, track, camera_id, index, detection, position):
+        if track.camera_id != camera_id or track.defect_type != detection['defect_type']:
+            return False
+        if index - track.last_index > self.max_gap_frames + 1:
+            return False
+        if position is None or track.position is None:
+            return True
+        return (abs(position[0] - track.position[0]) <= self.position_tolerance_yards
+                and abs(position[1] - track.position[1]) <= self.lateral_tolerance)
+
+    def update(self, frame_number, detections, camera_id=0):
+        """
+        Feed the detections of one analyzed frame.
+
+        Call this for every analyzed frame - also clean ones, with an empty
+        list - so tracks of defects that left the view are closed.
+
+        Args:
+            frame_number: Capture sequence number of the frame (may skip
+                          numbers of frames the queue dropped)
+            detections: Defective detection records of that frame; an
+                        optional 'location' (x, y) in 0-1 image coordinates
+                        enables position matching
+            camera_id: Camera that captured the frame
+
+        Returns:
+            list of consolidated defect events whose tracks were closed
+        """
+        with self._lock:
+            index = self._analyzed.get(camera_id, 0) + 1
+            self._analyzed[camera_id] = index
+
+            # Defects that must have left the view by now, seen or not
+            events = self._close([
+                t for t in self._tracks
+                if t.camera_id == camera_id and frame_number - t.first_frame > self.max_span_frames
+            ])
+
+            for detection in detections:
+                self.detections_in += 1
+                position = self._position(frame_number, detection.get('location'))
+
+                track = next(
+                    (t for t in self._tracks
+                     if self._matches(t, camera_id, index, detection, position)),
+                    None
+                )
+                if track is None:
+                    self._tracks.append(
+                        _Track(self._next_id, camera_id, frame_number, index, detection, position)
+                    )
+                    self._next_id += 1
+                else:
+                    track.add(frame_number, index, detection, position)
+
+            closed = [
+                t for t in self._tracks
+                if t.camera_id == camera_id and index - t.last_index > self.max_gap_frames
+            ]
+            return events + self._close(closed)
+
+    def flush(self):
+        """
+        Close all open tracks (end of scan).
+
+        Returns:
+            list of consolidated defect events
+        """
+        with self._lock:
+            return self._close(list(self._tracks))
+
+    def _close(self, tracks):
+        """Remove tracks and build their events (caller holds the lock)."""
+        events = []
+        for track in tracks:
+            self._tracks.remove(track)
+            events.append(self._build_event(track))
+        self.events_out += len(events)
+        return events
+
+    def _build_event(self, track):
+        """
+        Consolidated defect event, shaped like a detection record so the
+        detection table can show it directly.
+        """
+        peak = track.peak
+        event = dict(peak)
+        event.pop('location', None)
+        event.update({
+            "timestamp": track.first_seen,
+            "frame_id": self._frame_id(peak.get('frame_id'), track),
+            "severity": track.severity,
+            "confidence": peak.get('confidence', 0.0),
+            "event_id": track.track_id,
+            "camera_id": track.camera_id,
+            "first_frame": track.first_frame,
+            "last_frame": track.last_frame,
+            "frame_count": track.frame_count,
+            "peak_confidence": peak.get('confidence', 0.0),
+            "length_yards": (track.last_frame - track.first_frame) * self.yards_per_frame,
+        })
+        if track.position is not None:
+            event["position_yards"] = track.position[0]
+            event["lateral_position"] = track.position[1]
+        return event
+
+    @staticmethod
+    def _frame_id(peak_frame_id, track):
+        """Frame id of the first frame, plus the span if several frames."""
+        prefix = peak_frame_id.rsplit('-', 1)[0] if peak_frame_id else "CAM"
+        if track.first_frame == track.last_frame:
+            return f"{prefix}-{track.first_frame:05d}"
+        return f"{prefix}-{track.first_frame:05d}…{track.last_frame:05d}"
+
+    @property
+    def defect_count(self):
+        """Distinct defects seen so far (closed events + open tracks)."""
+        with self._lock:
+            return self.events_out + len(self._tracks)
+
+    def get_stats(self):
+        """
+        Get tracking statistics.
+
+        Returns:
+            dict with detections_in, events_out, open_tracks and
+            reduction (detections per emitted event)
+        """
+        with self._lock:
+            return {
+                'detections_in': self.detections_in,
+                'events_out': self.events_out,
+                'open_tracks': len(self._tracks),
+                'reduction': self.detections_in / self.events_out if self.events_out else 0.0,
+            }
+
+    def reset(self):
+        """Forget all tracks and counters."""
+        with self._lock:
+            self._tracks = []
+            self._analyzed = {}
+            self._next_id = 1
+            self.detections_in = 0
+            self.events_out = 0
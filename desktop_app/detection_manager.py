@@ -5,10 +5,14 @@ Supports both SIMULATION and REAL CAMERA modes.
 IMPORTANT: This module now handles TWO distinct modes:
 1. SIMULATION: Artificial defect generation (demo/testing)
 2. CAMERA: Real camera feed analysis (production use)
+
+Simulation frames come from the seeded SimulationEngine in blocks: at the
+configured frame rate each loop iteration generates the frames that are due
+(usually one), and with frame_rate=0 it generates whole blocks as fast as
+the UI, storage and reporting paths can absorb them (load testing).
 """
 
 import time
-import random
 from PySide6.QtCore import QThread, Signal
 import sys
 from pathlib import Path
@@ -16,7 +20,7 @@ from pathlib import Path
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from defect_scanner import FabricScanner
-from constants import ScanMode
+from constants import ScanMode, YARDS_PER_FRAME, SIMULATION_FRAME_RATE
 
 
 class DetectionManager(QThread):
@@ -28,15 +32,31 @@ class DetectionManager(QThread):
     # Signals for UI updates
     calibration_progress = Signal(int)  # 0-100
     scanning_progress = Signal(int)     # 0-100
-    new_detection = Signal(dict)        # Detection record
+    new_detections = Signal(list)       # Defect records of one generated block
     scan_complete = Signal()            # Scan finished
     stats_update = Signal(dict)         # Overall statistics
 
-    def __init__(self, mode=ScanMode.SIMULATION, duration_seconds=10):
+    def __init__(self, mode=ScanMode.SIMULATION, duration_seconds=10, detection_store=None,
+                 frame_rate=SIMULATION_FRAME_RATE, seed=None, max_frames=None):
+        """
+        Args:
+            mode: ScanMode to run
+            duration_seconds: Scan duration (None = until max_frames)
+            detection_store: Optional DetectionHistory that persists every defect
+            frame_rate: Simulated frames per second (0/None = as fast as possible)
+            seed: Simulation seed (same seed = same defect sequence; None = random)
+            max_frames: Stop after this many frames (None = duration only)
+        """
         super().__init__()
+        if duration_seconds is None and max_frames is None:
+            raise ValueError("Need duration_seconds or max_frames")
         self.mode = mode
         self.duration_seconds = duration_seconds
-        self.scanner = FabricScanner()
+        self.frame_rate = frame_rate
+        self.max_frames = max_frames
+        self.scanner = FabricScanner(store=detection_store, seed=seed)
+        self.seed = self.scanner.engine.seed
+        self.frames_generated = 0
         self.is_running = True
 
     def run(self):
@@ -73,41 +93,39 @@ class DetectionManager(QThread):
         time.sleep(0.1)
 
         # Phase 2: Scanning (simulated)
-        start_time = time.time()
-        frame_count = 0
-
-        while time.time() - start_time < self.duration_seconds and self.is_running:
-            # Generate frame ID (SIMULATION)
-            frame_id = f"SIM-{10000 + frame_count}"
-
-            # Analyze frame (ARTIFICIAL DEFECTS)
-            result = self.scanner.analyze_frame(frame_id)
-            self.scanner.scanned_yards += 0.5
-
-            # Create detection record
-            detection_record = {
-                "timestamp": time.strftime("%H:%M:%S"),
-                "frame_id": frame_id,
-                "is_defective": result["detected"],
-                "status": "KUSUR" if result["detected"] else "TAMAM",
-                "defect_type": result.get("type", "-"),
-                "confidence": result.get("confidence", 0)
-            }
-
-            # Store in scanner history
-            self.scanner.detection_history.append(detection_record)
-
-            if result["detected"]:
-                self.scanner.defects_found += 1
-
-            # Emit new detection (only defects to reduce noise)
-            if result["detected"]:
-                self.new_detection.emit(detection_record)
+        print(f"🎲 Simulation seed: {self.seed}")
+        engine = self.scanner.engine
+        start_time = time.perf_counter()
+        self.frames_generated = 0
+
+        while self.is_running:
+            elapsed = time.perf_counter() - start_time
+            if self.duration_seconds is not None and elapsed >= self.duration_seconds:
+                break
+            remaining = None if self.max_frames is None else self.max_frames - self.frames_generated
+            if remaining is not None and remaining <= 0:
+                break
+
+            if self.frame_rate:
+                # Frames due by now; sleep until the next one otherwise
+                due = int(elapsed * self.frame_rate) + 1 - self.frames_generated
+                if due <= 0:
+                    time.sleep(self.frames_generated / self.frame_rate - elapsed)
+                    continue
+            else:
+                due = engine.block_frames
+            if remaining is not None:
+                due = min(due, remaining)
+
+            # Analyze frames (ARTIFICIAL DEFECTS)
+            self._process_block(engine.next_block(min(due, engine.block_frames)))
 
             # Update progress
-            elapsed_time = time.time() - start_time
-            progress = min(int((elapsed_time / self.duration_seconds) * 100), 100)
-            self.scanning_progress.emit(progress)
+            if self.max_frames is not None:
+                progress = self.frames_generated / self.max_frames
+            else:
+                progress = (time.perf_counter() - start_time) / self.duration_seconds
+            self.scanning_progress.emit(min(int(progress * 100), 100))
 
             # Emit statistics update
             efficiency = max(100 - (self.scanner.defects_found * 2), 0)
@@ -117,13 +135,31 @@ class DetectionManager(QThread):
                 "efficiency": efficiency
             })
 
-            frame_count += 1
-            time.sleep(0.1)
-
         # Scan complete
         self.scanning_progress.emit(100)
         self.scan_complete.emit()
 
+    def _process_block(self, block):
+        """
+        Record a block of simulated frames and emit its defects.
+
+        Args:
+            block: FrameBlock from the simulation engine
+        """
+        # Frame ids continue SIM-10000, SIM-10001, ... across blocks
+        records = self.scanner.engine.to_records(block, frame_id_prefix="SIM-")
+
+        # Store in scanner history (and the detection store)
+        self.scanner.record_detections(records)
+        self.scanner.scanned_yards += len(records) * YARDS_PER_FRAME
+        self.frames_generated += len(records)
+
+        # Emit defects only to reduce noise (one signal per block)
+        defects = [record for record in records if record["is_defective"]]
+        self.scanner.defects_found += len(defects)
+        if defects:
+            self.new_detections.emit(defects)
+
     def stop(self):
         """Stop the detection process."""
         self.is_running = False
@@ -0,0 +1,130 @@
+"""
+Bounded frame ring buffer for Open Textile Intelligence.
+Decouples camera capture (producer) from ML inference (consumers).
+
+The capture thread never blocks on a slow model: when the buffer is full
+frames are dropped according to the configured DropPolicy and counted.
+"""
+
+import threading
+from collections import deque
+from constants import DropPolicy, FRAME_QUEUE_SIZE
+
+
+class FrameRingBuffer:
+    """
+    Thread-safe bounded queue of captured frames.
+
+    DROP_OLDEST: a full buffer evicts its oldest frame to make room.
+    KEEP_LATEST: get() returns the newest frame and discards older ones,
+                 so inference always works on the most recent image.
+    """
+
+    def __init__(self, capacity=FRAME_QUEUE_SIZE, drop_policy=DropPolicy.DROP_OLDEST):
+        """
+        Initialize frame buffer.
+
+        Args:
+            capacity: Maximum number of frames held at once (>= 1)
+            drop_policy: DropPolicy applied when consumers fall behind
+        """
+        self.capacity = max(1, int(capacity))
+        self.drop_policy = drop_policy
+
+        self._frames = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._closed = False
+
+        # Counters
+        self.frames_put = 0
+        self.frames_taken = 0
+        self.frames_dropped = 0
+
+    def put(self, item):
+        """
+        Add a frame without ever blocking the producer.
+
+        Args:
+            item: Frame packet to enqueue
+
+        Returns:
+            bool: False if the buffer has been closed
+        """
+        with self._not_empty:
+            if self._closed:
+                return False
+
+            if len(self._frames) >= self.capacity:
+                self._frames.popleft()
+                self.frames_dropped += 1
+
+            self._frames.append(item)
+            self.frames_put += 1
+            self._not_empty.notify()
+            return True
+
+    def get(self, timeout=None):
+        """
+        Take the next frame, waiting until one is available.
+
+        Args:
+            timeout: Seconds to wait (None = wait until a frame or close())
+
+        Returns:
+            Frame packet, or None on timeout / closed and drained buffer
+        """
+        with self._not_empty:
+            if not self._frames and not self._closed:
+                self._not_empty.wait(timeout)
+
+            if not self._frames:
+                return None
+
+            if self.drop_policy == DropPolicy.KEEP_LATEST:
+                self.frames_dropped += len(self._frames) - 1
+                item = self._frames.pop()
+                self._frames.clear()
+            else:
+                item = self._frames.popleft()
+
+            self.frames_taken += 1
+            return item
+
+    def close(self):
+        """Stop accepting frames and wake up all waiting consumers."""
+        with self._not_empty:
+            self._closed = True
+            self._not_empty.notify_all()
+
+    def clear(self):
+        """Discard all queued frames (counted as dropped)."""
+        with self._lock:
+            self.frames_dropped += len(self._frames)
+            self._frames.clear()
+
+    @property
+    def closed(self):
+        """Whether close() has been called."""
+        return self._closed
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+
+    def get_stats(self):
+        """
+        Get queue statistics.
+
+        Returns:
+            dict with depth, capacity, put/taken/dropped counters and policy
+        """
+        with self._lock:
+            return {
+                'depth': len(self._frames),
+                'capacity': self.capacity,
+                'frames_put': self.frames_put,
+                'frames_taken': self.frames_taken,
+                'frames_dropped': self.frames_dropped,
+                'drop_policy': self.drop_policy.name,
+            }
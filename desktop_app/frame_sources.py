@@ -0,0 +1,489 @@
+"""
+Frame sources for the capture thread.
+
+CameraManager reads frames from a FrameSource instead of talking to
+cv2.VideoCapture directly, so the full capture → ML → UI chain can run
+without camera hardware:
+
+- CameraSource:          USB/industrial camera (DirectShow on Windows)
+- VideoFileSource:       recorded video file or stream URL (rtsp://, http://)
+- ImageDirectorySource:  folder of still images, in file-name order
+- RawFrameDumpSource:    memory-mapped .npy or raw BGR frame dump (zero-copy)
+- SyntheticFrameSource:  deterministic synthetic fabric (synthetic_fabric.py)
+
+read() never sleeps; each source has a target_fps that the consumer paces
+to (CameraManager does this itself, frames() does it for standalone use).
+target_fps=None means as fast as possible.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from constants import TARGET_CAPTURE_FPS
+from synthetic_fabric import generate_fabric_frames
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp'}
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov', '.m4v', '.webm'}
+
+
+class FrameSourceError(Exception):
+    """A frame source could not be opened (message is shown to the user)."""
+
+
+def default_camera_backend():
+    """OpenCV capture backend for cameras on this platform."""
+    return cv2.CAP_DSHOW if sys.platform == 'win32' else cv2.CAP_ANY
+
+
+class FrameSource:
+    """
+    Base class for frame sources.
+
+    Subclasses implement open(), read() and close().
+    """
+
+    # True for sources where a failed read means the device disconnected
+    # (rather than the end of a recording)
+    is_live = False
+
+    def __init__(self, target_fps=None):
+        """
+        Args:
+            target_fps: Frames per second the consumer should pace to
+                        (None or 0 = as fast as possible)
+        """
+        self.target_fps = target_fps or None
+        self.frames_read = 0
+
+    def open(self):
+        """
+        Prepare the source for reading.
+
+        Raises:
+            FrameSourceError: If the source cannot be opened
+        """
+
+    def read(self):
+        """
+        Read the next frame.
+
+        Returns:
+            numpy.ndarray BGR frame, or None when the source is exhausted
+            or the device stopped delivering frames
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release the source."""
+
+    def describe(self):
+        """Short human-readable description (status bar, logs)."""
+        return type(self).__name__
+
+    def frames(self, max_frames=None):
+        """
+        Iterate over frames, paced to target_fps.
+
+        Args:
+            max_frames: Stop after this many frames (None = until exhausted)
+
+        Yields:
+            BGR frames
+        """
+        interval = 1.0 / self.target_fps if self.target_fps else 0.0
+        next_due = time.perf_counter()
+        count = 0
+
+        while max_frames is None or count < max_frames:
+            frame = self.read()
+            if frame is None:
+                return
+            count += 1
+            yield frame
+
+            if interval:
+                next_due += interval
+                remaining = next_due - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    # Fell behind: don't try to catch up with a burst
+                    next_due = time.perf_counter()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CameraSource(FrameSource):
+    """
+    Live camera via cv2.VideoCapture.
+    """
+
+    is_live = True
+
+    def __init__(self, camera_index=0, target_fps=None, backend=None):
+        """
+        Args:
+            camera_index: Camera device index
+            target_fps: Upper bound on capture rate (None = as fast as the camera)
+            backend: OpenCV capture API (None = default_camera_backend())
+        """
+        super().__init__(target_fps)
+        self.camera_index = camera_index
+        self.backend = default_camera_backend() if backend is None else backend
+        self.cap = None
+        self._first_frame = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.camera_index, self.backend)
+
+        if not self.cap.isOpened():
+            raise FrameSourceError(
+                f"Kamera açılamadı (İndeks: {self.camera_index})\n\n"
+                "ÇÖZÜM ADIMLARI:\n"
+                "1. Windows Ayarlar → Gizlilik ve Güvenlik → Kamera\n"
+                "2. 'Uygulamaların kameraya erişmesine izin ver' → AÇIK\n"
+                "3. Başka uygulamaları kapatın (Zoom, Teams, vb.)\n"
+                "4. Kamerayı çıkarıp tekrar takın"
+            )
+
+        # Try to read first frame to verify camera works
+        ret, frame = self.cap.read()
+        if not ret:
+            self.close()
+            raise FrameSourceError(
+                "Kamera açıldı ama kare okunamadı\n\n"
+                "ÇÖZÜM ADIMLARI:\n"
+                "1. USB kablosunu kontrol edin\n"
+                "2. Farklı USB port deneyin\n"
+                "3. Bilgisayarı yeniden başlatın"
+            )
+        self._first_frame = frame
+
+    def read(self):
+        if self._first_frame is not None:
+            frame, self._first_frame = self._first_frame, None
+        else:
+            ret, frame = self.cap.read()
+            if not ret:
+                return None
+        self.frames_read += 1
+        return frame
+
+    def close(self):
+        if self.cap is not None and self.cap.isOpened():
+            self.cap.release()
+        self.cap = None
+        self._first_frame = None
+
+    def describe(self):
+        return f"Kamera {self.camera_index}"
+
+
+class VideoFileSource(FrameSource):
+    """
+    Recorded video file or network stream (e.g. an RTSP stand-in).
+    """
+
+    def __init__(self, path, target_fps=None, loop=False):
+        """
+        Args:
+            path: Video file path or stream URL
+            target_fps: Playback rate (None = decode as fast as possible,
+                        use native_fps for real-time playback)
+            loop: Restart at the end of the file (files only)
+        """
+        super().__init__(target_fps)
+        self.path = str(path)
+        self.loop = loop
+        self.cap = None
+        self.native_fps = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            self.cap = None
+            raise FrameSourceError(f"Video açılamadı: {self.path}")
+        self.native_fps = self.cap.get(cv2.CAP_PROP_FPS) or None
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop and self.frames_read > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            return None
+        self.frames_read += 1
+        return frame
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+        self.cap = None
+
+    def describe(self):
+        return f"Video: {Path(self.path).name}"
+
+
+class ImageDirectorySource(FrameSource):
+    """
+    Still images from a directory, in file-name order.
+    """
+
+    def __init__(self, directory, target_fps=None, loop=False, recursive=False):
+        """
+        Args:
+            directory: Folder containing images (IMAGE_EXTENSIONS)
+            target_fps: Frames per second (None = as fast as possible)
+            loop: Start over after the last image
+            recursive: Include sub-directories
+        """
+        super().__init__(target_fps)
+        self.directory = Path(directory)
+        self.loop = loop
+        self.recursive = recursive
+        self.paths = []
+        self._index = 0
+
+    def open(self):
+        if not self.directory.is_dir():
+            raise FrameSourceError(f"Klasör bulunamadı: {self.directory}")
+
+        pattern = '**/*' if self.recursive else '*'
+        self.paths = sorted(
+            str(p) for p in self.directory.glob(pattern)
+            if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        if not self.paths:
+            raise FrameSourceError(f"Klasörde görüntü yok: {self.directory}")
+        self._index = 0
+
+    def read(self):
+        # Skip unreadable files instead of ending the scan
+        for _ in range(len(self.paths)):
+            if self._index >= len(self.paths):
+                if not self.loop:
+                    return None
+                self._index = 0
+
+            path = self.paths[self._index]
+            self._index += 1
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                self.frames_read += 1
+                return frame
+            print(f"⚠️  Görüntü okunamadı: {path}")
+
+        return None
+
+    def describe(self):
+        return f"Görüntü klasörü: {self.directory.name}"
+
+
+class RawFrameDumpSource(FrameSource):
+    """
+    Memory-mapped dump of uint8 BGR frames.
+
+    .npy files carry their own (N, H, W, 3) shape; headerless raw dumps need
+    width and height. Frames are returned as read-only views into the
+    mapping, so reading costs no copy and the OS pages data in on demand.
+    """
+
+    def __init__(self, path, width=None, height=None, channels=3, target_fps=None, loop=False):
+        """
+        Args:
+            path: .npy file or raw dump of concatenated frames
+            width, height: Frame size (raw dumps only)
+            channels: Channels per pixel (raw dumps only)
+            target_fps: Frames per second (None = as fast as possible)
+            loop: Start over after the last frame
+        """
+        super().__init__(target_fps)
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.loop = loop
+        self.frames_array = None
+        self._index = 0
+
+    def open(self):
+        if not self.path.is_file():
+            raise FrameSourceError(f"Kare dökümü bulunamadı: {self.path}")
+
+        if self.path.suffix.lower() == '.npy':
+            frames = np.load(self.path, mmap_mode='r')
+        else:
+            if not (self.width and self.height):
+                raise FrameSourceError("Ham kare dökümü için genişlik ve yükseklik gerekli")
+            frame_bytes = self.width * self.height * self.channels
+            size = self.path.stat().st_size
+            if size == 0 or size % frame_bytes:
+                raise FrameSourceError(
+                    f"Döküm boyutu ({size} bayt) {self.width}x{self.height}x{self.channels} "
+                    "karelere bölünemiyor"
+                )
+            frames = np.memmap(self.path, dtype=np.uint8, mode='r').reshape(
+                -1, self.height, self.width, self.channels
+            )
+
+        if frames.ndim != 4 or frames.dtype != np.uint8 or len(frames) == 0:
+            raise FrameSourceError(
+                f"Geçersiz kare dökümü {frames.shape} {frames.dtype} (beklenen: N x H x W x 3, uint8)"
+            )
+
+        self.frames_array = frames
+        self._index = 0
+
+    def read(self):
+        if self._index >= len(self.frames_array):
+            if not self.loop:
+                return None
+            self._index = 0
+
+        frame = self.frames_array[self._index]
+        self._index += 1
+        self.frames_read += 1
+        return frame
+
+    def close(self):
+        # Dropping the reference unmaps the file once no frame views remain
+        self.frames_array = None
+
+    def describe(self):
+        return f"Kare dökümü: {self.path.name}"
+
+
+def write_frame_dump(path, frames, count=None):
+    """
+    Write frames to a .npy dump readable by RawFrameDumpSource.
+
+    Args:
+        path: Output .npy path
+        frames: Iterable of equally sized BGR uint8 frames
+        count: Number of frames (required if frames has no len())
+
+    Returns:
+        Path of the written dump
+    """
+    path = Path(path)
+    iterator = iter(frames)
+    first = next(iterator)
+    count = len(frames) if count is None else count
+
+    dump = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(count,) + first.shape)
+    dump[0] = first
+    written = 1
+    for frame in iterator:
+        if written >= count:
+            break
+        dump[written] = frame
+        written += 1
+    dump.flush()
+    if written < count:
+        raise ValueError(f"Expected {count} frames, got {written}")
+    del dump
+    return path
+
+
+class SyntheticFrameSource(FrameSource):
+    """
+    Deterministic synthetic fabric frames.
+
+    The first cache_size frames are generated once and then replayed in a
+    cycle, so generation cost does not limit throughput in load tests.
+    """
+
+    def __init__(self, width=1280, height=720, fabric='pamuk', seed=0, defect_rate=0.05,
+                 count=None, cache_size=32, target_fps=None):
+        """
+        Args:
+            width, height: Frame size
+            fabric: Pattern name (see synthetic_fabric.FABRIC_PATTERNS)
+            seed: Random seed (same seed → same frame sequence)
+            defect_rate: Fraction of frames with a painted-in defect
+            count: Total frames before the source is exhausted (None = endless)
+            cache_size: Distinct frames generated before cycling
+            target_fps: Frames per second (None = as fast as possible)
+        """
+        super().__init__(target_fps)
+        self.width = width
+        self.height = height
+        self.fabric = fabric
+        self.seed = seed
+        self.defect_rate = defect_rate
+        self.count = count
+        self.cache_size = max(1, int(cache_size))
+        self._generator = None
+        self._cache = []
+
+    def open(self):
+        self._generator = generate_fabric_frames(
+            self.cache_size, self.width, self.height,
+            fabric=self.fabric, seed=self.seed, defect_rate=self.defect_rate
+        )
+        self._cache = []
+        self.frames_read = 0
+
+    def read(self):
+        if self.count is not None and self.frames_read >= self.count:
+            return None
+
+        index = self.frames_read % self.cache_size
+        if index >= len(self._cache):
+            self._cache.append(next(self._generator))
+        self.frames_read += 1
+        return self._cache[index]
+
+    def close(self):
+        self._generator = None
+        self._cache = []
+
+    def describe(self):
+        return f"Sentetik kumaş {self.width}x{self.height}"
+
+
+def create_frame_source(spec, target_fps=None, loop=True):
+    """
+    Build a frame source from a command-line style description.
+
+    Args:
+        spec: One of
+              - camera index ("0", 1)
+              - "synthetic" or "synthetic:WIDTHxHEIGHT"
+              - image directory
+              - .npy frame dump
+              - video file or stream URL (rtsp://, http://)
+        target_fps: Frames per second (None = camera default / as fast as possible)
+        loop: Restart finite sources (files, directories, dumps) at the end
+
+    Returns:
+        FrameSource (not opened yet)
+    """
+    if isinstance(spec, int) or str(spec).isdigit():
+        return CameraSource(int(spec), target_fps=target_fps or TARGET_CAPTURE_FPS)
+
+    spec = str(spec)
+    if spec == 'synthetic' or spec.startswith('synthetic:'):
+        width, height = 1280, 720
+        if ':' in spec:
+            try:
+                width, height = (int(v) for v in spec.split(':', 1)[1].lower().split('x'))
+            except ValueError:
+                raise ValueError(f"Invalid synthetic source '{spec}' (expected synthetic:WIDTHxHEIGHT)")
+        return SyntheticFrameSource(width, height, target_fps=target_fps)
+
+    path = Path(spec)
+    if path.is_dir():
+        return ImageDirectorySource(path, target_fps=target_fps, loop=loop)
+    if path.suffix.lower() == '.npy':
+        return RawFrameDumpSource(path, target_fps=target_fps, loop=loop)
+    return VideoFileSource(spec, target_fps=target_fps, loop=loop)
@@ -0,0 +1,213 @@
+"""
+Shared inference scheduler for multi-camera capture.
+
+Every camera captures into its own FrameRingBuffer. One scheduler thread
+pulls frames from all buffers, forms cross-camera batches for a single
+TextileInspectionPipeline and routes each result back to the camera it came
+from, so one pair of loaded models serves the whole loom.
+
+Batches are filled round-robin - one frame per camera per round - and the
+camera that starts the next batch rotates, so a fast or busy camera cannot
+starve the others and every camera gets an equal share of inference when
+the models are the bottleneck.
+"""
+
+import threading
+import time
+
+from frame_buffer import FrameRingBuffer
+from constants import DropPolicy, FRAME_QUEUE_SIZE
+
+
+class InferenceScheduler:
+    """
+    Fair round-robin batching of frames from several camera queues.
+    """
+
+    def __init__(self, ml_pipeline, handler, batch_size=8,
+                 queue_size=FRAME_QUEUE_SIZE, drop_policy=DropPolicy.DROP_OLDEST):
+        """
+        Initialize scheduler.
+
+        Args:
+            ml_pipeline: Pipeline with inspect_batch() shared by all cameras
+            handler: Callable(camera_id, packet, ml_result) invoked in the
+                     scheduler thread for every inspected frame; ml_result
+                     is the exception if inspect_batch() failed
+            batch_size: Maximum frames per inspect_batch() call
+            queue_size: Capacity of each camera's frame buffer
+            drop_policy: DropPolicy of each camera's frame buffer
+        """
+        self.ml_pipeline = ml_pipeline
+        self.handler = handler
+        self.batch_size = max(1, int(batch_size))
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+
+        self.buffers = {}           # camera_id → FrameRingBuffer
+        self._order = []            # round-robin order of camera ids
+        self._next_start = 0
+        self._frames_ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Counters
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.frames_inspected = {}  # camera_id → frames
+        self.inference_time_ms = 0.0
+
+    def add_camera(self, camera_id):
+        """
+        Register a camera and create its frame buffer.
+
+        Args:
+            camera_id: Hashable camera identifier
+
+        Returns:
+            FrameRingBuffer the camera should put() into (via submit())
+        """
+        buffer = FrameRingBuffer(capacity=self.queue_size, drop_policy=self.drop_policy)
+        self.buffers[camera_id] = buffer
+        self._order.append(camera_id)
+        self.frames_inspected[camera_id] = 0
+        return buffer
+
+    def submit(self, camera_id, packet):
+        """
+        Queue a captured frame (called from the camera's capture thread).
+
+        Args:
+            camera_id: Camera that captured the frame
+            packet: (frame_number, frame) tuple
+
+        Returns:
+            bool: False if the scheduler is shutting down
+        """
+        accepted = self.buffers[camera_id].put(packet)
+        self._frames_ready.set()
+        return accepted
+
+    def next_batch(self):
+        """
+        Take up to batch_size queued frames, one camera at a time.
+
+        Returns:
+            list of (camera_id, packet), empty if no frames are queued
+        """
+        # Clear before scanning: a put() after this point sets the event again
+        self._frames_ready.clear()
+
+        batch = []
+        cameras = self._order
+        if not cameras:
+            return batch
+
+        start = self._next_start % len(cameras)
+        rotation = cameras[start:] + cameras[:start]
+        self._next_start = start + 1
+
+        active = list(rotation)
+        while active and len(batch) < self.batch_size:
+            still_active = []
+            for camera_id in active:
+                if len(batch) >= self.batch_size:
+                    break
+                packet = self.buffers[camera_id].get(timeout=0)
+                if packet is not None:
+                    batch.append((camera_id, packet))
+                    still_active.append(camera_id)
+            active = still_active
+
+        return batch
+
+    def run_once(self, timeout=0.1):
+        """
+        Inspect one batch.
+
+        Args:
+            timeout: Seconds to wait for frames if all queues are empty
+
+        Returns:
+            int: Number of frames inspected
+        """
+        batch = self.next_batch()
+        if not batch:
+            self._frames_ready.wait(timeout)
+            batch = self.next_batch()
+            if not batch:
+                return 0
+
+        start = time.perf_counter()
+        try:
+            results = self.ml_pipeline.inspect_batch([packet[1] for _, packet in batch])
+        except Exception as e:
+            # Report the failure for every frame instead of killing the thread
+            print(f"❌ ML inference error: {e}")
+            results = [e] * len(batch)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._stats_lock:
+            self.batches += 1
+            self.inference_time_ms += elapsed_ms
+            for camera_id, _ in batch:
+                self.frames_inspected[camera_id] += 1
+
+        for (camera_id, packet), result in zip(batch, results):
+            self.handler(camera_id, packet, result)
+
+        return len(batch)
+
+    def _run(self):
+        """Scheduler loop: runs until stop() and all queues are drained."""
+        while True:
+            inspected = self.run_once()
+            if inspected == 0 and self._stop.is_set():
+                if all(len(buffer) == 0 for buffer in self.buffers.values()):
+                    break
+
+    def start(self):
+        """Start the scheduler thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="inference-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Close all queues, finish the frames already queued and stop.
+
+        Args:
+            timeout: Seconds to wait for the scheduler thread
+        """
+        for buffer in self.buffers.values():
+            buffer.close()
+        self._stop.set()
+        self._frames_ready.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_stats(self):
+        """
+        Get scheduling statistics.
+
+        Returns:
+            dict with batches, average_batch_size, average_batch_time_ms and
+            per-camera frames_inspected plus queue counters
+        """
+        with self._stats_lock:
+            batches = self.batches
+            inspected = dict(self.frames_inspected)
+            inference_time = self.inference_time_ms
+
+        total = sum(inspected.values())
+        return {
+            'batches': batches,
+            'frames_inspected': total,
+            'average_batch_size': total / batches if batches else 0.0,
+            'average_batch_time_ms': inference_time / batches if batches else 0.0,
+            'cameras': {
+                camera_id: dict(self.buffers[camera_id].get_stats(), frames_inspected=inspected[camera_id])
+                for camera_id in self._order
+            },
+        }
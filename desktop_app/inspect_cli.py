@@ -0,0 +1,474 @@
+"""
+Headless batch inspection.
+
+Runs TextileInspectionPipeline over image folders, glob patterns and recorded
+video files without Qt. Images are decoded on a thread pool (cv2.imread
+releases the GIL), video files are decoded by a read-ahead thread, frames
+are inspected in batches and every result is streamed to JSONL or CSV as
+soon as its batch finishes - suitable for re-inspecting archived rolls
+overnight.
+
+Usage (from desktop_app/):
+    python inspect_cli.py archive/roll_0412/ --output roll_0412.jsonl
+    python inspect_cli.py "archive/**/*.png" recordings/line2.mp4 -o results.csv
+    python inspect_cli.py recordings/line2.mp4 --video-stride 5 --num-workers 4
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cv2
+
+from frame_sources import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+
+# Columns written for every frame (CSV header / JSONL keys)
+RESULT_FIELDS = [
+    'source', 'frame_index', 'timestamp_ms',
+    'defect_detected', 'defect_type', 'defect_confidence', 'severity', 'is_structural',
+    'fabric_type', 'fabric_confidence', 'inference_time_ms', 'prefiltered',
+]
+
+
+def collect_inputs(inputs, recursive=False):
+    """
+    Expand directories and glob patterns into image and video file lists.
+
+    Args:
+        inputs: Paths, directories or glob patterns
+        recursive: Also scan sub-directories of given directories
+
+    Returns:
+        tuple: (image_paths, video_paths), each sorted and de-duplicated
+
+    Raises:
+        FileNotFoundError: If an input matches nothing
+    """
+    images, videos = [], []
+    seen = set()
+
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            pattern = '**/*' if recursive else '*'
+            candidates = sorted(p for p in path.glob(pattern) if p.is_file())
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = sorted(Path(p) for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+            if not candidates:
+                raise FileNotFoundError(f"No files match '{item}'")
+
+        for candidate in candidates:
+            suffix = candidate.suffix.lower()
+            key = str(candidate.resolve())
+            if key in seen:
+                continue
+            if suffix in IMAGE_EXTENSIONS:
+                images.append(str(candidate))
+            elif suffix in VIDEO_EXTENSIONS:
+                videos.append(str(candidate))
+            else:
+                continue
+            seen.add(key)
+
+    return images, videos
+
+
+def iter_image_frames(paths, executor, read_ahead=32):
+    """
+    Decode images on a thread pool, keeping at most read_ahead in flight.
+
+    Args:
+        paths: Image file paths
+        executor: ThreadPoolExecutor used for cv2.imread
+        read_ahead: Maximum decoded-but-unconsumed images
+
+    Yields:
+        tuple: (path, frame_index, timestamp_ms, frame); frame is None if
+        the file could not be decoded
+    """
+    pending = deque()
+    iterator = iter(paths)
+
+    for path in iterator:
+        pending.append((path, executor.submit(cv2.imread, path, cv2.IMREAD_COLOR)))
+        if len(pending) >= read_ahead:
+            done_path, future = pending.popleft()
+            yield done_path, None, None, future.result()
+
+    while pending:
+        done_path, future = pending.popleft()
+        yield done_path, None, None, future.result()
+
+
+def iter_video_frames(path, stride=1, read_ahead=32):
+    """
+    Decode a video file on a read-ahead thread.
+
+    Args:
+        path: Video file path
+        stride: Inspect every stride-th frame (others are grabbed, not decoded)
+        read_ahead: Maximum decoded-but-unconsumed frames
+
+    Yields:
+        tuple: (path, frame_index, timestamp_ms, frame)
+
+    Raises:
+        IOError: If the video cannot be opened
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video '{path}'")
+
+    frames = queue.Queue(maxsize=read_ahead)
+    stop = threading.Event()
+    done = object()
+
+    def reader():
+        index = 0
+        try:
+            while not stop.is_set():
+                if index % stride:
+                    # Skip without decoding
+                    if not cap.grab():
+                        break
+                    index += 1
+                    continue
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+                while not stop.is_set():
+                    try:
+                        frames.put((index, timestamp_ms, frame), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                index += 1
+        finally:
+            cap.release()
+            frames.put(done)
+
+    thread = threading.Thread(target=reader, name="video-reader", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = frames.get()
+            if item is done:
+                break
+            index, timestamp_ms, frame = item
+            yield path, index, timestamp_ms, frame
+    finally:
+        # Consumer stopped early: let the reader exit
+        stop.set()
+        while thread.is_alive():
+            try:
+                frames.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
+
+
+def iter_batches(frames, batch_size):
+    """
+    Group decoded frames into inspection batches.
+
+    Args:
+        frames: Iterable of (source, frame_index, timestamp_ms, frame)
+        batch_size: Frames per batch
+
+    Yields:
+        tuple: (items, failed) - items is a list of decodable frame tuples,
+        failed lists sources that could not be decoded
+    """
+    batch, failed = [], []
+    for item in frames:
+        if item[3] is None:
+            failed.append(item[0])
+            continue
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch, failed
+            batch, failed = [], []
+
+    if batch or failed:
+        yield batch, failed
+
+
+def to_record(source, frame_index, timestamp_ms, result):
+    """
+    Flatten one inspection result into an output record.
+
+    Args:
+        source: Image or video path
+        frame_index: Frame number in a video (None for images)
+        timestamp_ms: Video position in milliseconds (None for images)
+        result: Result dict from TextileInspectionPipeline
+
+    Returns:
+        dict with RESULT_FIELDS (plus defect_boxes in tiled mode and
+        anomaly_score in anomaly mode; the heatmap itself is not written)
+    """
+    record = {
+        'source': source,
+        'frame_index': frame_index,
+        'timestamp_ms': round(timestamp_ms, 1) if timestamp_ms is not None else None,
+        'defect_detected': bool(result['defect_detected']),
+        'defect_type': result['defect_type'],
+        'defect_confidence': round(float(result['defect_confidence']), 2),
+        'severity': result['severity'],
+        'is_structural': bool(result['is_structural']),
+        'fabric_type': result['fabric_type'],
+        'fabric_confidence': round(float(result['fabric_confidence']), 2),
+        'inference_time_ms': round(float(result['inference_time_ms']), 2),
+        'prefiltered': bool(result.get('prefiltered', False)),
+    }
+    if 'defect_boxes' in result:
+        record['defect_boxes'] = result['defect_boxes']
+    if result.get('anomaly_score') is not None:
+        record['anomaly_score'] = round(float(result['anomaly_score']), 4)
+    return record
+
+
+class ResultWriter:
+    """
+    Streams inspection records to a JSONL or CSV file (or stdout).
+    """
+
+    def __init__(self, output, fmt=None):
+        """
+        Open output.
+
+        Args:
+            output: File path or '-' for stdout
+            fmt: 'jsonl' or 'csv' (None = from the file extension, default jsonl)
+        """
+        if fmt is None:
+            fmt = 'csv' if str(output).lower().endswith('.csv') else 'jsonl'
+        if fmt not in ('jsonl', 'csv'):
+            raise ValueError(f"Unknown output format '{fmt}' (expected 'jsonl' or 'csv')")
+        self.format = fmt
+
+        if output == '-':
+            self._file = sys.stdout
+            self._owns_file = False
+        else:
+            self._file = open(output, 'w', encoding='utf-8', newline='')
+            self._owns_file = True
+
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(
+                self._file, fieldnames=RESULT_FIELDS + ['defect_boxes', 'anomaly_score'], extrasaction='ignore'
+            )
+            self._csv.writeheader()
+
+    def write_many(self, records):
+        """Write records and flush, so partial runs keep their results."""
+        for record in records:
+            if self._csv is not None:
+                row = dict(record)
+                if 'defect_boxes' in row:
+                    row['defect_boxes'] = json.dumps(row['defect_boxes'])
+                self._csv.writerow(row)
+            else:
+                self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        """Close the output file (stdout is left open)."""
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_inspection(pipeline, images, videos, writer, batch_size=16,
+                   decode_threads=None, video_stride=1, progress=None):
+    """
+    Inspect all inputs and stream results to writer.
+
+    Every video, and the image set as a whole, is inspected as its own
+    roll: pipeline.start_roll() resets the fabric lock and the pre-filter
+    baseline before each of them.
+
+    Args:
+        pipeline: TextileInspectionPipeline (or ParallelInspectionPipeline)
+        images: Image file paths
+        videos: Video file paths
+        writer: ResultWriter
+        batch_size: Frames per inspect_batch() call
+        decode_threads: Image decoding threads (None = CPU count)
+        video_stride: Inspect every n-th video frame
+        progress: Optional callable(frames_done) called after every batch
+
+    Returns:
+        dict with frames, defects, failed (undecodable sources), elapsed_s, fps
+    """
+    decode_threads = decode_threads or os.cpu_count() or 1
+    frames_done = 0
+    defects = 0
+    failed = []
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=decode_threads, thread_name_prefix="decode") as executor:
+        sources = []
+        if images:
+            sources.append(iter_image_frames(images, executor, read_ahead=max(batch_size * 2, decode_threads)))
+        sources += [iter_video_frames(path, video_stride, read_ahead=batch_size * 2) for path in videos]
+
+        for source in sources:
+            pipeline.start_roll()  # each recording is a separate roll
+            for batch, batch_failed in iter_batches(source, batch_size):
+                failed.extend(batch_failed)
+                if not batch:
+                    continue
+
+                results = pipeline.inspect_batch([item[3] for item in batch])
+                records = [
+                    to_record(path, index, timestamp_ms, result)
+                    for (path, index, timestamp_ms, _), result in zip(batch, results)
+                ]
+                writer.write_many(records)
+
+                frames_done += len(records)
+                defects += sum(record['defect_detected'] for record in records)
+                if progress is not None:
+                    progress(frames_done)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'frames': frames_done,
+        'defects': defects,
+        'failed': failed,
+        'elapsed_s': elapsed,
+        'fps': frames_done / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Open Textile Intelligence - headless batch inspection"
+    )
+    parser.add_argument("inputs", nargs="+", help="Image files, directories, glob patterns or video files")
+    parser.add_argument("-o", "--output", default="-", help="Output file (.jsonl or .csv, '-' = stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from extension)")
+    parser.add_argument("--recursive", action="store_true", help="Scan sub-directories")
+    parser.add_argument("--batch-size", type=int, default=16, help="Frames per inference batch")
+    parser.add_argument("--decode-threads", type=int, help="Image decoding threads (default: CPU count)")
+    parser.add_argument("--video-stride", type=int, default=1, help="Inspect every n-th video frame")
+    parser.add_argument("--num-workers", type=int, default=0, help="Inference worker processes (0 = in-process)")
+    parser.add_argument("--defect-weights", type=str, help="Defect detection weights or TorchScript artifact")
+    parser.add_argument("--fabric-weights", type=str, help="Fabric classification weights or TorchScript artifact")
+    parser.add_argument("--device", type=str, help="torch device (default: auto)")
+    parser.add_argument("--precision", default="fp32", choices=["fp32", "bf16", "int8_dynamic", "int8_static"])
+    parser.add_argument("--confidence", type=float, default=0.6, help="Defect confidence threshold (0-1)")
+    parser.add_argument("--tile-size", type=int, help="Tiled inspection with this tile size (pixels)")
+    parser.add_argument("--prefilter", action="store_true", help="Enable the texture pre-filter cascade")
+    parser.add_argument("--anomaly-bank", type=str, help="Anomaly mode with this memory bank (see ml.anomaly.build)")
+    parser.add_argument("--fabric-lock", action="store_true",
+                        help="Lock the fabric type after the first frames instead of classifying every frame")
+    parser.add_argument("--fabric-profiles", type=str,
+                        help="JSON file: fabric type → {confidence_threshold, anomaly_bank} (implies --fabric-lock)")
+    parser.add_argument("--offline", action="store_true", help="Never download weights; fail if a checkpoint is missing")
+    args = parser.parse_args(argv)
+
+    if args.batch_size < 1 or args.video_stride < 1:
+        parser.error("--batch-size and --video-stride must be at least 1")
+
+    try:
+        images, videos = collect_inputs(args.inputs, recursive=args.recursive)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if not images and not videos:
+        parser.error("No image or video files found")
+
+    roll_context = None
+    if args.fabric_profiles:
+        with open(args.fabric_profiles, encoding='utf-8') as f:
+            roll_context = {'profiles': json.load(f)}
+    elif args.fabric_lock:
+        roll_context = True
+
+    if args.offline:
+        # Inherited by inference worker processes too
+        os.environ["OTI_OFFLINE"] = "1"
+
+    import torch
+    from ml.export import find_exported_models
+    from ml.pipeline import create_ml_pipeline
+
+    defect_weights, fabric_weights = args.defect_weights, args.fabric_weights
+    if defect_weights is None and fabric_weights is None:
+        defect_weights, fabric_weights = find_exported_models()
+
+    # Model loading banners go to stderr so stdout can carry results
+    with contextlib.redirect_stdout(sys.stderr):
+        pipeline = create_ml_pipeline(
+            defect_weights=defect_weights,
+            fabric_weights=fabric_weights,
+            device=torch.device(args.device) if args.device else None,
+            confidence_threshold=args.confidence,
+            num_workers=args.num_workers,
+            precision=args.precision,
+            prefilter=args.prefilter or None,
+            tile_size=args.tile_size,
+            anomaly_bank=args.anomaly_bank,
+            roll_context=roll_context,
+        )
+
+    print(f"🔍 Inspecting {len(images)} images and {len(videos)} videos", file=sys.stderr)
+
+    def progress(frames_done):
+        print(f"\r   {frames_done} frames inspected", end="", file=sys.stderr, flush=True)
+
+    try:
+        with ResultWriter(args.output, args.format) as writer:
+            summary = run_inspection(
+                pipeline, images, videos, writer,
+                batch_size=args.batch_size,
+                decode_threads=args.decode_threads,
+                video_stride=args.video_stride,
+                progress=progress,
+            )
+    finally:
+        if hasattr(pipeline, 'close'):
+            pipeline.close()
+
+    print(file=sys.stderr)
+    for path in summary['failed']:
+        print(f"⚠️  Could not decode {path}", file=sys.stderr)
+    print(
+        f"✅ {summary['frames']} frames, {summary['defects']} defects in "
+        f"{summary['elapsed_s']:.1f}s ({summary['fps']:.1f} FPS)",
+        file=sys.stderr
+    )
+    roll_stats = pipeline.get_performance_stats().get('roll_context')
+    if roll_stats is not None:
+        print(
+            f"🧵 Fabric: {roll_stats['fabric_type'] or 'not locked'}, classifier skipped on "
+            f"{roll_stats['frames_skipped']}/{roll_stats['frames_seen']} frames",
+            file=sys.stderr
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,27 +4,74 @@ Main entry point for the native desktop application.
 
 Usage:
     python main.py
+    python main.py --source recordings/line2.mp4      # camera mode from a recording
+    python main.py --source synthetic:1920x1080 --source-fps 60
+    python main.py --source 0 --source 1 --source 2    # multi-camera loom
+    python main.py --no-ml-preload                     # load models only for camera mode
+    python main.py --offline                           # plant network: never download weights
+    python main.py --sim-fps 0 --seed 42               # simulation load test, replayable
 
 For packaging with PyInstaller:
     pyinstaller --onefile --windowed --name="OpenTextileIntelligence" main.py
 """
 
+import time
+
+# Cold-start reference point: everything below counts against the startup budget
+STARTED_AT = time.perf_counter()
+
+import argparse
+import os
 import sys
 from PySide6.QtWidgets import QApplication
 from ui.main_window import MainWindow
+from constants import SIMULATION_FRAME_RATE
 
 
 def main():
     """Main application entry point."""
+    parser = argparse.ArgumentParser(description="Open Textile Intelligence")
+    parser.add_argument(
+        "--source", action="append",
+        help="Camera mode frame source: camera index, video file/URL, image folder, "
+             ".npy frame dump or synthetic[:WIDTHxHEIGHT] (default: camera 0); "
+             "repeat for multi-camera mode"
+    )
+    parser.add_argument("--source-fps", type=float, help="Frame rate of --source (default: as fast as possible)")
+    parser.add_argument(
+        "--no-ml-preload", action="store_true",
+        help="Do not preload the ML models after startup; load them when camera mode is first used"
+    )
+    parser.add_argument(
+        "--offline", action="store_true",
+        help="Never download model weights; fail fast if the weights directory is incomplete"
+    )
+    parser.add_argument(
+        "--sim-fps", type=float, default=SIMULATION_FRAME_RATE,
+        help=f"Simulation mode frame rate (default: {SIMULATION_FRAME_RATE}, 0 = as fast as possible)"
+    )
+    parser.add_argument("--seed", type=int, help="Simulation seed (same seed = same defect sequence)")
+    args, qt_args = parser.parse_known_args()
+
+    if args.offline:
+        # Read by ml.shared.weights when the models are loaded
+        os.environ["OTI_OFFLINE"] = "1"
 
     # Create application
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Open Textile Intelligence")
     app.setOrganizationName("Bahattin Yunus Çetin")
     app.setApplicationVersion("1.0.0")
 
     # Create and show main window
-    window = MainWindow()
+    window = MainWindow(
+        frame_source_specs=args.source,
+        frame_source_fps=args.source_fps,
+        started_at=STARTED_AT,
+        preload_ml=not args.no_ml_preload,
+        simulation_frame_rate=args.sim_fps,
+        simulation_seed=args.seed
+    )
     window.show()
 
     # Run application event loop
@@ -9,6 +9,14 @@ PRODUCTION SYSTEM - NOT A DEMO
 Uses PyTorch with pretrained models adapted for textile inspection.
 """
 
-from .pipeline import TextileInspectionPipeline
-
 __all__ = ['TextileInspectionPipeline']
+
+
+def __getattr__(name):
+    # Imported on first use: `python -m ml.export` and
+    # `python -m ml.shared.weights` must not find their module already
+    # imported by the package (runpy warns about that)
+    if name == 'TextileInspectionPipeline':
+        from .pipeline import TextileInspectionPipeline
+        return TextileInspectionPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,23 @@
+"""
+Anomaly Detection Module for Textile Inspection.
+
+The defect classifier head is still an untrained placeholder, but clean
+fabric is plentiful. Anomaly mode learns what good fabric looks like
+instead of what defects look like:
+
+- Patch embeddings from mid-level stages of the defect backbone
+  (EfficientNet-B0), one per cell of a grid over the frame
+- A memory bank of embeddings from known-good rolls, greedy-coreset
+  subsampled and stored as a memory-mappable .npy file
+- Frames are scored by the distance of their patches to the nearest
+  bank entries (vectorized k-NN, no external index service)
+
+Build a bank with `python -m ml.anomaly.build`, then pass it to the
+pipeline as anomaly_bank.
+"""
+
+from .embedding import PatchEmbedder
+from .memory_bank import MemoryBank, greedy_coreset
+from .detector import AnomalyDetector, build_memory_bank
+
+__all__ = ['PatchEmbedder', 'MemoryBank', 'greedy_coreset', 'AnomalyDetector', 'build_memory_bank']
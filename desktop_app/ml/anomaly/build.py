@@ -0,0 +1,71 @@
+"""
+Build an anomaly memory bank from images of known-good fabric.
+
+Usage (from desktop_app/):
+    python -m ml.anomaly.build good_rolls/pamuk/ --output models/anomaly/pamuk
+    python -m ml.anomaly.build good/ -o models/anomaly/denim --coreset-ratio 0.05 --max-size 20000
+"""
+
+import argparse
+from pathlib import Path
+
+import torch
+
+from .detector import build_memory_bank
+from .embedding import PatchEmbedder
+from ..defect_detection.model import load_defect_model
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+def iter_images(directory):
+    """Yield readable images of a directory tree in sorted path order."""
+    import cv2
+
+    for path in sorted(Path(directory).rglob('*')):
+        if path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        image = cv2.imread(str(path))
+        if image is None:
+            print(f"⚠️  Could not decode {path}")
+            continue
+        yield image
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Open Textile Intelligence - anomaly memory bank builder"
+    )
+    parser.add_argument("images", type=str, help="Directory of clean (defect-free) fabric images")
+    parser.add_argument("-o", "--output", type=str, required=True, help="Bank directory to write")
+    parser.add_argument("--defect-weights", type=str, help="Defect model state_dict (default: pretrained backbone)")
+    parser.add_argument("--coreset-ratio", type=float, default=0.1, help="Fraction of patch embeddings kept")
+    parser.add_argument("--max-size", type=int, default=10000,
+                        help="Maximum number of embeddings in the bank (bounds k-NN time per frame)")
+    parser.add_argument("--grid-size", type=int, default=14, help="Patch grid side (embeddings per frame = square)")
+    parser.add_argument("--calibration-every", type=int, default=5,
+                        help="Hold out every n-th image to calibrate the threshold")
+    parser.add_argument("--threshold-margin", type=float, default=1.1,
+                        help="Threshold = highest held-out clean score x margin")
+    parser.add_argument("--device", type=str, default="cpu", help="torch device")
+    args = parser.parse_args()
+
+    device = torch.device(args.device)
+    model = load_defect_model(args.defect_weights, device)
+    embedder = PatchEmbedder(model, grid_size=args.grid_size)
+
+    bank = build_memory_bank(
+        embedder,
+        iter_images(args.images),
+        coreset_ratio=args.coreset_ratio,
+        max_size=args.max_size,
+        calibration_every=args.calibration_every,
+        threshold_margin=args.threshold_margin,
+        device=device
+    )
+    bank.metadata['source'] = str(Path(args.images).resolve())
+    print(f"✅ Memory bank ({len(bank)} x {bank.embedding_dim}) saved to {bank.save(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Anomaly-based defect detection.
+
+AnomalyDetector scores frames by how far their patch embeddings lie from
+the clean-fabric memory bank. It has the same detect()/detect_batch()
+interface as DefectDetector, so TextileInspectionPipeline uses it in place
+of the classifier head (whole-frame, batched, tiled and pre-filtered
+inspection all work unchanged).
+
+A frame's anomaly score is its worst patch score. Scores are mapped to a
+defect probability score / (score + threshold), so a frame exactly at the
+calibrated threshold has probability 0.5 and confidence_threshold = 0.5
+reproduces the calibrated decision.
+"""
+
+import numpy as np
+
+from .embedding import PatchEmbedder, DEFAULT_LAYERS
+from .memory_bank import MemoryBank, greedy_coreset
+from ..shared.profiling import measure
+from ..shared.transforms import get_opencv_transform
+from ..shared.utils import load_image_batch
+
+ANOMALY_CLASSES = ["Temiz", "Anomali"]
+
+
+class AnomalyDetector:
+    """
+    Nearest-neighbour anomaly scoring against a clean-fabric memory bank.
+    """
+
+    def __init__(self, defect_model, memory_bank, device='cpu', threshold=None, k=None,
+                 confidence_threshold=0.5):
+        """
+        Initialize anomaly detector.
+
+        Args:
+            defect_model: DefectDetectionModel whose backbone provides embeddings
+            memory_bank: MemoryBank or path of a saved bank directory
+            device: torch.device for the embedding forward pass
+            threshold: Anomaly score threshold (None = calibrated bank threshold)
+            k: Nearest neighbours averaged per patch (None = bank setting)
+            confidence_threshold: Minimum defect probability (0-1) to report
+        """
+        if not isinstance(memory_bank, MemoryBank):
+            memory_bank = MemoryBank.load(memory_bank)
+        self.memory_bank = memory_bank
+        metadata = memory_bank.metadata
+
+        self.device = device
+        self.embedder = PatchEmbedder(
+            defect_model,
+            layers=metadata.get('layers', DEFAULT_LAYERS),
+            grid_size=metadata.get('grid_size', 14)
+        ).to(device)
+        if self.embedder.embedding_dim != memory_bank.embedding_dim:
+            raise ValueError(
+                f"Memory bank embeddings have {memory_bank.embedding_dim} dimensions, "
+                f"the backbone produces {self.embedder.embedding_dim}"
+            )
+
+        self.threshold = threshold if threshold is not None else metadata.get('threshold')
+        if not self.threshold:
+            raise ValueError("Memory bank has no calibrated threshold; pass threshold=")
+        self.k = k or metadata.get('k', 1)
+        self.confidence_threshold = confidence_threshold
+        self.transform = get_opencv_transform(input_size=224, normalize=True)
+
+        # Optional LatencyRecorder (set by the pipeline)
+        self.profiler = None
+
+        print(f"✅ Anomaly detector ready ({len(memory_bank)} clean patches, "
+              f"threshold {self.threshold:.4g})")
+
+    def score_batch(self, batch_tensor):
+        """
+        Anomaly scores of a preprocessed batch.
+
+        Args:
+            batch_tensor: (B, 3, 224, 224) tensor
+
+        Returns:
+            tuple (scores, maps): (B,) image scores and (B, grid, grid)
+            patch score maps, float32 numpy arrays
+        """
+        with measure(self.profiler, 'anomaly_embed'):
+            embeddings = self.embedder(batch_tensor.to(self.device)).cpu().numpy()
+
+        batch, patches, dim = embeddings.shape
+        with measure(self.profiler, 'anomaly_knn'):
+            patch_scores = self.memory_bank.patch_scores(embeddings.reshape(-1, dim), k=self.k)
+
+        grid = self.embedder.grid_size
+        maps = patch_scores.reshape(batch, grid, grid)
+        return maps.reshape(batch, -1).max(axis=1), maps
+
+    def detect(self, cv_image, use_texture_enhancement=True, tensor=None, texture_features=None):
+        """
+        Score one frame (same result format as DefectDetector.detect()).
+
+        Args:
+            cv_image: OpenCV image (BGR numpy array)
+            use_texture_enhancement: Keep texture_features in the result
+            tensor: Already preprocessed (1, 3, 224, 224) tensor (None = preprocess here)
+            texture_features: Already extracted features for cv_image
+
+        Returns:
+            dict: Detection result plus anomaly_score and anomaly_map
+        """
+        return self.detect_batch(
+            [cv_image], use_texture_enhancement,
+            batch_tensor=tensor,
+            texture_features=[texture_features] if texture_features is not None else None
+        )[0]
+
+    def detect_batch(self, cv_images, use_texture_enhancement=True, batch_tensor=None, texture_features=None):
+        """
+        Score a batch of frames with one embedding pass and one k-NN query.
+
+        Args:
+            cv_images: List of OpenCV images
+            use_texture_enhancement: Keep texture_features in the results
+            batch_tensor: Already preprocessed (B, 3, 224, 224) tensor
+            texture_features: List of already extracted features, one per image
+
+        Returns:
+            list of detection results (see detect())
+        """
+        if len(cv_images) == 0:
+            return []
+
+        if batch_tensor is None:
+            batch_tensor = load_image_batch(cv_images, self.transform)
+        scores, maps = self.score_batch(batch_tensor)
+
+        if texture_features is None or not use_texture_enhancement:
+            texture_features = [None] * len(cv_images)
+
+        return [
+            self._build_result(float(score), score_map, features)
+            for score, score_map, features in zip(scores, maps, texture_features)
+        ]
+
+    def _build_result(self, score, score_map, texture_features=None):
+        """Detection result for one anomaly score."""
+        probability = score / (score + self.threshold) if score > 0 else 0.0
+        defect_detected = probability >= self.confidence_threshold
+
+        ratio = score / self.threshold
+        if not defect_detected:
+            severity = "NONE"
+        elif ratio >= 2.0:
+            severity = "HIGH"
+        elif ratio >= 1.3:
+            severity = "MEDIUM"
+        else:
+            severity = "LOW"
+
+        result = {
+            'defect_detected': defect_detected,
+            'defect_type': ANOMALY_CLASSES[1] if defect_detected else ANOMALY_CLASSES[0],
+            'confidence': (probability if defect_detected else 1.0 - probability) * 100,
+            'is_structural': False,
+            'severity': severity,
+            'class_idx': 1 if defect_detected else 0,
+            'defect_probability': probability * 100,
+            'anomaly_score': score,
+            'anomaly_map': score_map,
+        }
+        if texture_features is not None:
+            result['texture_features'] = texture_features
+        return result
+
+    def build_skipped_result(self, confidence, texture_features=None):
+        """
+        Clean result for a frame the pre-filter skipped.
+
+        Args:
+            confidence: Reported "Temiz" confidence percentage (0-100)
+            texture_features: Features the pre-filter decided on
+
+        Returns:
+            dict: Detection result with prefiltered=True
+        """
+        result = {
+            'defect_detected': False,
+            'defect_type': ANOMALY_CLASSES[0],
+            'confidence': confidence,
+            'is_structural': False,
+            'severity': "NONE",
+            'class_idx': 0,
+            'prefiltered': True,
+        }
+        if texture_features is not None:
+            result['texture_features'] = texture_features
+        return result
+
+    def get_defect_classes(self):
+        """
+        Get list of classes reported in anomaly mode.
+
+        Returns:
+            list of class names
+        """
+        return ANOMALY_CLASSES
+
+    def set_confidence_threshold(self, threshold):
+        """
+        Update confidence threshold.
+
+        Args:
+            threshold: New threshold (0.0-1.0)
+        """
+        self.confidence_threshold = max(0.0, min(1.0, threshold))
+        print(f"Updated confidence threshold: {self.confidence_threshold:.1%}")
+
+
+def build_memory_bank(embedder, images, coreset_ratio=0.1, max_size=None, calibration_every=5,
+                      threshold_margin=1.1, batch_size=16, k=1, seed=0, device='cpu'):
+    """
+    Build a memory bank from known-good fabric frames.
+
+    Every calibration_every-th frame is held out. The rest are embedded and
+    coreset-subsampled into the bank; the threshold is the highest
+    held-out frame score times threshold_margin.
+
+    Args:
+        embedder: PatchEmbedder
+        images: Iterable of clean OpenCV frames
+        coreset_ratio: Fraction of patch embeddings kept
+        max_size: Upper bound on the bank size (None = no bound)
+        calibration_every: Hold out every n-th frame for the threshold
+                           (needs at least n frames)
+        threshold_margin: Factor applied to the highest clean score
+        batch_size: Frames per embedding forward pass
+        k: Nearest neighbours per patch (stored for the detector)
+        seed: Coreset random seed
+        device: torch.device for embedding
+
+    Returns:
+        MemoryBank with threshold and embedding settings in its metadata
+    """
+    transform = get_opencv_transform(input_size=224, normalize=True)
+    embedder = embedder.to(device)
+
+    def embed(frames):
+        batch = load_image_batch(frames, transform).to(device)
+        return embedder(batch).cpu().numpy()
+
+    train, held_out, pending = [], [], []
+    num_frames = 0
+    for image in images:
+        is_held_out = calibration_every and num_frames % calibration_every == calibration_every - 1
+        num_frames += 1
+        if is_held_out:
+            held_out.append(embed([image]))
+            continue
+        pending.append(image)
+        if len(pending) == batch_size:
+            train.append(embed(pending))
+            pending = []
+    if pending:
+        train.append(embed(pending))
+    if not train:
+        raise ValueError("No training frames for the memory bank")
+
+    patches = np.concatenate(train).reshape(-1, embedder.embedding_dim)
+    size = max(1, int(len(patches) * coreset_ratio))
+    if max_size:
+        size = min(size, max_size)
+    print(f"🧮 Coreset: {size} of {len(patches)} patch embeddings")
+    selected = greedy_coreset(patches, size, seed=seed)
+
+    metadata = {
+        'layers': list(embedder.layers),
+        'grid_size': embedder.grid_size,
+        'k': k,
+        'num_frames': num_frames,
+        'num_patches': len(patches),
+    }
+    bank = MemoryBank(np.ascontiguousarray(patches[selected]), metadata)
+
+    if held_out:
+        held_out_scores = [
+            float(bank.patch_scores(frame.reshape(-1, embedder.embedding_dim), k=k).max())
+            for frame in held_out
+        ]
+    else:
+        # Too few frames to hold any out: coreset residuals of the training patches
+        held_out_scores = [float(bank.patch_scores(patches, k=k).max())]
+    bank.metadata['clean_score_max'] = max(held_out_scores)
+    bank.metadata['threshold'] = max(held_out_scores) * threshold_margin
+    print(f"📏 Threshold: {bank.metadata['threshold']:.4g} "
+          f"(max clean score {max(held_out_scores):.4g} over {len(held_out)} held-out frames)")
+    return bank
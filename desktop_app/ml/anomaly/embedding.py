@@ -0,0 +1,89 @@
+"""
+Patch embeddings from the defect detection backbone.
+
+Feature maps of two mid-level EfficientNet-B0 stages (28x28 and 14x14 for
+a 224x224 input) are brought to the same resolution, concatenated and
+averaged over a 3x3 neighbourhood, so every grid cell is described by the
+local texture around it rather than a single receptive field.
+"""
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# EfficientNet-B0 `features` stages used (stage 3: 40 ch @ /8, stage 5: 112 ch @ /16)
+DEFAULT_LAYERS = (3, 5)
+
+
+class PatchEmbedder(nn.Module):
+    """
+    Turns a batch of preprocessed frames into grid_size x grid_size patch embeddings.
+    """
+
+    def __init__(self, defect_model, layers=DEFAULT_LAYERS, grid_size=14):
+        """
+        Initialize embedder.
+
+        Args:
+            defect_model: DefectDetectionModel built from torchvision
+                          (TorchScript artifacts do not expose their stages)
+            layers: Indices of backbone.features stages to use
+            grid_size: Side of the patch grid (embeddings per frame =
+                       grid_size ** 2)
+
+        Raises:
+            ValueError: If the backbone has no `features` stages
+        """
+        super().__init__()
+        backbone = defect_model.backbone
+        # Reduced-precision wrappers keep the original module as .backbone
+        if not hasattr(backbone, 'features') and hasattr(backbone, 'backbone'):
+            backbone = backbone.backbone
+        features = getattr(backbone, 'features', None)
+        if not isinstance(features, nn.Sequential):
+            raise ValueError(
+                "Anomaly mode needs the torchvision defect model (state_dict or pretrained weights); "
+                "exported TorchScript artifacts do not expose intermediate layers"
+            )
+
+        self.layers = tuple(sorted(layers))
+        self.grid_size = grid_size
+        # Only the stages up to the deepest one used are ever run
+        self.stages = features[:self.layers[-1] + 1]
+        self.embedding_dim = sum(
+            self._stage_channels(self.stages[i]) for i in self.layers
+        )
+        self.eval()
+
+    @staticmethod
+    def _stage_channels(stage):
+        """Output channels of an EfficientNet stage."""
+        convs = [m for m in stage.modules() if isinstance(m, nn.Conv2d)]
+        return convs[-1].out_channels
+
+    @torch.no_grad()
+    def forward(self, x):
+        """
+        Embed a batch.
+
+        Args:
+            x: Preprocessed input tensor (B, 3, H, W)
+
+        Returns:
+            torch.Tensor (B, grid_size * grid_size, embedding_dim), float32
+        """
+        maps = []
+        for i, stage in enumerate(self.stages):
+            x = stage(x)
+            if i in self.layers:
+                maps.append(x)
+
+        size = (self.grid_size, self.grid_size)
+        pooled = []
+        for feature_map in maps:
+            # Local neighbourhood aggregation, then resample onto the grid
+            feature_map = F.avg_pool2d(feature_map, kernel_size=3, stride=1, padding=1)
+            pooled.append(F.adaptive_avg_pool2d(feature_map, size))
+
+        embedding = torch.cat(pooled, dim=1).float()         # (B, D, g, g)
+        return embedding.flatten(2).transpose(1, 2).contiguous()  # (B, g*g, D)
@@ -0,0 +1,192 @@
+"""
+Memory bank of clean-fabric patch embeddings with a vectorized k-NN index.
+
+The bank is a plain (N, D) float32 matrix. Nearest-neighbour search is
+exact and brute force: squared distances for a whole batch of query
+patches come from one matrix product,
+
+    ||q - b||^2 = ||q||^2 - 2 q.b + ||b||^2
+
+which BLAS runs at close to peak speed; coreset subsampling keeps N small
+enough for this to take a few milliseconds per frame.
+
+On disk a bank is a directory with embeddings.npy and bank.json
+(threshold and embedding settings). load() memory-maps the .npy, so
+several inspection processes share one copy of the bank in the page cache.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+EMBEDDINGS_NAME = "embeddings.npy"
+METADATA_NAME = "bank.json"
+
+
+def greedy_coreset(embeddings, size, projection_dim=128, seed=0):
+    """
+    Greedy k-center coreset selection.
+
+    Repeatedly picks the embedding farthest from everything selected so
+    far, so the subset covers the whole embedding distribution (rare
+    textures included) with far fewer points than random sampling.
+    Distances are computed on a random projection to projection_dim.
+
+    Args:
+        embeddings: (N, D) array
+        size: Number of embeddings to select
+        projection_dim: Random projection size for the distance computation
+                        (None = exact)
+        seed: Random seed (projection and first center)
+
+    Returns:
+        np.ndarray of selected row indices, in selection order
+    """
+    n, dim = embeddings.shape
+    size = min(int(size), n)
+    if size <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    generator = torch.Generator().manual_seed(seed)
+    x = torch.as_tensor(np.ascontiguousarray(embeddings), dtype=torch.float32)
+    if projection_dim and projection_dim < dim:
+        projection = torch.randn(dim, projection_dim, generator=generator) / projection_dim ** 0.5
+        x = x @ projection
+
+    norms = (x * x).sum(dim=1)
+    selected = np.empty(size, dtype=np.int64)
+    selected[0] = int(torch.randint(n, (1,), generator=generator))
+
+    center = x[selected[0]]
+    min_dist = norms - 2 * (x @ center) + norms[selected[0]]
+    for i in range(1, size):
+        index = int(torch.argmax(min_dist))
+        selected[i] = index
+        dist = norms - 2 * (x @ x[index]) + norms[index]
+        torch.minimum(min_dist, dist, out=min_dist)
+
+    return selected
+
+
+class MemoryBank:
+    """
+    Clean patch embeddings with exact nearest-neighbour distance queries.
+    """
+
+    def __init__(self, embeddings, metadata=None):
+        """
+        Initialize bank.
+
+        Args:
+            embeddings: (N, D) float32 array (may be a read-only memmap)
+            metadata: dict stored next to the embeddings (threshold,
+                      grid_size, layers, ...)
+        """
+        if embeddings.ndim != 2 or len(embeddings) == 0:
+            raise ValueError("Memory bank needs a non-empty (N, D) embedding matrix")
+        self.embeddings = embeddings
+        self.metadata = dict(metadata or {})
+        # One pass over the bank; reused by every query
+        self.norms = np.einsum('ij,ij->i', embeddings, embeddings).astype(np.float32)
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    @property
+    def embedding_dim(self):
+        return self.embeddings.shape[1]
+
+    def query(self, queries, k=1, chunk_size=4096):
+        """
+        Distances from each query to its k nearest bank embeddings.
+
+        Args:
+            queries: (P, D) array of patch embeddings
+            k: Number of neighbours
+            chunk_size: Query rows per matrix product (bounds the
+                        temporary (chunk, N) distance matrix)
+
+        Returns:
+            tuple (distances, indices), both (P, k), nearest first;
+            distances are Euclidean
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        k = min(int(k), len(self))
+        distances = np.empty((len(queries), k), dtype=np.float32)
+        indices = np.empty((len(queries), k), dtype=np.int64)
+
+        for start in range(0, len(queries), chunk_size):
+            chunk = queries[start:start + chunk_size]
+            d2 = chunk @ self.embeddings.T
+            d2 *= -2
+            d2 += np.einsum('ij,ij->i', chunk, chunk)[:, None]
+            d2 += self.norms[None, :]
+
+            if k == 1:
+                nearest = np.argmin(d2, axis=1)[:, None]
+            else:
+                nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            nearest_d2 = np.take_along_axis(d2, nearest, axis=1)
+            order = np.argsort(nearest_d2, axis=1)
+
+            rows = slice(start, start + len(chunk))
+            indices[rows] = np.take_along_axis(nearest, order, axis=1)
+            # Rounding can push tiny squared distances below zero
+            distances[rows] = np.sqrt(np.maximum(np.take_along_axis(nearest_d2, order, axis=1), 0))
+
+        return distances, indices
+
+    def patch_scores(self, queries, k=1):
+        """
+        Anomaly score of each query patch (mean distance to its k nearest
+        clean patches).
+
+        Args:
+            queries: (P, D) array
+            k: Number of neighbours
+
+        Returns:
+            np.ndarray (P,) float32
+        """
+        distances, _ = self.query(queries, k=k)
+        return distances.mean(axis=1)
+
+    def save(self, path):
+        """
+        Write the bank to a directory.
+
+        Args:
+            path: Directory (created if needed)
+
+        Returns:
+            Path of the directory
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / EMBEDDINGS_NAME, np.ascontiguousarray(self.embeddings, dtype=np.float32))
+        metadata = dict(self.metadata, size=len(self), embedding_dim=self.embedding_dim,
+                        saved_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+        with open(path / METADATA_NAME, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a bank written by save().
+
+        Args:
+            path: Bank directory
+            mmap: Memory-map the embeddings instead of reading them
+
+        Returns:
+            MemoryBank
+        """
+        path = Path(path)
+        with open(path / METADATA_NAME, encoding='utf-8') as f:
+            metadata = json.load(f)
+        embeddings = np.load(path / EMBEDDINGS_NAME, mmap_mode='r' if mmap else None)
+        return cls(embeddings, metadata)
@@ -22,5 +22,6 @@ Detects:
 
 from .model import DefectDetectionModel
 from .inference import DefectDetector
+from .prefilter import TexturePrefilter
 
-__all__ = ['DefectDetectionModel', 'DefectDetector']
+__all__ = ['DefectDetectionModel', 'DefectDetector', 'TexturePrefilter']
@@ -11,6 +11,7 @@ from .preprocessing import (
     extract_texture_features,
     enhance_defect_detection
 )
+from ..shared.profiling import measure
 from ..shared.transforms import get_transform
 from ..shared.utils import get_device
 
@@ -24,7 +25,8 @@ class DefectDetector:
     PHASE 2: Custom textile-trained model
     """
 
-    def __init__(self, weights_path=None, device=None, confidence_threshold=0.6):
+    def __init__(self, weights_path=None, device=None, confidence_threshold=0.6,
+                 precision='fp32', calibration_tensors=None):
         """
         Initialize defect detector.
 
@@ -32,6 +34,8 @@ class DefectDetector:
             weights_path: Path to model weights (None = use pretrained)
             device: torch.device (None = auto-detect)
             confidence_threshold: Minimum confidence to report defect (0.0-1.0)
+            precision: 'fp32', 'bf16', 'int8_dynamic' or 'int8_static'
+            calibration_tensors: Preprocessed frames for int8_static calibration
         """
         # Get device
         if device is None:
@@ -40,7 +44,8 @@ class DefectDetector:
 
         # Load model
         print(f"🔧 Loading defect detection model on {self.device}...")
-        self.model = load_defect_model(weights_path, device)
+        self.model = load_defect_model(weights_path, device, precision, calibration_tensors)
+        self.precision = precision
         self.model.eval()
 
         # Get transform
@@ -49,15 +54,22 @@ class DefectDetector:
         # Confidence threshold
         self.confidence_threshold = confidence_threshold
 
+        # Optional LatencyRecorder (set by the pipeline)
+        self.profiler = None
+
         print(f"✅ Defect detector ready (threshold: {confidence_threshold:.1%})")
 
-    def detect(self, cv_image, use_texture_enhancement=True):
+    def detect(self, cv_image, use_texture_enhancement=True, tensor=None, texture_features=None):
         """
         Detect defects in camera frame.
 
         Args:
             cv_image: OpenCV image (BGR numpy array)
             use_texture_enhancement: Whether to use texture features
+            tensor: Already preprocessed (1, 3, 224, 224) tensor for cv_image
+                    (None = preprocess here)
+            texture_features: Already extracted features for cv_image
+                    (None = extract here)
 
         Returns:
             dict with:
@@ -66,21 +78,85 @@ class DefectDetector:
                 - confidence: Confidence percentage (0-100)
                 - is_structural: Boolean (for yırtık/delik)
                 - severity: "HIGH", "MEDIUM", "LOW"
+                - defect_probability: Probability of any defect (0-100)
                 - texture_features: dict (if use_texture_enhancement=True)
         """
-        # Preprocess image
+        # Preprocess image (unless the caller already did)
         with torch.no_grad():
-            tensor = preprocess_for_defect_detection(cv_image, self.transform)
+            if tensor is None:
+                tensor = preprocess_for_defect_detection(cv_image, self.transform)
             tensor = tensor.to(self.device)
 
             # Run model inference
-            prediction = self.model.predict(tensor)
+            with measure(self.profiler, 'defect_forward'):
+                prediction = self.model.predict(tensor)
+
+        with measure(self.profiler, 'defect_postprocess'):
+            return self._build_result(prediction, cv_image, use_texture_enhancement, texture_features)
+
+    def detect_batch(self, cv_images, use_texture_enhancement=True, batch_tensor=None, texture_features=None):
+        """
+        Detect defects in batch of images with a single forward pass.
+
+        All frames are preprocessed, stacked into one (B, 3, 224, 224)
+        tensor and run through the backbone once.
+
+        Args:
+            cv_images: List of OpenCV images (BGR numpy arrays)
+            use_texture_enhancement: Whether to use texture features
+            batch_tensor: Already preprocessed (B, 3, 224, 224) tensor for
+                          cv_images (None = preprocess here)
+            texture_features: List of already extracted features, one per image
+                    (None = extract here)
+
+        Returns:
+            list of detection results (same format as detect())
+        """
+        if len(cv_images) == 0:
+            return []
+
+        # Preprocess and stack all frames (unless the caller already did)
+        with torch.no_grad():
+            if batch_tensor is None:
+                batch_tensor = torch.cat([
+                    preprocess_for_defect_detection(img, self.transform)
+                    for img in cv_images
+                ], dim=0)
+            batch = batch_tensor.to(self.device)
+
+            # Run model inference once for the whole batch
+            with measure(self.profiler, 'defect_forward'):
+                predictions = self.model.predict_batch(batch)
+
+        if texture_features is None:
+            texture_features = [None] * len(cv_images)
+
+        with measure(self.profiler, 'defect_postprocess'):
+            return [
+                self._build_result(prediction, img, use_texture_enhancement, features)
+                for prediction, img, features in zip(predictions, cv_images, texture_features)
+            ]
+
+    def _build_result(self, prediction, cv_image, use_texture_enhancement, texture_features=None):
+        """
+        Turn a raw model prediction into a detection result.
+
+        Args:
+            prediction: Prediction dict from DefectDetectionModel
+            cv_image: OpenCV image the prediction was made on
+            use_texture_enhancement: Whether to use texture features
+            texture_features: Precomputed features (None = extract from cv_image)
 
+        Returns:
+            dict: Detection result (see detect())
+        """
         # Extract texture features if requested
-        texture_features = None
-        if use_texture_enhancement:
+        if not use_texture_enhancement:
+            texture_features = None
+        elif texture_features is None:
             texture_features = extract_texture_features(cv_image)
 
+        if texture_features is not None:
             # Enhance prediction with texture analysis
             prediction = enhance_defect_detection(prediction, texture_features)
 
@@ -106,6 +182,8 @@ class DefectDetector:
             'is_structural': prediction['is_structural'],
             'severity': severity,
             'class_idx': prediction['class_idx'],
+            # Probability of any defect class (0-100), used for tile heatmaps
+            'defect_probability': (1.0 - float(prediction['probabilities'][0, 0])) * 100,
         }
 
         if texture_features is not None:
@@ -114,22 +192,31 @@ class DefectDetector:
 
         return result
 
-    def detect_batch(self, cv_images):
+    def build_skipped_result(self, confidence, texture_features=None):
         """
-        Detect defects in batch of images (for future optimization).
+        Build a clean detection result for a frame the pre-filter skipped.
 
         Args:
-            cv_images: List of OpenCV images
+            confidence: Reported "Temiz" confidence percentage (0-100)
+            texture_features: Features the pre-filter decided on
 
         Returns:
-            list of detection results
+            dict: Detection result (see detect()) with prefiltered=True
         """
-        results = []
-        for img in cv_images:
-            result = self.detect(img)
-            results.append(result)
+        result = {
+            'defect_detected': False,
+            'defect_type': DEFECT_CLASSES[0],
+            'confidence': confidence,
+            'is_structural': False,
+            'severity': "NONE",
+            'class_idx': 0,
+            'prefiltered': True,
+        }
+
+        if texture_features is not None:
+            result['texture_features'] = texture_features
 
-        return results
+        return result
 
     def get_defect_classes(self):
         """
@@ -12,6 +12,9 @@ The architecture is designed to be easily replaced with YOLO/segmentation models
 import torch
 import torch.nn as nn
 from torchvision import models
+from ..shared.precision import apply_precision
+from ..export import is_torchscript_file, load_torchscript_backbone
+from ..shared.weights import load_pretrained_backbone, load_state_dict_file, instantiate_with_state_dict
 
 
 # Defect classes (index 0 = no defect, 1-6 = defects)
@@ -41,21 +44,29 @@ class DefectDetectionModel(nn.Module):
     - Head: Custom classifier for 7 classes (1 clean + 6 defects)
     """
 
-    def __init__(self, num_classes=7, pretrained=True):
+    def __init__(self, num_classes=7, pretrained=True, backbone=None):
         """
         Initialize defect detection model.
 
         Args:
             num_classes: Number of classes (7 = 1 clean + 6 defect types)
             pretrained: Whether to use pretrained ImageNet weights
+            backbone: Ready-made backbone including the classification head
+                      (e.g. an exported TorchScript module); skips building
+                      the torchvision model
         """
         super(DefectDetectionModel, self).__init__()
 
+        self.num_classes = num_classes
+
+        if backbone is not None:
+            self.backbone = backbone
+            return
+
         # Load pretrained EfficientNet-B0
         if pretrained:
-            # Use weights parameter instead of deprecated pretrained
-            weights = models.EfficientNet_B0_Weights.IMAGENET1K_V1
-            self.backbone = models.efficientnet_b0(weights=weights)
+            # ImageNet weights from the project weights directory (never the hub cache)
+            self.backbone = load_pretrained_backbone(models.efficientnet_b0, 'efficientnet_b0')
         else:
             self.backbone = models.efficientnet_b0(weights=None)
 
@@ -68,8 +79,6 @@ class DefectDetectionModel(nn.Module):
             nn.Linear(in_features, num_classes)
         )
 
-        self.num_classes = num_classes
-
     def forward(self, x):
         """
         Forward pass.
@@ -97,57 +106,85 @@ class DefectDetectionModel(nn.Module):
                 - is_defective: Boolean
                 - is_structural: Boolean (for delik/yırtık)
         """
+        return self.predict_batch(x)[0]
+
+    def predict_batch(self, x):
+        """
+        Make predictions for every image in a batch with one forward pass.
+
+        Args:
+            x: Input tensor (B, 3, H, W)
+
+        Returns:
+            list of B prediction dicts (same keys as predict())
+        """
         with torch.no_grad():
             logits = self.forward(x)
 
             # Apply softmax to get probabilities
             probs = torch.softmax(logits, dim=1)
 
-            # Get prediction
-            confidence, class_idx = torch.max(probs, dim=1)
+            # Get predictions for the whole batch at once
+            confidences, class_indices = torch.max(probs, dim=1)
 
-            class_idx = class_idx.item()
-            confidence_pct = confidence.item() * 100
+            logits_np = logits.float().cpu().numpy()
+            probs_np = probs.float().cpu().numpy()
+            class_indices = class_indices.tolist()
+            confidences = confidences.float().tolist()
 
+        predictions = []
+        for i, class_idx in enumerate(class_indices):
             class_name = DEFECT_CLASSES[class_idx]
-            is_defective = class_idx > 0  # Index 0 is "Temiz"
-            is_structural = class_name in STRUCTURAL_DEFECTS
-
-            return {
+            predictions.append({
                 'class_idx': class_idx,
                 'class_name': class_name,
-                'confidence': confidence_pct,
-                'is_defective': is_defective,
-                'is_structural': is_structural,
-                'raw_logits': logits.cpu().numpy(),
-                'probabilities': probs.cpu().numpy()
-            }
+                'confidence': confidences[i] * 100,
+                'is_defective': class_idx > 0,  # Index 0 is "Temiz"
+                'is_structural': class_name in STRUCTURAL_DEFECTS,
+                'raw_logits': logits_np[i:i + 1],
+                'probabilities': probs_np[i:i + 1]
+            })
+
+        return predictions
 
 
-def load_defect_model(weights_path=None, device='cpu'):
+def load_defect_model(weights_path=None, device='cpu', precision='fp32', calibration_tensors=None):
     """
     Load defect detection model.
 
     Args:
         weights_path: Path to custom trained weights (None = use pretrained ImageNet)
         device: torch.device or str
+        precision: 'fp32', 'bf16', 'int8_dynamic' or 'int8_static'
+        calibration_tensors: Preprocessed frames for int8_static calibration
 
     Returns:
         DefectDetectionModel instance
     """
-    model = DefectDetectionModel(pretrained=(weights_path is None))
+    if weights_path is not None and is_torchscript_file(weights_path):
+        # Exported TorchScript artifact (see ml.export): no torchvision build
+        backbone = load_torchscript_backbone(weights_path, device)
+        model = DefectDetectionModel(backbone=backbone)
+        print(f"✅ Loaded TorchScript defect detection model from {weights_path}")
 
-    if weights_path is not None:
+    elif weights_path is not None:
         # Load custom weights if provided
-        state_dict = torch.load(weights_path, map_location=device)
-        model.load_state_dict(state_dict)
+        # Memory-mapped, hash-verified state_dict adopted without a copy
+        state_dict = load_state_dict_file(weights_path)
+        model = instantiate_with_state_dict(lambda: DefectDetectionModel(pretrained=False), state_dict)
         print(f"✅ Loaded custom defect detection weights from {weights_path}")
+
     else:
         # Using pretrained ImageNet weights as placeholder
+        model = DefectDetectionModel(pretrained=True)
         print("⚠️ Using pretrained ImageNet weights (PLACEHOLDER)")
         print("   Replace with textile-specific model for production")
 
     model.to(device)
     model.eval()
 
+    if precision != 'fp32':
+        model = apply_precision(model, precision, calibration_tensors, device)
+        print(f"⚡ Defect detection model running in {precision}")
+
     return model
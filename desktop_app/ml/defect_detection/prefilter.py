@@ -0,0 +1,208 @@
+"""
+Texture pre-filter cascade for defect detection.
+
+Most frames on a good roll are clean. The pre-filter runs before the
+EfficientNet pass and decides from the cheap texture statistics that are
+already computed for every frame (edge density, Laplacian variance,
+contrast) whether a frame is clearly normal: every statistic must lie
+within z_threshold standard deviations of a rolling baseline built from
+recent clean frames. Clearly normal frames skip the defect model.
+
+To measure what skipping costs, every audit_interval-th skippable frame is
+still run through the full model (shadow audit); if the model reports a
+defect on such a frame it counts as a pre-filter false negative.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+# Texture statistics compared against the rolling baseline
+PREFILTER_FEATURES = ('edge_density', 'blur_score', 'contrast')
+
+
+class TexturePrefilter:
+    """
+    Rolling-baseline gate that marks clearly clean frames.
+
+    Usage:
+        skip = prefilter.should_skip(texture_features)
+        if skip and prefilter.should_audit():
+            ... run the full model, then prefilter.record_audit(defect_detected)
+        prefilter.update(texture_features, is_clean)
+    """
+
+    def __init__(self, window=120, warmup_frames=30, z_threshold=2.5,
+                 audit_interval=50, min_std=1e-3):
+        """
+        Initialize pre-filter.
+
+        Args:
+            window: Number of recent clean frames in the rolling baseline
+            warmup_frames: Clean frames required before anything is skipped
+            z_threshold: Maximum deviation (in baseline standard deviations)
+                         of any statistic for a frame to count as clearly normal
+            audit_interval: Run every N-th skippable frame through the full
+                            model anyway to measure false negatives (0 = never)
+            min_std: Floor for the baseline standard deviation (relative to
+                     the baseline mean) so a perfectly uniform baseline does
+                     not reject every frame
+        """
+        if warmup_frames > window:
+            raise ValueError("warmup_frames cannot exceed window")
+
+        self.window = window
+        self.warmup_frames = warmup_frames
+        self.z_threshold = z_threshold
+        self.audit_interval = audit_interval
+        self.min_std = min_std
+
+        self._baseline = deque(maxlen=window)
+        self._clean_confidences = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def _vector(self, texture_features):
+        """Texture features as an array in PREFILTER_FEATURES order."""
+        return np.array([texture_features[name] for name in PREFILTER_FEATURES], dtype=np.float64)
+
+    @property
+    def ready(self):
+        """Whether the baseline holds enough clean frames to start skipping."""
+        return len(self._baseline) >= self.warmup_frames
+
+    def deviation(self, texture_features):
+        """
+        Largest absolute z-score of a frame against the rolling baseline.
+
+        Args:
+            texture_features: dict from extract_texture_features()
+
+        Returns:
+            float: Max |z| over PREFILTER_FEATURES (inf before warm-up)
+        """
+        with self._lock:
+            if not self.ready:
+                return float('inf')
+            baseline = np.array(self._baseline)
+
+        mean = baseline.mean(axis=0)
+        std = np.maximum(baseline.std(axis=0), self.min_std * np.abs(mean) + 1e-12)
+        z = np.abs(self._vector(texture_features) - mean) / std
+        return float(z.max())
+
+    def should_skip(self, texture_features):
+        """
+        Decide whether a frame is clearly normal.
+
+        Args:
+            texture_features: dict from extract_texture_features()
+
+        Returns:
+            bool: True if the defect model can be skipped for this frame
+        """
+        skip = self.deviation(texture_features) <= self.z_threshold
+
+        with self._lock:
+            self.frames_seen += 1
+            if skip:
+                self.frames_skippable += 1
+
+        return skip
+
+    def should_audit(self):
+        """
+        Whether the current skippable frame should get a shadow full run.
+
+        Call once per frame for which should_skip() returned True.
+
+        Returns:
+            bool: True if the frame should be run through the full model
+        """
+        if not self.audit_interval:
+            return False
+
+        with self._lock:
+            self._audit_counter += 1
+            if self._audit_counter < self.audit_interval:
+                return False
+            self._audit_counter = 0
+            return True
+
+    def record_audit(self, defect_detected):
+        """
+        Record the full-model verdict for an audited skippable frame.
+
+        Args:
+            defect_detected: Whether the full model reported a defect
+        """
+        with self._lock:
+            self.audited_frames += 1
+            if defect_detected:
+                self.false_negatives += 1
+
+    def update(self, texture_features, is_clean, confidence=None):
+        """
+        Add a frame to the rolling baseline if it is clean.
+
+        Args:
+            texture_features: dict from extract_texture_features()
+            is_clean: True for frames the model classified as clean or the
+                      pre-filter skipped
+            confidence: Model "Temiz" confidence (0-100) if the model ran
+        """
+        if not is_clean:
+            return
+
+        vector = self._vector(texture_features)
+        with self._lock:
+            self._baseline.append(vector)
+            if confidence is not None:
+                self._clean_confidences.append(confidence)
+
+    @property
+    def clean_confidence(self):
+        """Mean model confidence (0-100) on recent clean frames, reported for skipped frames."""
+        with self._lock:
+            if not self._clean_confidences:
+                return 0.0
+            return float(np.mean(self._clean_confidences))
+
+    def get_stats(self):
+        """
+        Get skip and false-negative statistics.
+
+        Returns:
+            dict with frames_seen, frames_skipped (skippable frames not
+            audited), skip_rate, audited_frames, false_negatives,
+            false_negative_rate and baseline_size
+        """
+        with self._lock:
+            skipped = self.frames_skippable - self.audited_frames
+            return {
+                'frames_seen': self.frames_seen,
+                'frames_skipped': skipped,
+                'skip_rate': skipped / self.frames_seen if self.frames_seen else 0.0,
+                'audited_frames': self.audited_frames,
+                'false_negatives': self.false_negatives,
+                'false_negative_rate': (
+                    self.false_negatives / self.audited_frames if self.audited_frames else 0.0
+                ),
+                'baseline_size': len(self._baseline),
+            }
+
+    def reset_stats(self):
+        """Reset counters (the baseline is kept)."""
+        with self._lock:
+            self.frames_seen = 0
+            self.frames_skippable = 0
+            self.audited_frames = 0
+            self.false_negatives = 0
+            self._audit_counter = 0
+
+    def reset_baseline(self):
+        """Forget the baseline, e.g. when a new roll or fabric is loaded."""
+        with self._lock:
+            self._baseline.clear()
+            self._clean_confidences.clear()
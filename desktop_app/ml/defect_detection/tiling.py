@@ -0,0 +1,154 @@
+"""
+Tiled sliding-window helpers for high-resolution defect inspection.
+
+Squashing a 4K or line-scan frame to 224x224 destroys sub-millimetre
+defects. Instead the frame is cut into overlapping tiles, every tile is
+classified by the defect model at (close to) native resolution and the
+per-tile defect probabilities are merged into a heatmap from which
+bounding boxes are extracted.
+"""
+
+import cv2
+import numpy as np
+
+
+def compute_tile_grid(height, width, tile_size, overlap=0.25):
+    """
+    Compute overlapping tile windows covering a frame.
+
+    The last row/column of tiles is aligned to the frame border so every
+    pixel is covered without padding. Frames smaller than tile_size give a
+    single (smaller) tile.
+
+    Args:
+        height: Frame height in pixels
+        width: Frame width in pixels
+        tile_size: Tile side length in pixels
+        overlap: Fraction of tile_size shared by neighbouring tiles (0-<1)
+
+    Returns:
+        list of (y0, x0, y1, x1) tuples
+    """
+    if tile_size <= 0:
+        raise ValueError("tile_size must be positive")
+    if not 0.0 <= overlap < 1.0:
+        raise ValueError("overlap must be in [0, 1)")
+
+    stride = max(1, int(round(tile_size * (1.0 - overlap))))
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, stride))
+        positions.append(length - tile_size)
+        return positions
+
+    return [
+        (y0, x0, min(y0 + tile_size, height), min(x0 + tile_size, width))
+        for y0 in starts(height)
+        for x0 in starts(width)
+    ]
+
+
+def extract_tiles(cv_image, tiles):
+    """
+    Cut tiles out of a frame (views, no copy).
+
+    Args:
+        cv_image: OpenCV image (BGR numpy array)
+        tiles: Tile windows from compute_tile_grid()
+
+    Returns:
+        list of numpy.ndarray views
+    """
+    return [cv_image[y0:y1, x0:x1] for y0, x0, y1, x1 in tiles]
+
+
+def build_heatmap(frame_shape, tiles, scores, scale=0.25):
+    """
+    Merge per-tile defect scores into a frame-level heatmap.
+
+    Overlapping tiles are averaged.
+
+    Args:
+        frame_shape: (height, width) of the original frame
+        tiles: Tile windows from compute_tile_grid()
+        scores: Defect probability (0-1) per tile
+        scale: Heatmap resolution relative to the frame
+
+    Returns:
+        numpy.ndarray: float32 heatmap of shape (height*scale, width*scale)
+    """
+    height, width = frame_shape[:2]
+    map_h = max(1, int(round(height * scale)))
+    map_w = max(1, int(round(width * scale)))
+
+    total = np.zeros((map_h, map_w), dtype=np.float32)
+    count = np.zeros((map_h, map_w), dtype=np.float32)
+
+    for (y0, x0, y1, x1), score in zip(tiles, scores):
+        ys, ye = int(y0 * scale), max(int(y0 * scale) + 1, int(round(y1 * scale)))
+        xs, xe = int(x0 * scale), max(int(x0 * scale) + 1, int(round(x1 * scale)))
+        total[ys:ye, xs:xe] += score
+        count[ys:ye, xs:xe] += 1.0
+
+    np.divide(total, count, out=total, where=count > 0)
+    return total
+
+
+def extract_defect_boxes(heatmap, threshold=0.6, scale=0.25):
+    """
+    Extract bounding boxes of connected high-score regions in a heatmap.
+
+    Args:
+        heatmap: Output of build_heatmap()
+        threshold: Minimum defect probability (0-1) for a heatmap cell
+        scale: Scale the heatmap was built with
+
+    Returns:
+        list of dicts with x, y, width, height (frame pixels) and
+        score (peak defect probability), sorted by score (highest first)
+    """
+    mask = (heatmap >= threshold).astype(np.uint8)
+    num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+
+    boxes = []
+    for label in range(1, num_labels):
+        x, y, w, h, _ = stats[label]
+        region = heatmap[y:y + h, x:x + w][labels[y:y + h, x:x + w] == label]
+        boxes.append({
+            'x': int(x / scale),
+            'y': int(y / scale),
+            'width': int(round(w / scale)),
+            'height': int(round(h / scale)),
+            'score': float(region.max()),
+        })
+
+    boxes.sort(key=lambda box: box['score'], reverse=True)
+    return boxes
+
+
+def label_boxes(boxes, tiles, scores, labels):
+    """
+    Attach the defect type of the strongest overlapping tile to each box.
+
+    Args:
+        boxes: Output of extract_defect_boxes() (modified in place)
+        tiles: Tile windows from compute_tile_grid()
+        scores: Defect probability per tile
+        labels: Defect class name per tile
+
+    Returns:
+        list: The same boxes, each with a defect_type key
+    """
+    for box in boxes:
+        bx0, by0 = box['x'], box['y']
+        bx1, by1 = bx0 + box['width'], by0 + box['height']
+
+        best_score, best_label = -1.0, None
+        for (y0, x0, y1, x1), score, label in zip(tiles, scores, labels):
+            if x0 < bx1 and bx0 < x1 and y0 < by1 and by0 < y1 and score > best_score:
+                best_score, best_label = score, label
+        box['defect_type'] = best_label
+
+    return boxes
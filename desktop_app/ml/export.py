@@ -0,0 +1,210 @@
+"""
+TorchScript export for the inspection models.
+
+Traces the EfficientNet-B0 defect model and ResNet-18 fabric model, freezes
+them (which folds BatchNorm into the preceding convolutions and inlines
+weights as constants) and saves TorchScript artifacts. load_defect_model() /
+load_fabric_model() load these artifacts directly, so application start-up
+skips building the torchvision Python modules and inference skips Python
+module dispatch.
+
+Artifacts are recorded in a manifest.json next to them (see
+ml.shared.weights) and verified against it before they are loaded.
+
+Usage (from desktop_app/):
+    python -m ml.export
+    python -m ml.export --defect-weights defect.pth --fabric-weights fabric.pth
+    python -m ml.export --precision int8_static --calibration-dir samples/
+"""
+
+import argparse
+import zipfile
+from pathlib import Path
+
+import torch
+
+from .shared.weights import register_weights, verify_weights
+
+# Default location of exported artifacts (picked up by the desktop app)
+DEFAULT_EXPORT_DIR = Path(__file__).resolve().parent.parent / "models"
+DEFECT_ARTIFACT_NAME = "defect_model.torchscript.pt"
+FABRIC_ARTIFACT_NAME = "fabric_model.torchscript.pt"
+
+
+def is_torchscript_file(path):
+    """
+    Check whether a file is a TorchScript archive (rather than a state_dict).
+
+    Args:
+        path: File path
+
+    Returns:
+        bool: True if the archive contains TorchScript code
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return any('/code/' in name for name in archive.namelist())
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+
+def find_exported_models(export_dir=DEFAULT_EXPORT_DIR):
+    """
+    Locate previously exported TorchScript artifacts.
+
+    Args:
+        export_dir: Directory written by export_models()
+
+    Returns:
+        tuple: (defect_path, fabric_path), each None if not present
+    """
+    export_dir = Path(export_dir)
+    defect_path = export_dir / DEFECT_ARTIFACT_NAME
+    fabric_path = export_dir / FABRIC_ARTIFACT_NAME
+    return (
+        str(defect_path) if defect_path.is_file() else None,
+        str(fabric_path) if fabric_path.is_file() else None,
+    )
+
+
+def trace_and_freeze(backbone, input_size=224):
+    """
+    Convert an eval-mode backbone into a frozen TorchScript module.
+
+    Args:
+        backbone: nn.Module to export
+        input_size: Square input resolution used for tracing
+
+    Returns:
+        torch.jit.ScriptModule with conv-bn folded
+    """
+    backbone.eval()
+    example = torch.randn(1, 3, input_size, input_size)
+
+    with torch.no_grad():
+        traced = torch.jit.trace(backbone, example)
+        frozen = torch.jit.freeze(traced)
+
+        # Run once so the profiling executor specializes the graph
+        frozen(example)
+
+    return frozen
+
+
+def export_models(
+    output_dir=DEFAULT_EXPORT_DIR,
+    defect_weights=None,
+    fabric_weights=None,
+    precision='fp32',
+    calibration_images=None
+):
+    """
+    Export both inspection models as frozen TorchScript artifacts.
+
+    Args:
+        output_dir: Directory to write artifacts into
+        defect_weights: Defect detection state_dict (None = pretrained)
+        fabric_weights: Fabric classification state_dict (None = pretrained)
+        precision: 'fp32', 'int8_dynamic' or 'int8_static' (bf16 autocast is
+                   applied at load time instead)
+        calibration_images: OpenCV frames for int8_static calibration
+
+    Returns:
+        tuple: (defect_artifact_path, fabric_artifact_path)
+    """
+    from .defect_detection.model import load_defect_model
+    from .fabric_classification.model import load_fabric_model
+    from .shared.transforms import get_opencv_transform
+    from .shared.utils import load_image_batch
+
+    if precision == 'bf16':
+        raise ValueError("Export fp32 and load with precision='bf16' instead")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    calibration_tensors = None
+    if calibration_images:
+        calibration_tensors = load_image_batch(calibration_images, get_opencv_transform())
+
+    # Export on CPU; TorchScript artifacts can be mapped to CUDA on load
+    exported = []
+    for name, loader, weights, artifact in (
+        ("defect detection", load_defect_model, defect_weights, DEFECT_ARTIFACT_NAME),
+        ("fabric classification", load_fabric_model, fabric_weights, FABRIC_ARTIFACT_NAME),
+    ):
+        print(f"🔧 Exporting {name} model ({precision})...")
+        model = loader(weights, 'cpu', precision, calibration_tensors)
+        scripted = trace_and_freeze(model.backbone)
+
+        path = output_dir / artifact
+        torch.jit.save(scripted, str(path))
+        register_weights(path, output_dir, source=str(weights) if weights else f"pretrained ({precision})")
+        print(f"✅ Saved {path}")
+        exported.append(str(path))
+
+    return tuple(exported)
+
+
+def load_torchscript_backbone(path, device='cpu'):
+    """
+    Load an exported TorchScript backbone.
+
+    Args:
+        path: Artifact written by export_models()
+        device: torch.device or str
+
+    Returns:
+        torch.jit.ScriptModule in eval mode
+
+    Raises:
+        WeightsError: If the artifact does not match its manifest entry
+    """
+    verify_weights(path)
+    backbone = torch.jit.load(str(path), map_location=device)
+    backbone.eval()
+    return backbone
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Open Textile Intelligence - TorchScript model export"
+    )
+    parser.add_argument(
+        "--output-dir", type=str, default=str(DEFAULT_EXPORT_DIR),
+        help="Directory for exported artifacts"
+    )
+    parser.add_argument("--defect-weights", type=str, help="Defect detection state_dict")
+    parser.add_argument("--fabric-weights", type=str, help="Fabric classification state_dict")
+    parser.add_argument(
+        "--precision", choices=['fp32', 'int8_dynamic', 'int8_static'], default='fp32',
+        help="Numeric precision baked into the artifacts"
+    )
+    parser.add_argument(
+        "--calibration-dir", type=str,
+        help="Directory of sample fabric images (required for int8_static)"
+    )
+    args = parser.parse_args()
+
+    calibration_images = None
+    if args.calibration_dir:
+        import cv2
+        calibration_images = [
+            img for img in (
+                cv2.imread(str(p)) for p in sorted(Path(args.calibration_dir).iterdir())
+                if p.suffix.lower() in ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+            )
+            if img is not None
+        ]
+
+    export_models(
+        output_dir=args.output_dir,
+        defect_weights=args.defect_weights,
+        fabric_weights=args.fabric_weights,
+        precision=args.precision,
+        calibration_images=calibration_images
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from .preprocessing import (
     extract_fabric_features,
     enhance_fabric_classification
 )
+from ..shared.profiling import measure
 from ..shared.transforms import get_transform
 from ..shared.utils import get_device
 
@@ -23,13 +24,15 @@ class FabricClassifier:
     PHASE 2: Custom textile-trained model
     """
 
-    def __init__(self, weights_path=None, device=None):
+    def __init__(self, weights_path=None, device=None, precision='fp32', calibration_tensors=None):
         """
         Initialize fabric classifier.
 
         Args:
             weights_path: Path to model weights (None = use pretrained)
             device: torch.device (None = auto-detect)
+            precision: 'fp32', 'bf16', 'int8_dynamic' or 'int8_static'
+            calibration_tensors: Preprocessed frames for int8_static calibration
         """
         # Get device
         if device is None:
@@ -38,21 +41,29 @@ class FabricClassifier:
 
         # Load model
         print(f"🔧 Loading fabric classification model on {self.device}...")
-        self.model = load_fabric_model(weights_path, device)
+        self.model = load_fabric_model(weights_path, device, precision, calibration_tensors)
+        self.precision = precision
         self.model.eval()
 
         # Get transform
         self.transform = get_transform(input_size=224, normalize=True)
 
+        # Optional LatencyRecorder (set by the pipeline)
+        self.profiler = None
+
         print(f"✅ Fabric classifier ready")
 
-    def classify(self, cv_image, use_feature_enhancement=True):
+    def classify(self, cv_image, use_feature_enhancement=True, tensor=None, fabric_features=None):
         """
         Classify fabric type from camera frame.
 
         Args:
             cv_image: OpenCV image (BGR numpy array)
             use_feature_enhancement: Whether to use texture features
+            tensor: Already preprocessed (1, 3, 224, 224) tensor for cv_image
+                    (None = preprocess here)
+            fabric_features: Already extracted features for cv_image
+                    (None = extract here)
 
         Returns:
             dict with:
@@ -61,19 +72,82 @@ class FabricClassifier:
                 - all_probabilities: Dict of all class probabilities
                 - fabric_features: dict (if use_feature_enhancement=True)
         """
-        # Preprocess image
+        # Preprocess image (unless the caller already did)
         with torch.no_grad():
-            tensor = preprocess_for_fabric_classification(cv_image, self.transform)
+            if tensor is None:
+                tensor = preprocess_for_fabric_classification(cv_image, self.transform)
             tensor = tensor.to(self.device)
 
             # Run model inference
-            prediction = self.model.predict(tensor)
+            with measure(self.profiler, 'fabric_forward'):
+                prediction = self.model.predict(tensor)
+
+        with measure(self.profiler, 'fabric_postprocess'):
+            return self._build_result(prediction, cv_image, use_feature_enhancement, fabric_features)
+
+    def classify_batch(self, cv_images, use_feature_enhancement=True, batch_tensor=None, fabric_features=None):
+        """
+        Classify fabric types in batch of images with a single forward pass.
+
+        All frames are preprocessed, stacked into one (B, 3, 224, 224)
+        tensor and run through the backbone once.
+
+        Args:
+            cv_images: List of OpenCV images (BGR numpy arrays)
+            use_feature_enhancement: Whether to use texture features
+            batch_tensor: Already preprocessed (B, 3, 224, 224) tensor for
+                          cv_images (None = preprocess here)
+            fabric_features: List of already extracted features, one per image
+                    (None = extract here)
+
+        Returns:
+            list of classification results (same format as classify())
+        """
+        if len(cv_images) == 0:
+            return []
+
+        # Preprocess and stack all frames (unless the caller already did)
+        with torch.no_grad():
+            if batch_tensor is None:
+                batch_tensor = torch.cat([
+                    preprocess_for_fabric_classification(img, self.transform)
+                    for img in cv_images
+                ], dim=0)
+            batch = batch_tensor.to(self.device)
+
+            # Run model inference once for the whole batch
+            with measure(self.profiler, 'fabric_forward'):
+                predictions = self.model.predict_batch(batch)
+
+        if fabric_features is None:
+            fabric_features = [None] * len(cv_images)
+
+        with measure(self.profiler, 'fabric_postprocess'):
+            return [
+                self._build_result(prediction, img, use_feature_enhancement, features)
+                for prediction, img, features in zip(predictions, cv_images, fabric_features)
+            ]
+
+    def _build_result(self, prediction, cv_image, use_feature_enhancement, fabric_features=None):
+        """
+        Turn a raw model prediction into a classification result.
 
+        Args:
+            prediction: Prediction dict from FabricClassificationModel
+            cv_image: OpenCV image the prediction was made on
+            use_feature_enhancement: Whether to use texture features
+            fabric_features: Precomputed features (None = extract from cv_image)
+
+        Returns:
+            dict: Classification result (see classify())
+        """
         # Extract fabric features if requested
-        fabric_features = None
-        if use_feature_enhancement:
+        if not use_feature_enhancement:
+            fabric_features = None
+        elif fabric_features is None:
             fabric_features = extract_fabric_features(cv_image)
 
+        if fabric_features is not None:
             # Enhance prediction with texture analysis
             prediction = enhance_fabric_classification(prediction, fabric_features)
 
@@ -90,23 +164,6 @@ class FabricClassifier:
 
         return result
 
-    def classify_batch(self, cv_images):
-        """
-        Classify fabric types in batch of images (for future optimization).
-
-        Args:
-            cv_images: List of OpenCV images
-
-        Returns:
-            list of classification results
-        """
-        results = []
-        for img in cv_images:
-            result = self.classify(img)
-            results.append(result)
-
-        return results
-
     def get_fabric_classes(self):
         """
         Get list of fabric classes.
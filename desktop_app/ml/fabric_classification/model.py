@@ -11,6 +11,9 @@ IMPORTANT: This is a PLACEHOLDER until a textile-specific model is trained.
 import torch
 import torch.nn as nn
 from torchvision import models
+from ..shared.precision import apply_precision
+from ..export import is_torchscript_file, load_torchscript_backbone
+from ..shared.weights import load_pretrained_backbone, load_state_dict_file, instantiate_with_state_dict
 
 
 # Fabric type classes
@@ -35,20 +38,29 @@ class FabricClassificationModel(nn.Module):
     - Head: Custom classifier for 5 fabric types
     """
 
-    def __init__(self, num_classes=5, pretrained=True):
+    def __init__(self, num_classes=5, pretrained=True, backbone=None):
         """
         Initialize fabric classification model.
 
         Args:
             num_classes: Number of fabric types (5)
             pretrained: Whether to use pretrained ImageNet weights
+            backbone: Ready-made backbone including the classification head
+                      (e.g. an exported TorchScript module); skips building
+                      the torchvision model
         """
         super(FabricClassificationModel, self).__init__()
 
+        self.num_classes = num_classes
+
+        if backbone is not None:
+            self.backbone = backbone
+            return
+
         # Load pretrained ResNet-18
         if pretrained:
-            weights = models.ResNet18_Weights.IMAGENET1K_V1
-            self.backbone = models.resnet18(weights=weights)
+            # ImageNet weights from the project weights directory (never the hub cache)
+            self.backbone = load_pretrained_backbone(models.resnet18, 'resnet18')
         else:
             self.backbone = models.resnet18(weights=None)
 
@@ -61,8 +73,6 @@ class FabricClassificationModel(nn.Module):
             nn.Linear(in_features, num_classes)
         )
 
-        self.num_classes = num_classes
-
     def forward(self, x):
         """
         Forward pass.
@@ -89,59 +99,88 @@ class FabricClassificationModel(nn.Module):
                 - confidence: Confidence percentage (0-100)
                 - all_probabilities: All class probabilities
         """
+        return self.predict_batch(x)[0]
+
+    def predict_batch(self, x):
+        """
+        Make predictions for every image in a batch with one forward pass.
+
+        Args:
+            x: Input tensor (B, 3, H, W)
+
+        Returns:
+            list of B prediction dicts (same keys as predict())
+        """
         with torch.no_grad():
             logits = self.forward(x)
 
             # Apply softmax to get probabilities
             probs = torch.softmax(logits, dim=1)
 
-            # Get prediction
-            confidence, class_idx = torch.max(probs, dim=1)
-
-            class_idx = class_idx.item()
-            confidence_pct = confidence.item() * 100
+            # Get predictions for the whole batch at once
+            confidences, class_indices = torch.max(probs, dim=1)
 
-            fabric_type = FABRIC_CLASSES[class_idx]
+            logits_np = logits.float().cpu().numpy()
+            probs_list = (probs.float() * 100).tolist()
+            class_indices = class_indices.tolist()
+            confidences = confidences.float().tolist()
 
+        predictions = []
+        for i, class_idx in enumerate(class_indices):
             # Get all probabilities for analysis
             all_probs = {
-                FABRIC_CLASSES[i]: probs[0, i].item() * 100
-                for i in range(len(FABRIC_CLASSES))
+                FABRIC_CLASSES[j]: probs_list[i][j]
+                for j in range(len(FABRIC_CLASSES))
             }
 
-            return {
+            predictions.append({
                 'class_idx': class_idx,
-                'fabric_type': fabric_type,
-                'confidence': confidence_pct,
+                'fabric_type': FABRIC_CLASSES[class_idx],
+                'confidence': confidences[i] * 100,
                 'all_probabilities': all_probs,
-                'raw_logits': logits.cpu().numpy(),
-            }
+                'raw_logits': logits_np[i:i + 1],
+            })
+
+        return predictions
 
 
-def load_fabric_model(weights_path=None, device='cpu'):
+def load_fabric_model(weights_path=None, device='cpu', precision='fp32', calibration_tensors=None):
     """
     Load fabric classification model.
 
     Args:
         weights_path: Path to custom trained weights (None = use pretrained ImageNet)
         device: torch.device or str
+        precision: 'fp32', 'bf16', 'int8_dynamic' or 'int8_static'
+        calibration_tensors: Preprocessed frames for int8_static calibration
 
     Returns:
         FabricClassificationModel instance
     """
-    model = FabricClassificationModel(pretrained=(weights_path is None))
+    if weights_path is not None and is_torchscript_file(weights_path):
+        # Exported TorchScript artifact (see ml.export): no torchvision build
+        backbone = load_torchscript_backbone(weights_path, device)
+        model = FabricClassificationModel(backbone=backbone)
+        print(f"✅ Loaded TorchScript fabric classification model from {weights_path}")
 
-    if weights_path is not None:
+    elif weights_path is not None:
         # Load custom weights if provided
-        state_dict = torch.load(weights_path, map_location=device)
-        model.load_state_dict(state_dict)
+        # Memory-mapped, hash-verified state_dict adopted without a copy
+        state_dict = load_state_dict_file(weights_path)
+        model = instantiate_with_state_dict(lambda: FabricClassificationModel(pretrained=False), state_dict)
         print(f"✅ Loaded custom fabric classification weights from {weights_path}")
+
     else:
         # Using pretrained ImageNet weights as placeholder
+        model = FabricClassificationModel(pretrained=True)
         print("⚠️ Using pretrained ImageNet weights (PLACEHOLDER)")
         print("   Replace with textile-specific model for production")
 
     model.to(device)
     model.eval()
 
+    if precision != 'fp32':
+        model = apply_precision(model, precision, calibration_tensors, device)
+        print(f"⚡ Fabric classification model running in {precision}")
+
     return model
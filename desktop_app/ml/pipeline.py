@@ -10,9 +10,16 @@ Uses PyTorch models for both defect detection and fabric classification.
 
 import torch
 import time
-from .defect_detection import DefectDetector
+from .defect_detection import DefectDetector, TexturePrefilter
+from .defect_detection.tiling import (
+    compute_tile_grid, extract_tiles, build_heatmap, extract_defect_boxes, label_boxes
+)
 from .fabric_classification import FabricClassifier
-from .shared.utils import get_device
+from .roll_context import RollContext
+from .shared.features import extract_frame_features
+from .shared.profiling import LatencyRecorder
+from .shared.transforms import get_transform, get_opencv_transform
+from .shared.utils import get_device, load_image_tensor, load_image_batch
 
 
 class TextileInspectionPipeline:
@@ -24,15 +31,37 @@ class TextileInspectionPipeline:
     2. Defect detection
     3. Result aggregation
 
-    Both models run in parallel on the same frame.
+    Both models run in parallel on the same frame and share a single
+    preprocessed input tensor (both use the same 224x224 ImageNet transform).
+    With a roll context, the fabric classifier only runs until the fabric
+    type of the roll is locked (and for periodic re-checks), and defect
+    inspection follows the profile of the locked fabric type.
+
+    Not thread-safe: callers sharing one instance between threads must
+    serialize inspect_frame()/inspect_batch() (see CameraManager).
     """
 
+    # Per-frame state (counters, profiler, pre-filter, roll context) is unguarded
+    thread_safe = False
+
     def __init__(
         self,
         defect_weights_path=None,
         fabric_weights_path=None,
         device=None,
-        confidence_threshold=0.6
+        confidence_threshold=0.6,
+        fast_preprocessing=True,
+        feature_downsample=None,
+        precision='fp32',
+        calibration_images=None,
+        prefilter=None,
+        tile_size=None,
+        tile_overlap=0.25,
+        tile_batch_size=32,
+        heatmap_scale=0.25,
+        profiling=True,
+        anomaly_bank=None,
+        roll_context=None
     ):
         """
         Initialize ML pipeline.
@@ -42,6 +71,32 @@ class TextileInspectionPipeline:
             fabric_weights_path: Path to fabric classification weights (None = pretrained)
             device: torch.device (None = auto-detect)
             confidence_threshold: Minimum confidence for defect reporting (0.0-1.0)
+            fast_preprocessing: Use the PIL-free OpenCV/NumPy transform
+                                (False = torchvision PIL transform)
+            feature_downsample: Compute texture features on a copy whose longest
+                                side is at most this many pixels (None = full res)
+            precision: 'fp32', 'bf16', 'int8_dynamic' or 'int8_static'
+            calibration_images: Representative OpenCV frames used to calibrate
+                                int8_static quantization
+            prefilter: Texture pre-filter cascade that skips the defect model
+                       on clearly clean frames (None/False = off, True =
+                       defaults, dict = TexturePrefilter keyword arguments)
+            tile_size: Enable tiled inspection with square tiles of this many
+                       pixels (None = classify the whole frame at 224x224)
+            tile_overlap: Fraction of tile_size shared by neighbouring tiles
+            tile_batch_size: Maximum number of tiles per forward pass
+            heatmap_scale: Resolution of the tiled defect heatmap relative
+                           to the frame
+            profiling: Record per-stage latency histograms (see
+                       get_performance_stats())
+            anomaly_bank: Clean-fabric memory bank (directory written by
+                          ml.anomaly.build, or a MemoryBank); defects are
+                          then reported by anomaly score instead of the
+                          classifier head (None = classifier)
+            roll_context: Lock the fabric type per roll instead of
+                          classifying every frame (None/False = off, True =
+                          defaults, dict = RollContext keyword arguments,
+                          e.g. per-fabric profiles)
         """
         print("="*60)
         print("INITIALIZING TEXTILE INSPECTION ML PIPELINE")
@@ -51,7 +106,20 @@ class TextileInspectionPipeline:
         if device is None:
             device = get_device()
         self.device = device
+        self.precision = precision
         print(f"🖥️  Device: {device}")
+        print(f"⚡ Precision: {precision}")
+
+        # Shared preprocessing (identical for both models)
+        if fast_preprocessing:
+            self.transform = get_opencv_transform(input_size=224, normalize=True)
+        else:
+            self.transform = get_transform(input_size=224, normalize=True)
+
+        # Calibration frames for static quantization
+        calibration_tensors = None
+        if calibration_images is not None and len(calibration_images) > 0:
+            calibration_tensors = load_image_batch(calibration_images, self.transform)
 
         # Initialize defect detector
         print("\n1️⃣  DEFECT DETECTION MODULE")
@@ -60,7 +128,9 @@ class TextileInspectionPipeline:
             self.defect_detector = DefectDetector(
                 weights_path=defect_weights_path,
                 device=device,
-                confidence_threshold=confidence_threshold
+                confidence_threshold=confidence_threshold,
+                precision=precision,
+                calibration_tensors=calibration_tensors
             )
             self.defect_detection_available = True
         except Exception as e:
@@ -74,7 +144,9 @@ class TextileInspectionPipeline:
         try:
             self.fabric_classifier = FabricClassifier(
                 weights_path=fabric_weights_path,
-                device=device
+                device=device,
+                precision=precision,
+                calibration_tensors=calibration_tensors
             )
             self.fabric_classification_available = True
         except Exception as e:
@@ -82,6 +154,34 @@ class TextileInspectionPipeline:
             self.fabric_classification_available = False
             raise
 
+        # Anomaly mode: distance to clean fabric replaces the classifier head
+        self._defect_model = self.defect_detector.model
+        self.anomaly_mode = anomaly_bank is not None
+        if self.anomaly_mode:
+            print("\n3️⃣  ANOMALY DETECTION MODULE")
+            print("-" * 60)
+            from .anomaly import AnomalyDetector
+            self.defect_detector = AnomalyDetector(
+                self._defect_model, anomaly_bank, device=device
+            )
+
+        # Roll context: fabric type lock and per-fabric defect inspection
+        if isinstance(roll_context, RollContext):
+            self.roll_context = roll_context
+        elif isinstance(roll_context, dict):
+            self.roll_context = RollContext(**roll_context)
+        elif roll_context:
+            self.roll_context = RollContext()
+        else:
+            self.roll_context = None
+
+        # Defaults used while no fabric profile applies
+        self.base_detector = self.defect_detector
+        self.base_threshold = self.defect_detector.confidence_threshold
+        self._fabric_detectors = {}  # fabric type → AnomalyDetector with its own bank
+        if self.roll_context is not None:
+            self._load_fabric_detectors()
+
         print("\n" + "="*60)
         print("✅ ML PIPELINE READY")
         print("="*60)
@@ -89,10 +189,78 @@ class TextileInspectionPipeline:
         print(f"Fabric Classes: {self.fabric_classifier.get_fabric_classes()}")
         print("="*60 + "\n")
 
+        # Fused texture feature extraction (shared by both models)
+        self.feature_downsample = feature_downsample
+
+        # Cheap texture cascade in front of the defect model
+        if isinstance(prefilter, TexturePrefilter):
+            self.prefilter = prefilter
+        elif isinstance(prefilter, dict):
+            self.prefilter = TexturePrefilter(**prefilter)
+        elif prefilter:
+            self.prefilter = TexturePrefilter()
+        else:
+            self.prefilter = None
+
+        # Tiled sliding-window inspection (high-resolution frames)
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.tile_batch_size = tile_batch_size
+        self.heatmap_scale = heatmap_scale
+
         # Performance tracking
         self.total_frames = 0
         self.total_inference_time = 0.0
 
+        # Per-stage latency histograms (shared with both models)
+        self.profiler = LatencyRecorder(enabled=profiling)
+        self.defect_detector.profiler = self.profiler
+        self.fabric_classifier.profiler = self.profiler
+        for detector in self._fabric_detectors.values():
+            detector.profiler = self.profiler
+
+    def _load_fabric_detectors(self):
+        """Create an anomaly detector for every fabric profile with its own memory bank."""
+        from .anomaly import AnomalyDetector
+
+        for fabric_type, profile in self.roll_context.profiles.items():
+            if profile.get('anomaly_bank') is None:
+                continue
+            print(f"🧵 {fabric_type}: anomaly bank {profile['anomaly_bank']}")
+            self._fabric_detectors[fabric_type] = AnomalyDetector(
+                self._defect_model, profile['anomaly_bank'], device=self.device,
+                confidence_threshold=profile.get('confidence_threshold', 0.5)
+            )
+
+    def _route_defect_inspection(self, fabric_type):
+        """
+        Switch defect inspection to the profile of a fabric type.
+
+        Args:
+            fabric_type: Locked fabric type (None = default detector and threshold)
+        """
+        profile = self.roll_context.profile(fabric_type)
+        detector = self._fabric_detectors.get(fabric_type, self.base_detector)
+        if detector is self.base_detector:
+            detector.confidence_threshold = profile.get('confidence_threshold', self.base_threshold)
+
+        if detector is not self.defect_detector:
+            print(f"🧵 Defect inspection routed to the {fabric_type or 'default'} profile")
+        self.defect_detector = detector
+
+    def start_roll(self):
+        """
+        Forget everything learned about the previous roll.
+
+        Unlocks the fabric type, restores the default defect detector and
+        clears the pre-filter baseline. Call whenever a new roll is loaded.
+        """
+        if self.roll_context is not None:
+            self.roll_context.reset()
+            self._route_defect_inspection(None)
+        if self.prefilter is not None:
+            self.prefilter.reset_baseline()
+
     def inspect_frame(self, cv_image):
         """
         Perform complete inspection on camera frame.
@@ -109,31 +277,328 @@ class TextileInspectionPipeline:
                 - severity: "HIGH", "MEDIUM", "LOW", "NONE"
                 - fabric_type: Fabric class name
                 - fabric_confidence: Confidence percentage (0-100)
+                - fabric_locked: True if the fabric type came from the roll
+                  context instead of the classifier
                 - inference_time_ms: Inference time in milliseconds
+                - defect_heatmap, defect_boxes, num_tiles: Only in tiled
+                  mode (see inspect_frame_tiled())
         """
-        start_time = time.time()
+        if self.tile_size:
+            return self.inspect_frame_tiled(cv_image)
 
-        # Run defect detection
-        defect_result = self.defect_detector.detect(
-            cv_image,
-            use_texture_enhancement=True
-        )
+        start_time = time.perf_counter_ns()
 
-        # Run fabric classification
-        fabric_result = self.fabric_classifier.classify(
-            cv_image,
-            use_feature_enhancement=True
-        )
+        # Preprocess once, feed the same tensor to both models
+        tensor = self.preprocess(cv_image)
+
+        # Texture features for both models in one fused pass
+        texture_features, fabric_features = self.extract_features(cv_image)
+
+        # Fabric type first: it selects the defect inspection profile
+        fabric_result = self._classify_fabric([cv_image], tensor, [fabric_features])[0]
+
+        # Run defect detection (clearly clean frames may skip it)
+        if self.prefilter is not None:
+            defect_result = self._detect_with_prefilter([cv_image], tensor, [texture_features])[0]
+        else:
+            defect_result = self.defect_detector.detect(
+                cv_image,
+                use_texture_enhancement=True,
+                tensor=tensor,
+                texture_features=texture_features
+            )
 
         # Calculate inference time
-        inference_time = (time.time() - start_time) * 1000  # ms
+        elapsed_ns = time.perf_counter_ns() - start_time
+        self.profiler.record('total', elapsed_ns)
+        inference_time = elapsed_ns / 1e6  # ms
+
+        # Update performance tracking
+        self.total_frames += 1
+        self.total_inference_time += inference_time
+
+        return self._aggregate_results(defect_result, fabric_result, inference_time)
+
+    def inspect_batch(self, cv_images):
+        """
+        Perform inspection on batch of frames.
+
+        Frames are stacked into a single (B, 3, 224, 224) tensor so each
+        backbone runs once per batch instead of once per frame.
+
+        Args:
+            cv_images: List of OpenCV images
+
+        Returns:
+            list of inspection results (same format as inspect_frame()),
+            in the same order as cv_images
+        """
+        if len(cv_images) == 0:
+            return []
+
+        # Tiled mode already batches the tiles of each frame
+        if self.tile_size:
+            return [self.inspect_frame_tiled(img) for img in cv_images]
+
+        start_time = time.perf_counter_ns()
+
+        # Preprocess once, feed the same batch to both models
+        batch_tensor = self.preprocess_batch(cv_images)
+
+        # Texture features for both models in one fused pass per frame
+        features = [self.extract_features(img) for img in cv_images]
+
+        # Fabric classification first (one forward pass over the frames the
+        # roll context does not cover); it selects the defect profile
+        fabric_results = self._classify_fabric(cv_images, batch_tensor, [f[1] for f in features])
+
+        # Run defect detection (one forward pass, clearly clean frames may skip it)
+        if self.prefilter is not None:
+            defect_results = self._detect_with_prefilter(
+                cv_images, batch_tensor, [f[0] for f in features]
+            )
+        else:
+            defect_results = self.defect_detector.detect_batch(
+                cv_images,
+                use_texture_enhancement=True,
+                batch_tensor=batch_tensor,
+                texture_features=[f[0] for f in features]
+            )
+
+        # Calculate inference time (amortized per frame)
+        elapsed_ns = time.perf_counter_ns() - start_time
+        self.profiler.record('total', elapsed_ns)
+        batch_time = elapsed_ns / 1e6  # ms
+        inference_time = batch_time / len(cv_images)
 
         # Update performance tracking
+        self.total_frames += len(cv_images)
+        self.total_inference_time += batch_time
+
+        return [
+            self._aggregate_results(defect_result, fabric_result, inference_time)
+            for defect_result, fabric_result in zip(defect_results, fabric_results)
+        ]
+
+    def inspect_frame_tiled(self, cv_image, tile_size=None):
+        """
+        Inspect a high-resolution frame tile by tile.
+
+        The frame is cut into overlapping tiles which are classified by the
+        defect model in batches of at most tile_batch_size. Per-tile defect
+        probabilities are merged into a heatmap and thresholded into
+        bounding boxes. The frame-level defect verdict is the tile with the
+        highest defect probability; fabric type is classified on the whole
+        frame as usual. The texture pre-filter is not used in tiled mode.
+
+        Args:
+            cv_image: OpenCV image (BGR numpy array)
+            tile_size: Tile side in pixels (None = pipeline tile_size)
+
+        Returns:
+            dict: Same keys as inspect_frame(), plus
+                - defect_heatmap: float32 array of defect probability (0-1)
+                  at heatmap_scale of the frame
+                - defect_boxes: list of dicts (x, y, width, height, score,
+                  defect_type) in frame pixels, highest score first
+                - num_tiles: Number of tiles inspected
+        """
+        tile_size = tile_size or self.tile_size
+        if not tile_size:
+            raise ValueError("Tiled inspection needs a tile_size")
+
+        start_time = time.perf_counter_ns()
+
+        # Whole-frame fabric classification (unless the roll context has it)
+        texture_features, fabric_features = self.extract_features(cv_image)
+        fabric_result = self._classify_fabric([cv_image], None, [fabric_features])[0]
+
+        # Defect detection on tiles, at most tile_batch_size per forward pass
+        tiles = compute_tile_grid(cv_image.shape[0], cv_image.shape[1], tile_size, self.tile_overlap)
+        tile_images = extract_tiles(cv_image, tiles)
+
+        tile_results = []
+        for start in range(0, len(tiles), self.tile_batch_size):
+            chunk = tile_images[start:start + self.tile_batch_size]
+            tile_results.extend(self.defect_detector.detect_batch(
+                chunk,
+                use_texture_enhancement=False,
+                batch_tensor=self.preprocess_batch(chunk)
+            ))
+
+        scores = [r['defect_probability'] / 100.0 for r in tile_results]
+        heatmap = build_heatmap(cv_image.shape, tiles, scores, self.heatmap_scale)
+        boxes = extract_defect_boxes(
+            heatmap, self.defect_detector.confidence_threshold, self.heatmap_scale
+        )
+        label_boxes(boxes, tiles, scores, [r['defect_type'] for r in tile_results])
+
+        # Frame verdict from the most defective tile
+        worst = max(range(len(tile_results)), key=lambda i: scores[i])
+        defect_result = dict(tile_results[worst], texture_features=texture_features)
+
+        elapsed_ns = time.perf_counter_ns() - start_time
+        self.profiler.record('total', elapsed_ns)
+        inference_time = elapsed_ns / 1e6  # ms
         self.total_frames += 1
         self.total_inference_time += inference_time
 
-        # Aggregate results
-        result = {
+        result = self._aggregate_results(defect_result, fabric_result, inference_time)
+        result['defect_heatmap'] = heatmap
+        result['defect_boxes'] = boxes
+        result['num_tiles'] = len(tiles)
+        return result
+
+    def preprocess(self, cv_image):
+        """
+        Convert a camera frame into the normalized tensor both models consume.
+
+        Args:
+            cv_image: OpenCV image (BGR numpy array)
+
+        Returns:
+            torch.Tensor: (1, 3, 224, 224) tensor on the pipeline device
+        """
+        with torch.no_grad(), self.profiler.measure('preprocess'):
+            return load_image_tensor(cv_image, self.transform).to(self.device)
+
+    def preprocess_batch(self, cv_images):
+        """
+        Convert a list of camera frames into one stacked input tensor.
+
+        Args:
+            cv_images: List of OpenCV images (BGR numpy arrays)
+
+        Returns:
+            torch.Tensor: (B, 3, 224, 224) tensor on the pipeline device
+        """
+        with torch.no_grad(), self.profiler.measure('preprocess'):
+            return load_image_batch(cv_images, self.transform).to(self.device)
+
+    def extract_features(self, cv_image):
+        """
+        Extract defect and fabric texture features in one fused pass.
+
+        Args:
+            cv_image: OpenCV image (BGR numpy array)
+
+        Returns:
+            tuple: (texture_features, fabric_features) dicts
+        """
+        with self.profiler.measure('texture_features'):
+            return extract_frame_features(cv_image, downsample_to=self.feature_downsample)
+
+    def _detect_with_prefilter(self, cv_images, batch_tensor, texture_features):
+        """
+        Run defect detection behind the texture pre-filter cascade.
+
+        Frames the pre-filter marks as clearly normal get a clean result
+        without the defect model, except for periodic audit frames that are
+        still run through it to measure the pre-filter's false negatives.
+        The remaining frames share one forward pass.
+
+        Args:
+            cv_images: List of OpenCV images
+            batch_tensor: Preprocessed (B, 3, 224, 224) tensor for cv_images
+            texture_features: List of texture feature dicts, one per image
+
+        Returns:
+            list of detection results (same format as DefectDetector.detect())
+        """
+        skip = [self.prefilter.should_skip(f) for f in texture_features]
+        audit = [s and self.prefilter.should_audit() for s in skip]
+        run = [i for i in range(len(cv_images)) if not skip[i] or audit[i]]
+
+        results = [None] * len(cv_images)
+        if run:
+            detected = self.defect_detector.detect_batch(
+                [cv_images[i] for i in run],
+                use_texture_enhancement=True,
+                batch_tensor=batch_tensor[run],
+                texture_features=[texture_features[i] for i in run]
+            )
+            for i, result in zip(run, detected):
+                results[i] = result
+
+        clean_confidence = self.prefilter.clean_confidence
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = self.defect_detector.build_skipped_result(
+                    clean_confidence, texture_features[i]
+                )
+                self.prefilter.update(texture_features[i], is_clean=True)
+                continue
+
+            if audit[i]:
+                self.prefilter.record_audit(result['defect_detected'])
+                result['prefilter_audit'] = True
+
+            is_clean = not result['defect_detected']
+            self.prefilter.update(
+                texture_features[i], is_clean,
+                confidence=result['confidence'] if result['class_idx'] == 0 else None
+            )
+
+        return results
+
+    def _classify_fabric(self, cv_images, batch_tensor, fabric_features):
+        """
+        Classify fabric type, skipping frames the roll context covers.
+
+        Frames that need the classifier (no roll context, warm-up, re-check)
+        share one forward pass; the others get the locked result. When the
+        lock changes, defect inspection is re-routed before the defect
+        model runs on these frames.
+
+        Args:
+            cv_images: List of OpenCV images
+            batch_tensor: Preprocessed (B, 3, 224, 224) tensor for cv_images
+                          (None = preprocess the frames that are classified)
+            fabric_features: List of fabric feature dicts, one per image
+
+        Returns:
+            list of classification results (same format as FabricClassifier.classify())
+        """
+        if self.roll_context is None:
+            results = [None] * len(cv_images)
+        else:
+            results = [self.roll_context.lookup(features) for features in fabric_features]
+
+        run = [i for i, result in enumerate(results) if result is None]
+        if not run:
+            return results
+
+        images = [cv_images[i] for i in run]
+        classified = self.fabric_classifier.classify_batch(
+            images,
+            use_feature_enhancement=True,
+            batch_tensor=batch_tensor[run] if batch_tensor is not None else self.preprocess_batch(images),
+            fabric_features=[fabric_features[i] for i in run]
+        )
+
+        changed = False
+        for i, result in zip(run, classified):
+            results[i] = result
+            if self.roll_context is not None:
+                changed = self.roll_context.update(result) or changed
+        if changed:
+            self._route_defect_inspection(self.roll_context.fabric_type)
+
+        return results
+
+    def _aggregate_results(self, defect_result, fabric_result, inference_time):
+        """
+        Combine defect and fabric results into one inspection result.
+
+        Args:
+            defect_result: Result dict from DefectDetector
+            fabric_result: Result dict from FabricClassifier
+            inference_time: Inference time in milliseconds
+
+        Returns:
+            dict: Inspection result (see inspect_frame())
+        """
+        return {
             # Defect detection
             'defect_detected': defect_result['defect_detected'],
             'defect_type': defect_result['defect_type'],
@@ -144,9 +609,12 @@ class TextileInspectionPipeline:
             # Fabric classification
             'fabric_type': fabric_result['fabric_type'],
             'fabric_confidence': fabric_result['confidence'],
+            'fabric_locked': fabric_result.get('fabric_locked', False),
 
             # Performance
             'inference_time_ms': inference_time,
+            'prefiltered': defect_result.get('prefiltered', False),
+            'anomaly_score': defect_result.get('anomaly_score'),
 
             # Additional details (for debugging/analysis)
             'texture_features': defect_result.get('texture_features', {}),
@@ -154,57 +622,62 @@ class TextileInspectionPipeline:
             'all_fabric_probabilities': fabric_result.get('all_probabilities', {}),
         }
 
-        return result
-
-    def inspect_batch(self, cv_images):
-        """
-        Perform inspection on batch of frames.
-
-        Args:
-            cv_images: List of OpenCV images
-
-        Returns:
-            list of inspection results
-        """
-        results = []
-        for img in cv_images:
-            result = self.inspect_frame(img)
-            results.append(result)
-
-        return results
-
     def get_performance_stats(self):
         """
         Get performance statistics.
 
         Returns:
-            dict with performance metrics
+            dict with performance metrics; 'stages' maps each instrumented
+            stage (see ml.shared.profiling) to rolling p50/p95/p99 latencies
         """
         if self.total_frames == 0:
             avg_time = 0.0
         else:
             avg_time = self.total_inference_time / self.total_frames
 
-        return {
+        stats = {
             'total_frames_processed': self.total_frames,
             'total_inference_time_ms': self.total_inference_time,
             'average_inference_time_ms': avg_time,
             'estimated_fps': 1000.0 / avg_time if avg_time > 0 else 0.0
         }
 
+        if self.prefilter is not None:
+            stats['prefilter'] = self.prefilter.get_stats()
+
+        if self.roll_context is not None:
+            stats['roll_context'] = self.roll_context.get_stats()
+
+        # Rolling p50/p95/p99 per stage (forward passes are per call, i.e.
+        # per batch when inspect_batch() is used)
+        stats['stages'] = self.profiler.get_stats()
+
+        return stats
+
     def reset_stats(self):
         """Reset performance statistics."""
         self.total_frames = 0
         self.total_inference_time = 0.0
+        self.profiler.reset()
+        if self.prefilter is not None:
+            self.prefilter.reset_stats()
+        if self.roll_context is not None:
+            self.roll_context.reset_stats()
 
     def set_confidence_threshold(self, threshold):
         """
         Update defect detection confidence threshold.
 
+        A threshold in the profile of the locked fabric type still takes
+        precedence while that fabric is being inspected.
+
         Args:
             threshold: New threshold (0.0-1.0)
         """
-        self.defect_detector.set_confidence_threshold(threshold)
+        self.base_detector.set_confidence_threshold(threshold)
+        self.base_threshold = self.base_detector.confidence_threshold
+        if self.roll_context is not None:
+            self._route_defect_inspection(self.roll_context.fabric_type)
 
     def get_model_info(self):
         """
@@ -220,6 +693,11 @@ class TextileInspectionPipeline:
             'defect_classes': self.defect_detector.get_defect_classes(),
             'fabric_classes': self.fabric_classifier.get_fabric_classes(),
             'confidence_threshold': self.defect_detector.confidence_threshold,
+            'precision': self.precision,
+            'tile_size': self.tile_size,
+            'anomaly_mode': self.anomaly_mode,
+            'roll_context': self.roll_context is not None,
+            'fabric_profiles': sorted(self.roll_context.profiles) if self.roll_context is not None else [],
         }
 
 
@@ -227,7 +705,19 @@ def create_ml_pipeline(
     defect_weights=None,
     fabric_weights=None,
     device=None,
-    confidence_threshold=0.6
+    confidence_threshold=0.6,
+    fast_preprocessing=True,
+    feature_downsample=None,
+    num_workers=0,
+    precision='fp32',
+    calibration_images=None,
+    prefilter=None,
+    tile_size=None,
+    tile_overlap=0.25,
+    tile_batch_size=32,
+    heatmap_scale=0.25,
+    anomaly_bank=None,
+    roll_context=None
 ):
     """
     Factory function to create ML pipeline.
@@ -237,20 +727,54 @@ def create_ml_pipeline(
         fabric_weights: Path to fabric classification weights
         device: torch.device or str
         confidence_threshold: Defect detection threshold
+        fast_preprocessing: Use the PIL-free OpenCV/NumPy transform
+        feature_downsample: Longest side for texture features (None = full res)
+        num_workers: >0 runs inspection in that many worker processes, each
+                     with its own models (frames shared via shared memory)
+        precision: 'fp32', 'bf16', 'int8_dynamic' or 'int8_static'
+        calibration_images: Representative OpenCV frames for int8_static
+        prefilter: Texture pre-filter cascade (None/False = off, True =
+                   defaults, dict = TexturePrefilter keyword arguments)
+        tile_size: Tile side in pixels for tiled inspection (None = off)
+        tile_overlap: Fraction of tile_size shared by neighbouring tiles
+        tile_batch_size: Maximum number of tiles per forward pass
+        heatmap_scale: Resolution of the tiled defect heatmap relative
+                       to the frame
+        anomaly_bank: Clean-fabric memory bank directory for anomaly mode
+        roll_context: Per-roll fabric type lock (None/False = off, True =
+                      defaults, dict = RollContext keyword arguments)
 
     Returns:
-        TextileInspectionPipeline instance
+        TextileInspectionPipeline instance, or ParallelInspectionPipeline
+        when num_workers > 0
 
     Raises:
         RuntimeError: If models fail to load
     """
+    pipeline_kwargs = dict(
+        defect_weights_path=defect_weights,
+        fabric_weights_path=fabric_weights,
+        device=device,
+        confidence_threshold=confidence_threshold,
+        fast_preprocessing=fast_preprocessing,
+        feature_downsample=feature_downsample,
+        precision=precision,
+        calibration_images=calibration_images,
+        prefilter=prefilter,
+        tile_size=tile_size,
+        tile_overlap=tile_overlap,
+        tile_batch_size=tile_batch_size,
+        heatmap_scale=heatmap_scale,
+        anomaly_bank=anomaly_bank,
+        roll_context=roll_context
+    )
+
     try:
-        pipeline = TextileInspectionPipeline(
-            defect_weights_path=defect_weights,
-            fabric_weights_path=fabric_weights,
-            device=device,
-            confidence_threshold=confidence_threshold
-        )
+        if num_workers and num_workers > 0:
+            from .process_pool import ParallelInspectionPipeline
+            return ParallelInspectionPipeline(num_workers=num_workers, **pipeline_kwargs)
+
+        pipeline = TextileInspectionPipeline(**pipeline_kwargs)
         return pipeline
 
     except Exception as e:
@@ -0,0 +1,539 @@
+"""
+Multi-process inspection pool.
+
+Runs several TextileInspectionPipeline instances in separate processes so
+inference scales across all CPU cores instead of being capped by the GIL
+and a single set of PyTorch intra-op threads.
+
+- Every worker process loads its own copy of both models.
+- Frames travel through multiprocessing.shared_memory; only the block
+  name, shape and dtype are pickled, never the ndarray itself.
+- Results are returned in the order frames were submitted.
+- When the parent replaces a shared-memory block (frames got larger), it
+  tells every worker to close its handle, so unlinked blocks are unmapped
+  instead of piling up in /dev/shm.
+- Per-stage latencies (ml.shared.profiling) are collected from the workers
+  on request and merged with the parent's own capture-side stages.
+
+Same public interface as TextileInspectionPipeline (inspect_frame,
+inspect_batch, get_performance_stats, ...), so CameraManager can use either.
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .shared.profiling import LatencyRecorder
+
+
+def _worker_main(worker_id, pipeline_kwargs, num_threads, task_queue, result_queue):
+    """
+    Worker process entry point.
+
+    Loads a pipeline, then inspects frames read from shared memory until a
+    None sentinel arrives.
+    """
+    import torch
+    from .pipeline import TextileInspectionPipeline
+
+    torch.set_num_threads(num_threads)
+
+    try:
+        pipeline = TextileInspectionPipeline(**pipeline_kwargs)
+    except Exception as e:
+        result_queue.put(('error', worker_id, None, str(e)))
+        return
+
+    result_queue.put(('ready', worker_id, None, pipeline.get_model_info()))
+
+    attached = {}  # shm name → SharedMemory (attach once, reuse)
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        kind, task_id, payload = task
+
+        if kind == 'threshold':
+            pipeline.set_confidence_threshold(payload)
+            continue
+        if kind == 'roll':
+            pipeline.start_roll()
+            continue
+        if kind == 'release':
+            # The parent destroyed these blocks; unmap them here as well
+            for name in payload:
+                shm = attached.pop(name, None)
+                if shm is not None:
+                    shm.close()
+            continue
+        if kind == 'reset_stats':
+            pipeline.reset_stats()
+            continue
+        if kind == 'stats':
+            result_queue.put(('result', worker_id, task_id, pipeline.profiler.snapshot()))
+            continue
+
+        try:
+            frames = []
+            for name, shape, dtype in payload:
+                if name not in attached:
+                    attached[name] = shared_memory.SharedMemory(name=name)
+                frames.append(np.ndarray(shape, dtype=dtype, buffer=attached[name].buf))
+
+            if len(frames) == 1:
+                results = [pipeline.inspect_frame(frames[0])]
+            else:
+                results = pipeline.inspect_batch(frames)
+
+            del frames  # Release buffer views before the slot is reused
+            result_queue.put(('result', worker_id, task_id, results))
+
+        except Exception as e:
+            result_queue.put(('failed', worker_id, task_id, str(e)))
+
+    for shm in attached.values():
+        shm.close()
+
+
+class _FrameSlot:
+    """One reusable shared-memory block holding a single frame."""
+
+    def __init__(self, nbytes):
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+
+    @property
+    def size(self):
+        return self.shm.size
+
+    def write(self, frame):
+        """Copy frame into the block, return (name, shape, dtype) descriptor."""
+        frame = np.ascontiguousarray(frame)
+        view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.shm.buf)
+        view[...] = frame
+        del view
+        return (self.shm.name, frame.shape, frame.dtype.str)
+
+    def destroy(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ParallelInspectionPipeline:
+    """
+    Process-pool version of TextileInspectionPipeline.
+
+    Usage:
+        with ParallelInspectionPipeline(num_workers=4, confidence_threshold=0.6) as pool:
+            results = pool.inspect_batch(frames)
+
+    Thread-safe: several threads may submit frames at once, and each task
+    runs in one worker process.
+    """
+
+    thread_safe = True
+
+    def __init__(
+        self,
+        num_workers=None,
+        frames_per_task=1,
+        max_in_flight=None,
+        startup_timeout=300,
+        **pipeline_kwargs
+    ):
+        """
+        Start worker processes and wait until every model is loaded.
+
+        Args:
+            num_workers: Number of worker processes (None = all CPU cores)
+            frames_per_task: Frames sent to one worker at a time; >1 lets each
+                             worker use batched inference
+            max_in_flight: Maximum tasks queued across all workers in imap()
+                           (None = 2 per worker)
+            startup_timeout: Seconds to wait for workers to load models
+            **pipeline_kwargs: Forwarded to TextileInspectionPipeline in each worker
+
+        Raises:
+            RuntimeError: If a worker fails to load its models
+        """
+        cpu_count = os.cpu_count() or 1
+        self.num_workers = max(1, int(num_workers or cpu_count))
+        self.frames_per_task = max(1, int(frames_per_task))
+        self.max_in_flight = max_in_flight or 2 * self.num_workers
+        self.pipeline_kwargs = pipeline_kwargs
+
+        # Split cores between workers to avoid thread oversubscription
+        threads_per_worker = max(1, cpu_count // self.num_workers)
+
+        # Bookkeeping (guarded by _lock)
+        self._lock = threading.Lock()
+        self._results_ready = threading.Condition(self._lock)
+        self._task_ids = itertools.count()
+        self._free_slots = []
+        self._task_slots = {}      # task_id → [slots]
+        self._task_worker = {}     # task_id → worker_id
+        self._in_flight = [0] * self.num_workers
+        self._results = {}         # task_id → ('result'|'failed', payload)
+        self._closed = False
+
+        # Performance tracking; the profiler holds the parent-side stages
+        # (CameraManager capture stages, 'pool_wait' per task)
+        self.total_frames = 0
+        self.total_inference_time = 0.0
+        self.profiler = LatencyRecorder()
+
+        print(f"🚀 Starting {self.num_workers} inspection worker processes "
+              f"({threads_per_worker} threads each)...")
+
+        ctx = mp.get_context('spawn')
+        self._result_queue = ctx.Queue()
+        self._task_queues = []
+        self._processes = []
+        for worker_id in range(self.num_workers):
+            task_queue = ctx.Queue()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(worker_id, pipeline_kwargs, threads_per_worker,
+                      task_queue, self._result_queue),
+                daemon=True
+            )
+            process.start()
+            self._task_queues.append(task_queue)
+            self._processes.append(process)
+
+        self._wait_until_ready(startup_timeout)
+
+        # Background thread moving results from the queue into _results
+        self._collector = threading.Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+
+        print("✅ Inspection worker pool ready")
+
+    def _wait_until_ready(self, timeout):
+        """Block until every worker has loaded its models."""
+        ready = 0
+        deadline = time.time() + timeout
+        self.model_info = None
+
+        while ready < self.num_workers:
+            try:
+                kind, worker_id, _, payload = self._result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if any(not p.is_alive() for p in self._processes):
+                    self.close()
+                    raise RuntimeError("Inspection worker exited during startup")
+                if time.time() > deadline:
+                    self.close()
+                    raise RuntimeError("Inspection workers did not start in time")
+                continue
+
+            if kind == 'error':
+                self.close()
+                raise RuntimeError(f"Worker {worker_id} failed to load models: {payload}")
+
+            ready += 1
+            self.model_info = payload
+
+    def _collect_results(self):
+        """Collector thread: store worker results and wake up waiters."""
+        while True:
+            try:
+                message = self._result_queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    return
+                self._check_workers_alive()
+                continue
+            except (EOFError, OSError):
+                return
+
+            if message is None:
+                return
+
+            kind, worker_id, task_id, payload = message
+            with self._lock:
+                self._in_flight[worker_id] -= 1
+                self._free_slots.extend(self._task_slots.pop(task_id, []))
+                self._task_worker.pop(task_id, None)
+                self._results[task_id] = (kind, payload)
+                self._results_ready.notify_all()
+
+    def _check_workers_alive(self):
+        """Fail pending tasks of workers that died unexpectedly."""
+        with self._lock:
+            for task_id, worker_id in list(self._task_worker.items()):
+                if not self._processes[worker_id].is_alive():
+                    self._free_slots.extend(self._task_slots.pop(task_id, []))
+                    del self._task_worker[task_id]
+                    self._results[task_id] = ('failed', f"Worker {worker_id} exited")
+            self._results_ready.notify_all()
+
+    def _acquire_slot(self, nbytes):
+        """Get a free shared-memory slot of at least nbytes (caller holds _lock)."""
+        for i, slot in enumerate(self._free_slots):
+            if slot.size >= nbytes:
+                return self._free_slots.pop(i)
+
+        # Replace an undersized free slot rather than growing the pool
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            name = slot.shm.name
+            slot.destroy()
+            # No task uses a free slot, so every worker can drop its handle
+            for task_queue in self._task_queues:
+                task_queue.put(('release', None, [name]))
+
+        return _FrameSlot(nbytes)
+
+    def submit(self, cv_images):
+        """
+        Send frames to the least busy worker.
+
+        Args:
+            cv_images: List of OpenCV images inspected together by one worker
+
+        Returns:
+            int: Task id to pass to result()
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Inspection worker pool is closed")
+
+            task_id = next(self._task_ids)
+            slots = [self._acquire_slot(img.nbytes) for img in cv_images]
+            payload = [slot.write(img) for slot, img in zip(slots, cv_images)]
+
+            worker_id = min(range(self.num_workers), key=lambda w: self._in_flight[w])
+            self._in_flight[worker_id] += 1
+            self._task_slots[task_id] = slots
+            self._task_worker[task_id] = worker_id
+
+        self._task_queues[worker_id].put(('inspect', task_id, payload))
+        return task_id
+
+    def result(self, task_id, timeout=None):
+        """
+        Wait for the results of a submitted task.
+
+        Args:
+            task_id: Id returned by submit()
+            timeout: Seconds to wait (None = forever)
+
+        Returns:
+            list of inspection results, one per submitted frame
+
+        Raises:
+            RuntimeError: If the worker failed or timed out
+        """
+        with self._results_ready:
+            ok = self._results_ready.wait_for(lambda: task_id in self._results, timeout)
+            if not ok:
+                raise RuntimeError(f"Inspection task {task_id} timed out")
+            kind, payload = self._results.pop(task_id)
+
+        if kind != 'result':
+            raise RuntimeError(f"Inspection failed in worker: {payload}")
+        return payload
+
+    def imap(self, cv_images):
+        """
+        Inspect an iterable of frames across all workers.
+
+        Frames are read lazily with at most max_in_flight tasks outstanding,
+        so arbitrarily long sources (e.g. video files) can be streamed.
+
+        Args:
+            cv_images: Iterable of OpenCV images
+
+        Yields:
+            Inspection results in the same order as cv_images
+        """
+        pending = deque()
+        iterator = iter(cv_images)
+
+        while True:
+            chunk = list(itertools.islice(iterator, self.frames_per_task))
+            if chunk:
+                start = time.time()
+                pending.append((self.submit(chunk), start, len(chunk)))
+
+            # Yield in order once enough work is queued or input is exhausted
+            while pending and (not chunk or len(pending) >= self.max_in_flight):
+                task_id, start, count = pending.popleft()
+                results = self.result(task_id)
+                self._record(count, (time.time() - start) * 1000)
+                for result in results:
+                    yield result
+
+            if not chunk:
+                return
+
+    def inspect_frame(self, cv_image):
+        """
+        Perform complete inspection on one camera frame in a worker process.
+
+        Args:
+            cv_image: OpenCV image (BGR numpy array)
+
+        Returns:
+            dict: Inspection result (see TextileInspectionPipeline.inspect_frame)
+        """
+        start = time.time()
+        result = self.result(self.submit([cv_image]))[0]
+        self._record(1, (time.time() - start) * 1000)
+        return result
+
+    def inspect_batch(self, cv_images):
+        """
+        Perform inspection on batch of frames, spread over all workers.
+
+        Args:
+            cv_images: List of OpenCV images
+
+        Returns:
+            list of inspection results, in the same order as cv_images
+        """
+        return list(self.imap(cv_images))
+
+    def _record(self, frames, elapsed_ms):
+        self.profiler.record('pool_wait', int(elapsed_ms * 1e6))
+        with self._lock:
+            self.total_frames += frames
+            self.total_inference_time += elapsed_ms
+
+    def _worker_stage_snapshots(self, timeout=10):
+        """Ask every live worker for its per-stage latency samples."""
+        task_ids = []
+        with self._lock:
+            if self._closed:
+                return []
+            for worker_id, process in enumerate(self._processes):
+                if not process.is_alive():
+                    continue
+                task_id = next(self._task_ids)
+                self._in_flight[worker_id] += 1
+                self._task_worker[task_id] = worker_id
+                task_ids.append((worker_id, task_id))
+
+        for worker_id, task_id in task_ids:
+            self._task_queues[worker_id].put(('stats', task_id, None))
+
+        snapshots = []
+        for _, task_id in task_ids:
+            try:
+                snapshots.append(self.result(task_id, timeout))
+            except RuntimeError:
+                continue  # worker busy or gone; report the others
+        return snapshots
+
+    def get_performance_stats(self):
+        """
+        Get performance statistics (wall time as seen by the caller).
+
+        Returns:
+            dict with performance metrics; 'stages' merges the per-stage
+            latencies of all workers with the parent-side stages
+        """
+        with self._lock:
+            frames = self.total_frames
+            total_time = self.total_inference_time
+
+        avg_time = total_time / frames if frames else 0.0
+
+        stages = LatencyRecorder(window=self.profiler.window * (self.num_workers + 1))
+        stages.merge(self.profiler.snapshot())
+        for snapshot in self._worker_stage_snapshots():
+            stages.merge(snapshot)
+
+        return {
+            'total_frames_processed': frames,
+            'total_inference_time_ms': total_time,
+            'average_inference_time_ms': avg_time,
+            'estimated_fps': 1000.0 / avg_time if avg_time > 0 else 0.0,
+            'num_workers': self.num_workers,
+            'stages': stages.get_stats(),
+        }
+
+    def reset_stats(self):
+        """Reset performance statistics (also in every worker)."""
+        with self._lock:
+            self.total_frames = 0
+            self.total_inference_time = 0.0
+        self.profiler.reset()
+        for task_queue in self._task_queues:
+            task_queue.put(('reset_stats', None, None))
+
+    def set_confidence_threshold(self, threshold):
+        """
+        Update defect detection confidence threshold in every worker.
+
+        Args:
+            threshold: New threshold (0.0-1.0)
+        """
+        for task_queue in self._task_queues:
+            task_queue.put(('threshold', None, threshold))
+        if self.model_info is not None:
+            self.model_info['confidence_threshold'] = max(0.0, min(1.0, threshold))
+
+    def start_roll(self):
+        """Reset the roll state (fabric lock, pre-filter baseline) of every worker."""
+        for task_queue in self._task_queues:
+            task_queue.put(('roll', None, None))
+
+    def get_model_info(self):
+        """
+        Get information about loaded models.
+
+        Returns:
+            dict with model information
+        """
+        info = dict(self.model_info or {})
+        info['num_workers'] = self.num_workers
+        return info
+
+    def close(self):
+        """Stop all workers and free shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+        collector = getattr(self, '_collector', None)
+        if collector is not None:
+            self._result_queue.put(None)
+            collector.join(timeout=2)
+
+        with self._lock:
+            for slot in self._free_slots:
+                slot.destroy()
+            for slots in self._task_slots.values():
+                for slot in slots:
+                    slot.destroy()
+            self._free_slots = []
+            self._task_slots = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,252 @@
+"""
+Roll-level fabric type lock.
+
+The fabric type on a roll practically never changes, yet the fabric
+classifier (ResNet-18) used to run on every frame. RollContext lets the
+pipeline classify the first frames of a roll, locks the fabric type once
+the last warmup_frames results agree with enough confidence, and from then
+on only asks for a re-check every recheck_interval frames. A confident
+re-check that disagrees with the lock (e.g. a splice to another fabric)
+makes the context classify every frame again; the lock is only replaced
+once warmup_frames consecutive confident results disagree with it, so one
+outlier - also one classified in the same batch right after the lock was
+taken - cannot unlock the roll.
+
+The context also holds per-fabric inspection profiles, which the pipeline
+applies whenever the locked fabric type changes:
+
+    profiles = {
+        "Denim": {"confidence_threshold": 0.7},
+        "Örme": {"anomaly_bank": "models/banks/orme"},
+    }
+"""
+
+import threading
+from collections import Counter, deque
+
+import numpy as np
+
+# Settings a fabric profile may override
+PROFILE_KEYS = ('confidence_threshold', 'anomaly_bank')
+
+
+class RollContext:
+    """
+    Fabric type lock for the roll currently being inspected.
+
+    Usage:
+        fabric_result = context.lookup(fabric_features)
+        if fabric_result is None:
+            fabric_result = classifier.classify(...)
+            if context.update(fabric_result):
+                ... locked fabric type changed, re-route defect inspection
+    """
+
+    def __init__(self, warmup_frames=10, min_agreement=0.8, min_confidence=50.0,
+                 recheck_interval=200, profiles=None):
+        """
+        Initialize roll context.
+
+        Args:
+            warmup_frames: Classified frames the lock decision is based on
+            min_agreement: Fraction of those frames that must agree on the
+                           fabric type (0-1)
+            min_confidence: Minimum mean classifier confidence (0-100) of the
+                            agreeing frames; re-checks below it are ignored
+            recheck_interval: Classify every N-th frame after locking to
+                              confirm the lock (0 = never); after a confident
+                              disagreement every frame is classified until
+                              the lock is confirmed or replaced
+            profiles: dict fabric type → dict with any of PROFILE_KEYS
+        """
+        if warmup_frames < 1:
+            raise ValueError("warmup_frames must be at least 1")
+        if not 0.0 < min_agreement <= 1.0:
+            raise ValueError("min_agreement must be in (0, 1]")
+        profiles = dict(profiles or {})
+        for fabric_type, profile in profiles.items():
+            unknown = set(profile) - set(PROFILE_KEYS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown settings in the '{fabric_type}' profile: {sorted(unknown)} "
+                    f"(allowed: {list(PROFILE_KEYS)})"
+                )
+
+        self.warmup_frames = warmup_frames
+        self.min_agreement = min_agreement
+        self.min_confidence = min_confidence
+        self.recheck_interval = recheck_interval
+        self.profiles = profiles
+
+        self._votes = deque(maxlen=warmup_frames)
+        self._disagreements = deque(maxlen=warmup_frames)  # votes against the lock
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def fabric_type(self):
+        """Locked fabric type, or None while warming up."""
+        return self._locked_type
+
+    @property
+    def locked(self):
+        """Whether the fabric type is locked."""
+        return self._locked_type is not None
+
+    def profile(self, fabric_type):
+        """
+        Inspection profile of a fabric type.
+
+        Args:
+            fabric_type: Fabric class name (None = no profile)
+
+        Returns:
+            dict (empty if the fabric type has no profile)
+        """
+        return self.profiles.get(fabric_type, {}) if fabric_type is not None else {}
+
+    def lookup(self, fabric_features=None):
+        """
+        Fabric result for the next frame, if the classifier can be skipped.
+
+        Call once per frame, in frame order.
+
+        Args:
+            fabric_features: Fabric features of the frame, copied into the
+                             returned result
+
+        Returns:
+            dict in FabricClassifier result format with fabric_locked=True,
+            or None if the frame must be classified (warm-up or re-check)
+        """
+        with self._lock:
+            self.frames_seen += 1
+            if self._locked_result is None:
+                self.frames_classified += 1
+                return None
+
+            self._since_check += 1
+            if self._disagreements or (
+                    self.recheck_interval and self._since_check >= self.recheck_interval):
+                self._since_check = 0
+                self.frames_classified += 1
+                self.rechecks += 1
+                return None
+
+            result = dict(self._locked_result)
+
+        if fabric_features is not None:
+            result['fabric_features'] = fabric_features
+        return result
+
+    def update(self, fabric_result):
+        """
+        Feed the classifier result of a frame lookup() returned None for.
+
+        Args:
+            fabric_result: dict from FabricClassifier.classify()
+
+        Returns:
+            bool: True if the locked fabric type changed (locked, or
+            unlocked by warmup_frames consecutive disagreeing results)
+        """
+        fabric_type = fabric_result['fabric_type']
+        confidence = fabric_result['confidence']
+        vote = (fabric_type, confidence, fabric_result.get('all_probabilities', {}))
+
+        with self._lock:
+            if self._locked_result is None:
+                self._votes.append(vote)
+                return self._try_lock()
+
+            if confidence < self.min_confidence:
+                return False
+            if fabric_type == self._locked_type:
+                self._disagreements.clear()  # lock confirmed
+                return False
+
+            self._disagreements.append(vote)
+            if len(self._disagreements) < self.warmup_frames:
+                return False
+
+            # Consistent confident disagreement: the fabric changed. The
+            # disagreeing results are the warm-up of the new lock.
+            self.unlocks += 1
+            self._locked_type = None
+            self._locked_result = None
+            self._votes.clear()
+            self._votes.extend(self._disagreements)
+            self._disagreements.clear()
+            self._try_lock()
+            return True
+
+    def _try_lock(self):
+        """Lock if the warm-up votes agree (called with self._lock held)."""
+        if len(self._votes) < self.warmup_frames:
+            return False
+
+        fabric_type, count = Counter(vote[0] for vote in self._votes).most_common(1)[0]
+        if count / len(self._votes) < self.min_agreement:
+            return False
+
+        confidence = float(np.mean([vote[1] for vote in self._votes if vote[0] == fabric_type]))
+        if confidence < self.min_confidence:
+            return False
+
+        classes = {name for vote in self._votes for name in vote[2]}
+        probabilities = {
+            name: float(np.mean([vote[2].get(name, 0.0) for vote in self._votes]))
+            for name in classes
+        }
+
+        self._locked_type = fabric_type
+        self._locked_result = {
+            'fabric_type': fabric_type,
+            'confidence': confidence,
+            'all_probabilities': probabilities,
+            'fabric_locked': True,
+        }
+        self._since_check = 0
+        self._disagreements.clear()
+        self.locks += 1
+        return True
+
+    def get_stats(self):
+        """
+        Get lock statistics.
+
+        Returns:
+            dict with fabric_type, frames_seen, frames_classified,
+            frames_skipped, skip_rate, rechecks, locks and unlocks
+        """
+        with self._lock:
+            skipped = self.frames_seen - self.frames_classified
+            return {
+                'fabric_type': self._locked_type,
+                'frames_seen': self.frames_seen,
+                'frames_classified': self.frames_classified,
+                'frames_skipped': skipped,
+                'skip_rate': skipped / self.frames_seen if self.frames_seen else 0.0,
+                'rechecks': self.rechecks,
+                'locks': self.locks,
+                'unlocks': self.unlocks,
+            }
+
+    def reset_stats(self):
+        """Reset counters (the lock is kept)."""
+        with self._lock:
+            self.frames_seen = 0
+            self.frames_classified = 0
+            self.rechecks = 0
+            self.locks = 0
+            self.unlocks = 0
+
+    def reset(self):
+        """Forget the lock and counters, e.g. when a new roll is loaded."""
+        with self._lock:
+            self._votes.clear()
+            self._disagreements.clear()
+            self._locked_type = None
+            self._locked_result = None
+            self._since_check = 0
+        self.reset_stats()
@@ -1,6 +1,16 @@
-"""Shared utilities and transforms for ML models."""
+"""Shared utilities and transforms for ML models.
 
-from .transforms import get_transform
-from .utils import load_image_tensor, tensor_to_numpy
+ml.shared.weights is not re-exported: it is also run as a script
+(python -m ml.shared.weights) and must not be imported by the package.
+"""
 
-__all__ = ['get_transform', 'load_image_tensor', 'tensor_to_numpy']
+from .features import extract_frame_features
+from .profiling import LatencyRecorder
+from .transforms import get_transform, get_opencv_transform, OpenCVTransform
+from .utils import load_image_tensor, load_image_batch, tensor_to_numpy
+
+__all__ = [
+    'get_transform', 'get_opencv_transform', 'OpenCVTransform',
+    'load_image_tensor', 'load_image_batch', 'tensor_to_numpy',
+    'extract_frame_features', 'LatencyRecorder',
+]
@@ -0,0 +1,90 @@
+"""
+Fused texture feature extraction for textile inspection.
+
+Computes the classical CV features used by both defect detection
+(extract_texture_features) and fabric classification (extract_fabric_features)
+in one pass over the frame: grayscale, Sobel gradients and the Laplacian are
+computed once and shared, and statistics use single-pass cv2.meanStdDev.
+"""
+
+import cv2
+import numpy as np
+
+# Canny thresholds used by the individual extractors
+DEFECT_CANNY_THRESHOLDS = (50, 150)
+FABRIC_CANNY_THRESHOLDS = (30, 100)
+
+
+def downsample_frame(cv_image, max_side):
+    """
+    Shrink a frame so its longest side is at most max_side pixels.
+
+    Args:
+        cv_image: OpenCV image (BGR numpy array)
+        max_side: Maximum length of the longest side (None = no resizing)
+
+    Returns:
+        numpy.ndarray: Downsampled image (or the input if already small enough)
+    """
+    if max_side is None:
+        return cv_image
+
+    h, w = cv_image.shape[:2]
+    scale = max_side / float(max(h, w))
+    if scale >= 1.0:
+        return cv_image
+
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(cv_image, size, interpolation=cv2.INTER_AREA)
+
+
+def extract_frame_features(cv_image, downsample_to=None):
+    """
+    Extract defect texture features and fabric features in one fused pass.
+
+    Results are identical to calling extract_texture_features() and
+    extract_fabric_features() separately on the same image.
+
+    Args:
+        cv_image: OpenCV image (BGR numpy array)
+        downsample_to: Compute on a copy whose longest side is at most this
+                       many pixels (None = full resolution). Note that edge
+                       density and Laplacian variance depend on scale.
+
+    Returns:
+        tuple: (texture_features, fabric_features) dicts
+    """
+    image = downsample_frame(cv_image, downsample_to)
+
+    # Grayscale once
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    num_pixels = gray.shape[0] * gray.shape[1]
+
+    # Gradients once, shared by both Canny passes (same border as cv2.Canny)
+    dx = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3, borderType=cv2.BORDER_REPLICATE)
+    dy = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3, borderType=cv2.BORDER_REPLICATE)
+    defect_edges = cv2.Canny(dx, dy, *DEFECT_CANNY_THRESHOLDS)
+    fabric_edges = cv2.Canny(dx, dy, *FABRIC_CANNY_THRESHOLDS)
+
+    # Laplacian variance once (blur score / texture coarseness)
+    _, laplacian_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_64F))
+    laplacian_var = float(laplacian_std[0, 0]) ** 2
+
+    # Intensity statistics (single pass each)
+    gray_mean, gray_std = cv2.meanStdDev(gray)
+    _, channel_std = cv2.meanStdDev(image)
+
+    texture_features = {
+        'edge_density': cv2.countNonZero(defect_edges) / num_pixels,
+        'blur_score': laplacian_var,
+        'contrast': float(gray_std[0, 0])
+    }
+
+    fabric_features = {
+        'texture_coarseness': laplacian_var,
+        'color_uniformity': float(np.mean(channel_std)),
+        'edge_density': cv2.countNonZero(fabric_edges) / num_pixels,
+        'brightness': float(gray_mean[0, 0])
+    }
+
+    return texture_features, fabric_features
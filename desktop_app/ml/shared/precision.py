@@ -0,0 +1,257 @@
+"""
+Reduced-precision inference modes for CPU inspection.
+
+Supported precisions (applied to a model's backbone, so predict() and
+predict_batch() keep working unchanged):
+
+- fp32:          Default full-precision model
+- bf16:          bfloat16 autocast (fast on CPUs with AVX512-BF16 / AMX)
+- int8_dynamic:  Dynamic quantization of Linear layers (weights int8,
+                 activations quantized on the fly; no calibration needed)
+- int8_static:   FX graph-mode static quantization of conv + linear layers,
+                 calibrated on representative fabric frames
+
+Use build_precision_report() to measure speed and accuracy delta of each
+mode against fp32 and select_fastest_precision() to pick the fastest one
+within tolerance.
+"""
+
+import copy
+import time
+
+import torch
+import torch.nn as nn
+
+PRECISION_MODES = ('fp32', 'bf16', 'int8_dynamic', 'int8_static')
+
+
+class AutocastBackbone(nn.Module):
+    """Runs a backbone under torch.autocast and returns fp32 logits."""
+
+    def __init__(self, backbone, dtype=torch.bfloat16, device_type='cpu'):
+        super().__init__()
+        self.backbone = backbone
+        self.dtype = dtype
+        self.device_type = device_type
+
+    def forward(self, x):
+        with torch.autocast(device_type=self.device_type, dtype=self.dtype):
+            return self.backbone(x).float()
+
+
+def _quantization_engine():
+    """Pick the best available quantized kernel backend."""
+    engines = torch.backends.quantized.supported_engines
+    for engine in ('x86', 'fbgemm', 'qnnpack'):
+        if engine in engines:
+            return engine
+    raise RuntimeError("No quantized engine available in this PyTorch build")
+
+
+def calibrate(prepared_backbone, calibration_tensors, batch_size=8):
+    """
+    Feed representative inputs through a prepared (observed) backbone.
+
+    Args:
+        prepared_backbone: Module returned by prepare_fx()
+        calibration_tensors: Tensor (N, 3, H, W) or list of such tensors
+        batch_size: Images per calibration forward pass
+    """
+    if isinstance(calibration_tensors, torch.Tensor):
+        calibration_tensors = [calibration_tensors]
+
+    prepared_backbone.eval()
+    with torch.no_grad():
+        for tensor in calibration_tensors:
+            for start in range(0, tensor.shape[0], batch_size):
+                prepared_backbone(tensor[start:start + batch_size])
+
+
+def apply_precision(model, precision='fp32', calibration_tensors=None, device='cpu'):
+    """
+    Convert a DefectDetectionModel / FabricClassificationModel in place.
+
+    Args:
+        model: Model with a .backbone attribute (in eval mode)
+        precision: One of PRECISION_MODES
+        calibration_tensors: Preprocessed frames (N, 3, 224, 224), required
+                             for int8_static
+        device: torch.device or str the model runs on
+
+    Returns:
+        The same model, with its backbone replaced as needed
+
+    Raises:
+        ValueError: Unknown precision, int8_static without calibration data,
+                    or int8 on an already exported TorchScript backbone
+        RuntimeError: Quantization requested on a non-CPU device
+    """
+    if precision not in PRECISION_MODES:
+        raise ValueError(f"Unknown precision '{precision}' (expected one of {PRECISION_MODES})")
+
+    device_type = torch.device(device).type
+    model.eval()
+
+    if precision == 'fp32':
+        return model
+
+    if precision == 'bf16':
+        model.backbone = AutocastBackbone(model.backbone, torch.bfloat16, device_type)
+        model.precision = precision
+        return model
+
+    # Quantized kernels only exist for CPU
+    if device_type != 'cpu':
+        raise RuntimeError(f"{precision} quantization is only supported on CPU (got {device})")
+
+    # Frozen TorchScript graphs cannot be re-quantized; bake int8 in at export
+    if isinstance(model.backbone, torch.jit.ScriptModule):
+        raise ValueError(
+            f"{precision} cannot be applied to a TorchScript model; "
+            f"export it with 'python -m ml.export --precision {precision}' instead"
+        )
+
+    torch.backends.quantized.engine = _quantization_engine()
+
+    if precision == 'int8_dynamic':
+        model.backbone = torch.ao.quantization.quantize_dynamic(
+            model.backbone, {nn.Linear}, dtype=torch.qint8
+        )
+
+    elif precision == 'int8_static':
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+        if calibration_tensors is None or len(calibration_tensors) == 0:
+            raise ValueError("int8_static precision needs calibration frames")
+
+        example = calibration_tensors
+        if not isinstance(example, torch.Tensor):
+            example = example[0]
+        example_inputs = (example[:1].to('cpu'),)
+
+        qconfig_mapping = get_default_qconfig_mapping(torch.backends.quantized.engine)
+        prepared = prepare_fx(model.backbone, qconfig_mapping, example_inputs)
+        calibrate(prepared, calibration_tensors)
+        model.backbone = convert_fx(prepared)
+
+    model.precision = precision
+    return model
+
+
+def _time_forward_ms(model, tensors, repeats):
+    """Median forward time in milliseconds for one pass over tensors."""
+    samples = []
+    with torch.no_grad():
+        model(tensors)  # warm-up
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model(tensors)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def compare_to_reference(reference_model, candidate_model, tensors, repeats=3):
+    """
+    Measure accuracy delta and speed of a model against its fp32 reference.
+
+    Args:
+        reference_model: fp32 model
+        candidate_model: Reduced-precision copy of the same model
+        tensors: Evaluation batch (N, 3, 224, 224)
+        repeats: Timed repetitions
+
+    Returns:
+        dict with top1_agreement (0-1), max/mean probability delta
+        (percentage points), timings and speedup
+    """
+    with torch.no_grad():
+        ref_probs = torch.softmax(reference_model(tensors).float(), dim=1)
+        cand_probs = torch.softmax(candidate_model(tensors).float(), dim=1)
+
+    prob_delta = (ref_probs - cand_probs).abs() * 100
+    agreement = (ref_probs.argmax(dim=1) == cand_probs.argmax(dim=1)).float().mean()
+
+    reference_ms = _time_forward_ms(reference_model, tensors, repeats)
+    candidate_ms = _time_forward_ms(candidate_model, tensors, repeats)
+
+    return {
+        'top1_agreement': agreement.item(),
+        'max_prob_delta': prob_delta.max().item(),
+        'mean_prob_delta': prob_delta.mean().item(),
+        'reference_ms': reference_ms,
+        'candidate_ms': candidate_ms,
+        'speedup': reference_ms / candidate_ms if candidate_ms > 0 else 0.0,
+    }
+
+
+def build_precision_report(models, tensors, modes=PRECISION_MODES, calibration_tensors=None,
+                           device='cpu', repeats=3):
+    """
+    Compare every precision mode against fp32 for a set of models.
+
+    Args:
+        models: dict name → fp32 model (e.g. {'defect': ..., 'fabric': ...})
+        tensors: Evaluation batch (N, 3, 224, 224)
+        modes: Precision modes to evaluate
+        calibration_tensors: Calibration frames for int8_static
+                             (None = use the evaluation batch)
+        device: torch.device or str
+        repeats: Timed repetitions per measurement
+
+    Returns:
+        dict precision → dict model name → comparison (see compare_to_reference),
+        or {'error': message} if the mode is unavailable
+    """
+    if calibration_tensors is None:
+        calibration_tensors = tensors
+
+    report = {}
+    for precision in modes:
+        report[precision] = {}
+        for name, model in models.items():
+            try:
+                candidate = apply_precision(
+                    copy.deepcopy(model), precision,
+                    calibration_tensors=calibration_tensors, device=device
+                )
+                report[precision][name] = compare_to_reference(model, candidate, tensors, repeats)
+            except Exception as e:
+                report[precision][name] = {'error': str(e)}
+
+    return report
+
+
+def select_fastest_precision(report, max_prob_delta=5.0, min_top1_agreement=0.99):
+    """
+    Pick the fastest precision whose accuracy delta stays within tolerance.
+
+    A mode qualifies only if every model in it meets both limits; its speed
+    is the sum of the models' forward times.
+
+    Args:
+        report: Output of build_precision_report()
+        max_prob_delta: Largest allowed probability change (percentage points)
+        min_top1_agreement: Minimum fraction of unchanged top-1 predictions
+
+    Returns:
+        str: Selected precision ('fp32' if nothing else qualifies)
+    """
+    best, best_ms = 'fp32', None
+
+    for precision, per_model in report.items():
+        if any('error' in r for r in per_model.values()):
+            continue
+        within_tolerance = all(
+            r['max_prob_delta'] <= max_prob_delta and r['top1_agreement'] >= min_top1_agreement
+            for r in per_model.values()
+        )
+        if not within_tolerance:
+            continue
+
+        total_ms = sum(r['candidate_ms'] for r in per_model.values())
+        if best_ms is None or total_ms < best_ms:
+            best, best_ms = precision, total_ms
+
+    return best
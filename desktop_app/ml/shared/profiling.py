@@ -0,0 +1,157 @@
+"""
+Per-stage latency instrumentation.
+
+LatencyRecorder keeps the most recent durations of each named stage in a
+fixed-size ring buffer (monotonic time.perf_counter_ns timestamps) and
+computes rolling p50/p95/p99 on demand. Recording is one integer store
+under a lock, so it is cheap enough to leave on in production.
+
+Stages used by the application:
+    capture, color_conversion, ui_emit          (CameraManager)
+    preprocess, texture_features,
+    defect_forward, defect_postprocess,
+    fabric_forward, fabric_postprocess, total   (TextileInspectionPipeline)
+    anomaly_embed, anomaly_knn                  (AnomalyDetector, anomaly mode)
+    pool_wait                                   (ParallelInspectionPipeline)
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyRecorder:
+    """
+    Rolling per-stage latency histograms.
+    """
+
+    def __init__(self, window=1024, enabled=True):
+        """
+        Initialize recorder.
+
+        Args:
+            window: Number of most recent samples kept per stage
+            enabled: If False, record() and measure() do nothing
+        """
+        self.window = window
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._samples = {}   # stage → int64 ring buffer (ns)
+        self._counts = {}    # stage → total samples recorded
+        self._unmerged = {}  # stage → merged samples older than their window
+
+    def record(self, stage, duration_ns):
+        """
+        Record one duration.
+
+        Args:
+            stage: Stage name
+            duration_ns: Duration in nanoseconds
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = np.zeros(self.window, dtype=np.int64)
+                self._samples[stage] = samples
+                self._counts[stage] = 0
+
+            count = self._counts[stage]
+            samples[count % self.window] = duration_ns
+            self._counts[stage] = count + 1
+
+    @contextmanager
+    def measure(self, stage):
+        """
+        Time a block of code.
+
+        Usage:
+            with recorder.measure('preprocess'):
+                ...
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter_ns() - start)
+
+    def snapshot(self):
+        """
+        Copy of the recorded samples, e.g. to send to another process.
+
+        Returns:
+            dict stage → (count, int64 array of the last `window` durations in ns)
+        """
+        with self._lock:
+            return {
+                stage: (self._counts[stage] + self._unmerged.get(stage, 0),
+                        samples[:min(self._counts[stage], self.window)].copy())
+                for stage, samples in self._samples.items()
+            }
+
+    def merge(self, snapshot):
+        """
+        Add the samples of another recorder (see snapshot()).
+
+        Args:
+            snapshot: dict from LatencyRecorder.snapshot()
+        """
+        for stage, (count, samples) in snapshot.items():
+            for duration_ns in samples:
+                self.record(stage, int(duration_ns))
+            with self._lock:
+                self._unmerged[stage] = self._unmerged.get(stage, 0) + count - len(samples)
+
+    def get_stats(self):
+        """
+        Get rolling latency percentiles per stage.
+
+        Returns:
+            dict stage → dict with count (total recorded), p50_ms, p95_ms,
+            p99_ms, mean_ms and max_ms over the last `window` samples
+        """
+        stats = {}
+        for stage, (count, samples) in self.snapshot().items():
+            if len(samples) == 0:
+                continue
+            ms = samples / 1e6
+            p50, p95, p99 = np.percentile(ms, PERCENTILES)
+            stats[stage] = {
+                'count': count,
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+                'mean_ms': float(ms.mean()),
+                'max_ms': float(ms.max()),
+            }
+
+        return stats
+
+    def reset(self):
+        """Forget all samples."""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._unmerged.clear()
+
+
+def measure(recorder, stage):
+    """
+    Time a block with an optional recorder.
+
+    Args:
+        recorder: LatencyRecorder or None
+        stage: Stage name
+
+    Returns:
+        Context manager (no-op if recorder is None)
+    """
+    if recorder is None:
+        return nullcontext()
+    return recorder.measure(stage)
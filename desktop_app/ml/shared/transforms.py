@@ -3,10 +3,15 @@ Image preprocessing transforms for textile inspection.
 Standard transforms compatible with PyTorch pretrained models.
 """
 
+import threading
 import torch
 from torchvision import transforms
 import numpy as np
 
+# ImageNet normalization (standard for pretrained models)
+IMAGENET_MEAN = [0.485, 0.456, 0.406]
+IMAGENET_STD = [0.229, 0.224, 0.225]
+
 
 def get_transform(input_size=224, normalize=True):
     """
@@ -28,14 +33,113 @@ def get_transform(input_size=224, normalize=True):
         # ImageNet normalization (standard for pretrained models)
         transform_list.append(
             transforms.Normalize(
-                mean=[0.485, 0.456, 0.406],
-                std=[0.229, 0.224, 0.225]
+                mean=IMAGENET_MEAN,
+                std=IMAGENET_STD
             )
         )
 
     return transforms.Compose(transform_list)
 
 
+class OpenCVTransform:
+    """
+    PIL-free equivalent of get_transform() for BGR frames from cv2.VideoCapture.
+
+    Resizes with cv2.resize and performs the BGR→RGB swap, HWC→CHW layout
+    change, uint8→float conversion and ImageNet normalization as a single
+    vectorized multiply-add, writing straight into a caller-provided tensor
+    (e.g. one row of a preallocated batch).
+    """
+
+    # load_image_tensor() passes the raw BGR array instead of a PIL image
+    accepts_bgr = True
+
+    def __init__(self, input_size=224, normalize=True):
+        """
+        Initialize transform.
+
+        Args:
+            input_size: Target image size (default 224 for most pretrained models)
+            normalize: Whether to apply ImageNet normalization
+        """
+        self.input_size = input_size
+        self.normalize = normalize
+
+        # Per-channel scale/offset in RGB order: (x / 255 - mean) / std
+        if normalize:
+            mean = np.array(IMAGENET_MEAN, dtype=np.float32)
+            std = np.array(IMAGENET_STD, dtype=np.float32)
+        else:
+            mean = np.zeros(3, dtype=np.float32)
+            std = np.ones(3, dtype=np.float32)
+        self._scale = (1.0 / (255.0 * std)).reshape(3, 1, 1)
+        self._offset = (-mean / std).reshape(3, 1, 1)
+
+        # Per-thread resize scratch buffer (inference workers share transforms)
+        self._local = threading.local()
+
+    def _resize(self, cv_image):
+        """Resize into a reused uint8 buffer, matching PIL's antialiased resize."""
+        import cv2
+
+        size = self.input_size
+        buffer = getattr(self._local, 'resized', None)
+        if buffer is None:
+            buffer = np.empty((size, size, 3), dtype=np.uint8)
+            self._local.resized = buffer
+
+        h, w = cv_image.shape[:2]
+        # INTER_AREA approximates PIL's antialiasing filter when shrinking
+        interpolation = cv2.INTER_AREA if (h > size and w > size) else cv2.INTER_LINEAR
+        cv2.resize(cv_image, (size, size), dst=buffer, interpolation=interpolation)
+        return buffer
+
+    def __call__(self, cv_image, out=None):
+        """
+        Transform an OpenCV image into a normalized CHW float tensor.
+
+        Args:
+            cv_image: OpenCV image (BGR uint8 numpy array)
+            out: Optional preallocated float32 tensor (3, H, W) to write into
+
+        Returns:
+            torch.Tensor: (3, input_size, input_size) RGB tensor
+        """
+        if cv_image.ndim == 2:
+            import cv2
+            cv_image = cv2.cvtColor(cv_image, cv2.COLOR_GRAY2BGR)
+
+        resized = self._resize(cv_image)
+
+        if out is None:
+            out = torch.empty((3, self.input_size, self.input_size), dtype=torch.float32)
+        out_np = out.numpy()
+
+        # BGR HWC → RGB CHW view (no copy), then one fused scale + offset pass
+        rgb_chw = resized.transpose(2, 0, 1)[::-1]
+        np.multiply(rgb_chw, self._scale, out=out_np)
+        np.add(out_np, self._offset, out=out_np)
+
+        return out
+
+
+def get_opencv_transform(input_size=224, normalize=True):
+    """
+    Get PIL-free transform that works directly on OpenCV BGR frames.
+
+    Produces outputs numerically equivalent to get_transform() (within
+    resampling differences of about one intensity level).
+
+    Args:
+        input_size: Target image size (default 224 for most pretrained models)
+        normalize: Whether to apply ImageNet normalization
+
+    Returns:
+        OpenCVTransform instance
+    """
+    return OpenCVTransform(input_size=input_size, normalize=normalize)
+
+
 def get_augmentation_transform(input_size=224):
     """
     Get augmentation transform for training (future use).
@@ -53,8 +157,8 @@ def get_augmentation_transform(input_size=224):
         transforms.ColorJitter(brightness=0.2, contrast=0.2, saturation=0.2),
         transforms.ToTensor(),
         transforms.Normalize(
-            mean=[0.485, 0.456, 0.406],
-            std=[0.229, 0.224, 0.225]
+            mean=IMAGENET_MEAN,
+            std=IMAGENET_STD
         )
     ])
 
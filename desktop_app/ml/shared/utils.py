@@ -11,13 +11,17 @@ def load_image_tensor(cv_image, transform):
 
     Args:
         cv_image: OpenCV image (BGR numpy array)
-        transform: torchvision transform to apply
+        transform: torchvision transform or OpenCVTransform to apply
 
     Returns:
         torch.Tensor: Image tensor ready for model input
     """
     from .transforms import opencv_to_pil
 
+    # OpenCV transforms consume the BGR frame directly (no PIL round-trip)
+    if getattr(transform, 'accepts_bgr', False):
+        return transform(cv_image).unsqueeze(0)
+
     # Convert to PIL
     pil_image = opencv_to_pil(cv_image)
 
@@ -30,6 +34,30 @@ def load_image_tensor(cv_image, transform):
     return tensor
 
 
+def load_image_batch(cv_images, transform):
+    """
+    Convert a list of OpenCV images into one stacked batch tensor.
+
+    With an OpenCVTransform every frame is written straight into a single
+    preallocated (B, 3, H, W) tensor; other transforms fall back to stacking.
+
+    Args:
+        cv_images: List of OpenCV images (BGR numpy arrays)
+        transform: torchvision transform or OpenCVTransform to apply
+
+    Returns:
+        torch.Tensor: Batch tensor ready for model input
+    """
+    if getattr(transform, 'accepts_bgr', False):
+        size = transform.input_size
+        batch = torch.empty((len(cv_images), 3, size, size), dtype=torch.float32)
+        for i, cv_image in enumerate(cv_images):
+            transform(cv_image, out=batch[i])
+        return batch
+
+    return torch.cat([load_image_tensor(img, transform) for img in cv_images], dim=0)
+
+
 def tensor_to_numpy(tensor):
     """
     Convert PyTorch tensor to numpy array.
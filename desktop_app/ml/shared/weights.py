@@ -0,0 +1,331 @@
+"""
+Project-managed model weights.
+
+Plant PCs have no internet access, so nothing may depend on torchvision
+downloading ImageNet weights into the torch hub cache at start-up. All
+checkpoints live in one weights directory (desktop_app/models/weights by
+default, OTI_WEIGHTS_DIR to override) next to a manifest.json that records
+the sha256 of every file; files are verified against it before loading.
+
+Offline mode (OTI_OFFLINE=1, or offline=True) never touches the network:
+a missing or corrupt checkpoint raises WeightsError immediately instead of
+hanging on a download. Online, missing pretrained weights are copied from
+the torch hub cache or downloaded once and recorded in the manifest.
+
+state_dicts are loaded with torch.load(mmap=True) and assigned directly to
+a model built on the meta device, so parameters stay backed by the page
+cache of the checkpoint file: no random initialization, no second copy of
+the weights, and processes loading the same checkpoint share its pages.
+
+Usage (from desktop_app/, on a machine with internet access):
+    python -m ml.shared.weights fetch           # pretrained backbones
+    python -m ml.shared.weights add defect.pth  # custom checkpoint
+    python -m ml.shared.weights verify
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+import torch
+
+DEFAULT_WEIGHTS_DIR = Path(__file__).resolve().parent.parent.parent / "models" / "weights"
+MANIFEST_NAME = "manifest.json"
+
+# Pretrained backbones: name → torchvision weights enum
+PRETRAINED_WEIGHTS = {
+    'efficientnet_b0': 'EfficientNet_B0_Weights.IMAGENET1K_V1',
+    'resnet18': 'ResNet18_Weights.IMAGENET1K_V1',
+}
+
+# torchvision file names end in the first hex digits of their sha256
+_HASH_PREFIX = re.compile(r'-([a-f0-9]{6,})\.')
+
+
+class WeightsError(RuntimeError):
+    """A checkpoint is missing, corrupt or cannot be fetched."""
+
+
+def is_offline():
+    """True if OTI_OFFLINE is set (to anything but 0)."""
+    return os.environ.get("OTI_OFFLINE", "") not in ("", "0")
+
+
+def get_weights_dir(weights_dir=None):
+    """
+    Resolve the weights directory.
+
+    Args:
+        weights_dir: Explicit directory (None = OTI_WEIGHTS_DIR or the default)
+
+    Returns:
+        Path
+    """
+    if weights_dir is None:
+        weights_dir = os.environ.get("OTI_WEIGHTS_DIR") or DEFAULT_WEIGHTS_DIR
+    return Path(weights_dir)
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    """
+    Content hash of a file.
+
+    Args:
+        path: File path
+        chunk_size: Read size in bytes
+
+    Returns:
+        str: Hex sha256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(weights_dir=None):
+    """
+    Load the manifest of a weights directory.
+
+    Returns:
+        dict file name → {'sha256': ..., 'source': ...}
+    """
+    path = get_weights_dir(weights_dir) / MANIFEST_NAME
+    if not path.is_file():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest, weights_dir):
+    path = get_weights_dir(weights_dir) / MANIFEST_NAME
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def register_weights(path, weights_dir=None, source=None):
+    """
+    Copy a checkpoint into the weights directory and record its hash.
+
+    Args:
+        path: Checkpoint file
+        weights_dir: Target weights directory
+        source: Where the file came from (URL or original path)
+
+    Returns:
+        Path of the registered file
+    """
+    weights_dir = get_weights_dir(weights_dir)
+    weights_dir.mkdir(parents=True, exist_ok=True)
+    path = Path(path)
+    target = weights_dir / path.name
+    if path.resolve() != target.resolve():
+        shutil.copyfile(path, target)
+
+    manifest = read_manifest(weights_dir)
+    manifest[target.name] = {'sha256': sha256_file(target), 'source': source or str(path)}
+    _write_manifest(manifest, weights_dir)
+    return target
+
+
+def verify_weights(path, expected_sha256=None, weights_dir=None):
+    """
+    Check a checkpoint against its recorded hash.
+
+    Args:
+        path: Checkpoint file
+        expected_sha256: Hash to compare with (None = look the file up in
+                         the manifest of weights_dir / its own directory)
+        weights_dir: Weights directory whose manifest to use
+
+    Returns:
+        bool: True if verified, False if no hash is known for the file
+
+    Raises:
+        WeightsError: If the file does not match its hash
+    """
+    path = Path(path)
+    if expected_sha256 is None:
+        manifest_dir = weights_dir if weights_dir is not None else path.parent
+        entry = read_manifest(manifest_dir).get(path.name)
+        if entry is None:
+            return False
+        expected_sha256 = entry['sha256']
+
+    actual = sha256_file(path)
+    if actual != expected_sha256:
+        raise WeightsError(
+            f"Checksum mismatch for {path}: expected {expected_sha256[:12]}…, got {actual[:12]}… "
+            f"(file corrupt or replaced; re-register it with 'python -m ml.shared.weights add')"
+        )
+    return True
+
+
+def resolve_pretrained_weights(name, weights_dir=None, offline=None):
+    """
+    Local, verified checkpoint of a pretrained torchvision backbone.
+
+    Looks in the weights directory first, then the torch hub cache, and
+    downloads only if neither has it and offline mode is off.
+
+    Args:
+        name: Key of PRETRAINED_WEIGHTS (e.g. 'efficientnet_b0')
+        weights_dir: Weights directory
+        offline: Never download (None = OTI_OFFLINE)
+
+    Returns:
+        Path of the checkpoint
+
+    Raises:
+        WeightsError: Missing in offline mode, corrupt, or download failed
+    """
+    from torchvision.models import get_weight
+
+    if offline is None:
+        offline = is_offline()
+    weights_dir = get_weights_dir(weights_dir)
+
+    url = get_weight(PRETRAINED_WEIGHTS[name]).url
+    filename = url.rsplit('/', 1)[-1]
+    target = weights_dir / filename
+
+    if target.is_file():
+        if not verify_weights(target, weights_dir=weights_dir):
+            _check_hash_prefix(target)
+            register_weights(target, weights_dir, source=url)
+        return target
+
+    cached = Path(torch.hub.get_dir()) / "checkpoints" / filename
+    if cached.is_file():
+        _check_hash_prefix(cached)
+        return register_weights(cached, weights_dir, source=url)
+
+    if offline:
+        raise WeightsError(
+            f"Pretrained weights '{filename}' not found in {weights_dir} (offline mode). "
+            f"Run 'python -m ml.shared.weights fetch' on a machine with internet access "
+            f"and copy the weights directory to this PC."
+        )
+
+    weights_dir.mkdir(parents=True, exist_ok=True)
+    match = _HASH_PREFIX.search(filename)
+    try:
+        torch.hub.download_url_to_file(url, str(target), hash_prefix=match.group(1) if match else None)
+    except Exception as e:
+        raise WeightsError(f"Could not download {url}: {e}") from e
+    return register_weights(target, weights_dir, source=url)
+
+
+def _check_hash_prefix(path):
+    """Verify a torchvision checkpoint against the hash in its file name."""
+    match = _HASH_PREFIX.search(Path(path).name)
+    if match and not sha256_file(path).startswith(match.group(1)):
+        raise WeightsError(f"Checksum mismatch for {path} (does not match its file name)")
+
+
+def load_state_dict_file(path, verify=True):
+    """
+    Memory-map a state_dict checkpoint (torch.load(mmap=True), torch 2.1+).
+
+    Args:
+        path: Checkpoint written by torch.save(state_dict)
+        verify: Check the file against its manifest entry, if it has one
+
+    Returns:
+        dict of CPU tensors backed by the file (copied into memory only
+        for legacy, non-zip checkpoints)
+
+    Raises:
+        WeightsError: If verification fails
+    """
+    if verify:
+        verify_weights(path)
+    try:
+        return torch.load(path, map_location='cpu', mmap=True, weights_only=True)
+    except RuntimeError as e:
+        if 'mmap' not in str(e):
+            raise
+        # Pre-1.6 serialization format cannot be memory-mapped
+        return torch.load(path, map_location='cpu', weights_only=True)
+
+
+def instantiate_with_state_dict(factory, state_dict):
+    """
+    Build a module without initializing its weights and adopt a state_dict.
+
+    The module is created on the meta device, then the state_dict tensors
+    are assigned as its parameters and buffers (no copy; load_state_dict
+    assign=True needs torch 2.1+).
+
+    Args:
+        factory: Callable returning the module
+        state_dict: Complete state_dict for that module
+
+    Returns:
+        nn.Module on the state_dict's device
+    """
+    with torch.device('meta'):
+        module = factory()
+    module.load_state_dict(state_dict, assign=True)
+    return module
+
+
+def load_pretrained_backbone(builder, name, weights_dir=None, offline=None):
+    """
+    torchvision backbone with pretrained weights from the weights directory.
+
+    Replaces builder(weights=...), which downloads into the torch hub cache.
+
+    Args:
+        builder: torchvision model function (e.g. models.resnet18)
+        name: Key of PRETRAINED_WEIGHTS
+        weights_dir: Weights directory
+        offline: Never download (None = OTI_OFFLINE)
+
+    Returns:
+        nn.Module
+    """
+    path = resolve_pretrained_weights(name, weights_dir, offline)
+    state_dict = load_state_dict_file(path, verify=False)  # verified by resolve
+    return instantiate_with_state_dict(lambda: builder(weights=None), state_dict)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open Textile Intelligence - model weights")
+    parser.add_argument("--weights-dir", type=str, help=f"Weights directory (default: {DEFAULT_WEIGHTS_DIR})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("fetch", help="Download/copy the pretrained backbones into the weights directory")
+    add_parser = subparsers.add_parser("add", help="Register a custom checkpoint")
+    add_parser.add_argument("paths", nargs="+")
+    subparsers.add_parser("verify", help="Check every file against the manifest")
+    args = parser.parse_args()
+
+    weights_dir = get_weights_dir(args.weights_dir)
+
+    if args.command == "fetch":
+        for name in PRETRAINED_WEIGHTS:
+            print(f"✅ {name}: {resolve_pretrained_weights(name, weights_dir, offline=False)}")
+    elif args.command == "add":
+        for path in args.paths:
+            print(f"✅ Registered {register_weights(path, weights_dir)}")
+    else:
+        failed = 0
+        for filename in sorted(read_manifest(weights_dir)):
+            try:
+                verify_weights(weights_dir / filename, weights_dir=weights_dir)
+                print(f"✅ {filename}")
+            except (WeightsError, OSError) as e:
+                failed += 1
+                print(f"❌ {filename}: {e}")
+        raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
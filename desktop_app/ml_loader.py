@@ -0,0 +1,116 @@
+"""
+Background ML pipeline loader for Open Textile Intelligence.
+
+Importing torch/torchvision and building both models takes seconds. Doing
+it in the MainWindow constructor froze the window before its first paint,
+even for operators who only run simulation mode. MLPipelineLoader does the
+imports and model construction in a worker thread and reports progress, so
+the window is interactive immediately and the pipeline is either preloaded
+after the first paint or loaded the first time camera mode needs it.
+
+Nothing in this module imports torch at import time.
+"""
+
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+
+class MLPipelineLoader(QThread):
+    """
+    Imports the ML stack and creates the TextileInspectionPipeline off the UI thread.
+    """
+
+    # Signals
+    progress = Signal(int, str)     # Percentage (0-100), stage description
+    loaded = Signal(object, float)  # Pipeline, total load time in seconds
+    failed = Signal(str, str)       # "import" or "error", detail (missing module / message)
+
+    def __init__(self, defect_weights=None, fabric_weights=None, device=None, confidence_threshold=0.6,
+                 roll_context=None):
+        """
+        Initialize loader.
+
+        Args:
+            defect_weights: Path to defect detection weights (None together
+                            with fabric_weights = exported models if present,
+                            else pretrained)
+            fabric_weights: Path to fabric classification weights
+            device: torch.device or str (None = auto-detect)
+            confidence_threshold: Defect detection threshold
+            roll_context: Per-roll fabric type lock settings (see create_ml_pipeline)
+        """
+        super().__init__()
+        self.defect_weights = defect_weights
+        self.fabric_weights = fabric_weights
+        self.device = device
+        self.confidence_threshold = confidence_threshold
+        self.roll_context = roll_context
+
+        self.pipeline = None
+        self.load_seconds = None
+        self.stage_seconds = {}  # stage → seconds, for the cold-start report
+
+    def run(self):
+        """Load the pipeline and emit loaded or failed."""
+        start = time.perf_counter()
+        self.stage_seconds = {}
+        try:
+            self._stage(5, "PyTorch yükleniyor", 'import_torch', self._import_torch)
+            self._stage(35, "ML modülleri yükleniyor", 'import_ml', self._import_ml)
+            weights = self._stage(45, "Model dosyaları aranıyor", 'find_weights', self._find_weights)
+            self.pipeline = self._stage(50, "Modeller yükleniyor", 'create_pipeline', self._create_pipeline, weights)
+        except ImportError as e:
+            missing_module = e.name or (str(e).split("'")[1] if "'" in str(e) else "PyTorch")
+            print(f"❌ ML Import Error: {e}")
+            self.failed.emit("import", missing_module)
+            return
+        except Exception as e:
+            print(f"❌ ML Pipeline Error: {e}")
+            self.failed.emit("error", str(e))
+            return
+
+        self.load_seconds = time.perf_counter() - start
+        print(f"⏱️  ML pipeline loaded in {self.load_seconds:.2f}s " + ", ".join(
+            f"{stage}={seconds:.2f}s" for stage, seconds in self.stage_seconds.items()
+        ))
+        self.progress.emit(100, "ML sistemi hazır")
+        self.loaded.emit(self.pipeline, self.load_seconds)
+
+    def _stage(self, percent, description, name, func, *args):
+        """Report progress, run one loading stage and time it."""
+        self.progress.emit(percent, description)
+        stage_start = time.perf_counter()
+        result = func(*args)
+        self.stage_seconds[name] = time.perf_counter() - stage_start
+        return result
+
+    @staticmethod
+    def _import_torch():
+        import torch  # noqa: F401 - the slow part of the cold start
+        import torchvision  # noqa: F401
+
+    @staticmethod
+    def _import_ml():
+        import ml.pipeline  # noqa: F401
+        import ml.export  # noqa: F401
+
+    def _find_weights(self):
+        if self.defect_weights is not None or self.fabric_weights is not None:
+            return self.defect_weights, self.fabric_weights
+
+        # Prefer frozen TorchScript artifacts (python -m ml.export) if present
+        from ml.export import find_exported_models
+        return find_exported_models()
+
+    def _create_pipeline(self, weights):
+        from ml.pipeline import create_ml_pipeline
+
+        defect_weights, fabric_weights = weights
+        return create_ml_pipeline(
+            defect_weights=defect_weights,  # None = use pretrained ImageNet (PHASE 1)
+            fabric_weights=fabric_weights,  # None = use pretrained ImageNet (PHASE 1)
+            device=self.device,             # None = auto-detect (CUDA if available)
+            confidence_threshold=self.confidence_threshold,
+            roll_context=self.roll_context
+        )
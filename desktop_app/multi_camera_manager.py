@@ -0,0 +1,339 @@
+"""
+Multi-camera manager for Open Textile Intelligence.
+
+Looms carry two to four cameras across the fabric width. Each camera
+captures in its own thread into its own queue; a single InferenceScheduler
+batches frames from all queues through ONE TextileInspectionPipeline and
+routes the results back per camera. The models are loaded once for the
+whole loom.
+
+Exposes the same signals as CameraManager, so the main window can drive
+either one. Detections are merged per camera by a DefectTracker; events
+carry camera_id and frame ids of the form "CAM2-00042".
+"""
+
+import threading
+import time
+
+from PySide6.QtCore import QThread, Signal
+from PySide6.QtGui import QImage
+
+from camera_manager import build_detection_record, build_error_record
+from constants import YARDS_PER_FRAME, DropPolicy, FRAME_QUEUE_SIZE, UI_REFRESH_HZ
+from defect_tracker import DefectTracker
+from frame_sources import FrameSourceError
+from inference_scheduler import InferenceScheduler
+from preview import PreviewRenderer
+
+# How often progress, statistics and FPS are published (seconds)
+STATS_INTERVAL = 0.1
+
+
+class MultiCameraManager(QThread):
+    """
+    Captures from several frame sources and shares one inference pipeline.
+    """
+
+    # Signals (same as CameraManager)
+    frame_captured = Signal(QImage)  # Preview of the selected camera
+    frame_analyzed = Signal(dict)    # Consolidated defect events (with camera_id)
+    fps_updated = Signal(float)      # Total capture frame rate
+    queue_stats_updated = Signal(dict)  # Aggregate + per-camera queue counters
+    camera_error = Signal(str)       # Error messages
+    scanning_progress = Signal(int)  # Progress percentage (0-100)
+    scan_complete = Signal()         # Scan finished
+    camera_opened = Signal(bool)     # All cameras opened successfully
+    stats_update = Signal(dict)      # Real-time statistics (matches simulation)
+
+    def __init__(
+        self,
+        frame_sources,
+        duration_seconds=10,
+        ml_pipeline=None,
+        batch_size=None,
+        queue_size=FRAME_QUEUE_SIZE,
+        drop_policy=DropPolicy.DROP_OLDEST,
+        preview_size=None,
+        preview_fps=UI_REFRESH_HZ,
+        preview_camera=0,
+        defect_tracker=None,
+        detection_store=None
+    ):
+        """
+        Initialize multi-camera manager.
+
+        Args:
+            frame_sources: List of FrameSource, one per camera (camera id =
+                           position in the list)
+            duration_seconds: Scan duration
+            ml_pipeline: Shared TextileInspectionPipeline (None = ML disabled)
+            batch_size: Frames per inference batch (None = 2 per camera)
+            queue_size: Capacity of each camera's frame buffer
+            drop_policy: DropPolicy of each camera's frame buffer
+            preview_size: (width, height) of the preview widget
+            preview_fps: Maximum preview frames rendered per second
+            preview_camera: Camera shown in the preview
+            defect_tracker: DefectTracker shared by all cameras (tracks are
+                            kept per camera; None = default tracker)
+            detection_store: Optional DetectionHistory that persists every
+                             defect event
+        """
+        super().__init__()
+        if not frame_sources:
+            raise ValueError("At least one frame source is required")
+
+        self.frame_sources = list(frame_sources)
+        self.num_cameras = len(self.frame_sources)
+        self.duration_seconds = duration_seconds
+        self.is_running = False
+
+        self._stats_lock = threading.Lock()
+        self.frame_counts = [0] * self.num_cameras      # Frames captured per camera
+        self.analyzed_counts = [0] * self.num_cameras   # Frames processed by ML
+        self.clean_counts = [0] * self.num_cameras      # Frames without defects
+
+        # ML Pipeline (one instance for all cameras)
+        self.ml_pipeline = ml_pipeline
+        self.ml_enabled = ml_pipeline is not None
+        self.scheduler = InferenceScheduler(
+            ml_pipeline,
+            self._handle_result,
+            batch_size=batch_size or 2 * self.num_cameras,
+            queue_size=queue_size,
+            drop_policy=drop_policy
+        )
+        for camera_id in range(self.num_cameras):
+            self.scheduler.add_camera(camera_id)
+
+        # One event per physical defect instead of one per defective frame
+        self.defect_tracker = defect_tracker or DefectTracker()
+        self.detection_store = detection_store
+
+        # Preview rendering (scaled and converted off the UI thread)
+        preview_size = preview_size or (None, None)
+        self.preview = PreviewRenderer(*preview_size, max_fps=preview_fps)
+        self.preview_camera = preview_camera
+
+        self._stop = threading.Event()
+        self._capture_threads = []
+
+        if not self.ml_enabled:
+            print("⚠️  Multi-camera manager initialized WITHOUT ML pipeline")
+            print("   Defect detection will be disabled")
+
+    def run(self):
+        """Open all cameras, capture until the scan ends, then drain inference."""
+        opened = []
+        for source in self.frame_sources:
+            try:
+                source.open()
+                opened.append(source)
+            except FrameSourceError as e:
+                for other in opened:
+                    other.close()
+                self.camera_error.emit(f"{source.describe()}:\n{e}")
+                self.camera_opened.emit(False)
+                return
+
+        self.camera_opened.emit(True)
+        self.is_running = True
+        self._stop.clear()
+
+        if self.ml_enabled:
+            self.scheduler.start()
+
+        self._capture_threads = [
+            threading.Thread(target=self._capture_loop, args=(camera_id,),
+                             name=f"capture-{camera_id}", daemon=True)
+            for camera_id in range(self.num_cameras)
+        ]
+        for thread in self._capture_threads:
+            thread.start()
+
+        start_time = time.time()
+        fps_start = start_time
+        fps_frames = 0
+
+        while self.is_running and (time.time() - start_time) < self.duration_seconds:
+            if not any(thread.is_alive() for thread in self._capture_threads):
+                # Every (finite) source is exhausted
+                break
+
+            time.sleep(STATS_INTERVAL)
+
+            elapsed_time = time.time() - start_time
+            self.scanning_progress.emit(min(int((elapsed_time / self.duration_seconds) * 100), 100))
+            self.stats_update.emit(self._build_stats())
+
+            if time.time() - fps_start >= 1.0:
+                total = sum(self.frame_counts)
+                self.fps_updated.emit((total - fps_frames) / (time.time() - fps_start))
+                self.queue_stats_updated.emit(self.get_queue_stats())
+                fps_frames = total
+                fps_start = time.time()
+
+        # Cleanup: stop capture, let the scheduler finish queued frames
+        self._stop.set()
+        for thread in self._capture_threads:
+            thread.join()
+        self.scheduler.stop()
+
+        # Defects still in view at the end of the scan
+        self._publish_events(self.defect_tracker.flush())
+
+        self.stats_update.emit(self._build_stats())
+        self.queue_stats_updated.emit(self.get_queue_stats())
+        self.scanning_progress.emit(100)
+        self.release_camera()
+        self.scan_complete.emit()
+
+    def _capture_loop(self, camera_id):
+        """
+        Capture frames from one camera into its queue (capture thread).
+
+        Args:
+            camera_id: Index into frame_sources
+        """
+        source = self.frame_sources[camera_id]
+        frame_interval = 1.0 / source.target_fps if source.target_fps else 0.0
+
+        while not self._stop.is_set():
+            loop_start = time.time()
+            try:
+                frame = source.read()
+            except Exception as e:
+                # Decode/driver error: stop this camera, the others keep running
+                print(f"❌ Capture error on {source.describe()}: {e}")
+                self.camera_error.emit(f"Kare okunamadı - {source.describe()}:\n{e}")
+                break
+            if frame is None:
+                if source.is_live:
+                    self.camera_error.emit(f"Kare okunamadı - {source.describe()} bağlantısı koptu")
+                break
+
+            with self._stats_lock:
+                self.frame_counts[camera_id] += 1
+                frame_number = self.frame_counts[camera_id]
+
+            if camera_id == self.preview_camera and self.preview.due(loop_start):
+                self.frame_captured.emit(self.preview.render(frame))
+
+            if self.ml_enabled:
+                self.scheduler.submit(camera_id, (frame_number, frame))
+
+            # Pace capture to the source's target FPS
+            remaining = frame_interval - (time.time() - loop_start)
+            if remaining > 0:
+                self._stop.wait(remaining)
+
+    def _handle_result(self, camera_id, packet, ml_result):
+        """
+        Route one inspection result back to its camera (scheduler thread).
+
+        Args:
+            camera_id: Camera that captured the frame
+            packet: (frame_number, frame) tuple
+            ml_result: Pipeline result dict, or the exception if ML failed
+        """
+        frame_number, frame = packet
+        frame_id = f"CAM{camera_id + 1}-{frame_number:05d}"
+
+        if isinstance(ml_result, Exception):
+            record = build_error_record(ml_result, frame_id)
+        else:
+            record = build_detection_record(ml_result, frame_id, frame.shape)
+        record["camera_id"] = camera_id
+
+        with self._stats_lock:
+            self.analyzed_counts[camera_id] += 1
+            if not record["is_defective"]:
+                self.clean_counts[camera_id] += 1
+
+        detections = [record] if record["is_defective"] else []
+        self._publish_events(self.defect_tracker.update(frame_number, detections, camera_id))
+
+    def _publish_events(self, events):
+        """Persist consolidated defect events and send them to the UI."""
+        for event in events:
+            if self.detection_store is not None:
+                self.detection_store.append(event)
+            self.frame_analyzed.emit(event)
+
+    def _build_stats(self):
+        """
+        Build statistics dict for stats_update.
+
+        Cameras cover the fabric width side by side, so scanned length is
+        the average number of frames per camera.
+
+        Returns:
+            dict with scanned_yards, defects_found, efficiency
+        """
+        with self._stats_lock:
+            captured = sum(self.frame_counts)
+            analyzed = sum(self.analyzed_counts)
+            clean = sum(self.clean_counts)
+
+        scanned_yards = captured / self.num_cameras * YARDS_PER_FRAME
+        efficiency = int((clean / analyzed) * 100) if analyzed > 0 else 100
+
+        return {
+            'scanned_yards': scanned_yards,
+            'defects_found': self.defect_tracker.defect_count,
+            'efficiency': efficiency
+        }
+
+    def get_queue_stats(self):
+        """
+        Get queue statistics.
+
+        Returns:
+            dict with aggregate 'capture' and 'inference' counters (same
+            keys as CameraManager.get_queue_stats()) and per-camera
+            'cameras' counters
+        """
+        scheduler_stats = self.scheduler.get_stats()
+        cameras = scheduler_stats['cameras']
+        with self._stats_lock:
+            frame_counts = list(self.frame_counts)
+            analyzed = sum(self.analyzed_counts)
+
+        for camera_id, count in enumerate(frame_counts):
+            cameras[camera_id]['frames_captured'] = count
+
+        return {
+            'capture': {
+                'frames_captured': sum(frame_counts),
+                'queue_depth': sum(c['depth'] for c in cameras.values()),
+                'queue_capacity': sum(c['capacity'] for c in cameras.values()),
+                'frames_dropped': sum(c['frames_dropped'] for c in cameras.values()),
+                'drop_policy': self.scheduler.drop_policy.name,
+            },
+            'inference': {
+                'workers': 1 if self.ml_enabled else 0,
+                'frames_analyzed': analyzed,
+                'frames_pending': sum(c['depth'] for c in cameras.values()),
+                'batches': scheduler_stats['batches'],
+                'average_batch_size': scheduler_stats['average_batch_size'],
+            },
+            'cameras': cameras,
+        }
+
+    def set_preview_size(self, width, height):
+        """
+        Update the preview widget size (called from the UI thread on resize).
+
+        Args:
+            width, height: Widget size in pixels
+        """
+        self.preview.set_target_size(width, height)
+
+    def stop(self):
+        """Stop capture on all cameras."""
+        self.is_running = False
+        self.wait()
+
+    def release_camera(self):
+        """Release all frame sources."""
+        for source in self.frame_sources:
+            source.close()
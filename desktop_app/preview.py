@@ -0,0 +1,122 @@
+"""
+Preview frame rendering for the camera view.
+
+Runs in the capture thread. Each frame is downscaled to the current size of
+the preview widget (keeping aspect ratio) into a reused scratch buffer, then
+converted BGR→RGBX by cv2.cvtColor straight into the memory of a new QImage.
+The QImage owns that memory, so it is handed to the UI without a deep copy
+and the UI thread only has to blit it - no colour conversion or smooth
+scaling happens on the GUI thread.
+"""
+
+import threading
+
+import cv2
+import numpy as np
+from PySide6.QtGui import QImage
+
+
+def fit_size(frame_width, frame_height, max_width, max_height):
+    """
+    Largest size with the frame's aspect ratio that fits in a box.
+
+    Args:
+        frame_width, frame_height: Source frame size
+        max_width, max_height: Target box size
+
+    Returns:
+        tuple: (width, height), each at least 1
+    """
+    scale = min(max_width / frame_width, max_height / frame_height)
+    return max(1, int(frame_width * scale)), max(1, int(frame_height * scale))
+
+
+class PreviewRenderer:
+    """
+    Converts captured BGR frames into display-sized QImages off the UI thread.
+    """
+
+    def __init__(self, max_width=None, max_height=None, max_fps=None):
+        """
+        Initialize renderer.
+
+        Args:
+            max_width, max_height: Preview widget size (None = native size)
+            max_fps: Render at most this many previews per second (None = every frame)
+        """
+        self._lock = threading.Lock()
+        self._target = None
+        if max_width and max_height:
+            self._target = (int(max_width), int(max_height))
+
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self._last_render = None
+        self._scratch = None
+
+    def set_target_size(self, width, height):
+        """
+        Update the preview widget size (safe to call from the UI thread).
+
+        Args:
+            width, height: Widget size in pixels
+        """
+        with self._lock:
+            self._target = (max(1, int(width)), max(1, int(height)))
+
+    def target_size(self):
+        """Current preview widget size, or None for native size."""
+        with self._lock:
+            return self._target
+
+    def due(self, now):
+        """
+        Whether a new preview should be rendered at time `now`.
+
+        Args:
+            now: time.time() timestamp
+
+        Returns:
+            bool: True if at least min_interval passed since the last render
+        """
+        if self._last_render is not None and now - self._last_render < self.min_interval:
+            return False
+        self._last_render = now
+        return True
+
+    def _resize(self, frame, size):
+        """Downscale into a reused BGR scratch buffer."""
+        width, height = size
+        if self._scratch is None or self._scratch.shape[:2] != (height, width):
+            self._scratch = np.empty((height, width, 3), dtype=np.uint8)
+
+        src_h, src_w = frame.shape[:2]
+        interpolation = cv2.INTER_AREA if width < src_w else cv2.INTER_LINEAR
+        cv2.resize(frame, size, dst=self._scratch, interpolation=interpolation)
+        return self._scratch
+
+    def render(self, frame):
+        """
+        Render a BGR frame into a preview QImage.
+
+        Args:
+            frame: OpenCV frame (BGR numpy array)
+
+        Returns:
+            QImage (Format_RGBX8888) sized to fit the preview widget
+        """
+        src_h, src_w = frame.shape[:2]
+        target = self.target_size()
+        size = fit_size(src_w, src_h, *target) if target else (src_w, src_h)
+
+        if size != (src_w, src_h):
+            frame = self._resize(frame, size)
+
+        # Convert straight into the QImage's own memory (no extra copy)
+        width, height = size
+        image = QImage(width, height, QImage.Format_RGBX8888)
+        pixels = np.frombuffer(image.bits(), dtype=np.uint8).reshape(
+            height, image.bytesPerLine()
+        )[:, :width * 4].reshape(height, width, 4)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=pixels)
+
+        return image
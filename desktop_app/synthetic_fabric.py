@@ -0,0 +1,111 @@
+"""
+Synthetic fabric frame generator.
+
+Produces deterministic (seeded) BGR frames that look like woven or knitted
+fabric, optionally with a defect painted in. Used for offline benchmarks,
+simulated frame sources and tests, so no camera or image dataset is needed.
+"""
+
+import cv2
+import numpy as np
+
+# Weave patterns: (period_x, period_y, base BGR colour)
+FABRIC_PATTERNS = {
+    'pamuk': (6.0, 6.0, (200, 205, 210)),   # Plain cotton weave
+    'denim': (4.0, 9.0, (140, 90, 40)),     # Twill-like diagonal
+    'orme': (8.0, 5.0, (90, 130, 170)),     # Knit loops
+}
+
+DEFECT_TYPES = ('delik', 'leke', 'yirtik', 'iplik_kopmasi')
+
+
+def generate_fabric_frame(width, height, fabric='pamuk', seed=0, defect=None, noise=6.0):
+    """
+    Generate one synthetic fabric frame.
+
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+        fabric: Pattern name from FABRIC_PATTERNS
+        seed: Random seed (same seed → identical frame)
+        defect: None or one of DEFECT_TYPES
+        noise: Standard deviation of sensor noise (grey levels)
+
+    Returns:
+        numpy.ndarray: BGR uint8 frame (height, width, 3)
+    """
+    if fabric not in FABRIC_PATTERNS:
+        raise ValueError(f"Unknown fabric '{fabric}' (expected one of {list(FABRIC_PATTERNS)})")
+
+    period_x, period_y, base_color = FABRIC_PATTERNS[fabric]
+    rng = np.random.default_rng(seed)
+
+    # Weave texture (float32 throughout to keep 4K frames cheap)
+    x = np.arange(width, dtype=np.float32)[None, :]
+    y = np.arange(height, dtype=np.float32)[:, None]
+    phase = rng.uniform(0, 2 * np.pi)
+    if fabric == 'denim':
+        weave = np.sin((x + y) * (2 * np.pi / period_y) + phase) * np.cos(x * (2 * np.pi / period_x))
+    else:
+        weave = np.sin(x * (2 * np.pi / period_x) + phase) * np.cos(y * (2 * np.pi / period_y))
+
+    shade = 1.0 + 0.12 * weave + rng.normal(0, noise / 255.0, (height, width)).astype(np.float32)
+    frame = np.clip(shade[..., None] * np.array(base_color, dtype=np.float32), 0, 255).astype(np.uint8)
+
+    if defect is not None:
+        _paint_defect(frame, defect, rng)
+
+    return frame
+
+
+def _paint_defect(frame, defect, rng):
+    """Draw a defect of the given type at a random position (in place)."""
+    height, width = frame.shape[:2]
+    size = max(4, min(width, height) // 10)
+    cx = int(rng.integers(size, max(size + 1, width - size)))
+    cy = int(rng.integers(size, max(size + 1, height - size)))
+
+    if defect == 'delik':
+        # Hole: dark background showing through
+        cv2.circle(frame, (cx, cy), size // 2, (15, 15, 15), -1)
+    elif defect == 'leke':
+        # Stain: soft-edged discoloured blob
+        mask = np.zeros(frame.shape[:2], dtype=np.float32)
+        cv2.ellipse(mask, (cx, cy), (size, size // 2), float(rng.uniform(0, 180)), 0, 360, 1.0, -1)
+        mask = cv2.GaussianBlur(mask, (0, 0), size / 4)[..., None]
+        stain = np.array((40, 90, 120), dtype=np.float32)
+        frame[:] = (frame * (1 - 0.6 * mask) + stain * 0.6 * mask).astype(np.uint8)
+    elif defect == 'yirtik':
+        # Tear: jagged dark line
+        points = np.array([
+            (cx + int(i * size / 4), cy + int(rng.integers(-size // 6 - 1, size // 6 + 1)))
+            for i in range(-4, 5)
+        ], dtype=np.int32)
+        cv2.polylines(frame, [points], False, (20, 20, 20), max(2, size // 12))
+    elif defect == 'iplik_kopmasi':
+        # Thread break: one missing horizontal thread across the frame
+        frame[cy:cy + max(1, size // 20)] = (frame[cy:cy + max(1, size // 20)] * 0.55).astype(np.uint8)
+    else:
+        raise ValueError(f"Unknown defect '{defect}' (expected one of {DEFECT_TYPES})")
+
+
+def generate_fabric_frames(count, width, height, fabric='pamuk', seed=0, defect_rate=0.0):
+    """
+    Generate a reproducible sequence of frames from one roll.
+
+    Args:
+        count: Number of frames
+        width, height: Frame size
+        fabric: Pattern name from FABRIC_PATTERNS
+        seed: Base random seed
+        defect_rate: Fraction of frames (0-1) with a random defect
+
+    Yields:
+        numpy.ndarray: BGR frames
+    """
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        defect = None
+        if rng.random() < defect_rate:
+            defect = DEFECT_TYPES[int(rng.integers(len(DEFECT_TYPES)))]
+        yield generate_fabric_frame(width, height, fabric, seed=seed * 100003 + i, defect=defect)
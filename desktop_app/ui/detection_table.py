@@ -0,0 +1,289 @@
+"""
+Virtualized detection table for the live detection feed.
+
+DetectionStore keeps detections in capped, column-oriented ring buffers, and
+DetectionTableModel exposes them to a QTableView. The view only asks for the
+cells that are visible, detections are appended in batches (one model update
+per batch instead of one row insert per detection) and the highlight flash of
+a batch is cleared by a single timer.
+"""
+
+import time
+
+import numpy as np
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PySide6.QtGui import QBrush, QColor
+
+from .styles import get_defect_color
+
+# Table columns: (header, alignment)
+DETECTION_COLUMNS = (
+    ("Zaman", Qt.AlignCenter),
+    ("Kare No", Qt.AlignCenter),
+    ("Durum", Qt.AlignCenter),
+    ("Kusur Tipi", Qt.AlignLeft | Qt.AlignVCenter),
+    ("Güven (%)", Qt.AlignCenter),
+)
+
+HIGHLIGHT_COLOR = "#3498db"
+STATUS_COLOR = "#e74c3c"
+
+
+def confidence_color(confidence_pct):
+    """Return the foreground color for a confidence percentage."""
+    if confidence_pct >= 95:
+        return "#27ae60"
+    elif confidence_pct >= 85:
+        return "#f39c12"
+    return "#e74c3c"
+
+
+class DetectionStore:
+    """
+    Capped column-oriented store of detection rows.
+
+    Each column is a preallocated array used as a ring buffer: once capacity
+    is reached, new rows overwrite the oldest ones. Rows are addressed
+    logically (0 = oldest retained row).
+    """
+
+    def __init__(self, capacity=10000):
+        """
+        Initialize store.
+
+        Args:
+            capacity: Maximum number of retained rows
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.times = np.empty(capacity, dtype=object)
+        self.frame_ids = np.empty(capacity, dtype=object)
+        self.statuses = np.empty(capacity, dtype=object)
+        self.defect_types = np.empty(capacity, dtype=object)
+        self.confidences = np.zeros(capacity, dtype=np.float32)
+
+        self._start = 0
+        self._size = 0
+        self.total_appended = 0
+
+    def __len__(self):
+        return self._size
+
+    def _physical(self, row):
+        return (self._start + row) % self.capacity
+
+    def append_many(self, detections):
+        """
+        Append a batch of detection records.
+
+        Args:
+            detections: List of detection dicts (timestamp, frame_id, status,
+                        defect_type, confidence)
+
+        Returns:
+            int: Number of old rows evicted to make room
+        """
+        # Only the newest `capacity` records can survive this batch
+        skipped = max(0, len(detections) - self.capacity)
+        detections = detections[skipped:]
+
+        evicted = self.evict(self._size + len(detections) - self.capacity)
+
+        for detection in detections:
+            i = self._physical(self._size)
+            self.times[i] = _format_time(detection["timestamp"])
+            self.frame_ids[i] = detection["frame_id"]
+            self.statuses[i] = f"⚠️ {detection['status']}"
+            self.defect_types[i] = detection["defect_type"]
+
+            # Confidence may be a fraction (simulation) or percentage (ML)
+            confidence = detection["confidence"]
+            self.confidences[i] = confidence * 100 if confidence <= 1.0 else confidence
+            self._size += 1
+
+        self.total_appended += skipped + len(detections)
+        return evicted + skipped
+
+    def evict(self, count):
+        """
+        Drop the oldest rows.
+
+        Args:
+            count: Number of rows to drop (clamped to the current size)
+
+        Returns:
+            int: Number of rows dropped
+        """
+        count = max(0, min(count, self._size))
+        self._start = (self._start + count) % self.capacity
+        self._size -= count
+        return count
+
+    def row(self, row):
+        """
+        Get one row as a tuple in column order.
+
+        Args:
+            row: Logical row index (0 = oldest retained row)
+
+        Returns:
+            tuple: (time, frame_id, status, defect_type, confidence_pct)
+        """
+        i = self._physical(row)
+        return (
+            self.times[i], self.frame_ids[i], self.statuses[i],
+            self.defect_types[i], float(self.confidences[i])
+        )
+
+    def sequence(self, row):
+        """Absolute append number of a logical row (stable across evictions)."""
+        return self.total_appended - self._size + row
+
+    def clear(self):
+        """Remove all rows."""
+        self.times[:] = None
+        self.frame_ids[:] = None
+        self.statuses[:] = None
+        self.defect_types[:] = None
+        self._start = 0
+        self._size = 0
+        self.total_appended = 0
+
+
+def _format_time(timestamp):
+    """Convert a detection timestamp (string or epoch seconds) to HH:MM:SS."""
+    if isinstance(timestamp, str):
+        return timestamp
+    return time.strftime("%H:%M:%S", time.localtime(timestamp))
+
+
+class DetectionTableModel(QAbstractTableModel):
+    """
+    Read-only table model over a DetectionStore.
+
+    Rows of the most recently appended batch are highlighted until one
+    shared single-shot timer expires.
+    """
+
+    def __init__(self, capacity=10000, highlight_ms=500, parent=None):
+        """
+        Initialize model.
+
+        Args:
+            capacity: Maximum number of rows kept (oldest rows are dropped)
+            highlight_ms: Duration of the new-row highlight flash
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.store = DetectionStore(capacity)
+        self._brushes = {}
+
+        # Rows with sequence >= _highlight_from are highlighted
+        self._highlight_from = None
+        self._highlight_timer = QTimer(self)
+        self._highlight_timer.setSingleShot(True)
+        self._highlight_timer.setInterval(highlight_ms)
+        self._highlight_timer.timeout.connect(self._clear_highlight)
+
+    def _brush(self, color):
+        """Cached QBrush per color string (data() is called per visible cell)."""
+        brush = self._brushes.get(color)
+        if brush is None:
+            brush = QBrush(QColor(color))
+            self._brushes[color] = brush
+        return brush
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(DETECTION_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return DETECTION_COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row, column = index.row(), index.column()
+
+        if role == Qt.DisplayRole:
+            value = self.store.row(row)[column]
+            return f"{value:.1f}%" if column == 4 else value
+
+        if role == Qt.TextAlignmentRole:
+            return int(DETECTION_COLUMNS[column][1])
+
+        if role == Qt.ForegroundRole:
+            if column == 2:
+                return self._brush(STATUS_COLOR)
+            if column == 3:
+                return self._brush(get_defect_color(self.store.row(row)[3]))
+            if column == 4:
+                return self._brush(confidence_color(self.store.row(row)[4]))
+            return None
+
+        if role == Qt.BackgroundRole:
+            if self._highlight_from is not None and self.store.sequence(row) >= self._highlight_from:
+                return self._brush(HIGHLIGHT_COLOR)
+            return None
+
+        return None
+
+    def append_detections(self, detections):
+        """
+        Append a batch of detections with one model update and one highlight.
+
+        Args:
+            detections: List of detection dicts
+        """
+        if not detections:
+            return
+
+        incoming = min(len(detections), self.store.capacity)
+        evicted = max(0, len(self.store) + incoming - self.store.capacity)
+
+        # Drop the oldest rows first so the view never sees stale indices
+        if evicted:
+            self.beginRemoveRows(QModelIndex(), 0, evicted - 1)
+            self.store.evict(evicted)
+            self.endRemoveRows()
+
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + incoming - 1)
+        self.store.append_many(detections)
+        self.endInsertRows()
+
+        # Previous batch loses its highlight; this batch flashes until the timer fires
+        previous = self._highlight_from
+        self._highlight_from = self.store.sequence(first)
+        if previous is not None and first > 0:
+            previous_row = max(0, previous - self.store.sequence(0))
+            if previous_row < first:
+                self._emit_background_changed(previous_row, first - 1)
+        self._highlight_timer.start()
+
+    def _clear_highlight(self):
+        self._highlight_from = None
+        if len(self.store):
+            self._emit_background_changed(0, len(self.store) - 1)
+
+    def _emit_background_changed(self, first_row, last_row):
+        self.dataChanged.emit(
+            self.index(first_row, 0),
+            self.index(last_row, len(DETECTION_COLUMNS) - 1),
+            [Qt.BackgroundRole]
+        )
+
+    def clear(self):
+        """Remove all rows."""
+        self.beginResetModel()
+        self.store.clear()
+        self._highlight_from = None
+        self._highlight_timer.stop()
+        self.endResetModel()
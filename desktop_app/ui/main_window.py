@@ -6,19 +6,29 @@ FIXED: Camera permissions, responsive UI, proper error handling.
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QTableWidget, QTableWidgetItem, QProgressBar, QFrame,
+    QTableView, QAbstractItemView, QProgressBar, QFrame,
     QPushButton, QHeaderView, QSlider, QComboBox, QSplitter,
     QMessageBox, QApplication
 )
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QColor, QBrush, QPixmap, QScreen
-from .styles import DARK_THEME, get_defect_color
+from PySide6.QtCore import Qt, QTimer, QEvent
+from PySide6.QtGui import QPixmap, QScreen
+from .styles import DARK_THEME
+from .detection_table import DetectionTableModel
+from .signal_coalescer import SignalCoalescer
 import sys
+import time
 from pathlib import Path
 
 # Add desktop_app to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from constants import ScanMode, SystemState, MODE_NAMES, STATE_NAMES
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+from constants import (
+    ScanMode, SystemState, MODE_NAMES, STATE_NAMES,
+    DETECTION_TABLE_CAPACITY, UI_REFRESH_HZ,
+    DETECTION_DB_PATH, DETECTION_RETENTION_DAYS,
+    STARTUP_BUDGET_SECONDS, ML_PRELOAD_DELAY_MS, FABRIC_ROLL_CONTEXT,
+    SIMULATION_FRAME_RATE
+)
 
 
 class MetricCard(QFrame):
@@ -87,7 +97,25 @@ class MainWindow(QMainWindow):
     PRODUCTION: Handles both simulation and real camera modes.
     """
 
-    def __init__(self):
+    def __init__(self, frame_source_specs=None, frame_source_fps=None, started_at=None, preload_ml=True,
+                 simulation_frame_rate=SIMULATION_FRAME_RATE, simulation_seed=None):
+        """
+        Args:
+            frame_source_specs: Capture sources for camera mode instead of the
+                                real camera (see frame_sources.create_frame_source);
+                                more than one runs multi-camera mode with a
+                                shared inference pipeline
+            frame_source_fps: Frame rate for those sources (None = as fast as possible)
+            started_at: time.perf_counter() at process start, for the
+                        cold-start measurement (None = window construction)
+            preload_ml: Load the ML pipeline in the background right after
+                        the first paint (False = only when camera mode needs it)
+            simulation_frame_rate: Simulation mode frames per second
+                                   (0 = as fast as possible, for load testing)
+            simulation_seed: Simulation seed (same seed = same defect
+                             sequence; None = random)
+        """
+        self.started_at = started_at if started_at is not None else time.perf_counter()
         super().__init__()
         # System state
         self.current_mode = ScanMode.SIMULATION  # Default mode
@@ -99,17 +127,36 @@ class MainWindow(QMainWindow):
         self.detection_manager = None
         self.camera_manager = None
 
-        # ML Pipeline (initialized after UI)
+        # Alternative capture sources (cameras, video files, synthetic...)
+        self.frame_source_specs = list(frame_source_specs or [])
+        self.frame_source_fps = frame_source_fps
+
+        # Simulation mode settings
+        self.simulation_frame_rate = simulation_frame_rate
+        self.simulation_seed = simulation_seed
+
+        # ML Pipeline (loaded in the background after the first paint)
         self.ml_pipeline = None
         self.ml_available = False
+        self.ml_load_failed = False
+        self.ml_loader = None
+        self.preload_ml = preload_ml
+        self._pending_camera_duration = None  # Camera scan waiting for the models
+        self._first_show_handled = False
+        self.startup_seconds = None
+
+        # Persistent detection history (None if the database cannot be opened)
+        self.detection_store = self._open_detection_store()
 
         # Stats tracking
         self.defects_found = 0
         self.scanned_yards = 0.0
 
+        # Worker signals are coalesced into UI updates at a fixed rate
+        self.signal_coalescer = SignalCoalescer(refresh_hz=UI_REFRESH_HZ, parent=self)
+
         self.init_ui()
         self.resize_to_screen()
-        self.initialize_ml_pipeline()
 
     def resize_to_screen(self):
         """Resize window to fit screen properly."""
@@ -399,6 +446,7 @@ class MainWindow(QMainWindow):
         self.camera_view.setText("Kamera Modu: KAPALI\n\nGerçek kamera modunu kullanmak için:\n1. 'GERÇEK KAMERA MODU' seçin\n2. 'Taramayı Başlat' butonuna tıklayın")
         self.camera_view.setMinimumSize(300, 200)
         self.camera_view.setScaledContents(False)
+        self.camera_view.installEventFilter(self)  # Track size for off-thread scaling
         camera_layout.addWidget(self.camera_view, 1)
 
         content_splitter.addWidget(camera_panel)
@@ -414,20 +462,24 @@ class MainWindow(QMainWindow):
         table_header.setStyleSheet("font-size: 10pt;")
         table_layout.addWidget(table_header)
 
-        self.detection_table = QTableWidget()
-        self.detection_table.setColumnCount(5)
-        self.detection_table.setHorizontalHeaderLabels([
-            "Zaman", "Kare No", "Durum", "Kusur Tipi", "Güven (%)"
-        ])
+        # Virtualized model/view table: only visible rows are rendered
+        self.detection_model = DetectionTableModel(capacity=DETECTION_TABLE_CAPACITY, parent=self)
+        self.detection_table = QTableView()
+        self.detection_table.setModel(self.detection_model)
 
         # Configure table
         self.detection_table.setAlternatingRowColors(True)
-        self.detection_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.detection_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.detection_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.detection_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.detection_table.verticalHeader().setVisible(False)
 
-        # Column widths - responsive
+        # Fixed row height so the view never measures rows
+        self.detection_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.detection_table.verticalHeader().setDefaultSectionSize(24)
+
+        # Column widths - responsive (sized from visible rows only)
         header = self.detection_table.horizontalHeader()
+        header.setResizeContentsPrecision(0)
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
@@ -448,47 +500,113 @@ class MainWindow(QMainWindow):
         # Status bar
         self.statusBar().showMessage("Sistem hazır. Mod seçin ve taramayı başlatın.")
 
-    def initialize_ml_pipeline(self):
+        # Background ML loading progress (hidden when idle)
+        self.ml_progress_bar = QProgressBar()
+        self.ml_progress_bar.setMaximumWidth(160)
+        self.ml_progress_bar.setMaximumHeight(14)
+        self.ml_progress_bar.setRange(0, 100)
+        self.ml_progress_bar.hide()
+        self.statusBar().addPermanentWidget(self.ml_progress_bar)
+
+    def showEvent(self, event):
+        """Measure the cold start once the window is first shown."""
+        super().showEvent(event)
+        if not self._first_show_handled:
+            self._first_show_handled = True
+            # Runs after the pending paint events of the first show
+            QTimer.singleShot(0, self._on_first_paint)
+
+    def _on_first_paint(self):
+        """Report the cold-start time and schedule the ML preload."""
+        self.startup_seconds = time.perf_counter() - self.started_at
+        budget_ms = STARTUP_BUDGET_SECONDS * 1000
+        print(f"⏱️  Startup: {self.startup_seconds * 1000:.0f} ms (budget {budget_ms:.0f} ms)")
+        if self.startup_seconds > STARTUP_BUDGET_SECONDS:
+            print(f"⚠️  Startup exceeded its {budget_ms:.0f} ms budget")
+
+        if self.preload_ml:
+            QTimer.singleShot(ML_PRELOAD_DELAY_MS, self.start_ml_loading)
+
+    def start_ml_loading(self):
         """
-        Initialize Machine Learning pipeline for defect detection and fabric classification.
+        Load the Machine Learning pipeline (defect detection + fabric
+        classification) in the background.
 
-        PRODUCTION SYSTEM - Uses real PyTorch deep learning models.
+        PRODUCTION SYSTEM - Uses real PyTorch deep learning models. Called
+        after the first paint (preload) or when camera mode first needs the
+        pipeline; does nothing if it is loaded, loading or has failed.
         """
-        try:
-            print("\n" + "="*70)
-            print("STARTING ML PIPELINE INITIALIZATION")
-            print("="*70)
-
-            from ml.pipeline import create_ml_pipeline
-
-            # Create ML pipeline with pretrained models
-            # For production, replace None with paths to custom-trained weights
-            self.ml_pipeline = create_ml_pipeline(
-                defect_weights=None,  # None = use pretrained ImageNet (PHASE 1)
-                fabric_weights=None,   # None = use pretrained ImageNet (PHASE 1)
-                device=None,           # None = auto-detect (CUDA if available)
-                confidence_threshold=0.6  # 60% minimum confidence for defect reporting
-            )
+        if self.ml_available or self.ml_load_failed or self.ml_loader is not None:
+            return
+
+        from ml_loader import MLPipelineLoader
+
+        print("\n" + "="*70)
+        print("STARTING ML PIPELINE INITIALIZATION (background)")
+        print("="*70)
 
-            self.ml_available = True
+        self.ml_loader = MLPipelineLoader(
+            confidence_threshold=0.6,  # 60% minimum confidence
+            roll_context=FABRIC_ROLL_CONTEXT
+        )
+        self.ml_loader.progress.connect(self.on_ml_loading_progress)
+        self.ml_loader.loaded.connect(self.on_ml_loaded)
+        self.ml_loader.failed.connect(self.on_ml_failed)
+
+        self.ml_progress_bar.setValue(0)
+        self.ml_progress_bar.show()
+        self.ml_loader.start()
 
-            # Update status
+    def on_ml_loading_progress(self, percent, description):
+        """Show ML loading progress in the status bar."""
+        self.ml_progress_bar.setValue(percent)
+        if not self.is_scanning or self._pending_camera_duration is not None:
+            self.statusBar().showMessage(f"⏳ ML sistemi yükleniyor: {description}...")
+
+    def on_ml_loaded(self, pipeline, load_seconds):
+        """
+        Take over the pipeline built by the loader.
+
+        Args:
+            pipeline: TextileInspectionPipeline
+            load_seconds: Time the background load took
+        """
+        self.ml_pipeline = pipeline
+        self.ml_available = True
+        self.ml_progress_bar.hide()
+
+        print("\n✅ ML PIPELINE READY FOR PRODUCTION USE")
+        print("="*70 + "\n")
+
+        # Camera scan requested while the models were loading
+        if self._pending_camera_duration is not None:
+            duration = self._pending_camera_duration
+            self._pending_camera_duration = None
+            self._start_camera_scan(duration)
+            return
+
+        # Update status
+        if not self.is_scanning:
             self.statusBar().showMessage(
-                "✅ ML sistemi hazır - Gerçek derin öğrenme modelleri yüklendi"
+                f"✅ ML sistemi hazır - Gerçek derin öğrenme modelleri yüklendi ({load_seconds:.1f} sn)"
             )
 
-            print("\n✅ ML PIPELINE READY FOR PRODUCTION USE")
-            print("="*70 + "\n")
-
-        except ImportError as e:
-            self.ml_available = False
+    def on_ml_failed(self, error_kind, detail):
+        """
+        Report a failed pipeline load and fall back to simulation mode.
 
-            # Determine which package is missing
-            missing_module = str(e).split("'")[1] if "'" in str(e) else "PyTorch"
+        Args:
+            error_kind: "import" if a package is missing, else "error"
+            detail: Missing module name or error message
+        """
+        self.ml_available = False
+        self.ml_load_failed = True
+        self.ml_progress_bar.hide()
 
+        if error_kind == "import":
             error_msg = (
                 f"PyTorch Machine Learning Framework Gerekli\n\n"
-                f"Eksik modül: {missing_module}\n\n"
+                f"Eksik modül: {detail}\n\n"
                 f"KURULUM:\n"
                 f"1. Komut istemini (CMD) yönetici olarak açın\n"
                 f"2. Şu komutu çalıştırın:\n\n"
@@ -498,51 +616,43 @@ class MainWindow(QMainWindow):
                 f"uygun versiyonu seçebilirsiniz.\n\n"
                 f"Şu an sadece Simülasyon Modu kullanılabilir."
             )
-            print(f"❌ ML Import Error: {e}")
             print(error_msg)
-
-            msg_box = QMessageBox(self)
-            msg_box.setIcon(QMessageBox.Warning)
-            msg_box.setWindowTitle("ML Framework Gerekli")
-            msg_box.setText("PyTorch yüklü değil")
-            msg_box.setInformativeText(error_msg)
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.exec()
-
-            # Disable camera mode
-            mode_index = self.mode_selector.findData(ScanMode.CAMERA)
-            if mode_index >= 0:
-                self.mode_selector.model().item(mode_index).setEnabled(False)
-
-            self.statusBar().showMessage("⚠ Sadece Simülasyon Modu - PyTorch kurulumu gerekli")
-
-        except Exception as e:
-            self.ml_available = False
+            icon, title, text = QMessageBox.Warning, "ML Framework Gerekli", "PyTorch yüklü değil"
+            status = "⚠ Sadece Simülasyon Modu - PyTorch kurulumu gerekli"
+        else:
             error_msg = (
                 f"ML Sistemi Başlatma Hatası\n\n"
-                f"Hata detayı: {str(e)}\n\n"
+                f"Hata detayı: {detail}\n\n"
                 f"Olası çözümler:\n"
                 f"1. PyTorch kurulumunu kontrol edin\n"
                 f"2. GPU sürücülerini güncelleyin (CUDA kullanıyorsanız)\n"
                 f"3. Uygulamayı yeniden başlatın\n\n"
                 f"Şu an sadece Simülasyon Modu kullanılabilir."
             )
-            print(f"❌ ML Pipeline Error: {e}")
+            icon, title, text = QMessageBox.Critical, "ML Sistemi Hatası", "ML Pipeline başlatılamadı"
+            status = "⚠ Sadece Simülasyon Modu - ML sistemi yüklenemedi"
 
-            msg_box = QMessageBox(self)
-            msg_box.setIcon(QMessageBox.Critical)
-            msg_box.setWindowTitle("ML Sistemi Hatası")
-            msg_box.setText("ML Pipeline başlatılamadı")
-            msg_box.setInformativeText(error_msg)
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.exec()
+        # A camera scan waiting for the models cannot start
+        if self._pending_camera_duration is not None:
+            self._pending_camera_duration = None
+            self.scan_finished()
 
-            # Disable camera mode
-            mode_index = self.mode_selector.findData(ScanMode.CAMERA)
-            if mode_index >= 0:
-                self.mode_selector.model().item(mode_index).setEnabled(False)
+        msg_box = QMessageBox(self)
+        msg_box.setIcon(icon)
+        msg_box.setWindowTitle(title)
+        msg_box.setText(text)
+        msg_box.setInformativeText(error_msg)
+        msg_box.setStandardButtons(QMessageBox.Ok)
+        msg_box.exec()
+
+        # Disable camera mode
+        mode_index = self.mode_selector.findData(ScanMode.CAMERA)
+        if mode_index >= 0:
+            self.mode_selector.model().item(mode_index).setEnabled(False)
+        if self.current_mode == ScanMode.CAMERA:
+            self.mode_selector.setCurrentIndex(self.mode_selector.findData(ScanMode.SIMULATION))
 
-            self.statusBar().showMessage("⚠ Sadece Simülasyon Modu - ML sistemi yüklenemedi")
+        self.statusBar().showMessage(status)
 
     def test_camera(self):
         """Test camera access and show results."""
@@ -632,6 +742,9 @@ class MainWindow(QMainWindow):
             self.camera_view.setText("Kamera Hazır\n\n'Taramayı Başlat' butonuna tıklayın")
             self.camera_status_label.setText("Kamera Kapalı – Tarama başlatılmadı")
 
+            # Camera mode needs the models: load them now if not preloaded
+            self.start_ml_loading()
+
         self.statusBar().showMessage(f"Mod değiştirildi: {MODE_NAMES[new_mode]}")
 
     def start_scan(self):
@@ -640,7 +753,7 @@ class MainWindow(QMainWindow):
             return
 
         # Clear previous data
-        self.detection_table.setRowCount(0)
+        self.detection_model.clear()
         self.calibration_bar.setValue(0)
         self.scanning_bar.setValue(0)
         self.metric_scanned.set_value("0.0")
@@ -663,6 +776,30 @@ class MainWindow(QMainWindow):
         else:
             self._start_camera_scan(duration)
 
+    def _open_detection_store(self):
+        """
+        Open the SQLite detection history.
+
+        Returns:
+            DetectionHistory, or None if the database is unavailable (scans
+            then run without persistence)
+        """
+        import sqlite3
+        from detection_store import DetectionHistory
+
+        try:
+            return DetectionHistory(DETECTION_DB_PATH, retention_days=DETECTION_RETENTION_DAYS)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  Detection store unavailable ({e}) - detections will not be persisted")
+            return None
+
+    def _start_roll(self, source):
+        """Begin a new roll in the detection store and the ML pipeline for the scan being started."""
+        if self.detection_store is not None:
+            self.detection_store.start_roll(mode=self.current_mode.name, source=source)
+        if self.current_mode == ScanMode.CAMERA and self.ml_pipeline is not None:
+            self.ml_pipeline.start_roll()
+
     def _start_simulation_scan(self, duration):
         """Start simulation mode scan."""
         from detection_manager import DetectionManager
@@ -670,13 +807,21 @@ class MainWindow(QMainWindow):
         self.system_state = SystemState.SCANNING_SIMULATION
         self.metric_status.set_value("SİMÜLASYON")
 
-        self.detection_manager = DetectionManager(mode=ScanMode.SIMULATION, duration_seconds=duration)
+        self._start_roll("simulation")
+        self.detection_manager = DetectionManager(
+            mode=ScanMode.SIMULATION,
+            duration_seconds=duration,
+            detection_store=self.detection_store,
+            frame_rate=self.simulation_frame_rate,
+            seed=self.simulation_seed
+        )
 
-        # Connect signals
-        self.detection_manager.calibration_progress.connect(self.update_calibration)
-        self.detection_manager.scanning_progress.connect(self.update_scanning)
-        self.detection_manager.new_detection.connect(self.add_detection_row)
-        self.detection_manager.stats_update.connect(self.update_stats)
+        # Connect signals (high-frequency ones coalesced to UI_REFRESH_HZ)
+        coalescer = self.signal_coalescer
+        coalescer.connect_latest(self.detection_manager.calibration_progress, self.update_calibration)
+        coalescer.connect_latest(self.detection_manager.scanning_progress, self.update_scanning)
+        coalescer.connect_batched(self.detection_manager.new_detections, self.add_detection_batches)
+        coalescer.connect_latest(self.detection_manager.stats_update, self.update_stats)
         self.detection_manager.scan_complete.connect(self.scan_finished)
 
         # Start
@@ -687,6 +832,14 @@ class MainWindow(QMainWindow):
         """Start real camera mode scan with ML pipeline."""
         from camera_manager import CameraManager
 
+        # Models still loading (or not requested yet): start once they are ready
+        if not self.ml_available and not self.ml_load_failed:
+            self._pending_camera_duration = duration
+            self.metric_status.set_value("ML YÜKLENİYOR")
+            self.statusBar().showMessage("⏳ ML sistemi yükleniyor - tarama modeller hazır olunca başlayacak...")
+            self.start_ml_loading()
+            return
+
         # Check if ML is available
         if not self.ml_available or self.ml_pipeline is None:
             QMessageBox.critical(
@@ -714,22 +867,47 @@ class MainWindow(QMainWindow):
             font-weight: bold;
         """)
 
+        # Capture from configured sources instead of the default camera
+        from frame_sources import create_frame_source
+        frame_sources = [
+            create_frame_source(spec, target_fps=self.frame_source_fps)
+            for spec in self.frame_source_specs
+        ]
+        preview_size = (self.camera_view.width(), self.camera_view.height())
+        self._start_roll(", ".join(source.describe() for source in frame_sources) or "camera 0")
+
         # Create camera manager WITH ML pipeline
-        self.camera_manager = CameraManager(
-            camera_index=0,
-            duration_seconds=duration,
-            ml_pipeline=self.ml_pipeline  # Pass ML pipeline
-        )
+        if len(frame_sources) > 1:
+            # Several cameras share one pipeline through the inference scheduler
+            from multi_camera_manager import MultiCameraManager
+            self.camera_manager = MultiCameraManager(
+                frame_sources,
+                duration_seconds=duration,
+                ml_pipeline=self.ml_pipeline,
+                preview_size=preview_size,
+                detection_store=self.detection_store
+            )
+        else:
+            self.camera_manager = CameraManager(
+                camera_index=0,
+                duration_seconds=duration,
+                ml_pipeline=self.ml_pipeline,  # Pass ML pipeline
+                preview_size=preview_size,
+                frame_source=frame_sources[0] if frame_sources else None,
+                detection_store=self.detection_store
+            )
 
-        # Connect signals
-        self.camera_manager.frame_captured.connect(self.update_camera_view)
-        self.camera_manager.frame_analyzed.connect(self.add_detection_row)
-        self.camera_manager.fps_updated.connect(self.update_fps)
+        # Connect signals (per-frame ones coalesced to UI_REFRESH_HZ)
+        coalescer = self.signal_coalescer
+        coalescer.connect_latest(self.camera_manager.frame_captured, self.update_camera_view)
+        coalescer.connect_batched(self.camera_manager.frame_analyzed, self.add_detections)
+        coalescer.connect_latest(self.camera_manager.fps_updated, self.update_fps)
+        coalescer.connect_latest(self.camera_manager.queue_stats_updated, self.update_queue_stats)
+        coalescer.connect_latest(self.camera_manager.scanning_progress, self.update_scanning)
+        coalescer.connect_latest(self.camera_manager.stats_update, self.update_stats)
         self.camera_manager.camera_error.connect(self.handle_camera_error)
-        self.camera_manager.scanning_progress.connect(self.update_scanning)
         self.camera_manager.scan_complete.connect(self.scan_finished)
         self.camera_manager.camera_opened.connect(self.on_camera_opened)
-        self.camera_manager.stats_update.connect(self.update_stats)
 
         # Start
         self.camera_manager.start()
@@ -800,20 +978,31 @@ class MainWindow(QMainWindow):
         self.scanning_bar.setValue(value)
 
     def update_camera_view(self, q_image):
-        """Update camera view with new frame."""
-        pixmap = QPixmap.fromImage(q_image)
-        # Scale to fit while maintaining aspect ratio
-        scaled_pixmap = pixmap.scaled(
-            self.camera_view.size(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        self.camera_view.setPixmap(scaled_pixmap)
+        """Update camera view with new frame (already scaled by the capture thread)."""
+        self.camera_view.setPixmap(QPixmap.fromImage(q_image))
+
+    def eventFilter(self, watched, event):
+        """Forward camera view resizes to the capture thread's preview renderer."""
+        if watched is self.camera_view and event.type() == QEvent.Resize:
+            if self.camera_manager is not None:
+                size = event.size()
+                self.camera_manager.set_preview_size(size.width(), size.height())
+        return super().eventFilter(watched, event)
 
     def update_fps(self, fps):
         """Update FPS label."""
         self.fps_label.setText(f"{fps:.1f}")
 
+    def update_queue_stats(self, stats):
+        """Show capture → inference queue health next to the FPS label."""
+        capture = stats['capture']
+        inference = stats['inference']
+        self.fps_label.setToolTip(
+            f"Kuyruk: {capture['queue_depth']}/{capture['queue_capacity']}\n"
+            f"Düşürülen kare: {capture['frames_dropped']}\n"
+            f"Analiz edilen kare: {inference['frames_analyzed']}"
+        )
+
     def handle_camera_error(self, error_message):
         """Handle camera errors with dialog."""
         # Cancel scanning state immediately
@@ -836,63 +1025,20 @@ class MainWindow(QMainWindow):
         # Stop scanning
         self.scan_finished()
 
-    def add_detection_row(self, detection):
-        """Add new detection to table with highlight animation."""
-        row_position = self.detection_table.rowCount()
-        self.detection_table.insertRow(row_position)
-
-        # Time
-        if isinstance(detection["timestamp"], str):
-            time_str = detection["timestamp"]
-        else:
-            # Convert timestamp to time string
-            import time
-            time_str = time.strftime("%H:%M:%S", time.localtime(detection["timestamp"]))
-
-        time_item = QTableWidgetItem(time_str)
-        time_item.setTextAlignment(Qt.AlignCenter)
-        self.detection_table.setItem(row_position, 0, time_item)
-
-        # Frame ID
-        frame_item = QTableWidgetItem(detection["frame_id"])
-        frame_item.setTextAlignment(Qt.AlignCenter)
-        self.detection_table.setItem(row_position, 1, frame_item)
-
-        # Status
-        status_item = QTableWidgetItem(f"⚠️ {detection['status']}")
-        status_item.setTextAlignment(Qt.AlignCenter)
-        status_item.setForeground(QBrush(QColor("#e74c3c")))
-        self.detection_table.setItem(row_position, 2, status_item)
-
-        # Defect type
-        defect_item = QTableWidgetItem(detection["defect_type"])
-        defect_color = get_defect_color(detection["defect_type"])
-        defect_item.setForeground(QBrush(QColor(defect_color)))
-        defect_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        self.detection_table.setItem(row_position, 3, defect_item)
-
-        # Confidence
-        confidence_pct = detection["confidence"] * 100 if detection["confidence"] <= 1.0 else detection["confidence"]
-        conf_item = QTableWidgetItem(f"{confidence_pct:.1f}%")
-        conf_item.setTextAlignment(Qt.AlignCenter)
-
-        if confidence_pct >= 95:
-            conf_item.setForeground(QBrush(QColor("#27ae60")))
-        elif confidence_pct >= 85:
-            conf_item.setForeground(QBrush(QColor("#f39c12")))
-        else:
-            conf_item.setForeground(QBrush(QColor("#e74c3c")))
-
-        self.detection_table.setItem(row_position, 4, conf_item)
+    def add_detections(self, detections):
+        """Append a batch of coalesced detections to the table in one model update."""
+        # One insert + one highlight timer for the whole batch
+        self.detection_model.append_detections(detections)
 
         # Update stats
-        self.defects_found += 1
+        self.defects_found += len(detections)
         self.metric_defects.set_value(str(self.defects_found))
 
-        # Update fabric type if available (from ML)
-        if "fabric_type" in detection and detection["fabric_type"]:
-            fabric_type = detection["fabric_type"]
-            fabric_conf = detection.get("fabric_confidence", 0)
+        # Update fabric type if available (from ML), latest detection wins
+        latest = detections[-1]
+        if "fabric_type" in latest and latest["fabric_type"]:
+            fabric_type = latest["fabric_type"]
+            fabric_conf = latest.get("fabric_confidence", 0)
 
             # Update fabric metric card
             if fabric_conf > 0:
@@ -900,22 +1046,12 @@ class MainWindow(QMainWindow):
             else:
                 self.metric_fabric.set_value(fabric_type)
 
-        # Scroll to new row
+        # Scroll to newest rows
         self.detection_table.scrollToBottom()
 
-        # Highlight animation (brief flash)
-        self.highlight_row(row_position)
-
-    def highlight_row(self, row):
-        """Briefly highlight a new row."""
-        for col in range(self.detection_table.columnCount()):
-            item = self.detection_table.item(row, col)
-            if item:
-                original_bg = item.background()
-                item.setBackground(QBrush(QColor("#3498db")))
-
-                # Reset after delay
-                QTimer.singleShot(500, lambda i=item, bg=original_bg: i.setBackground(bg))
+    def add_detection_batches(self, batches):
+        """Append coalesced per-block detection lists (simulation mode) as one batch."""
+        self.add_detections([detection for batch in batches for detection in batch])
 
     def update_stats(self, stats):
         """Update statistics metrics (both simulation and camera modes)."""
@@ -933,6 +1069,13 @@ class MainWindow(QMainWindow):
 
     def scan_finished(self):
         """Handle scan completion."""
+        # Deliver the last coalesced updates, then detach from the workers
+        self.signal_coalescer.disconnect_all()
+        self._pending_camera_duration = None
+
+        if self.detection_store is not None:
+            self.detection_store.end_roll()
+
         self.metric_status.set_value("TAMAMLANDI")
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
@@ -967,4 +1110,12 @@ class MainWindow(QMainWindow):
             self.camera_manager.stop()
             self.camera_manager.release_camera()
 
+        # A background model load cannot be interrupted; let it finish
+        if self.ml_loader is not None:
+            self.ml_loader.wait()
+
+        # Commit detections still queued for the database
+        if self.detection_store is not None:
+            self.detection_store.close()
+
         event.accept()
@@ -0,0 +1,173 @@
+"""
+Signal coalescing between worker threads and the UI thread.
+
+CameraManager and DetectionManager emit progress, statistics, preview frames
+and detections many times per second. With the default queued connections
+every emission becomes an event in the UI thread's queue. SignalCoalescer
+instead receives the signals with a direct connection, so the slot runs in
+the emitting worker thread and only stores the value under a lock (it never
+waits for the UI), and a UI-thread timer delivers the stored values at a
+fixed refresh rate:
+
+- connect_latest():  only the newest value is delivered (progress, stats,
+                     preview frames, FPS)
+- connect_batched(): all values since the last tick are delivered as one
+                     list (detections)
+
+The number of pending UI events therefore stays flat no matter how fast the
+workers emit.
+"""
+
+import threading
+
+from PySide6.QtCore import QObject, Qt, QTimer
+
+_NO_VALUE = object()
+
+
+class _Channel:
+    """One coalesced signal → handler route."""
+
+    def __init__(self, signal, handler, batched):
+        self.signal = signal
+        self.handler = handler
+        self.batched = batched
+        self.value = [] if batched else _NO_VALUE
+        self.slot = None
+        self.received = 0
+        self.delivered = 0
+
+    def receive(self, lock, value):
+        """Store a value (runs in the emitting thread)."""
+        with lock:
+            self.received += 1
+            if self.batched:
+                self.value.append(value)
+            else:
+                self.value = value
+
+    def take(self):
+        """Swap out the pending value (caller holds the lock)."""
+        value = self.value
+        if self.batched:
+            if not value:
+                return _NO_VALUE
+            self.value = []
+        else:
+            self.value = _NO_VALUE
+        return value
+
+
+class SignalCoalescer(QObject):
+    """
+    Throttles high-frequency cross-thread signals into UI updates at a fixed rate.
+
+    Create it in the UI thread; handlers are always called in the UI thread.
+    """
+
+    def __init__(self, refresh_hz=30, parent=None):
+        """
+        Initialize coalescer.
+
+        Args:
+            refresh_hz: UI updates per second
+            parent: Parent QObject (UI thread)
+        """
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._channels = []
+
+        # Totals of channels that were already disconnected
+        self._retired_received = 0
+        self._retired_delivered = 0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.flush)
+        self.set_refresh_rate(refresh_hz)
+
+    def set_refresh_rate(self, refresh_hz):
+        """
+        Change the UI update rate.
+
+        Args:
+            refresh_hz: UI updates per second
+        """
+        if refresh_hz <= 0:
+            raise ValueError("refresh_hz must be positive")
+        self.refresh_hz = refresh_hz
+        self._timer.setInterval(max(1, int(1000 / refresh_hz)))
+
+    def _connect(self, signal, handler, batched):
+        channel = _Channel(signal, handler, batched)
+        channel.slot = lambda *args: channel.receive(self._lock, args[0] if len(args) == 1 else args)
+        signal.connect(channel.slot, Qt.DirectConnection)
+        with self._lock:
+            self._channels.append(channel)
+        if not self._timer.isActive():
+            self._timer.start()
+        return channel
+
+    def connect_latest(self, signal, handler):
+        """
+        Deliver only the newest value of a signal per refresh tick.
+
+        Args:
+            signal: Bound signal emitted from any thread
+            handler: UI-thread callable taking the value
+        """
+        self._connect(signal, handler, batched=False)
+
+    def connect_batched(self, signal, handler):
+        """
+        Deliver every value of a signal, grouped per refresh tick.
+
+        Args:
+            signal: Bound signal emitted from any thread
+            handler: UI-thread callable taking a list of values
+        """
+        self._connect(signal, handler, batched=True)
+
+    def flush(self):
+        """Deliver all pending values now (UI thread)."""
+        with self._lock:
+            pending = [(channel, channel.take()) for channel in self._channels]
+
+        for channel, value in pending:
+            if value is _NO_VALUE:
+                continue
+            channel.delivered += 1
+            channel.handler(value)
+
+    def disconnect_all(self):
+        """Deliver pending values, then disconnect every signal and stop the timer."""
+        self.flush()
+        self._timer.stop()
+
+        with self._lock:
+            channels, self._channels = self._channels, []
+            self._retired_received += sum(channel.received for channel in channels)
+            self._retired_delivered += sum(channel.delivered for channel in channels)
+
+        for channel in channels:
+            try:
+                channel.signal.disconnect(channel.slot)
+            except (RuntimeError, TypeError):
+                # Sender already deleted
+                pass
+
+    def get_stats(self):
+        """
+        Get coalescing statistics since creation.
+
+        Returns:
+            dict with signals_received, updates_delivered and refresh_hz
+        """
+        with self._lock:
+            received = self._retired_received + sum(c.received for c in self._channels)
+            delivered = self._retired_delivered + sum(c.delivered for c in self._channels)
+
+        return {
+            'signals_received': received,
+            'updates_delivered': delivered,
+            'refresh_hz': self.refresh_hz,
+        }
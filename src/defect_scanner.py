@@ -3,6 +3,7 @@ import json
 import time
 import random
 import sys
+from collections import deque
 from rich.console import Console
 from rich.table import Table
 from rich.progress import (
@@ -16,11 +17,28 @@ from rich.panel import Panel
 from rich.layout import Layout
 from rich import print
 
+try:
+    from .simulation_engine import SimulationEngine
+except ImportError:
+    # Run as a script / imported with src/ on sys.path (desktop app)
+    from simulation_engine import SimulationEngine
+
 console = Console()
 
 
+# Detections kept in memory; the full history lives in the DetectionHistory
+HISTORY_SIZE = 10000
+
+
 class FabricScanner:
-    def __init__(self):
+    def __init__(self, store=None, history_size=HISTORY_SIZE, seed=None):
+        """
+        Args:
+            store: Optional DetectionHistory every detection is appended to
+            history_size: Most recent detections kept in detection_history
+            seed: SimulationEngine seed (same seed = same defect sequence;
+                  None = random)
+        """
         self.defects = [
             "Leke",
             "Delik",
@@ -30,19 +48,27 @@ class FabricScanner:
         ]
         self.scanned_yards = 0
         self.defects_found = 0
-        self.detection_history = []  # Store all detections for UI consumption
+        self.detection_history = deque(maxlen=history_size)  # Recent detections for UI consumption
+        self.store = store
         self.calibration_progress = 0
         self.scanning_progress = 0
+        self.engine = SimulationEngine(seed=seed, defect_types=self.defects)
 
     def analyze_frame(self, frame_id):
-        """Simulates analyzing a single frame of fabric."""
-        is_defective = random.random() < 0.15  # 15% chance of defect
+        """Simulates analyzing a single frame of fabric (next frame of the seeded engine)."""
+        return self.engine.frame_result(self.engine.next_block(1), 0)
 
-        if is_defective:
-            defect_type = random.choice(self.defects)
-            confidence = random.uniform(0.85, 0.99)
-            return {"detected": True, "type": defect_type, "confidence": confidence}
-        return {"detected": False}
+    def record_detection(self, detection_record):
+        """Keep a detection in the recent history and persist it to the store."""
+        self.detection_history.append(detection_record)
+        if self.store is not None:
+            self.store.append(detection_record)
+
+    def record_detections(self, detection_records):
+        """Batch version of record_detection() (one store queue item)."""
+        self.detection_history.extend(detection_records)
+        if self.store is not None:
+            self.store.append_many(detection_records)
 
     def run_simulation(self, duration_seconds=10, output_file=None):
         console.print(
@@ -87,9 +113,11 @@ class FabricScanner:
             table.add_column("Güven", justify="right")
 
             start_time = time.time()
+            frame_count = 0
 
             while time.time() - start_time < duration_seconds:
-                frame_id = f"FR-{random.randint(10000, 99999)}"
+                frame_id = f"FR-{10000 + frame_count}"
+                frame_count += 1
                 result = self.analyze_frame(frame_id)
                 self.scanned_yards += 0.5
 
@@ -106,10 +134,11 @@ class FabricScanner:
                     "defect_type": result.get("type", "-"),
                     "confidence": result.get("confidence", 0)
                 }
-                self.detection_history.append(detection_record)
+                self.record_detection(detection_record)
 
                 if result["detected"]:
                     self.defects_found += 1
+                    simulation_data["defects"].append(detection_record)
                     status_icon = "⚠️ KUSUR"
                     defect_info = result["type"]
                     conf_str = f"{result['confidence']:.1%}"
@@ -173,10 +202,27 @@ if __name__ == "__main__":
         "--output", type=str, help="Raporun kaydedileceği JSON dosyası yolu"
     )
 
+    parser.add_argument(
+        "--db", type=str, help="Tespitlerin kaydedileceği SQLite veritabanı yolu"
+    )
+    parser.add_argument(
+        "--seed", type=int, help="Tohum değeri (aynı tohum = aynı kusur dizisi)"
+    )
+
     args = parser.parse_args()
 
+    store = None
+    if args.db:
+        from detection_store import DetectionHistory
+        store = DetectionHistory(args.db)
+        store.start_roll(mode="SIMULATION", source="defect_scanner")
+
     try:
-        scanner = FabricScanner()
+        scanner = FabricScanner(store=store, seed=args.seed)
         scanner.run_simulation(duration_seconds=args.duration, output_file=args.output)
     except KeyboardInterrupt:
         console.print("[bold red]Sistem Kullanıcı Tarafından Durduruldu[/bold red]")
+    finally:
+        if store is not None:
+            store.end_roll()
+            store.close()
@@ -0,0 +1,445 @@
+"""
+Persistent detection store for Open Textile Intelligence.
+
+Append-only SQLite database (WAL mode) for every simulation and camera
+defect (clean frames are dropped unless defects_only=False). append() only
+puts the record on a queue; a single writer thread commits queued records
+in batched transactions, so producers (scanner, capture and inference
+threads) only wait when max_queue items are already pending. Committed rows
+survive an application crash; only records queued during the last
+flush_interval can be lost.
+
+History queries use their own connections and, thanks to WAL, run while
+the writer keeps committing. Rows older than retention_days are deleted
+on start-up and then periodically by the writer thread.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+
+# Columns stored as-is; every other key of a detection record goes into `extra`
+_COLUMNS = (
+    'frame_id', 'camera_id', 'status', 'is_defective', 'defect_type', 'confidence',
+    'severity', 'fabric_type', 'first_frame', 'last_frame', 'frame_count',
+)
+
+# Record keys not worth persisting (bulky debug data)
+_SKIPPED_KEYS = {'texture_features', 'fabric_features', 'location', 'defect_heatmap'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rolls (
+    roll_id     TEXT PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    ended_at    REAL,
+    mode        TEXT,
+    source      TEXT
+);
+CREATE TABLE IF NOT EXISTS detections (
+    id            INTEGER PRIMARY KEY,
+    roll_id       TEXT,
+    ts            REAL NOT NULL,
+    frame_id      TEXT,
+    camera_id     INTEGER,
+    status        TEXT,
+    is_defective  INTEGER NOT NULL DEFAULT 0,
+    defect_type   TEXT,
+    confidence    REAL,
+    severity      TEXT,
+    fabric_type   TEXT,
+    first_frame   INTEGER,
+    last_frame    INTEGER,
+    frame_count   INTEGER,
+    extra         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_detections_roll_ts ON detections (roll_id, ts);
+CREATE INDEX IF NOT EXISTS idx_detections_ts ON detections (ts);
+CREATE INDEX IF NOT EXISTS idx_detections_type_ts ON detections (defect_type, ts);
+"""
+
+_STOP = object()
+
+
+class DetectionHistory:
+    """
+    SQLite-backed, append-only detection history with a batching writer thread.
+    """
+
+    def __init__(self, db_path, batch_size=256, flush_interval=0.2,
+                 retention_days=90, retention_check_interval=3600,
+                 defects_only=True, max_queue=1024):
+        """
+        Open (or create) the database and start the writer thread.
+
+        Args:
+            db_path: SQLite database file
+            batch_size: Maximum records committed per transaction
+            flush_interval: Maximum seconds a record waits before it is committed
+            retention_days: Delete detections older than this (None = keep forever)
+            retention_check_interval: Seconds between retention runs
+            defects_only: Drop records with is_defective False on append, so
+                          simulation frames and camera defect events store
+                          the same thing (defects)
+            max_queue: Maximum queued items (one append() or append_many()
+                       each); appending blocks while the queue is full, so a
+                       producer faster than the disk is slowed down instead
+                       of growing memory without limit
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.retention_check_interval = retention_check_interval
+        self.defects_only = defects_only
+
+        self.current_roll = None
+        self.records_written = 0
+        self.batches_written = 0
+        self.last_error = None
+
+        self._queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._closed = False
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self.apply_retention()
+        self._last_retention = time.time()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="detection-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        """New connection (each thread uses its own; callers must close it)."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        # WAL + NORMAL: committed transactions survive an application crash
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ------------------------------------------------------------------ writing
+
+    def start_roll(self, roll_id=None, mode=None, source=None):
+        """
+        Begin a new roll (scan); later append() calls default to it.
+
+        Args:
+            roll_id: Roll identifier (None = generated)
+            mode: Scan mode name (e.g. "SIMULATION", "CAMERA")
+            source: Capture source description
+
+        Returns:
+            str: roll_id
+        """
+        roll_id = roll_id or time.strftime("ROLL-%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.current_roll = roll_id
+        self._queue.put(('roll', (roll_id, time.time(), mode, source)))
+        return roll_id
+
+    def end_roll(self, roll_id=None):
+        """
+        Mark a roll as finished.
+
+        Args:
+            roll_id: Roll to close (None = current roll)
+        """
+        roll_id = roll_id or self.current_roll
+        if roll_id is None:
+            return
+        self._queue.put(('end_roll', (time.time(), roll_id)))
+        if roll_id == self.current_roll:
+            self.current_roll = None
+
+    def append(self, detection, roll_id=None, timestamp=None):
+        """
+        Queue one detection for writing (never blocks on disk, only while
+        max_queue items are waiting).
+
+        Args:
+            detection: Detection record dict (see DetectionManager/CameraManager)
+            roll_id: Roll the detection belongs to (None = current roll)
+            timestamp: Unix time of the detection (None = now)
+        """
+        if self._closed:
+            raise RuntimeError("DetectionHistory is closed")
+        if self.defects_only and not detection.get('is_defective', True):
+            return
+        self._queue.put(('detection', self._to_row(detection, roll_id or self.current_roll, timestamp)))
+
+    def append_many(self, detections, roll_id=None, timestamp=None):
+        """
+        Queue several detections as one queue item (see append()).
+
+        Args:
+            detections: Iterable of detection record dicts
+            roll_id: Roll the detections belong to (None = current roll)
+            timestamp: Unix time of the detections (None = now)
+        """
+        if self._closed:
+            raise RuntimeError("DetectionHistory is closed")
+        roll_id = roll_id or self.current_roll
+        rows = [
+            self._to_row(detection, roll_id, timestamp) for detection in detections
+            if not self.defects_only or detection.get('is_defective', True)
+        ]
+        if rows:
+            self._queue.put(('detections', rows))
+
+    def _to_row(self, detection, roll_id, timestamp):
+        """Flatten a detection record into a detections table row."""
+        values = [detection.get(column) for column in _COLUMNS]
+        values[_COLUMNS.index('is_defective')] = int(bool(detection.get('is_defective', True)))
+
+        extra = {
+            key: value for key, value in detection.items()
+            if key not in _COLUMNS and key not in _SKIPPED_KEYS
+        }
+        return (
+            roll_id,
+            time.time() if timestamp is None else timestamp,
+            *values,
+            json.dumps(extra, ensure_ascii=False, default=str) if extra else None,
+        )
+
+    def flush(self, timeout=10):
+        """
+        Wait until everything queued so far is committed.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            bool: True if flushed within the timeout; after close() it
+            returns at once, True if the writer committed everything
+        """
+        if self._closed:
+            return not self._writer.is_alive()
+        done = threading.Event()
+        self._queue.put(('flush', done))
+        return done.wait(timeout)
+
+    def _writer_loop(self):
+        """Writer thread: commit queued items in batches."""
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+
+                # Gather a batch: whatever arrives within flush_interval
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                stop = False
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=max(0.0, remaining)) if remaining > 0 \
+                            else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                    if item[0] == 'flush':
+                        break
+
+                self._write_batch(conn, batch)
+
+                if self.retention_days is not None and \
+                        time.time() - self._last_retention >= self.retention_check_interval:
+                    self._delete_expired(conn)
+                    self._last_retention = time.time()
+
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn, batch):
+        """Write one batch in a single transaction, then release flush waiters."""
+        rows = [payload for kind, payload in batch if kind == 'detection']
+        for kind, payload in batch:
+            if kind == 'detections':
+                rows.extend(payload)
+        waiters = [payload for kind, payload in batch if kind == 'flush']
+        try:
+            with conn:
+                for kind, payload in batch:
+                    if kind == 'roll':
+                        conn.execute(
+                            "INSERT OR IGNORE INTO rolls (roll_id, started_at, mode, source) VALUES (?, ?, ?, ?)",
+                            payload
+                        )
+                    elif kind == 'end_roll':
+                        conn.execute("UPDATE rolls SET ended_at = ? WHERE roll_id = ?", payload)
+                if rows:
+                    conn.executemany(
+                        f"INSERT INTO detections (roll_id, ts, {', '.join(_COLUMNS)}, extra) "
+                        f"VALUES ({', '.join('?' * (len(_COLUMNS) + 3))})",
+                        rows
+                    )
+            self.records_written += len(rows)
+            self.batches_written += 1
+        except sqlite3.Error as e:
+            self.last_error = str(e)
+            print(f"❌ Detection store write failed: {e}")
+        finally:
+            for done in waiters:
+                done.set()
+
+    # ---------------------------------------------------------------- retention
+
+    def apply_retention(self, now=None):
+        """
+        Delete detections older than retention_days.
+
+        Args:
+            now: Reference unix time (None = now)
+
+        Returns:
+            int: Number of deleted detections
+        """
+        if self.retention_days is None:
+            return 0
+        with closing(self._connect()) as conn:
+            return self._delete_expired(conn, now)
+
+    def _delete_expired(self, conn, now=None):
+        cutoff = (time.time() if now is None else now) - self.retention_days * 86400
+        with conn:
+            deleted = conn.execute("DELETE FROM detections WHERE ts < ?", (cutoff,)).rowcount
+            conn.execute(
+                "DELETE FROM rolls WHERE ended_at IS NOT NULL AND ended_at < ? "
+                "AND roll_id NOT IN (SELECT DISTINCT roll_id FROM detections WHERE roll_id IS NOT NULL)",
+                (cutoff,)
+            )
+        return deleted
+
+    # ------------------------------------------------------------------ queries
+
+    def query(self, roll_id=None, defect_type=None, since=None, until=None,
+              defective_only=True, limit=1000):
+        """
+        Read detection history, newest first.
+
+        Args:
+            roll_id: Only this roll
+            defect_type: Only this defect class
+            since, until: Unix time range
+            defective_only: Skip records with is_defective = 0
+            limit: Maximum rows returned
+
+        Returns:
+            list of detection dicts (stored columns merged with extra fields,
+            plus roll_id and ts)
+        """
+        conditions, params = [], []
+        if roll_id is not None:
+            conditions.append("roll_id = ?")
+            params.append(roll_id)
+        if defect_type is not None:
+            conditions.append("defect_type = ?")
+            params.append(defect_type)
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("ts < ?")
+            params.append(until)
+        if defective_only:
+            conditions.append("is_defective = 1")
+
+        sql = "SELECT * FROM detections"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        results = []
+        for row in rows:
+            record = dict(row)
+            extra = record.pop('extra')
+            record.pop('id')
+            record['is_defective'] = bool(record['is_defective'])
+            if extra:
+                record.update(json.loads(extra))
+            results.append(record)
+        return results
+
+    def count_by_type(self, roll_id=None, since=None):
+        """
+        Count defective detections per defect type.
+
+        Args:
+            roll_id: Only this roll
+            since: Only detections after this unix time
+
+        Returns:
+            dict defect_type → count
+        """
+        sql = "SELECT defect_type, COUNT(*) FROM detections WHERE is_defective = 1"
+        params = []
+        if roll_id is not None:
+            sql += " AND roll_id = ?"
+            params.append(roll_id)
+        if since is not None:
+            sql += " AND ts >= ?"
+            params.append(since)
+        sql += " GROUP BY defect_type"
+
+        with closing(self._connect()) as conn:
+            return dict(conn.execute(sql, params).fetchall())
+
+    def list_rolls(self, limit=100):
+        """
+        Most recent rolls with their detection counts.
+
+        Returns:
+            list of dicts (roll_id, started_at, ended_at, mode, source, detections)
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT r.*, (SELECT COUNT(*) FROM detections d WHERE d.roll_id = r.roll_id) AS detections "
+                "FROM rolls r ORDER BY started_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_stats(self):
+        """
+        Get writer statistics.
+
+        Returns:
+            dict with records_written, batches_written, queue_depth and last_error
+        """
+        return {
+            'records_written': self.records_written,
+            'batches_written': self.batches_written,
+            'queue_depth': self._queue.qsize(),
+            'last_error': self.last_error,
+        }
+
+    def close(self, timeout=10):
+        """Commit everything still queued and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
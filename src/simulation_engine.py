@@ -0,0 +1,433 @@
+"""
+Seeded, vectorized simulation engine for Open Textile Intelligence.
+
+FabricScanner.analyze_frame() used to draw every frame from the global
+`random` module and DetectionManager slept 100 ms per frame, so simulations
+were capped at 10 FPS and could not be replayed. SimulationEngine generates
+frames in NumPy blocks instead:
+
+- Defects come in bursts. The line alternates between normal stretches
+  (sporadic defects at defect_rate) and bursts (one fault repeating on
+  consecutive frames at burst_defect_rate, all of the same class). Stretch
+  lengths are geometric, i.e. a two-state Markov chain per frame.
+- Defect classes follow class_weights (stains and weaving faults are far
+  more common than holes).
+- The sequence depends only on the seed. Frames are generated in fixed
+  blocks of block_frames, each from its own generator seeded with
+  (seed, block number), so next_block() returns the same frames no matter
+  how the caller splits them into requests.
+
+Load test (no UI, optionally through the detection store):
+    python src/simulation_engine.py --frames 5000000 --seed 42 --db load.db
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+DEFECT_TYPES = (
+    "Leke",
+    "Delik",
+    "Dokuma Hatası",
+    "Renk Uyuşmazlığı",
+    "İplik Kopması",
+)
+
+# Relative frequency of each defect class (DEFECT_TYPES order)
+DEFAULT_CLASS_WEIGHTS = (0.35, 0.10, 0.25, 0.15, 0.15)
+
+# Frames generated per internal block (one generator per block)
+BLOCK_FRAMES = 65536
+
+
+class FrameBlock:
+    """
+    Consecutive simulated frames as parallel NumPy arrays.
+    """
+
+    def __init__(self, frame_index, is_defective, defect_class, confidence, in_burst):
+        """
+        Initialize block.
+
+        Args:
+            frame_index: (N,) int64 frame numbers
+            is_defective: (N,) bool
+            defect_class: (N,) int8 index into the engine's defect types
+                          (-1 for clean frames)
+            confidence: (N,) float32 detection confidence (0-1, 0 for clean frames)
+            in_burst: (N,) bool, frame lies in a defect burst
+        """
+        self.frame_index = frame_index
+        self.is_defective = is_defective
+        self.defect_class = defect_class
+        self.confidence = confidence
+        self.in_burst = in_burst
+
+    def __len__(self):
+        return len(self.frame_index)
+
+    def __getitem__(self, index):
+        """Sub-block for a slice (or index array)."""
+        return FrameBlock(
+            self.frame_index[index], self.is_defective[index], self.defect_class[index],
+            self.confidence[index], self.in_burst[index]
+        )
+
+    @classmethod
+    def concatenate(cls, blocks):
+        """
+        Join blocks in order.
+
+        Args:
+            blocks: Non-empty list of FrameBlock
+
+        Returns:
+            FrameBlock
+        """
+        if len(blocks) == 1:
+            return blocks[0]
+        return cls(*(
+            np.concatenate([getattr(block, name) for block in blocks])
+            for name in ('frame_index', 'is_defective', 'defect_class', 'confidence', 'in_burst')
+        ))
+
+    @property
+    def defect_count(self):
+        """Number of defective frames."""
+        return int(np.count_nonzero(self.is_defective))
+
+    def class_counts(self, num_classes):
+        """
+        Defects per class.
+
+        Args:
+            num_classes: Number of defect types
+
+        Returns:
+            np.ndarray (num_classes,) int64
+        """
+        return np.bincount(self.defect_class[self.is_defective], minlength=num_classes)
+
+
+class SimulationEngine:
+    """
+    Deterministic generator of simulated inspection frames.
+
+    Usage:
+        engine = SimulationEngine(seed=42)
+        for block in engine.blocks(1_000_000):
+            records = engine.to_records(block, defects_only=True)
+    """
+
+    def __init__(self, seed=None, defect_rate=0.05, burst_rate=0.02, mean_burst_frames=6.0,
+                 burst_defect_rate=0.8, defect_types=DEFECT_TYPES, class_weights=DEFAULT_CLASS_WEIGHTS,
+                 confidence_range=(0.85, 0.99), block_frames=BLOCK_FRAMES):
+        """
+        Initialize engine.
+
+        Args:
+            seed: Integer seed (None = random; the chosen seed is kept in
+                  self.seed so the run can be replayed)
+            defect_rate: Defect probability per frame outside bursts
+            burst_rate: Probability per normal frame that a burst starts
+                        (0 = no bursts)
+            mean_burst_frames: Mean burst length in frames
+            burst_defect_rate: Defect probability per frame inside a burst
+            defect_types: Defect class names
+            class_weights: Relative frequency of each defect class
+            confidence_range: (low, high) of the uniform detection confidence
+            block_frames: Frames per internal block; part of the sequence
+                          definition (same seed and block_frames = same frames)
+        """
+        if len(class_weights) != len(defect_types):
+            raise ValueError("class_weights needs one weight per defect type")
+        if mean_burst_frames < 1:
+            raise ValueError("mean_burst_frames must be at least 1")
+        for name, rate in (('defect_rate', defect_rate), ('burst_rate', burst_rate),
+                           ('burst_defect_rate', burst_defect_rate)):
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{name} must be in [0, 1]")
+
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+        self.seed = seed
+        self.defect_rate = defect_rate
+        self.burst_rate = burst_rate
+        self.mean_burst_frames = mean_burst_frames
+        self.burst_defect_rate = burst_defect_rate
+        self.defect_types = tuple(defect_types)
+        weights = np.asarray(class_weights, dtype=np.float64)
+        self.class_weights = weights / weights.sum()
+        self.confidence_range = confidence_range
+        self.block_frames = block_frames
+
+        # Record field lookup: defect_class -1 picks the trailing "-"
+        self._type_names = np.array(self.defect_types + ("-",), dtype=object)
+        self.reset()
+
+    def reset(self):
+        """Restart the sequence from its first frame."""
+        self.frames_generated = 0
+        self._blocks_generated = 0
+        self._buffer = None
+        self._buffer_pos = 0
+        # Markov chain state carried across blocks: the roll starts just
+        # after a (zero-length) burst, i.e. with a normal stretch
+        self._in_burst = True
+        self._run_left = 0
+        self._run_class = 0
+
+    @property
+    def expected_defect_rate(self):
+        """Long-run fraction of defective frames."""
+        if self.burst_rate <= 0:
+            return self.defect_rate
+        burst_share = self.mean_burst_frames / (1.0 / self.burst_rate + self.mean_burst_frames)
+        return burst_share * self.burst_defect_rate + (1.0 - burst_share) * self.defect_rate
+
+    def _stretches(self, rng, n):
+        """
+        Burst state and burst class of the next n frames.
+
+        Returns:
+            tuple (in_burst (n,) bool, run_class (n,) int8)
+        """
+        if self.burst_rate <= 0:
+            return np.zeros(n, dtype=bool), np.zeros(n, dtype=np.int8)
+
+        states = [np.array([self._in_burst])]
+        lengths = [np.array([self._run_left])]
+        classes = [np.array([self._run_class])]
+        covered = self._run_left
+        state = self._in_burst
+
+        while covered < n:
+            # Enough normal/burst pairs to cover the rest on average, plus slack
+            pairs = int((n - covered) / (1.0 / self.burst_rate + self.mean_burst_frames)) + 8
+            normal = rng.geometric(self.burst_rate, pairs)
+            burst = rng.geometric(1.0 / self.mean_burst_frames, pairs)
+            burst_class = rng.choice(len(self.defect_types), size=pairs, p=self.class_weights)
+
+            run_lengths = np.empty(2 * pairs, dtype=np.int64)
+            run_states = np.empty(2 * pairs, dtype=bool)
+            # Alternate, starting with the state that follows the current one
+            run_lengths[0::2], run_lengths[1::2] = (normal, burst) if state else (burst, normal)
+            run_states[0::2], run_states[1::2] = not state, state
+
+            states.append(run_states)
+            lengths.append(run_lengths)
+            classes.append(np.repeat(burst_class, 2))
+            covered += int(run_lengths.sum())
+            state = bool(run_states[-1])
+
+        states = np.concatenate(states)
+        lengths = np.concatenate(lengths)
+        classes = np.concatenate(classes).astype(np.int8)
+
+        # Cut the stretch that crosses the block end; the rest carries over
+        ends = np.cumsum(lengths)
+        last = int(np.searchsorted(ends, n))
+        self._in_burst = bool(states[last])
+        self._run_left = int(ends[last] - n)
+        self._run_class = int(classes[last])
+        lengths = lengths[:last + 1].copy()
+        lengths[last] -= self._run_left
+
+        return (np.repeat(states[:last + 1], lengths),
+                np.repeat(classes[:last + 1], lengths))
+
+    def _generate(self):
+        """Generate the next internal block."""
+        n = self.block_frames
+        rng = np.random.default_rng([self.seed, self._blocks_generated])
+        in_burst, run_class = self._stretches(rng, n)
+
+        is_defective = rng.random(n) < np.where(in_burst, self.burst_defect_rate, self.defect_rate)
+        sporadic_class = rng.choice(len(self.defect_types), size=n, p=self.class_weights).astype(np.int8)
+        defect_class = np.where(in_burst, run_class, sporadic_class)
+        defect_class[~is_defective] = -1
+
+        low, high = self.confidence_range
+        confidence = rng.uniform(low, high, n).astype(np.float32)
+        confidence[~is_defective] = 0.0
+
+        frame_index = np.arange(n, dtype=np.int64) + self._blocks_generated * n
+        self._blocks_generated += 1
+        return FrameBlock(frame_index, is_defective, defect_class, confidence, in_burst)
+
+    def next_block(self, num_frames):
+        """
+        The next num_frames frames of the sequence.
+
+        Args:
+            num_frames: Number of frames (> 0)
+
+        Returns:
+            FrameBlock
+        """
+        if num_frames <= 0:
+            raise ValueError("num_frames must be positive")
+
+        parts = []
+        needed = num_frames
+        while needed:
+            if self._buffer is None or self._buffer_pos == len(self._buffer):
+                self._buffer = self._generate()
+                self._buffer_pos = 0
+            take = min(needed, len(self._buffer) - self._buffer_pos)
+            parts.append(self._buffer[self._buffer_pos:self._buffer_pos + take])
+            self._buffer_pos += take
+            needed -= take
+
+        self.frames_generated += num_frames
+        return FrameBlock.concatenate(parts)
+
+    def blocks(self, total_frames, block_size=None):
+        """
+        Iterate over the next total_frames frames in blocks.
+
+        Args:
+            total_frames: Number of frames
+            block_size: Frames per yielded block (None = block_frames)
+
+        Yields:
+            FrameBlock
+        """
+        block_size = block_size or self.block_frames
+        remaining = total_frames
+        while remaining > 0:
+            size = min(block_size, remaining)
+            yield self.next_block(size)
+            remaining -= size
+
+    def frame_result(self, block, i):
+        """
+        One frame in FabricScanner.analyze_frame() format.
+
+        Args:
+            block: FrameBlock
+            i: Frame position in the block
+
+        Returns:
+            dict with detected (and type, confidence if defective)
+        """
+        if not block.is_defective[i]:
+            return {"detected": False}
+        return {
+            "detected": True,
+            "type": self.defect_types[block.defect_class[i]],
+            "confidence": float(block.confidence[i]),
+        }
+
+    def to_records(self, block, frame_id_prefix="SIM-", first_frame_id=10000,
+                   defects_only=False, timestamp=None):
+        """
+        Detection records of a block (the format DetectionManager emits and stores).
+
+        Args:
+            block: FrameBlock
+            frame_id_prefix: Prefix of the frame ids
+            first_frame_id: Frame id number of frame index 0
+            defects_only: Skip clean frames
+            timestamp: Display time (None = now)
+
+        Returns:
+            list of dicts with timestamp, frame_id, is_defective, status,
+            defect_type, confidence
+        """
+        if defects_only:
+            block = block[block.is_defective]
+        if timestamp is None:
+            timestamp = time.strftime("%H:%M:%S")
+
+        defective = block.is_defective.tolist()
+        return [
+            {
+                "timestamp": timestamp,
+                "frame_id": f"{frame_id_prefix}{first_frame_id + index}",
+                "is_defective": is_defective,
+                "status": "KUSUR" if is_defective else "TAMAM",
+                "defect_type": defect_type,
+                "confidence": confidence,
+            }
+            for index, is_defective, defect_type, confidence in zip(
+                block.frame_index.tolist(), defective,
+                self._type_names[block.defect_class].tolist(), block.confidence.tolist()
+            )
+        ]
+
+
+def run_load_test(frames, seed=None, db_path=None, defects_only=False, block_size=BLOCK_FRAMES):
+    """
+    Generate frames as fast as possible, optionally through a DetectionHistory.
+
+    Args:
+        frames: Number of frames
+        seed: Engine seed
+        db_path: SQLite detection store to write records to (None = generate only)
+        defects_only: Store only defective frames
+        block_size: Frames per block
+
+    Returns:
+        dict with seed, frames, defects, per-class counts and throughput
+    """
+    engine = SimulationEngine(seed=seed)
+    store = None
+    if db_path:
+        from detection_store import DetectionHistory
+        store = DetectionHistory(db_path, defects_only=defects_only)
+        store.start_roll(mode="SIMULATION", source=f"load test seed={engine.seed}")
+
+    counts = np.zeros(len(engine.defect_types), dtype=np.int64)
+    stored = 0
+    start = time.perf_counter()
+    try:
+        for block in engine.blocks(frames, block_size):
+            counts += block.class_counts(len(engine.defect_types))
+            if store is not None:
+                records = engine.to_records(block, defects_only=defects_only)
+                store.append_many(records)
+                stored += len(records)
+        generated = time.perf_counter() - start
+        if store is not None:
+            store.flush(timeout=None)
+    finally:
+        if store is not None:
+            store.end_roll()
+            store.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seed": engine.seed,
+        "frames": frames,
+        "defects": int(counts.sum()),
+        "defects_by_type": dict(zip(engine.defect_types, counts.tolist())),
+        "records_stored": stored,
+        "elapsed_s": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "producer_fps": frames / generated if generated > 0 else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Open Textile Intelligence - Yük Testi Simülasyonu"
+    )
+    parser.add_argument("--frames", type=int, default=1_000_000, help="Üretilecek kare sayısı")
+    parser.add_argument("--seed", type=int, help="Tohum değeri (aynı tohum = aynı kare dizisi)")
+    parser.add_argument("--db", type=str, help="Kayıtların yazılacağı SQLite veritabanı yolu")
+    parser.add_argument("--defects-only", action="store_true", help="Sadece kusurlu kareleri kaydet")
+    parser.add_argument("--block-size", type=int, default=BLOCK_FRAMES, help="Blok başına kare sayısı")
+    args = parser.parse_args()
+
+    report = run_load_test(args.frames, seed=args.seed, db_path=args.db,
+                           defects_only=args.defects_only, block_size=args.block_size)
+    print(f"🎲 Seed: {report['seed']}")
+    print(f"🧵 {report['frames']:,} kare, {report['defects']:,} kusur "
+          f"({report['defects'] / max(report['frames'], 1):.2%})")
+    for defect_type, count in report['defects_by_type'].items():
+        print(f"   {defect_type}: {count:,}")
+    if args.db:
+        print(f"💾 {report['records_stored']:,} kayıt yazıldı ({report['producer_fps']:,.0f} kare/s üretim)")
+    print(f"⚡ {report['elapsed_s']:.2f}s, {report['fps']:,.0f} kare/s")
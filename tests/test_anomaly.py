@@ -0,0 +1,179 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from synthetic_fabric import generate_fabric_frame
+from ml.anomaly import (
+    PatchEmbedder,
+    MemoryBank,
+    AnomalyDetector,
+    build_memory_bank,
+    greedy_coreset,
+)
+from ml.defect_detection.model import DefectDetectionModel
+from ml.fabric_classification.model import FabricClassificationModel
+from ml.pipeline import TextileInspectionPipeline
+from ml.shared.transforms import get_opencv_transform
+from ml.shared.utils import load_image_batch
+
+
+def clean_frames(count, seed=0):
+    return [
+        generate_fabric_frame(320, 240, "pamuk", seed=seed + i) for i in range(count)
+    ]
+
+
+def defect_frames(seed=2000):
+    defects = ["delik", "leke", "yirtik", "iplik_kopmasi"]
+    return [
+        generate_fabric_frame(320, 240, "pamuk", seed=seed + i, defect=d)
+        for i, d in enumerate(defects)
+    ]
+
+
+def calibrated_model(frames):
+    """
+    Random-init defect model with BatchNorm statistics estimated on fabric
+    frames (stands in for the ImageNet backbone, which tests cannot download).
+    """
+    torch.manual_seed(0)
+    model = DefectDetectionModel(pretrained=False)
+    for module in model.modules():
+        if isinstance(module, torch.nn.BatchNorm2d):
+            module.momentum = None  # cumulative average over the batch
+    model.train()
+    with torch.no_grad():
+        model(load_image_batch(frames, get_opencv_transform(224)))
+    return model.eval()
+
+
+class TestMemoryBank(unittest.TestCase):
+    def test_query_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        bank = MemoryBank(rng.normal(size=(500, 16)).astype(np.float32))
+        queries = rng.normal(size=(40, 16)).astype(np.float32)
+
+        distances, indices = bank.query(queries, k=3, chunk_size=16)
+
+        exact = np.linalg.norm(
+            queries[:, None, :] - bank.embeddings[None, :, :], axis=2
+        )
+        np.testing.assert_array_equal(indices, np.argsort(exact, axis=1)[:, :3])
+        np.testing.assert_allclose(
+            distances, np.sort(exact, axis=1)[:, :3], rtol=1e-4, atol=1e-4
+        )
+        np.testing.assert_allclose(
+            bank.patch_scores(queries, k=1), distances[:, 0], rtol=1e-6
+        )
+
+    def test_coreset_covers_every_cluster(self):
+        rng = np.random.default_rng(0)
+        centers = np.array([[0.0] * 8, [50.0] * 8, [-50.0] * 8], dtype=np.float32)
+        sizes = [1000, 200, 5]  # rare cluster must still be covered
+        points = np.concatenate(
+            [c + rng.normal(size=(n, 8)) for c, n in zip(centers, sizes)]
+        ).astype(np.float32)
+        labels = np.repeat([0, 1, 2], sizes)
+
+        selected = greedy_coreset(points, 3, projection_dim=None)
+
+        self.assertEqual(sorted(labels[selected]), [0, 1, 2])
+
+    def test_save_and_memory_mapped_load(self):
+        rng = np.random.default_rng(1)
+        bank = MemoryBank(
+            rng.normal(size=(100, 8)).astype(np.float32),
+            {"threshold": 2.5, "grid_size": 14},
+        )
+        queries = rng.normal(size=(10, 8)).astype(np.float32)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            bank.save(tmp)
+            loaded = MemoryBank.load(tmp)
+
+            self.assertIsInstance(loaded.embeddings, np.memmap)
+            self.assertEqual(loaded.metadata["threshold"], 2.5)
+            self.assertEqual(loaded.metadata["size"], 100)
+            np.testing.assert_allclose(
+                loaded.patch_scores(queries), bank.patch_scores(queries)
+            )
+
+
+class TestAnomalyDetection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        train = clean_frames(30)
+        cls.model = calibrated_model(train[:8])
+        cls.bank = build_memory_bank(PatchEmbedder(cls.model), train, coreset_ratio=0.1)
+
+    def test_bank_metadata(self):
+        self.assertEqual(
+            len(self.bank), int(24 * 14 * 14 * 0.1)
+        )  # 6 of 30 frames held out
+        self.assertEqual(
+            self.bank.embedding_dim, PatchEmbedder(self.model).embedding_dim
+        )
+        self.assertGreater(
+            self.bank.metadata["threshold"], self.bank.metadata["clean_score_max"]
+        )
+
+    def test_defects_score_above_clean_fabric(self):
+        detector = AnomalyDetector(self.model, self.bank)
+
+        clean = detector.detect_batch(clean_frames(4, seed=1000))
+        defective = detector.detect_batch(defect_frames())
+
+        self.assertFalse(any(r["defect_detected"] for r in clean))
+        self.assertTrue(all(r["defect_detected"] for r in defective))
+        self.assertTrue(all(r["defect_type"] == "Anomali" for r in defective))
+        self.assertEqual(defective[0]["anomaly_map"].shape, (14, 14))
+        self.assertLess(
+            max(r["anomaly_score"] for r in clean),
+            min(r["anomaly_score"] for r in defective),
+        )
+
+    def test_torchscript_backbone_rejected(self):
+        with self.assertRaises(ValueError):
+            PatchEmbedder(DefectDetectionModel(backbone=torch.nn.Identity()))
+
+    def test_pipeline_anomaly_mode(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            defect_weights = os.path.join(tmp, "defect.pth")
+            fabric_weights = os.path.join(tmp, "fabric.pth")
+            torch.save(self.model.state_dict(), defect_weights)
+            torch.save(
+                FabricClassificationModel(pretrained=False).state_dict(), fabric_weights
+            )
+            bank_dir = self.bank.save(os.path.join(tmp, "bank"))
+
+            pipeline = TextileInspectionPipeline(
+                defect_weights_path=defect_weights,
+                fabric_weights_path=fabric_weights,
+                device=torch.device("cpu"),
+                anomaly_bank=str(bank_dir),
+            )
+            results = pipeline.inspect_batch(
+                clean_frames(2, seed=1000) + defect_frames()[:2]
+            )
+
+            self.assertEqual(
+                [r["defect_detected"] for r in results], [False, False, True, True]
+            )
+            self.assertIsNotNone(results[0]["anomaly_score"])
+            self.assertTrue(pipeline.get_model_info()["anomaly_mode"])
+            self.assertIn("anomaly_knn", pipeline.get_performance_stats()["stages"])
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import unittest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from constants import YARDS_PER_FRAME, CAMERA_VIEW_LENGTH_YARDS
+from defect_tracker import DefectTracker, detection_location
+
+
+def _detection(
+    frame, defect_type="Leke", confidence=80.0, location=None, severity="MEDIUM"
+):
+    return {
+        "timestamp": "12:00:00",
+        "frame_id": f"CAM-{frame:05d}",
+        "is_defective": True,
+        "status": "KUSUR",
+        "defect_type": defect_type,
+        "confidence": confidence,
+        "severity": severity,
+        "location": location,
+    }
+
+
+class TestDefectTracker(unittest.TestCase):
+    def _run(self, tracker, frames, camera_id=0):
+        """Feed {frame_number: [detections]} for a contiguous frame range."""
+        events = []
+        for frame in range(min(frames), max(frames) + 1):
+            events += tracker.update(frame, frames.get(frame, []), camera_id)
+        return events
+
+    def test_consecutive_frames_become_one_event(self):
+        """Test if a defect seen in 30 frames is reported once, with its span and peak."""
+        # 15 yards in view at 0.5 yards/frame: a defect stays 30 frames
+        tracker = DefectTracker(max_gap_frames=3, view_length_yards=15.0)
+        frames = {n: [_detection(n, confidence=50.0 + n)] for n in range(10, 40)}
+        frames.update({n: [] for n in range(40, 45)})
+
+        events = self._run(tracker, frames)
+
+        self.assertEqual(len(events), 1)
+        event = events[0]
+        self.assertEqual((event["first_frame"], event["last_frame"]), (10, 39))
+        self.assertEqual(event["frame_count"], 30)
+        self.assertEqual(event["peak_confidence"], 89.0)
+        self.assertEqual(event["frame_id"], "CAM-00010…00039")
+        self.assertNotIn("location", event)
+        self.assertEqual(tracker.get_stats()["reduction"], 30.0)
+
+    def test_gap_tolerance(self):
+        """Test if short detection gaps are bridged and long ones split the defect."""
+        tracker = DefectTracker(max_gap_frames=2)
+        frames = {
+            1: [_detection(1)],
+            4: [_detection(4)],  # 2 missed frames: same defect
+            8: [_detection(8)],
+            20: [],
+        }  # 3 missed frames: new defect
+
+        events = self._run(tracker, frames)
+
+        self.assertEqual(
+            [(e["first_frame"], e["last_frame"]) for e in events], [(1, 4), (8, 8)]
+        )
+
+    def test_dropped_frames_are_not_misses(self):
+        """Test if capture numbers skipped by queue drops do not split a defect."""
+        tracker = DefectTracker(max_gap_frames=3, view_length_yards=25.0)
+
+        # A backlog drops 4 frames between every analyzed frame
+        events = []
+        for frame in range(0, 50, 5):
+            events += tracker.update(frame, [_detection(frame)])
+        self.assertEqual(events, [])
+        self.assertEqual(tracker.defect_count, 1)
+
+        # Analyzed frames without the defect still close the track
+        for frame in range(50, 70, 5):
+            events += tracker.update(frame, [])
+        self.assertEqual(
+            [(e["first_frame"], e["last_frame"], e["frame_count"]) for e in events],
+            [(0, 45, 10)],
+        )
+
+    def test_long_run_is_split_by_fabric_advance(self):
+        """Test if an unlocated same-class run longer than the view is several events."""
+        tracker = DefectTracker(max_gap_frames=3)  # 2 yd view, 0.5 yd/frame
+        self.assertEqual(tracker.max_span_frames, 7)
+
+        events = []
+        for frame in range(3000):
+            events += tracker.update(frame, [_detection(frame)])
+        events += tracker.flush()
+
+        self.assertGreater(len(events), 300)
+        self.assertEqual(sum(e["frame_count"] for e in events), 3000)
+        self.assertTrue(all(e["last_frame"] - e["first_frame"] <= 7 for e in events))
+        self.assertLessEqual(max(e["length_yards"] for e in events), 3.5)
+
+    def test_class_and_camera_separate_tracks(self):
+        """Test if different defect classes and cameras are never merged."""
+        tracker = DefectTracker()
+        tracker.update(
+            1, [_detection(1, "Leke"), _detection(1, "Delik", severity="HIGH")]
+        )
+        tracker.update(1, [_detection(1, "Leke")], camera_id=1)
+        tracker.update(2, [_detection(2, "Leke")])
+
+        self.assertEqual(tracker.defect_count, 3)
+        events = tracker.flush()
+        self.assertEqual(
+            sorted((e["camera_id"], e["defect_type"]) for e in events),
+            [(0, "Delik"), (0, "Leke"), (1, "Leke")],
+        )
+        self.assertEqual(tracker.defect_count, 3)
+
+    def test_location_follows_fabric_advance(self):
+        """Test if located detections match only at the same roll position."""
+        tracker = DefectTracker(
+            yards_per_frame=0.1,
+            view_length_yards=1.0,
+            position_tolerance_yards=0.05,
+            lateral_tolerance=0.1,
+        )
+
+        # One stain moving down the view 0.1 per frame, and a second stain at another x
+        for n in range(5):
+            tracker.update(
+                n,
+                [
+                    _detection(n, location=(0.2, 0.1 + 0.1 * n)),
+                    _detection(n, location=(0.7, 0.1 + 0.1 * n)),
+                ],
+            )
+        # A stain at x=0.2 that is further along the roll (different position)
+        tracker.update(5, [_detection(5, location=(0.2, 0.9))])
+
+        events = tracker.flush()
+        self.assertEqual(sorted(e["frame_count"] for e in events), [1, 5, 5])
+        for event in events:
+            if event["frame_count"] == 5:
+                self.assertAlmostEqual(event["position_yards"], -0.1)
+
+    def test_default_view_follows_defect_through_frame(self):
+        """Test if, with the camera defaults, a defect crossing the view is one event."""
+        tracker = DefectTracker()
+        self.assertEqual(tracker.view_length_yards, CAMERA_VIEW_LENGTH_YARDS)
+
+        # The fabric advances a quarter of the view per frame; a second stain
+        # at the same x enters 1 yard behind the first one
+        step = YARDS_PER_FRAME / CAMERA_VIEW_LENGTH_YARDS
+        frames = {}
+        for n in range(6):
+            frames[n] = []
+            if n < 4:
+                frames[n].append(_detection(n, location=(0.5, 0.1 + step * n)))
+            if n >= 2:
+                frames[n].append(_detection(n, location=(0.5, 0.1 + step * (n - 2))))
+        frames.update({n: [] for n in range(6, 12)})
+
+        events = self._run(tracker, frames)
+
+        self.assertEqual(
+            [(e["first_frame"], e["last_frame"], e["frame_count"]) for e in events],
+            [(0, 3, 4), (2, 5, 4)],
+        )
+        self.assertAlmostEqual(
+            events[1]["position_yards"] - events[0]["position_yards"], 1.0
+        )
+
+        with self.assertRaises(ValueError):
+            DefectTracker(yards_per_frame=0.5, view_length_yards=0.5)
+
+    def test_detection_location(self):
+        """Test if the strongest box centre is normalized to the frame size."""
+        result = {
+            "defect_boxes": [
+                {"x": 100, "y": 50, "width": 100, "height": 50, "score": 0.9}
+            ]
+        }
+        self.assertEqual(detection_location(result, (500, 1000, 3)), (0.15, 0.15))
+        self.assertIsNone(detection_location({}, (500, 1000, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import unittest
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from src.defect_scanner import FabricScanner
+from src.detection_store import DetectionHistory
+
+
+def _detection(frame, defect_type="Leke", confidence=0.9, is_defective=True):
+    return {
+        "timestamp": "12:00:00",
+        "frame_id": f"SIM-{frame}",
+        "is_defective": is_defective,
+        "status": "KUSUR" if is_defective else "TAMAM",
+        "defect_type": defect_type if is_defective else "-",
+        "confidence": confidence,
+    }
+
+
+class TestDetectionHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "detections.db"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batched_writes_survive_reopen(self):
+        store = DetectionHistory(self.db_path, batch_size=50, flush_interval=0.05)
+        roll_id = store.start_roll(mode="SIMULATION", source="test")
+        for frame in range(120):
+            store.append(_detection(frame))
+        self.assertTrue(store.flush())
+
+        stats = store.get_stats()
+        self.assertEqual(stats["records_written"], 120)
+        self.assertLess(stats["batches_written"], 120)  # many records per transaction
+        store.end_roll()
+        store.close()
+
+        with DetectionHistory(self.db_path) as reopened:
+            records = reopened.query(roll_id=roll_id)
+            self.assertEqual(len(records), 120)
+            self.assertEqual(records[0]["frame_id"], "SIM-119")  # newest first
+            self.assertEqual(
+                records[0]["timestamp"], "12:00:00"
+            )  # extra field round-trips
+            self.assertIs(records[0]["is_defective"], True)
+
+            rolls = reopened.list_rolls()
+            self.assertEqual(rolls[0]["roll_id"], roll_id)
+            self.assertEqual(rolls[0]["detections"], 120)
+            self.assertIsNotNone(rolls[0]["ended_at"])
+
+    def test_wal_mode_and_indexes(self):
+        DetectionHistory(self.db_path).close()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            plan = " ".join(
+                str(row)
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM detections WHERE defect_type = ? AND ts >= ?",
+                    ("Leke", 0),
+                )
+            )
+            self.assertIn("idx_detections_type_ts", plan)
+        finally:
+            conn.close()
+
+    def test_query_filters(self):
+        with DetectionHistory(self.db_path, defects_only=False) as store:
+            first = store.start_roll()
+            store.append(_detection(1, "Leke"), timestamp=100.0)
+            store.append(_detection(2, "Delik"), timestamp=200.0)
+            store.append(_detection(3, is_defective=False), timestamp=250.0)
+            second = store.start_roll()
+            store.append(_detection(4, "Leke"), timestamp=300.0)
+            store.flush()
+
+            self.assertEqual(len(store.query(roll_id=first)), 2)
+            self.assertEqual(len(store.query(roll_id=first, defective_only=False)), 3)
+            self.assertEqual(
+                [r["frame_id"] for r in store.query(defect_type="Leke")],
+                ["SIM-4", "SIM-1"],
+            )
+            self.assertEqual(
+                [r["frame_id"] for r in store.query(since=150.0, until=300.0)],
+                ["SIM-2"],
+            )
+            self.assertEqual(store.query(roll_id=second)[0]["roll_id"], second)
+            self.assertEqual(store.count_by_type(), {"Leke": 2, "Delik": 1})
+
+    def test_clean_frames_dropped_and_queue_bounded(self):
+        """Test if only defects are stored by default and appends wait for a full queue."""
+        with DetectionHistory(self.db_path, max_queue=2) as store:
+            store.start_roll()
+            store.flush()
+
+            write_batch = store._write_batch
+            depths = []
+
+            def slow_write_batch(conn, batch):
+                time.sleep(0.01)
+                write_batch(conn, batch)
+
+            with mock.patch.object(store, "_write_batch", slow_write_batch):
+                for frame in range(20):
+                    store.append_many(
+                        [_detection(frame), _detection(frame, is_defective=False)]
+                    )
+                    store.append(_detection(frame, is_defective=False))
+                    depths.append(store.get_stats()["queue_depth"])
+                store.flush()
+
+            self.assertLessEqual(max(depths), 2)
+            self.assertEqual(store.get_stats()["records_written"], 20)
+            self.assertEqual(len(store.query(defective_only=False)), 20)
+
+    def test_retention_deletes_old_detections(self):
+        with DetectionHistory(self.db_path, retention_days=1) as store:
+            store.append(_detection(1), timestamp=time.time() - 3 * 86400)
+            store.append(_detection(2))
+            store.flush()
+
+            self.assertEqual(store.apply_retention(), 1)
+            self.assertEqual([r["frame_id"] for r in store.query()], ["SIM-2"])
+
+    def test_read_connections_are_closed(self):
+        """Test if queries close their connections instead of leaving them to the GC."""
+        with DetectionHistory(self.db_path, retention_days=1) as store:
+            store.append(_detection(1))
+            store.flush()
+
+            opened = []
+            connect = store._connect
+
+            def tracking_connect():
+                conn = connect()
+                opened.append(conn)
+                return conn
+
+            with mock.patch.object(store, "_connect", tracking_connect):
+                for _ in range(20):
+                    store.query()
+                    store.count_by_type()
+                    store.list_rolls()
+                    store.apply_retention()
+
+            self.assertEqual(len(opened), 80)
+            for conn in opened:
+                with self.assertRaises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
+
+    def test_append_after_close_raises(self):
+        store = DetectionHistory(self.db_path)
+        store.close()
+        with self.assertRaises(RuntimeError):
+            store.append(_detection(1))
+
+        # Nothing can be pending any more: flush must not wait for the timeout
+        started = time.monotonic()
+        self.assertTrue(store.flush(timeout=5))
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+class TestScannerPersistence(unittest.TestCase):
+    def test_record_detection_persists_and_bounds_history(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with DetectionHistory(Path(tmp) / "detections.db") as store:
+                scanner = FabricScanner(store=store, history_size=5)
+                for frame in range(8):
+                    scanner.record_detection(_detection(frame))
+                store.flush()
+
+                self.assertEqual(len(scanner.detection_history), 5)
+                self.assertEqual(len(store.query()), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
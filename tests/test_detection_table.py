@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from PySide6.QtCore import Qt, QCoreApplication
+
+from ui.detection_table import DetectionStore, DetectionTableModel
+
+
+def make_detection(i):
+    return {
+        "timestamp": "12:00:00",
+        "frame_id": f"CAM-{i:05d}",
+        "status": "KUSUR",
+        "defect_type": "Leke",
+        "confidence": 0.9,
+    }
+
+
+class TestDetectionStore(unittest.TestCase):
+    def test_capped_ring(self):
+        """Test if the store keeps only the newest rows in order."""
+        store = DetectionStore(capacity=3)
+        evicted = store.append_many([make_detection(i) for i in range(5)])
+
+        self.assertEqual(evicted, 2)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(
+            [store.row(r)[1] for r in range(3)], ["CAM-00002", "CAM-00003", "CAM-00004"]
+        )
+        self.assertAlmostEqual(store.row(0)[4], 90.0, places=4)
+        self.assertEqual(store.sequence(0), 2)
+
+
+class TestDetectionTableModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def test_batched_append_and_highlight(self):
+        """Test if a batch is appended at once and only it is highlighted."""
+        model = DetectionTableModel(capacity=4)
+        inserts = []
+        model.rowsInserted.connect(
+            lambda parent, first, last: inserts.append((first, last))
+        )
+
+        model.append_detections([make_detection(i) for i in range(3)])
+        model.append_detections([make_detection(i) for i in range(3, 6)])
+
+        self.assertEqual(model.rowCount(), 4)
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(model.data(model.index(0, 1)), "CAM-00002")
+        self.assertEqual(model.data(model.index(3, 4)), "90.0%")
+
+        # Rows 1-3 are the latest batch, row 0 is from the previous one
+        self.assertIsNone(model.data(model.index(0, 0), Qt.BackgroundRole))
+        self.assertIsNotNone(model.data(model.index(3, 0), Qt.BackgroundRole))
+
+        model._clear_highlight()
+        self.assertIsNone(model.data(model.index(3, 0), Qt.BackgroundRole))
+
+        model.clear()
+        self.assertEqual(model.rowCount(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from constants import DropPolicy
+from frame_buffer import FrameRingBuffer
+
+
+class TestFrameRingBuffer(unittest.TestCase):
+    def test_drop_oldest(self):
+        """Test if a full buffer evicts its oldest frames."""
+        buffer = FrameRingBuffer(capacity=3, drop_policy=DropPolicy.DROP_OLDEST)
+        for i in range(5):
+            buffer.put(i)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.frames_dropped, 2)
+        self.assertEqual([buffer.get(timeout=0) for _ in range(3)], [2, 3, 4])
+
+    def test_keep_latest(self):
+        """Test if KEEP_LATEST hands out only the newest frame."""
+        buffer = FrameRingBuffer(capacity=4, drop_policy=DropPolicy.KEEP_LATEST)
+        for i in range(3):
+            buffer.put(i)
+
+        self.assertEqual(buffer.get(timeout=0), 2)
+        self.assertEqual(buffer.frames_dropped, 2)
+        self.assertEqual(len(buffer), 0)
+
+    def test_close_wakes_consumers(self):
+        """Test if close() releases a consumer blocked in get()."""
+        buffer = FrameRingBuffer(capacity=2)
+        results = []
+        consumer = threading.Thread(target=lambda: results.append(buffer.get()))
+        consumer.start()
+
+        buffer.close()
+        consumer.join(timeout=2)
+
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(results, [None])
+        self.assertFalse(buffer.put("late frame"))
+
+    def test_stats(self):
+        """Test if get_stats reports depth and counters."""
+        buffer = FrameRingBuffer(capacity=2)
+        buffer.put("a")
+        stats = buffer.get_stats()
+        self.assertEqual(stats["depth"], 1)
+        self.assertEqual(stats["capacity"], 2)
+        self.assertEqual(stats["frames_put"], 1)
+        self.assertEqual(stats["drop_policy"], "DROP_OLDEST")
+
+
+if __name__ == "__main__":
+    unittest.main()
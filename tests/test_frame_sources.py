@@ -0,0 +1,202 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from frame_sources import (
+    FrameSourceError,
+    ImageDirectorySource,
+    RawFrameDumpSource,
+    SyntheticFrameSource,
+    VideoFileSource,
+    create_frame_source,
+    write_frame_dump,
+)
+from synthetic_fabric import generate_fabric_frames
+
+
+class TestFrameSources(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.frames = list(generate_fabric_frames(4, 80, 60, seed=5))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_synthetic_source_is_deterministic(self):
+        """Test if synthetic sources replay the same seeded sequence."""
+        with SyntheticFrameSource(
+            80, 60, seed=5, defect_rate=0.0, count=6, cache_size=4
+        ) as source:
+            frames = list(source.frames())
+
+        self.assertEqual(len(frames), 6)
+        np.testing.assert_array_equal(frames[0], self.frames[0])
+        np.testing.assert_array_equal(frames[3], self.frames[3])
+        self.assertIs(frames[4], frames[0])  # cached frames are cycled
+
+    def test_video_file_source_loops(self):
+        """Test if a video source ends at EOF, or restarts when looping."""
+        path = self.root / "roll.avi"
+        writer = cv2.VideoWriter(
+            str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (80, 60)
+        )
+        for frame in self.frames:
+            writer.write(frame)
+        writer.release()
+
+        with VideoFileSource(path) as source:
+            self.assertEqual(len(list(source.frames())), 4)
+            self.assertAlmostEqual(source.native_fps, 10.0)
+
+        with VideoFileSource(path, loop=True) as source:
+            self.assertEqual(len(list(source.frames(max_frames=10))), 10)
+
+        with self.assertRaises(FrameSourceError):
+            VideoFileSource(self.root / "missing.avi").open()
+
+    def test_image_directory_skips_unreadable(self):
+        """Test if image folders are read in name order, skipping bad files."""
+        for i, frame in enumerate(self.frames):
+            cv2.imwrite(str(self.root / f"{i:02d}.png"), frame)
+        (self.root / "05.png").write_bytes(b"broken")
+
+        with ImageDirectorySource(self.root) as source:
+            frames = list(source.frames())
+
+        self.assertEqual(len(frames), 4)
+        np.testing.assert_array_equal(frames[2], self.frames[2])
+
+    def test_raw_dump_is_memory_mapped(self):
+        """Test if .npy and headerless dumps return read-only mapped frames."""
+        npy_path = write_frame_dump(self.root / "dump.npy", self.frames)
+        raw_path = self.root / "dump.raw"
+        np.stack(self.frames).tofile(raw_path)
+
+        for source in (
+            RawFrameDumpSource(npy_path),
+            RawFrameDumpSource(raw_path, width=80, height=60),
+        ):
+            with source:
+                frames = list(source.frames())
+                self.assertEqual(len(frames), 4)
+                np.testing.assert_array_equal(frames[1], self.frames[1])
+                self.assertFalse(frames[1].flags.writeable)
+                self.assertIsInstance(frames[1].base, np.memmap)
+
+        with self.assertRaises(FrameSourceError):
+            RawFrameDumpSource(raw_path, width=81, height=60).open()
+
+    def test_frames_paced_to_target_fps(self):
+        """Test if frames() honours target_fps."""
+        with SyntheticFrameSource(32, 32, count=5, target_fps=50) as source:
+            start = time.perf_counter()
+            list(source.frames())
+            elapsed = time.perf_counter() - start
+
+        self.assertGreaterEqual(elapsed, 4 / 50 * 0.9)
+
+    def test_create_frame_source(self):
+        """Test if source specs map to the right source types."""
+        source = create_frame_source("synthetic:320x240", target_fps=15)
+        self.assertIsInstance(source, SyntheticFrameSource)
+        self.assertEqual(
+            (source.width, source.height, source.target_fps), (320, 240, 15)
+        )
+
+        self.assertIsInstance(create_frame_source(str(self.root)), ImageDirectorySource)
+        self.assertIsInstance(
+            create_frame_source("rtsp://10.0.0.5/stream"), VideoFileSource
+        )
+        self.assertTrue(create_frame_source("0").is_live)
+
+
+class TestCameraManagerWithSource(unittest.TestCase):
+    def test_capture_loop_runs_without_camera(self):
+        """Test if CameraManager captures from a synthetic source until it ends."""
+        from PySide6.QtCore import QCoreApplication
+        from camera_manager import CameraManager
+
+        app = QCoreApplication.instance() or QCoreApplication([])
+        source = SyntheticFrameSource(64, 48, count=8, cache_size=2)
+        manager = CameraManager(
+            duration_seconds=30, frame_source=source, preview_size=(32, 24)
+        )
+
+        events = []
+        manager.camera_opened.connect(lambda ok: events.append(("opened", ok)))
+        manager.camera_error.connect(lambda msg: events.append(("error", msg)))
+        manager.scan_complete.connect(lambda: events.append(("complete", None)))
+
+        manager.run()  # capture loop in this thread
+        app.processEvents()
+
+        self.assertEqual(manager.frame_count, 8)
+        self.assertEqual(events, [("opened", True), ("complete", None)])
+
+    def test_shared_pipeline_is_serialized(self):
+        """Test if inference workers only call a thread-safe pipeline concurrently."""
+        from camera_manager import CameraManager
+
+        class FakePipeline:
+            thread_safe = False
+
+            def __init__(self):
+                self.active = 0
+                self.max_active = 0
+                self.lock = threading.Lock()
+
+            def inspect_frame(self, frame):
+                with self.lock:
+                    self.active += 1
+                    self.max_active = max(self.max_active, self.active)
+                time.sleep(0.01)
+                with self.lock:
+                    self.active -= 1
+                return {
+                    "defect_detected": False,
+                    "defect_type": "Kusur Yok",
+                    "defect_confidence": 0.0,
+                    "fabric_type": "Pamuk",
+                    "fabric_confidence": 90.0,
+                    "is_structural": False,
+                    "severity": "NONE",
+                    "inference_time_ms": 10.0,
+                }
+
+        frame = np.zeros((24, 32, 3), dtype=np.uint8)
+        for thread_safe, serialized in ((False, True), (True, False)):
+            pipeline = FakePipeline()
+            pipeline.thread_safe = thread_safe
+            manager = CameraManager(
+                ml_pipeline=pipeline,
+                num_inference_workers=3,
+                frame_source=SyntheticFrameSource(32, 24, count=1),
+            )
+            workers = [
+                threading.Thread(
+                    target=lambda: [
+                        manager._analyze_frame_with_ml(frame, n) for n in range(5)
+                    ]
+                )
+                for _ in range(3)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            self.assertEqual(pipeline.max_active == 1, serialized)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+import os
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from inference_scheduler import InferenceScheduler
+from frame_sources import SyntheticFrameSource
+
+
+class _FakePipeline:
+    """Records the batches it is given; frames with a bright pixel are defects."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def inspect_batch(self, cv_images):
+        with self._lock:
+            self.batches.append(len(cv_images))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [
+            {
+                "defect_detected": bool(img[0, 0, 0] == 255),
+                "defect_type": "Delik",
+                "defect_confidence": 90.0,
+                "is_structural": True,
+                "severity": "HIGH",
+                "fabric_type": "Pamuk",
+                "fabric_confidence": 80.0,
+                "inference_time_ms": 1.0,
+            }
+            for img in cv_images
+        ]
+
+
+def _frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+class TestInferenceScheduler(unittest.TestCase):
+    def _scheduler(self, pipeline, batch_size=4, queue_size=8):
+        routed = []
+        scheduler = InferenceScheduler(
+            pipeline,
+            lambda cam, packet, result: routed.append((cam, packet[0], result)),
+            batch_size=batch_size,
+            queue_size=queue_size,
+        )
+        for camera_id in range(3):
+            scheduler.add_camera(camera_id)
+        return scheduler, routed
+
+    def test_batches_interleave_cameras(self):
+        """Test if a busy camera cannot fill a batch while others wait."""
+        scheduler, _ = self._scheduler(_FakePipeline())
+        for n in range(6):
+            scheduler.submit(0, (n, _frame(0)))
+        scheduler.submit(1, (0, _frame(0)))
+        scheduler.submit(2, (0, _frame(0)))
+
+        batch = [camera_id for camera_id, _ in scheduler.next_batch()]
+        self.assertEqual(batch, [0, 1, 2, 0])
+
+        # The next batch starts with the next camera in the rotation
+        scheduler.submit(1, (1, _frame(0)))
+        batch = [camera_id for camera_id, _ in scheduler.next_batch()]
+        self.assertEqual(batch, [1, 0, 0, 0])
+
+    def test_results_routed_per_camera(self):
+        """Test if every result goes back to the camera that captured it."""
+        pipeline = _FakePipeline()
+        scheduler, routed = self._scheduler(pipeline, batch_size=3)
+        for camera_id in range(3):
+            for n in range(2):
+                scheduler.submit(camera_id, (n, _frame(255 if camera_id == 1 else 0)))
+
+        scheduler.start()
+        scheduler.stop(timeout=5)
+
+        self.assertEqual(len(routed), 6)
+        self.assertEqual(pipeline.batches, [3, 3])
+        for camera_id, _, result in routed:
+            self.assertEqual(result["defect_detected"], camera_id == 1)
+
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["frames_inspected"], 6)
+        self.assertEqual(stats["average_batch_size"], 3.0)
+        self.assertEqual(stats["cameras"][2]["frames_inspected"], 2)
+
+    def test_pipeline_failure_reported(self):
+        """Test if a failing batch reports the exception for each frame."""
+        scheduler, routed = self._scheduler(_FakePipeline(fail=True))
+        scheduler.submit(0, (1, _frame(0)))
+        scheduler.submit(2, (1, _frame(0)))
+
+        self.assertEqual(scheduler.run_once(timeout=0), 2)
+        self.assertTrue(
+            all(isinstance(result, RuntimeError) for _, _, result in routed)
+        )
+
+
+class TestMultiCameraManager(unittest.TestCase):
+    def test_cameras_share_one_pipeline(self):
+        """Test if all cameras are inspected by one pipeline and tagged by camera."""
+        from PySide6.QtCore import QCoreApplication
+        from multi_camera_manager import MultiCameraManager
+
+        app = QCoreApplication.instance() or QCoreApplication([])
+        pipeline = _FakePipeline()
+        sources = [
+            SyntheticFrameSource(32, 24, seed=i, count=4, cache_size=2)
+            for i in range(3)
+        ]
+        manager = MultiCameraManager(
+            sources,
+            duration_seconds=30,
+            ml_pipeline=pipeline,
+            queue_size=16,
+            preview_size=(16, 12),
+        )
+
+        completed = []
+        manager.scan_complete.connect(lambda: completed.append(True))
+
+        manager.run()  # orchestration in this thread
+        app.processEvents()
+
+        self.assertEqual(completed, [True])
+        self.assertEqual(manager.frame_counts, [4, 4, 4])
+        self.assertEqual(manager.analyzed_counts, [4, 4, 4])
+        self.assertEqual(sum(pipeline.batches), 12)
+
+        stats = manager.get_queue_stats()
+        self.assertEqual(stats["capture"]["frames_captured"], 12)
+        self.assertEqual(stats["cameras"][1]["frames_inspected"], 4)
+
+    def test_read_error_stops_only_that_camera(self):
+        """Test if a source that raises is reported and the other cameras finish."""
+        from PySide6.QtCore import QCoreApplication
+        from multi_camera_manager import MultiCameraManager
+
+        class FailingSource(SyntheticFrameSource):
+            def read(self):
+                if self.reads >= 2:
+                    raise RuntimeError("decode error")
+                self.reads += 1
+                return super().read()
+
+        app = QCoreApplication.instance() or QCoreApplication([])
+        failing = FailingSource(32, 24, seed=1, count=4, cache_size=2)
+        failing.reads = 0
+        sources = [
+            SyntheticFrameSource(32, 24, seed=0, count=4, cache_size=2),
+            failing,
+        ]
+        manager = MultiCameraManager(
+            sources, duration_seconds=30, ml_pipeline=_FakePipeline(), queue_size=16
+        )
+
+        errors = []
+        manager.camera_error.connect(errors.append)
+        manager.run()
+        app.processEvents()
+
+        self.assertEqual(manager.frame_counts, [4, 2])
+        self.assertEqual(len(errors), 1)
+        self.assertIn(failing.describe(), errors[0])
+        self.assertIn("decode error", errors[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import csv
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import cv2
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from inspect_cli import ResultWriter, collect_inputs, run_inspection
+from synthetic_fabric import generate_fabric_frames
+
+
+class _FakePipeline:
+    """Stands in for TextileInspectionPipeline (records batch sizes and rolls)."""
+
+    def __init__(self):
+        self.batches = []
+        self.calls = []
+
+    def start_roll(self):
+        self.calls.append("roll")
+
+    def inspect_batch(self, cv_images):
+        self.batches.append(len(cv_images))
+        self.calls.append(len(cv_images))
+        return [
+            {
+                "defect_detected": img.mean() < 150,
+                "defect_type": "Leke",
+                "defect_confidence": 70.0,
+                "severity": "MEDIUM",
+                "is_structural": False,
+                "fabric_type": "Pamuk",
+                "fabric_confidence": 90.0,
+                "inference_time_ms": 1.0,
+            }
+            for img in cv_images
+        ]
+
+
+class TestInspectCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        (root / "roll" / "sub").mkdir(parents=True)
+
+        frames = list(generate_fabric_frames(5, 96, 64, seed=1))
+        for i, frame in enumerate(frames):
+            cv2.imwrite(str(root / "roll" / f"{i}.png"), frame)
+        cv2.imwrite(str(root / "roll" / "sub" / "deep.jpg"), frames[0])
+        (root / "roll" / "broken.png").write_bytes(b"not an image")
+        (root / "roll" / "notes.txt").write_text("ignored")
+
+        writer = cv2.VideoWriter(
+            str(root / "line.avi"), cv2.VideoWriter_fourcc(*"MJPG"), 10, (96, 64)
+        )
+        for frame in generate_fabric_frames(7, 96, 64, seed=2):
+            writer.write(frame)
+        writer.release()
+        self.root = root
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_collect_inputs(self):
+        """Test if directories, recursion and globs are expanded by file type."""
+        images, videos = collect_inputs(
+            [str(self.root / "roll"), str(self.root / "*.avi")]
+        )
+        self.assertEqual(len(images), 6)  # 5 frames + broken.png, no sub-dir
+        self.assertEqual([Path(v).name for v in videos], ["line.avi"])
+
+        images, _ = collect_inputs([str(self.root / "roll")], recursive=True)
+        self.assertEqual(len(images), 7)
+
+        with self.assertRaises(FileNotFoundError):
+            collect_inputs([str(self.root / "missing_*.png")])
+
+    def test_run_inspection_streams_jsonl(self):
+        """Test if images and strided video frames are batched and written."""
+        images, videos = collect_inputs(
+            [str(self.root / "roll"), str(self.root / "line.avi")]
+        )
+        pipeline = _FakePipeline()
+        output = self.root / "out.jsonl"
+
+        with ResultWriter(str(output)) as writer:
+            summary = run_inspection(
+                pipeline,
+                images,
+                videos,
+                writer,
+                batch_size=2,
+                decode_threads=2,
+                video_stride=3,
+            )
+
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        video_records = [r for r in records if r["source"].endswith("line.avi")]
+
+        self.assertEqual(summary["frames"], 5 + 3)
+        self.assertEqual(len(records), summary["frames"])
+        self.assertEqual([Path(p).name for p in summary["failed"]], ["broken.png"])
+        self.assertEqual([r["frame_index"] for r in video_records], [0, 3, 6])
+        self.assertTrue(all(size <= 2 for size in pipeline.batches))
+
+    def test_each_input_is_a_roll(self):
+        """Test if the image set and every video start a new roll."""
+        images, videos = collect_inputs(
+            [str(self.root / "roll" / "*.png"), str(self.root / "line.avi")]
+        )
+        videos = videos * 2  # two recordings
+        pipeline = _FakePipeline()
+
+        with ResultWriter(str(self.root / "out.jsonl")) as writer:
+            run_inspection(pipeline, images, videos, writer, batch_size=4)
+
+        self.assertEqual(pipeline.calls, ["roll", 4, 1, "roll", 4, 3, "roll", 4, 3])
+
+        # No images: no empty roll for them
+        pipeline = _FakePipeline()
+        with ResultWriter(str(self.root / "out.jsonl")) as writer:
+            run_inspection(pipeline, [], videos[:1], writer, batch_size=8)
+        self.assertEqual(pipeline.calls, ["roll", 7])
+
+    def test_csv_output(self):
+        """Test if .csv outputs get a header and one row per frame."""
+        images, _ = collect_inputs([str(self.root / "roll" / "*.png")])
+        output = self.root / "out.csv"
+
+        with ResultWriter(str(output)) as writer:
+            run_inspection(_FakePipeline(), images, [], writer, batch_size=4)
+
+        with open(output, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["fabric_type"], "Pamuk")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import os
+import sys
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import torch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+DESKTOP_APP = Path(__file__).resolve().parent.parent / "desktop_app"
+sys.path.insert(0, str(DESKTOP_APP))
+
+from PySide6.QtCore import QCoreApplication
+
+from ml_loader import MLPipelineLoader
+from ml.defect_detection.model import DefectDetectionModel
+from ml.fabric_classification.model import FabricClassificationModel
+
+
+class TestMLPipelineLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+        # Random-init weights so the tests never need to download anything
+        cls.weights_dir = tempfile.mkdtemp()
+        cls.defect_weights = os.path.join(cls.weights_dir, "defect.pth")
+        cls.fabric_weights = os.path.join(cls.weights_dir, "fabric.pth")
+        torch.save(
+            DefectDetectionModel(pretrained=False).state_dict(), cls.defect_weights
+        )
+        torch.save(
+            FabricClassificationModel(pretrained=False).state_dict(), cls.fabric_weights
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.weights_dir, ignore_errors=True)
+
+    def _run(self, loader):
+        """Run the loader synchronously and collect its signals."""
+        events = {"progress": [], "loaded": [], "failed": []}
+        loader.progress.connect(
+            lambda percent, text: events["progress"].append(percent)
+        )
+        loader.loaded.connect(
+            lambda pipeline, seconds: events["loaded"].append((pipeline, seconds))
+        )
+        loader.failed.connect(
+            lambda kind, detail: events["failed"].append((kind, detail))
+        )
+        loader.run()
+        return events
+
+    def test_loads_pipeline_with_progress(self):
+        loader = MLPipelineLoader(
+            defect_weights=self.defect_weights,
+            fabric_weights=self.fabric_weights,
+            device=torch.device("cpu"),
+        )
+        events = self._run(loader)
+
+        self.assertEqual(events["failed"], [])
+        self.assertEqual(len(events["loaded"]), 1)
+        pipeline, seconds = events["loaded"][0]
+        self.assertIs(pipeline, loader.pipeline)
+        self.assertGreater(seconds, 0)
+        self.assertEqual(events["progress"], sorted(events["progress"]))
+        self.assertEqual(events["progress"][-1], 100)
+        self.assertEqual(
+            set(loader.stage_seconds),
+            {"import_torch", "import_ml", "find_weights", "create_pipeline"},
+        )
+
+    def test_missing_package_reported_as_import_failure(self):
+        error = ImportError("No module named 'torch'", name="torch")
+        with mock.patch.object(MLPipelineLoader, "_import_torch", side_effect=error):
+            events = self._run(MLPipelineLoader())
+
+        self.assertEqual(events["failed"], [("import", "torch")])
+        self.assertEqual(events["loaded"], [])
+
+    def test_model_error_reported(self):
+        loader = MLPipelineLoader(
+            defect_weights=os.path.join(self.weights_dir, "missing.pth"),
+            fabric_weights=self.fabric_weights,
+            device=torch.device("cpu"),
+        )
+        events = self._run(loader)
+
+        self.assertEqual(len(events["failed"]), 1)
+        self.assertEqual(events["failed"][0][0], "error")
+        self.assertIsNone(loader.pipeline)
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_main_window_does_not_import_torch(self):
+        # A fresh interpreter: this test process has already imported torch
+        code = (
+            "import sys; import ui.main_window, ml_loader; "
+            "sys.exit(1 if 'torch' in sys.modules else 0)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=DESKTOP_APP,
+            capture_output=True,
+            env=dict(os.environ, QT_QPA_PLATFORM="offscreen"),
+        )
+        self.assertEqual(result.returncode, 0, result.stderr.decode(errors="replace"))
+
+
+if __name__ == "__main__":
+    unittest.main()
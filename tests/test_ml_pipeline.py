@@ -0,0 +1,493 @@
+import unittest
+import copy
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import torch
+
+# ML modules are imported the same way the desktop app imports them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from ml.pipeline import TextileInspectionPipeline, create_ml_pipeline
+from ml.process_pool import ParallelInspectionPipeline
+from ml.export import export_models, is_torchscript_file, load_torchscript_backbone
+from ml.shared.weights import WeightsError, read_manifest
+from ml.shared.transforms import get_transform, get_opencv_transform
+from ml.shared.utils import load_image_tensor, load_image_batch
+from ml.shared.features import extract_frame_features
+from ml.shared.profiling import LatencyRecorder
+from ml.shared.precision import (
+    apply_precision,
+    build_precision_report,
+    select_fastest_precision,
+)
+from ml.defect_detection.preprocessing import extract_texture_features
+from ml.fabric_classification.preprocessing import extract_fabric_features
+from ml.defect_detection.model import DefectDetectionModel
+from ml.defect_detection.prefilter import TexturePrefilter
+from ml.defect_detection.tiling import (
+    compute_tile_grid,
+    build_heatmap,
+    extract_defect_boxes,
+)
+from ml.fabric_classification.model import FabricClassificationModel
+
+
+def make_fabric_image(width=320, height=240, seed=0):
+    """Create a synthetic woven-looking BGR frame."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    weave = 128 + 40 * np.sin(x / 3.0) * np.cos(y / 3.0)
+    noise = rng.normal(0, 8, size=(height, width))
+    gray = np.clip(weave + noise, 0, 255).astype(np.uint8)
+    return np.dstack(
+        [gray, (gray * 0.9).astype(np.uint8), (gray * 0.8).astype(np.uint8)]
+    )
+
+
+class TestInspectionPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Random-init weights so the tests never need to download anything
+        torch.manual_seed(0)
+        cls.weights_dir = tempfile.mkdtemp()
+        cls.defect_weights = os.path.join(cls.weights_dir, "defect.pth")
+        cls.fabric_weights = os.path.join(cls.weights_dir, "fabric.pth")
+        torch.save(
+            DefectDetectionModel(pretrained=False).state_dict(), cls.defect_weights
+        )
+        torch.save(
+            FabricClassificationModel(pretrained=False).state_dict(), cls.fabric_weights
+        )
+
+        cls.pipeline = TextileInspectionPipeline(
+            defect_weights_path=cls.defect_weights,
+            fabric_weights_path=cls.fabric_weights,
+            device=torch.device("cpu"),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.weights_dir, ignore_errors=True)
+
+    def test_inspect_frame_structure(self):
+        """Test if inspect_frame returns all expected keys."""
+        result = self.pipeline.inspect_frame(make_fabric_image())
+        for key in (
+            "defect_detected",
+            "defect_type",
+            "defect_confidence",
+            "is_structural",
+            "severity",
+            "fabric_type",
+            "fabric_confidence",
+            "inference_time_ms",
+        ):
+            self.assertIn(key, result)
+
+    def test_batch_matches_single_frame(self):
+        """Test if batched inspection gives the same per-frame results."""
+        images = [make_fabric_image(seed=i) for i in range(4)]
+
+        single = [self.pipeline.inspect_frame(img) for img in images]
+        batched = self.pipeline.inspect_batch(images)
+
+        self.assertEqual(len(batched), len(images))
+        for s, b in zip(single, batched):
+            self.assertEqual(s["defect_type"], b["defect_type"])
+            self.assertEqual(s["fabric_type"], b["fabric_type"])
+            self.assertAlmostEqual(
+                s["defect_confidence"], b["defect_confidence"], places=3
+            )
+            self.assertAlmostEqual(
+                s["fabric_confidence"], b["fabric_confidence"], places=3
+            )
+
+    def test_frame_preprocessed_once(self):
+        """Test if both models share one preprocessed tensor per frame."""
+        shared = mock.Mock(wraps=self.pipeline.transform)
+        shared.accepts_bgr = True
+        shared.input_size = 224
+        unused = mock.Mock(side_effect=AssertionError("models must not preprocess"))
+
+        with mock.patch.object(self.pipeline, "transform", shared), mock.patch.object(
+            self.pipeline.defect_detector, "transform", unused
+        ), mock.patch.object(self.pipeline.fabric_classifier, "transform", unused):
+            self.pipeline.inspect_frame(make_fabric_image())
+            self.assertEqual(shared.call_count, 1)
+
+            shared.reset_mock()
+            self.pipeline.inspect_batch([make_fabric_image(seed=i) for i in range(3)])
+            self.assertEqual(shared.call_count, 3)
+
+    def test_stage_latency_stats(self):
+        """Test if every pipeline stage gets rolling percentiles."""
+        self.pipeline.reset_stats()
+        self.pipeline.inspect_frame(make_fabric_image())
+        self.pipeline.inspect_batch([make_fabric_image(seed=i) for i in range(2)])
+
+        stages = self.pipeline.get_performance_stats()["stages"]
+        for stage in (
+            "preprocess",
+            "texture_features",
+            "defect_forward",
+            "defect_postprocess",
+            "fabric_forward",
+            "fabric_postprocess",
+            "total",
+        ):
+            self.assertIn(stage, stages)
+            self.assertLessEqual(stages[stage]["p50_ms"], stages[stage]["p99_ms"])
+        self.assertEqual(stages["total"]["count"], 2)
+        self.assertEqual(stages["texture_features"]["count"], 3)
+
+    def test_empty_batch(self):
+        """Test if an empty batch returns no results."""
+        self.assertEqual(self.pipeline.inspect_batch([]), [])
+
+    def test_process_pool_keeps_frame_order(self):
+        """Test if the process pool returns the same results in frame order."""
+        images = [make_fabric_image(seed=i) for i in range(5)]
+        expected = self.pipeline.inspect_batch(images)
+
+        with ParallelInspectionPipeline(
+            num_workers=2,
+            defect_weights_path=self.defect_weights,
+            fabric_weights_path=self.fabric_weights,
+            device="cpu",
+        ) as pool:
+            results = pool.inspect_batch(images)
+            single = pool.inspect_frame(images[0])
+
+        self.assertEqual(len(results), len(images))
+        for e, r in zip(expected, results):
+            self.assertEqual(e["defect_type"], r["defect_type"])
+            self.assertAlmostEqual(
+                e["defect_confidence"], r["defect_confidence"], places=3
+            )
+        self.assertEqual(single["fabric_type"], expected[0]["fabric_type"])
+
+    def test_process_pool_stages_and_released_slots(self):
+        """Test if pool stats merge worker stages and replaced slots get unmapped."""
+
+        def mapped_stale_blocks(process):
+            # Blocks the parent unlinked but the worker still maps
+            with open(f"/proc/{process.pid}/maps") as maps:
+                return sum("psm_" in line and "(deleted)" in line for line in maps)
+
+        with ParallelInspectionPipeline(
+            num_workers=2,
+            defect_weights_path=self.defect_weights,
+            fabric_weights_path=self.fabric_weights,
+            device="cpu",
+        ) as pool:
+            # Growing frames force the pool to replace its shared-memory slots
+            for width, height in ((160, 120), (240, 180), (320, 240)):
+                pool.inspect_batch(
+                    [make_fabric_image(width, height, seed=i) for i in range(4)]
+                )
+
+            stats = pool.get_performance_stats()
+            if os.path.exists("/proc/self/maps"):
+                for process in pool._processes:
+                    self.assertEqual(mapped_stale_blocks(process), 0)
+
+            pool.reset_stats()
+            self.assertEqual(pool.get_performance_stats()["stages"], {})
+
+        self.assertEqual(stats["stages"]["total"]["count"], 12)
+        self.assertEqual(stats["stages"]["pool_wait"]["count"], 12)
+        self.assertIn("defect_forward", stats["stages"])
+
+    def test_torchscript_export_matches_eager(self):
+        """Test if exported TorchScript models give the eager pipeline's results."""
+        export_dir = os.path.join(self.weights_dir, "export")
+        defect_path, fabric_path = export_models(
+            export_dir, self.defect_weights, self.fabric_weights
+        )
+        self.assertTrue(is_torchscript_file(defect_path))
+        self.assertFalse(is_torchscript_file(self.defect_weights))
+
+        scripted = TextileInspectionPipeline(
+            defect_weights_path=defect_path,
+            fabric_weights_path=fabric_path,
+            device=torch.device("cpu"),
+        )
+        images = [make_fabric_image(seed=i) for i in range(3)]
+        for e, r in zip(
+            self.pipeline.inspect_batch(images), scripted.inspect_batch(images)
+        ):
+            self.assertEqual(e["defect_type"], r["defect_type"])
+            self.assertEqual(e["fabric_type"], r["fabric_type"])
+            self.assertAlmostEqual(
+                e["defect_confidence"], r["defect_confidence"], places=2
+            )
+            self.assertAlmostEqual(
+                e["fabric_confidence"], r["fabric_confidence"], places=2
+            )
+
+        # Artifacts are hash-verified like state_dict checkpoints
+        self.assertEqual(
+            sorted(read_manifest(export_dir)),
+            sorted(os.path.basename(p) for p in (defect_path, fabric_path)),
+        )
+        with open(fabric_path, "ab") as f:
+            f.write(b"tampered")
+        with self.assertRaises(WeightsError):
+            load_torchscript_backbone(fabric_path)
+
+    def test_prefilter_skips_clean_frames(self):
+        """Test if the texture cascade skips clean frames but not a damaged one."""
+        pipeline = TextileInspectionPipeline(
+            defect_weights_path=self.defect_weights,
+            fabric_weights_path=self.fabric_weights,
+            device=torch.device("cpu"),
+            prefilter={
+                "window": 20,
+                "warmup_frames": 5,
+                "z_threshold": 4.0,
+                "audit_interval": 3,
+            },
+        )
+        clean = [make_fabric_image(seed=i) for i in range(20)]
+        results = pipeline.inspect_batch(clean[:10]) + [
+            pipeline.inspect_frame(f) for f in clean[10:]
+        ]
+
+        skipped = [r for r in results if r["prefiltered"]]
+        self.assertGreater(len(skipped), 0)
+        for r in skipped:
+            self.assertFalse(r["defect_detected"])
+            self.assertEqual(r["defect_type"], "Temiz")
+
+        stats = pipeline.get_performance_stats()["prefilter"]
+        self.assertEqual(stats["frames_seen"], 20)
+        self.assertEqual(stats["frames_skipped"], len(skipped))
+        self.assertGreater(stats["audited_frames"], 0)
+        self.assertAlmostEqual(stats["skip_rate"], len(skipped) / 20)
+
+        # A large dark hole is far outside the baseline and must reach the model
+        damaged = make_fabric_image(seed=99)
+        damaged[60:180, 80:240] = 0
+        self.assertFalse(pipeline.inspect_frame(damaged)["prefiltered"])
+
+    def test_tiled_inspection(self):
+        """Test if tiled mode covers the frame and returns a heatmap."""
+        image = make_fabric_image(640, 480)
+        result = self.pipeline.inspect_frame_tiled(image, tile_size=224)
+
+        tiles = compute_tile_grid(480, 640, 224, self.pipeline.tile_overlap)
+        self.assertEqual(result["num_tiles"], len(tiles))
+        self.assertEqual(result["defect_heatmap"].shape, (120, 160))
+        self.assertTrue(
+            ((result["defect_heatmap"] >= 0) & (result["defect_heatmap"] <= 1)).all()
+        )
+        for key in ("defect_type", "fabric_type", "defect_boxes"):
+            self.assertIn(key, result)
+
+    def test_factory_passes_tiling_options(self):
+        """Test if create_ml_pipeline forwards every tiling option."""
+        pipeline = create_ml_pipeline(
+            defect_weights=self.defect_weights,
+            fabric_weights=self.fabric_weights,
+            device=torch.device("cpu"),
+            tile_size=224,
+            tile_overlap=0.5,
+            tile_batch_size=4,
+            heatmap_scale=0.5,
+        )
+        self.assertEqual(
+            (pipeline.tile_size, pipeline.tile_overlap, pipeline.tile_batch_size),
+            (224, 0.5, 4),
+        )
+        result = pipeline.inspect_frame(make_fabric_image(640, 480))
+        self.assertEqual(result["defect_heatmap"].shape, (240, 320))
+
+
+class TestTiling(unittest.TestCase):
+    def test_grid_covers_frame(self):
+        """Test if overlapping tiles cover every pixel and stay inside the frame."""
+        covered = np.zeros((1000, 3000), dtype=bool)
+        for y0, x0, y1, x1 in compute_tile_grid(1000, 3000, 256, overlap=0.5):
+            self.assertLessEqual(y1, 1000)
+            self.assertLessEqual(x1, 3000)
+            covered[y0:y1, x0:x1] = True
+        self.assertTrue(covered.all())
+        self.assertEqual(compute_tile_grid(100, 120, 224), [(0, 0, 100, 120)])
+
+    def test_boxes_from_heatmap(self):
+        """Test if a high-scoring tile becomes a box in frame coordinates."""
+        tiles = compute_tile_grid(400, 400, 100, overlap=0.0)
+        scores = [0.9 if (y0, x0) == (200, 100) else 0.1 for y0, x0, _, _ in tiles]
+        heatmap = build_heatmap((400, 400), tiles, scores, scale=0.25)
+        boxes = extract_defect_boxes(heatmap, threshold=0.6, scale=0.25)
+
+        self.assertEqual(len(boxes), 1)
+        self.assertEqual((boxes[0]["x"], boxes[0]["y"]), (100, 200))
+        self.assertEqual((boxes[0]["width"], boxes[0]["height"]), (100, 100))
+        self.assertAlmostEqual(boxes[0]["score"], 0.9, places=5)
+
+
+class TestTexturePrefilter(unittest.TestCase):
+    def test_warmup_and_false_negatives(self):
+        """Test if nothing is skipped before warm-up and audits count misses."""
+        prefilter = TexturePrefilter(window=10, warmup_frames=4, audit_interval=1)
+        features = {"edge_density": 0.1, "blur_score": 200.0, "contrast": 30.0}
+
+        self.assertFalse(prefilter.should_skip(features))
+        for i in range(4):
+            prefilter.update({**features, "contrast": 30.0 + i}, is_clean=True)
+        self.assertTrue(prefilter.should_skip(features))
+        self.assertFalse(prefilter.should_skip({**features, "contrast": 90.0}))
+
+        self.assertTrue(prefilter.should_audit())
+        prefilter.record_audit(defect_detected=True)
+        stats = prefilter.get_stats()
+        self.assertEqual(stats["false_negatives"], 1)
+        self.assertEqual(stats["false_negative_rate"], 1.0)
+        self.assertEqual(stats["frames_skipped"], 0)
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    def test_rolling_percentiles(self):
+        """Test if percentiles cover only the most recent window of samples."""
+        recorder = LatencyRecorder(window=100)
+        for i in range(1, 201):
+            recorder.record("stage", i * 1_000_000)
+
+        stats = recorder.get_stats()["stage"]
+        self.assertEqual(stats["count"], 200)
+        self.assertAlmostEqual(stats["p50_ms"], 150.5)
+        self.assertAlmostEqual(stats["max_ms"], 200.0)
+        self.assertGreater(stats["p99_ms"], stats["p95_ms"])
+
+        merged = LatencyRecorder(window=400)
+        merged.merge(recorder.snapshot())
+        merged.merge(recorder.snapshot())
+        stats = merged.get_stats()["stage"]
+        self.assertEqual(stats["count"], 400)
+        self.assertAlmostEqual(stats["p50_ms"], 150.5)
+
+        disabled = LatencyRecorder(enabled=False)
+        with disabled.measure("stage"):
+            pass
+        self.assertEqual(disabled.get_stats(), {})
+
+
+class TestOpenCVTransform(unittest.TestCase):
+    def test_parity_with_pil_transform(self):
+        """Test if the OpenCV path matches get_transform() within one intensity level."""
+        pil_transform = get_transform(input_size=224, normalize=True)
+        cv_transform = get_opencv_transform(input_size=224, normalize=True)
+
+        for width, height in ((640, 480), (1920, 1080), (200, 150)):
+            # Pattern scales with resolution, like the same fabric seen by
+            # cameras of different resolution
+            y, x = np.mgrid[0:height, 0:width]
+            gray = 128 + 60 * np.sin(x * 40.0 / width) * np.cos(y * 30.0 / height)
+            gray = np.clip(
+                gray + np.random.default_rng(width).normal(0, 6, gray.shape), 0, 255
+            )
+            image = np.dstack([gray, 255 - gray, np.roll(gray, 7, axis=1)]).astype(
+                np.uint8
+            )
+
+            expected = load_image_tensor(image, pil_transform)
+            actual = load_image_tensor(image, cv_transform)
+
+            self.assertEqual(actual.shape, expected.shape)
+            diff = (actual - expected).abs()
+            # 1/255 of range after ImageNet normalization is ~0.017
+            self.assertLess(diff.mean().item(), 0.03)
+            self.assertLess(diff.max().item(), 0.25)
+
+    def test_unnormalized_range(self):
+        """Test if normalize=False keeps values in [0, 1] like ToTensor."""
+        tensor = get_opencv_transform(normalize=False)(make_fabric_image())
+        self.assertGreaterEqual(tensor.min().item(), 0.0)
+        self.assertLessEqual(tensor.max().item(), 1.0)
+
+    def test_batch_written_in_place(self):
+        """Test if load_image_batch fills one preallocated batch tensor."""
+        transform = get_opencv_transform()
+        images = [make_fabric_image(seed=i) for i in range(3)]
+        batch = load_image_batch(images, transform)
+
+        self.assertEqual(tuple(batch.shape), (3, 3, 224, 224))
+        for i, image in enumerate(images):
+            self.assertTrue(torch.equal(batch[i], transform(image)))
+
+
+class TestFusedFeatures(unittest.TestCase):
+    def test_matches_individual_extractors(self):
+        """Test if the fused extractor reproduces both feature dicts."""
+        image = make_fabric_image(640, 480)
+        texture, fabric = extract_frame_features(image)
+
+        expected_texture = extract_texture_features(image)
+        expected_fabric = extract_fabric_features(image)
+
+        self.assertEqual(texture.keys(), expected_texture.keys())
+        self.assertEqual(fabric.keys(), expected_fabric.keys())
+        for key, value in expected_texture.items():
+            self.assertAlmostEqual(texture[key], value, places=6)
+        for key, value in expected_fabric.items():
+            self.assertAlmostEqual(fabric[key], value, places=6)
+
+    def test_downsampled(self):
+        """Test if features can be computed on a downsampled copy."""
+        texture, fabric = extract_frame_features(
+            make_fabric_image(1920, 1080), downsample_to=480
+        )
+        self.assertGreater(texture["blur_score"], 0.0)
+        self.assertGreater(fabric["brightness"], 0.0)
+
+
+class TestPrecisionModes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        torch.manual_seed(0)
+        cls.model = FabricClassificationModel(pretrained=False).eval()
+        transform = get_opencv_transform()
+        cls.tensors = load_image_batch(
+            [make_fabric_image(seed=i) for i in range(4)], transform
+        )
+
+    def test_report_and_selection(self):
+        """Test if every mode is compared to fp32 and a mode is selected."""
+        report = build_precision_report({"fabric": self.model}, self.tensors, repeats=1)
+
+        self.assertEqual(set(report), {"fp32", "bf16", "int8_dynamic", "int8_static"})
+        self.assertAlmostEqual(
+            report["fp32"]["fabric"]["max_prob_delta"], 0.0, places=4
+        )
+        for precision, per_model in report.items():
+            result = per_model["fabric"]
+            if "error" not in result:
+                self.assertGreaterEqual(result["top1_agreement"], 0.0)
+                self.assertGreater(result["candidate_ms"], 0.0)
+
+        self.assertIn(select_fastest_precision(report), report)
+
+    def test_quantized_model_keeps_predict_interface(self):
+        """Test if a static int8 model still returns prediction dicts."""
+        model = apply_precision(
+            copy.deepcopy(self.model), "int8_static", calibration_tensors=self.tensors
+        )
+        predictions = model.predict_batch(self.tensors)
+        self.assertEqual(len(predictions), 4)
+        self.assertIn("fabric_type", predictions[0])
+
+    def test_static_requires_calibration(self):
+        """Test if int8_static without calibration frames is rejected."""
+        with self.assertRaises(ValueError):
+            apply_precision(copy.deepcopy(self.model), "int8_static")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import torch
+from torchvision import models
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from ml.shared.weights import (
+    WeightsError,
+    register_weights,
+    verify_weights,
+    read_manifest,
+    resolve_pretrained_weights,
+    load_state_dict_file,
+    instantiate_with_state_dict,
+)
+from ml.defect_detection.model import DefectDetectionModel, load_defect_model
+from ml.fabric_classification.model import FabricClassificationModel
+
+
+class TestWeightsDirectory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.weights_dir = Path(self.tmp.name) / "weights"
+        self.hub_dir = Path(self.tmp.name) / "hub"
+        # Isolate from the real weights directory and torch hub cache
+        self.env = mock.patch.dict(
+            os.environ, {"OTI_WEIGHTS_DIR": str(self.weights_dir)}
+        )
+        self.env.start()
+        self.hub = mock.patch.object(
+            torch.hub, "get_dir", return_value=str(self.hub_dir)
+        )
+        self.hub.start()
+
+    def tearDown(self):
+        self.hub.stop()
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def _save(self, module, name):
+        path = Path(self.tmp.name) / name
+        torch.save(module.state_dict(), path)
+        return path
+
+    def test_register_and_verify(self):
+        path = register_weights(self._save(torch.nn.Linear(4, 2), "head.pth"))
+        self.assertEqual(path.parent, self.weights_dir)
+        self.assertIn("head.pth", read_manifest())
+        self.assertTrue(verify_weights(path))
+
+        with open(path, "ab") as f:
+            f.write(b"corrupt")
+        with self.assertRaises(WeightsError):
+            verify_weights(path)
+        with self.assertRaises(WeightsError):
+            load_state_dict_file(path)
+
+    def test_unregistered_file_is_not_verified(self):
+        path = self._save(torch.nn.Linear(4, 2), "loose.pth")
+        self.assertFalse(verify_weights(path))
+
+    def test_offline_missing_weights_fail_fast(self):
+        with mock.patch.object(torch.hub, "download_url_to_file") as download:
+            with self.assertRaises(WeightsError):
+                resolve_pretrained_weights("resnet18", offline=True)
+            download.assert_not_called()
+
+        with mock.patch.dict(os.environ, {"OTI_OFFLINE": "1"}):
+            with self.assertRaises(WeightsError):
+                FabricClassificationModel(pretrained=True)
+
+    def test_pretrained_backbone_from_weights_directory(self):
+        # Stand-in for the ImageNet checkpoint, registered under its torchvision name
+        torch.manual_seed(0)
+        reference = models.resnet18(weights=None)
+        filename = models.ResNet18_Weights.IMAGENET1K_V1.url.rsplit("/", 1)[-1]
+        register_weights(self._save(reference, filename))
+
+        with mock.patch.object(torch.hub, "download_url_to_file") as download:
+            model = FabricClassificationModel(pretrained=True)
+            download.assert_not_called()
+
+        torch.testing.assert_close(model.backbone.conv1.weight, reference.conv1.weight)
+        self.assertFalse(any(p.is_meta for p in model.parameters()))
+
+    def test_hub_cache_file_must_match_name_hash(self):
+        filename = models.ResNet18_Weights.IMAGENET1K_V1.url.rsplit("/", 1)[-1]
+        cached = self.hub_dir / "checkpoints" / filename
+        cached.parent.mkdir(parents=True)
+        torch.save(models.resnet18(weights=None).state_dict(), cached)
+
+        with self.assertRaises(WeightsError):
+            resolve_pretrained_weights("resnet18", offline=True)
+
+    def test_state_dict_is_memory_mapped(self):
+        torch.manual_seed(0)
+        reference = DefectDetectionModel(pretrained=False).eval()
+        path = self._save(reference, "defect.pth")
+
+        state_dict = load_state_dict_file(path)
+        model = instantiate_with_state_dict(
+            lambda: DefectDetectionModel(pretrained=False), state_dict
+        )
+        # Parameters share storage with the mapped file instead of a copy
+        self.assertEqual(
+            model.backbone.classifier[1].weight.data_ptr(),
+            state_dict["backbone.classifier.1.weight"].data_ptr(),
+        )
+
+        loaded = load_defect_model(str(path))
+        x = torch.randn(2, 3, 224, 224)
+        with torch.no_grad():
+            torch.testing.assert_close(loaded(x), reference(x))
+
+    def test_legacy_checkpoint_falls_back_to_regular_load(self):
+        path = Path(self.tmp.name) / "legacy.pth"
+        layer = torch.nn.Linear(4, 2)
+        torch.save(layer.state_dict(), path, _use_new_zipfile_serialization=False)
+
+        state_dict = load_state_dict_file(path)
+        torch.testing.assert_close(state_dict["weight"], layer.weight.detach())
+
+    def test_module_entry_points_run_cleanly(self):
+        """Test if the documented python -m commands run without runpy warnings."""
+        desktop_app = Path(__file__).resolve().parent.parent / "desktop_app"
+        for module in ("ml.shared.weights", "ml.export"):
+            result = subprocess.run(
+                [sys.executable, "-W", "error::RuntimeWarning", "-m", module, "--help"],
+                cwd=desktop_app,
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
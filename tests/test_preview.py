@@ -0,0 +1,44 @@
+import unittest
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from PySide6.QtGui import QImage
+
+from preview import PreviewRenderer, fit_size
+
+
+class TestPreviewRenderer(unittest.TestCase):
+    def test_fit_size_keeps_aspect(self):
+        """Test if the preview fits the widget with the frame's aspect ratio."""
+        self.assertEqual(fit_size(1920, 1080, 640, 480), (640, 360))
+        self.assertEqual(fit_size(640, 480, 400, 400), (400, 300))
+
+    def test_render_downscales_and_converts(self):
+        """Test if rendering matches resize + BGR→RGB at the widget size."""
+        frame = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        image = PreviewRenderer(320, 320).render(frame)
+
+        self.assertEqual((image.width(), image.height()), (320, 240))
+        self.assertEqual(image.format(), QImage.Format_RGBX8888)
+
+        expected = cv2.resize(frame, (320, 240), interpolation=cv2.INTER_AREA)
+        for x, y in ((0, 0), (100, 37), (319, 239)):
+            color = image.pixelColor(x, y)
+            b, g, r = expected[y, x]
+            self.assertEqual((color.red(), color.green(), color.blue()), (r, g, b))
+
+    def test_render_rate_cap(self):
+        """Test if previews are rendered at most max_fps times per second."""
+        renderer = PreviewRenderer(max_fps=10)
+        self.assertTrue(renderer.due(0.0))
+        self.assertFalse(renderer.due(0.05))
+        self.assertTrue(renderer.due(0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import torch
+
+# ML modules are imported the same way the desktop app imports them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from ml.pipeline import TextileInspectionPipeline
+from ml.roll_context import RollContext
+from ml.defect_detection.model import DefectDetectionModel
+from ml.fabric_classification.model import FabricClassificationModel
+
+
+def fabric_result(fabric_type, confidence=90.0):
+    return {
+        "fabric_type": fabric_type,
+        "confidence": confidence,
+        "all_probabilities": {fabric_type: confidence / 100.0},
+    }
+
+
+def make_fabric_image(seed=0):
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:240, 0:320]
+    gray = np.clip(
+        128 + 40 * np.sin(x / 3.0) * np.cos(y / 3.0) + rng.normal(0, 8, (240, 320)),
+        0,
+        255,
+    )
+    return np.dstack([gray.astype(np.uint8)] * 3)
+
+
+class TestRollContext(unittest.TestCase):
+    def feed(self, context, results):
+        """Run results through the lookup/update protocol, return the lookups."""
+        lookups = []
+        for result in results:
+            lookup = context.lookup()
+            lookups.append(lookup)
+            if lookup is None:
+                context.update(result)
+        return lookups
+
+    def test_locks_after_stable_warmup(self):
+        context = RollContext(warmup_frames=3, recheck_interval=0)
+        lookups = self.feed(context, [fabric_result("Denim")] * 10)
+
+        self.assertEqual(lookups[:3], [None] * 3)
+        self.assertTrue(all(lookup["fabric_type"] == "Denim" for lookup in lookups[3:]))
+        self.assertTrue(lookups[3]["fabric_locked"])
+        stats = context.get_stats()
+        self.assertEqual((stats["frames_classified"], stats["frames_skipped"]), (3, 7))
+        self.assertEqual(stats["fabric_type"], "Denim")
+
+    def test_no_lock_without_agreement_or_confidence(self):
+        context = RollContext(warmup_frames=4, min_agreement=0.75)
+        self.feed(context, [fabric_result("Denim"), fabric_result("Pamuk")] * 4)
+        self.assertFalse(context.locked)
+
+        context = RollContext(warmup_frames=4, min_confidence=60.0)
+        self.feed(context, [fabric_result("Denim", confidence=40.0)] * 8)
+        self.assertFalse(context.locked)
+
+        # The window slides: a stable run after a noisy start still locks
+        context = RollContext(warmup_frames=4)
+        self.feed(context, [fabric_result("Pamuk")] * 2 + [fabric_result("Denim")] * 4)
+        self.assertEqual(context.fabric_type, "Denim")
+
+    def test_recheck_confirms_or_unlocks(self):
+        context = RollContext(warmup_frames=2, recheck_interval=5)
+        lookups = self.feed(context, [fabric_result("Denim")] * 12)
+        self.assertEqual(
+            [i for i, lookup in enumerate(lookups) if lookup is None], [0, 1, 6, 11]
+        )
+        self.assertEqual(context.get_stats()["rechecks"], 2)
+
+        # Unconfident disagreement is ignored
+        self.feed(context, [None] * 4)
+        self.assertIsNone(context.lookup())
+        self.assertFalse(context.update(fabric_result("Örme", confidence=20.0)))
+        self.assertTrue(context.locked)
+
+        # A confident one makes every frame classified until it is confirmed...
+        self.feed(context, [None] * 4)
+        self.assertIsNone(context.lookup())
+        self.assertFalse(context.update(fabric_result("Örme")))
+        self.assertTrue(context.locked)
+        self.assertIsNone(context.lookup())
+        self.assertFalse(context.update(fabric_result("Denim")))
+        self.assertIsNotNone(context.lookup())
+
+        # ...and warmup_frames consecutive ones move the lock to the new fabric
+        self.feed(context, [None] * 3)
+        self.assertEqual(self.feed(context, [fabric_result("Örme")] * 2), [None, None])
+        self.assertEqual(context.fabric_type, "Örme")
+        stats = context.get_stats()
+        self.assertEqual((stats["unlocks"], stats["locks"]), (1, 2))
+
+        context.reset()
+        self.assertFalse(context.locked)
+        self.assertEqual(context.get_stats()["frames_seen"], 0)
+
+    def test_batch_right_after_lock(self):
+        """Test if one outlier classified in the locking batch keeps the lock."""
+        context = RollContext(warmup_frames=3, recheck_interval=0)
+
+        # A batch looks up all frames before any of them is classified
+        results = [fabric_result("Denim")] * 3 + [fabric_result("Pamuk")]
+        results += [fabric_result("Denim")] * 4
+        self.assertEqual([context.lookup() for _ in results], [None] * 8)
+        changes = [context.update(result) for result in results]
+
+        self.assertEqual(changes, [False, False, True] + [False] * 5)
+        self.assertEqual(context.fabric_type, "Denim")
+        self.assertIsNotNone(context.lookup())
+
+        # A run of warmup_frames disagreeing frames in the batch does move the lock
+        context = RollContext(warmup_frames=3, recheck_interval=0)
+        results = [fabric_result("Denim")] * 3 + [fabric_result("Pamuk")] * 3
+        self.assertEqual([context.lookup() for _ in results], [None] * 6)
+        changes = [context.update(result) for result in results]
+
+        self.assertEqual(changes, [False, False, True, False, False, True])
+        self.assertEqual(context.fabric_type, "Pamuk")
+
+    def test_profiles(self):
+        context = RollContext(profiles={"Denim": {"confidence_threshold": 0.8}})
+        self.assertEqual(context.profile("Denim"), {"confidence_threshold": 0.8})
+        self.assertEqual(context.profile("Pamuk"), {})
+        self.assertEqual(context.profile(None), {})
+        with self.assertRaises(ValueError):
+            RollContext(profiles={"Denim": {"threshold": 0.8}})
+
+
+class TestPipelineRollContext(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        torch.manual_seed(0)
+        cls.weights_dir = tempfile.mkdtemp()
+        cls.defect_weights = os.path.join(cls.weights_dir, "defect.pth")
+        cls.fabric_weights = os.path.join(cls.weights_dir, "fabric.pth")
+        torch.save(
+            DefectDetectionModel(pretrained=False).state_dict(), cls.defect_weights
+        )
+        torch.save(
+            FabricClassificationModel(pretrained=False).state_dict(), cls.fabric_weights
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.weights_dir, ignore_errors=True)
+
+    def make_pipeline(self, **roll_context):
+        # Random-init classifier: identical frames still give identical predictions
+        settings = dict(warmup_frames=3, min_confidence=0.0, recheck_interval=0)
+        settings.update(roll_context)
+        return TextileInspectionPipeline(
+            defect_weights_path=self.defect_weights,
+            fabric_weights_path=self.fabric_weights,
+            device=torch.device("cpu"),
+            roll_context=settings,
+        )
+
+    def test_classifier_skipped_after_lock(self):
+        pipeline = self.make_pipeline()
+        image = make_fabric_image()
+        classify = mock.Mock(wraps=pipeline.fabric_classifier.classify_batch)
+
+        with mock.patch.object(pipeline.fabric_classifier, "classify_batch", classify):
+            single = [pipeline.inspect_frame(image) for _ in range(5)]
+            batched = pipeline.inspect_batch([image] * 4)
+
+        self.assertEqual(classify.call_count, 3)
+        self.assertEqual([r["fabric_locked"] for r in single], [False] * 3 + [True] * 2)
+        self.assertTrue(all(r["fabric_locked"] for r in batched))
+        self.assertEqual(
+            {r["fabric_type"] for r in single + batched}, {single[0]["fabric_type"]}
+        )
+        self.assertAlmostEqual(
+            batched[0]["fabric_confidence"], single[0]["fabric_confidence"], places=3
+        )
+
+        stats = pipeline.get_performance_stats()["roll_context"]
+        self.assertEqual((stats["frames_seen"], stats["frames_skipped"]), (9, 6))
+
+    def test_profile_threshold_routing(self):
+        probe = self.make_pipeline()
+        fabric_type = probe.inspect_frame(make_fabric_image())["fabric_type"]
+
+        pipeline = self.make_pipeline(
+            profiles={fabric_type: {"confidence_threshold": 0.95}}
+        )
+        for _ in range(3):
+            pipeline.inspect_frame(make_fabric_image())
+        self.assertEqual(pipeline.defect_detector.confidence_threshold, 0.95)
+        self.assertIn(fabric_type, pipeline.get_model_info()["fabric_profiles"])
+
+        # The profile wins over the operator threshold while the fabric is locked
+        pipeline.set_confidence_threshold(0.7)
+        self.assertEqual(pipeline.defect_detector.confidence_threshold, 0.95)
+
+        # A new roll unlocks and restores the default threshold
+        pipeline.start_roll()
+        self.assertFalse(pipeline.roll_context.locked)
+        self.assertAlmostEqual(pipeline.defect_detector.confidence_threshold, 0.7)
+
+    def test_tiled_inspection_uses_lock(self):
+        pipeline = self.make_pipeline(warmup_frames=1)
+        pipeline.tile_size = 160
+        results = [pipeline.inspect_frame(make_fabric_image(seed=i)) for i in range(2)]
+        self.assertEqual([r["fabric_locked"] for r in results], [False, True])
+        self.assertIn("defect_heatmap", results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
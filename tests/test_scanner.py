@@ -43,6 +43,9 @@ class TestFabricScanner(unittest.TestCase):
             self.assertIn("defects", data)
             self.assertIn("summary", data)
             self.assertIsInstance(data["defects"], list)
+            self.assertEqual(len(data["defects"]), data["summary"]["total_defects"])
+            for defect in data["defects"]:
+                self.assertTrue(defect["is_defective"])
 
         finally:
             # Clean up
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import threading
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+
+from PySide6.QtCore import QCoreApplication, QObject, Signal
+
+from ui.signal_coalescer import SignalCoalescer
+
+
+class Emitter(QObject):
+    progress = Signal(int)
+    detection = Signal(dict)
+
+
+class TestSignalCoalescer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def test_latest_and_batched_from_worker_thread(self):
+        """Test if worker emissions are coalesced and delivered in the UI thread."""
+        emitter = Emitter()
+        coalescer = SignalCoalescer(refresh_hz=30)
+        progress, batches, threads = [], [], set()
+
+        def on_progress(value):
+            threads.add(threading.get_ident())
+            progress.append(value)
+
+        coalescer.connect_latest(emitter.progress, on_progress)
+        coalescer.connect_batched(emitter.detection, batches.append)
+
+        def work():
+            for i in range(50):
+                emitter.progress.emit(i)
+                emitter.detection.emit({"frame": i})
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        worker.join()
+
+        # Nothing reaches the UI until the next refresh tick
+        self.assertEqual(progress, [])
+        coalescer.flush()
+
+        self.assertEqual(progress, [49])
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([d["frame"] for d in batches[0]], list(range(50)))
+        self.assertEqual(threads, {threading.get_ident()})
+
+        coalescer.disconnect_all()
+        emitter.progress.emit(99)
+        coalescer.flush()
+        self.assertEqual(progress, [49])
+        self.assertEqual(coalescer.get_stats()["signals_received"], 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
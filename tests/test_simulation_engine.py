@@ -0,0 +1,154 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from src.simulation_engine import SimulationEngine, FrameBlock
+from src.defect_scanner import FabricScanner
+from src.detection_store import DetectionHistory
+
+
+def concat(blocks):
+    return FrameBlock.concatenate(list(blocks))
+
+
+class TestSimulationEngine(unittest.TestCase):
+    def test_same_seed_same_sequence(self):
+        """Test if the sequence depends only on the seed, not on how it is requested."""
+        a = concat(
+            SimulationEngine(seed=7, block_frames=1000).blocks(5000, block_size=333)
+        )
+        engine = SimulationEngine(seed=7, block_frames=1000)
+        b = concat(
+            [engine.next_block(1)] + [engine.next_block(2499), engine.next_block(2500)]
+        )
+
+        for name in (
+            "frame_index",
+            "is_defective",
+            "defect_class",
+            "confidence",
+            "in_burst",
+        ):
+            np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
+        np.testing.assert_array_equal(a.frame_index, np.arange(5000))
+
+        other = concat(SimulationEngine(seed=8, block_frames=1000).blocks(5000))
+        self.assertFalse(np.array_equal(a.is_defective, other.is_defective))
+
+        engine.reset()
+        np.testing.assert_array_equal(
+            engine.next_block(5000).is_defective, a.is_defective
+        )
+
+    def test_rates_and_class_distribution(self):
+        """Test if defect and class frequencies match the configured distribution."""
+        engine = SimulationEngine(seed=1)
+        block = concat(engine.blocks(1_000_000))
+
+        rate = block.defect_count / len(block)
+        self.assertAlmostEqual(rate, engine.expected_defect_rate, delta=0.01)
+
+        shares = block.class_counts(len(engine.defect_types)) / block.defect_count
+        np.testing.assert_allclose(shares, engine.class_weights, atol=0.02)
+
+        defective = block.confidence[block.is_defective]
+        self.assertTrue(np.all((defective >= 0.85) & (defective <= 0.99)))
+        self.assertTrue(np.all(block.defect_class[~block.is_defective] == -1))
+
+    def test_defects_come_in_bursts(self):
+        """Test if a defect makes a defect on the next frame more likely."""
+        block = SimulationEngine(seed=2).next_block(200_000)
+        defective = block.is_defective
+        after_defect = defective[1:][defective[:-1]].mean()
+        self.assertGreater(after_defect, 2 * defective.mean())
+
+        # Consecutive burst defects repeat the same class
+        burst = (
+            block.in_burst[1:] & block.in_burst[:-1] & defective[1:] & defective[:-1]
+        )
+        same_class = block.defect_class[1:][burst] == block.defect_class[:-1][burst]
+        self.assertGreater(same_class.mean(), 0.9)
+
+        no_bursts = SimulationEngine(seed=2, burst_rate=0).next_block(10_000)
+        self.assertFalse(no_bursts.in_burst.any())
+
+    def test_records(self):
+        engine = SimulationEngine(seed=3)
+        block = engine.next_block(1000)
+        records = engine.to_records(block, frame_id_prefix="SIM-", timestamp="12:00:00")
+
+        self.assertEqual(len(records), 1000)
+        self.assertEqual(records[0]["frame_id"], "SIM-10000")
+        for record, defective in zip(records, block.is_defective):
+            self.assertEqual(record["is_defective"], bool(defective))
+            self.assertEqual(record["status"], "KUSUR" if defective else "TAMAM")
+            if not defective:
+                self.assertEqual(record["defect_type"], "-")
+
+        defects = engine.to_records(block, defects_only=True)
+        self.assertEqual(len(defects), block.defect_count)
+        self.assertTrue(
+            all(record["defect_type"] in engine.defect_types for record in defects)
+        )
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            SimulationEngine(class_weights=(1.0,))
+        with self.assertRaises(ValueError):
+            SimulationEngine(defect_rate=1.5)
+
+    def test_scanner_replays_with_seed(self):
+        scanner_a, scanner_b = FabricScanner(seed=11), FabricScanner(seed=11)
+        a = [scanner_a.analyze_frame(f"FR-{i}") for i in range(50)]
+        b = [scanner_b.analyze_frame(f"FR-{i}") for i in range(50)]
+        self.assertEqual(a, b)
+        self.assertTrue(any(result["detected"] for result in a))
+
+
+class TestDetectionManagerSimulation(unittest.TestCase):
+    def test_unthrottled_run_is_replayable(self):
+        """Test if an unthrottled run stores every frame and matches the engine sequence."""
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+        from PySide6.QtCore import QCoreApplication
+        from detection_manager import DetectionManager
+
+        app = QCoreApplication.instance() or QCoreApplication([])  # noqa: F841
+        frames = 150_000
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with DetectionHistory(Path(tmp) / "detections.db") as store:
+                store.start_roll(mode="SIMULATION", source="test")
+                manager = DetectionManager(
+                    duration_seconds=None,
+                    detection_store=store,
+                    frame_rate=0,
+                    seed=5,
+                    max_frames=frames,
+                )
+                emitted = []
+                manager.new_detections.connect(emitted.append)
+                manager.run()  # in this thread
+                store.flush(timeout=None)
+
+                expected = SimulationEngine(seed=5).next_block(frames)
+                self.assertEqual(manager.frames_generated, frames)
+                self.assertEqual(manager.scanner.defects_found, expected.defect_count)
+                self.assertEqual(
+                    sum(len(batch) for batch in emitted), expected.defect_count
+                )
+                self.assertEqual(manager.scanner.scanned_yards, frames * 0.5)
+                # Clean frames are not persisted, like in camera mode
+        self.assertEqual(store.get_stats()["records_written"], expected.defect_count)
+
+        with self.assertRaises(ValueError):
+            DetectionManager(duration_seconds=None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "desktop_app"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from synthetic_fabric import DEFECT_TYPES, generate_fabric_frame, generate_fabric_frames
+from run_benchmarks import compare
+
+
+class TestSyntheticFabric(unittest.TestCase):
+    def test_frames_are_reproducible(self):
+        """Test if the same seed always gives the same frame."""
+        a = generate_fabric_frame(320, 240, fabric="denim", seed=3)
+        b = generate_fabric_frame(320, 240, fabric="denim", seed=3)
+        c = generate_fabric_frame(320, 240, fabric="denim", seed=4)
+
+        self.assertEqual(a.shape, (240, 320, 3))
+        self.assertEqual(a.dtype, np.uint8)
+        np.testing.assert_array_equal(a, b)
+        self.assertFalse(np.array_equal(a, c))
+
+    def test_defects_change_frame(self):
+        """Test if every defect type is painted into the frame."""
+        clean = generate_fabric_frame(200, 200, seed=1)
+        for defect in DEFECT_TYPES:
+            frame = generate_fabric_frame(200, 200, seed=1, defect=defect)
+            self.assertFalse(np.array_equal(clean, frame), defect)
+
+        with self.assertRaises(ValueError):
+            generate_fabric_frame(64, 64, fabric="ipek")
+
+    def test_frame_sequence(self):
+        """Test if a roll sequence has the requested length and is seeded."""
+        first = list(generate_fabric_frames(5, 64, 48, seed=2, defect_rate=0.5))
+        second = list(generate_fabric_frames(5, 64, 48, seed=2, defect_rate=0.5))
+
+        self.assertEqual(len(first), 5)
+        for a, b in zip(first, second):
+            np.testing.assert_array_equal(a, b)
+
+
+class TestBenchmarkCompare(unittest.TestCase):
+    def test_throughput_regression_detected(self):
+        """Test if only FPS drops beyond the tolerance count as regressions."""
+        baseline = {
+            "results": {
+                "inspect_frame/640x480": {"fps": 100.0},
+                "inspect_batch/640x480": {"fps": 100.0},
+                "preprocess/640x480": {"fps": 100.0},
+            }
+        }
+        current = {
+            "results": {
+                "inspect_frame/640x480": {"fps": 80.0},
+                "inspect_batch/640x480": {"fps": 90.0},
+                "preprocess/640x480": {"fps": 150.0},
+                "video_loop/640x480": {"fps": 5.0},
+            }
+        }
+
+        rows = {row["case"]: row for row in compare(current, baseline, tolerance=0.15)}
+
+        self.assertNotIn("video_loop/640x480", rows)
+        self.assertTrue(rows["inspect_frame/640x480"]["regression"])
+        self.assertFalse(rows["inspect_batch/640x480"]["regression"])
+        self.assertFalse(rows["preprocess/640x480"]["regression"])
+        self.assertAlmostEqual(rows["preprocess/640x480"]["change"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()